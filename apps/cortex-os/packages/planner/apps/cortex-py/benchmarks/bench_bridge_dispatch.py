@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark bridge request dispatch over a local pipe.
+
+Drives a mixed JSON-RPC workload through an OS pipe into the bridge's
+dispatch layer and compares the previous one-request-at-a-time loop with
+pipelined dispatch. Method handlers simulate their latency with
+``asyncio.sleep`` so the numbers isolate dispatch and I/O behaviour from the
+ML components.
+
+    python benchmarks/bench_bridge_dispatch.py --requests 2000
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import random
+import threading
+import time
+from pathlib import Path
+
+# Loaded by path: the "mlx" package name would otherwise resolve to Apple's MLX
+_DISPATCH_PATH = Path(__file__).resolve().parents[1] / "src" / "mlx" / "dispatch.py"
+_spec = importlib.util.spec_from_file_location("bridge_dispatch", _DISPATCH_PATH)
+dispatch = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(dispatch)
+
+# Method -> (share of requests, simulated latency in ms)
+WORKLOAD = {
+    "select_optimal_model": (0.10, 20.0),
+    "validate_input": (0.10, 4.0),
+    "validate_output": (0.10, 4.0),
+    "get_memory_state": (0.30, 0.5),
+    "record_inference": (0.30, 0.5),
+    "get_performance_metrics": (0.10, 0.5),
+}
+
+
+class CountingStream:
+    """Binary stream wrapper counting write calls."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.writes = 0
+
+    def write(self, data: bytes):
+        self.writes += 1
+        return self.raw.write(data)
+
+    def flush(self):
+        self.raw.flush()
+
+
+def make_requests(count: int, seed: int) -> list[bytes]:
+    rng = random.Random(seed)
+    methods = list(WORKLOAD)
+    weights = [share for share, _ in WORKLOAD.values()]
+    return [
+        json.dumps({"id": f"req-{i}", "method": method, "params": {}}).encode() + b"\n"
+        for i, method in enumerate(rng.choices(methods, weights, k=count))
+    ]
+
+
+async def serve(in_fd: int, out_fd: int, pipelined: bool) -> int:
+    stdin = os.fdopen(in_fd, "rb", buffering=0)
+    stdout = CountingStream(os.fdopen(out_fd, "wb"))
+    reader = await dispatch.open_line_reader(stdin)
+
+    if pipelined:
+        writer = dispatch.BatchedWriter(stdout)
+
+        def send(line: str):
+            writer.write_line(line)
+
+    else:
+
+        def send(line: str):
+            # Previous behaviour: print(..., flush=True) per message
+            stdout.write(line.encode() + b"\n")
+            stdout.flush()
+
+    async def handle(message):
+        await asyncio.sleep(WORKLOAD[message["method"]][1] / 1000)
+        send(json.dumps({"type": "response", "id": message["id"], "result": {}}))
+
+    dispatcher = dispatch.PipelinedDispatcher(handle)
+    while line := await reader.readline():
+        message = json.loads(line)
+        if pipelined:
+            await dispatcher.submit(message)
+        else:
+            await handle(message)
+    await dispatcher.drain()
+    if pipelined:
+        writer.flush()
+    stdout.raw.close()
+    return stdout.writes
+
+
+def run(requests: list[bytes], pipelined: bool) -> tuple[float, int]:
+    in_r, in_w = os.pipe()
+    out_r, out_w = os.pipe()
+    expected = {json.loads(r)["id"] for r in requests}
+    received: set[str] = set()
+
+    def feed():
+        with os.fdopen(in_w, "wb") as pipe:
+            for request in requests:
+                pipe.write(request)
+
+    def collect():
+        with os.fdopen(out_r, "rb") as pipe:
+            for line in pipe:
+                received.add(json.loads(line)["id"])
+
+    threads = [threading.Thread(target=feed), threading.Thread(target=collect)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    writes = asyncio.run(serve(in_r, out_w, pipelined))
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    assert received == expected, "responses do not match request ids"
+    return elapsed, writes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    requests = make_requests(args.requests, args.seed)
+    serial_latency_s = (
+        sum(WORKLOAD[json.loads(r)["method"]][1] for r in requests) / 1000
+    )
+    print(f"{args.requests} requests, sum of handler latencies {serial_latency_s:.2f}s")
+    for label, pipelined in (("sequential", False), ("pipelined", True)):
+        elapsed, writes = run(requests, pipelined)
+        print(
+            f"{label:>10}: {elapsed:6.2f}s  {args.requests / elapsed:8.0f} req/s"
+            f"  {writes} writes"
+        )
+
+
+if __name__ == "__main__":
+    main()
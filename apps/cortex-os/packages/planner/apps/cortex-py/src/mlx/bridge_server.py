@@ -14,6 +14,12 @@ import traceback
 from datetime import datetime
 from typing import Any
 
+from .dispatch import (
+    DEFAULT_MAX_IN_FLIGHT,
+    BatchedWriter,
+    PipelinedDispatcher,
+    open_line_reader,
+)
 from .memory_monitor import MemoryMonitor
 from .model_registry import ModelRegistry
 
@@ -32,8 +38,16 @@ logger = logging.getLogger(__name__)
 class MLOptimizationBridgeServer:
     """Bridge server for ML optimization engine."""
 
-    def __init__(self):
-        """Initialize the bridge server."""
+    def __init__(
+        self,
+        class_limits: dict[str, int] | None = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    ):
+        """Initialize the bridge server.
+
+        ``class_limits`` overrides the per-method-class concurrency limits of
+        :data:`~.dispatch.DEFAULT_CLASS_LIMITS`.
+        """
 
         # Initialize ML components
         self.model_registry = ModelRegistry()
@@ -49,6 +63,12 @@ class MLOptimizationBridgeServer:
 
         self.is_running = False
 
+        # Requests run concurrently; responses are correlated by id
+        self.dispatcher = PipelinedDispatcher(
+            self.process_message, class_limits, max_in_flight=max_in_flight
+        )
+        self.writer = BatchedWriter(sys.stdout)
+
         # Method registry
         self.methods = {
             "health_check": self.health_check,
@@ -94,12 +114,18 @@ class MLOptimizationBridgeServer:
             await self.cleanup()
 
     async def message_loop(self):
-        """Main message processing loop."""
+        """Main message processing loop.
+
+        Each request is dispatched as soon as it is read, so cheap calls are
+        not queued behind slow ones. In-flight requests are drained on EOF.
+        """
+
+        reader = await open_line_reader(sys.stdin)
 
         while self.is_running:
             try:
                 # Read message from stdin
-                line = await self.read_stdin_line()
+                line = await self.read_stdin_line(reader)
                 if not line:
                     continue
 
@@ -110,8 +136,8 @@ class MLOptimizationBridgeServer:
                     await self.send_log("error", f"Invalid JSON: {e}")
                     continue
 
-                # Process message
-                await self.process_message(message)
+                # Dispatch message
+                await self.dispatcher.submit(message)
 
             except EOFError:
                 # EOF received, shutdown gracefully
@@ -122,19 +148,27 @@ class MLOptimizationBridgeServer:
                 await self.send_log("error", f"Message loop error: {e}")
                 await asyncio.sleep(0.1)  # Brief pause to prevent tight error loop
 
-    async def read_stdin_line(self) -> str | None:
-        """Read a line from stdin asynchronously."""
+        await self.dispatcher.drain()
 
-        loop = asyncio.get_event_loop()
+    async def read_stdin_line(
+        self, reader: asyncio.StreamReader | None = None
+    ) -> str | None:
+        """Read a line from stdin asynchronously.
 
-        def read_line():
-            return sys.stdin.readline()
+        Raises ``EOFError`` once stdin is closed.
+        """
 
-        try:
-            line = await loop.run_in_executor(None, read_line)
-            return line.strip() if line else None
-        except Exception:
-            return None
+        if reader is not None:
+            data = await reader.readline()
+            if not data:
+                raise EOFError
+            return data.decode().strip()
+
+        loop = asyncio.get_running_loop()
+        line = await loop.run_in_executor(None, sys.stdin.readline)
+        if not line:
+            raise EOFError
+        return line.strip()
 
     async def process_message(self, message: dict[str, Any]):
         """Process incoming message."""
@@ -201,11 +235,11 @@ class MLOptimizationBridgeServer:
         await self.send_message(log_message)
 
     async def send_message(self, message: dict[str, Any]):
-        """Send message to stdout."""
+        """Queue message for the next batched write to stdout."""
 
         try:
             json_message = json.dumps(message)
-            print(json_message, flush=True)
+            self.writer.write_line(json_message)
         except Exception as e:
             logger.error(f"Failed to send message: {e}")
 
@@ -510,6 +544,7 @@ class MLOptimizationBridgeServer:
             await self.send_event(
                 "bridge_shutdown", {"timestamp": datetime.now().isoformat()}
             )
+            self.writer.flush()
 
         except Exception as e:
             logger.error(f"Cleanup error: {e}")
@@ -0,0 +1,167 @@
+"""
+Pipelined request dispatch for the ML optimization bridge.
+
+Requests are started as soon as they are read instead of one at a time. Each
+method belongs to a class with its own concurrency limit, so slow model
+selection cannot starve cheap telemetry calls. Responses carry the request id
+and may be written out of order; output lines produced in the same event loop
+turn are coalesced into a single write.
+"""
+
+import asyncio
+import logging
+import sys
+from collections.abc import Awaitable, Callable
+from typing import Any, BinaryIO, TextIO
+
+logger = logging.getLogger(__name__)
+
+# Method name -> method class
+DEFAULT_METHOD_CLASSES = {
+    "select_optimal_model": "selection",
+    "validate_input": "validation",
+    "validate_output": "validation",
+    "health_check": "telemetry",
+    "get_performance_metrics": "telemetry",
+    "get_memory_state": "telemetry",
+    "get_optimization_stats": "telemetry",
+    "record_inference": "telemetry",
+}
+
+# Method class -> maximum concurrent requests; "default" covers unmapped methods
+DEFAULT_CLASS_LIMITS = {
+    "selection": 2,
+    "validation": 8,
+    "telemetry": 32,
+    "default": 8,
+}
+
+DEFAULT_MAX_IN_FLIGHT = 256
+MAX_LINE_BYTES = 16 * 1024 * 1024
+MAX_WRITE_BUFFER_BYTES = 64 * 1024
+
+
+class PipelinedDispatcher:
+    """Run message handlers concurrently under per-method-class limits."""
+
+    def __init__(
+        self,
+        handler: Callable[[dict[str, Any]], Awaitable[None]],
+        class_limits: dict[str, int] | None = None,
+        method_classes: dict[str, str] | None = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    ):
+        """Initialize the dispatcher."""
+
+        limits = {**DEFAULT_CLASS_LIMITS, **(class_limits or {})}
+        if any(limit < 1 for limit in limits.values()) or max_in_flight < 1:
+            raise ValueError("Concurrency limits must be >= 1")
+
+        self.handler = handler
+        self.method_classes = (
+            DEFAULT_METHOD_CLASSES if method_classes is None else method_classes
+        )
+        self._semaphores = {name: asyncio.Semaphore(n) for name, n in limits.items()}
+        # Bounds buffered work: reading stops while this many requests are pending
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def pending(self) -> int:
+        """Number of requests started but not yet finished."""
+
+        return len(self._tasks)
+
+    async def submit(self, message: dict[str, Any]):
+        """Start handling ``message``, waiting only if too many are in flight."""
+
+        await self._in_flight.acquire()
+        task = asyncio.create_task(self._run(message))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def drain(self):
+        """Wait for every submitted request to finish."""
+
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    async def _run(self, message: dict[str, Any]):
+        method_class = self.method_classes.get(message.get("method"), "default")
+        semaphore = self._semaphores.get(method_class, self._semaphores["default"])
+        try:
+            async with semaphore:
+                await self.handler(message)
+        except Exception as e:
+            logger.error(f"Dispatch of {message.get('method')} failed: {e}")
+        finally:
+            self._in_flight.release()
+
+
+class BatchedWriter:
+    """Line writer that coalesces output produced in one event loop turn."""
+
+    def __init__(
+        self,
+        stream: TextIO | BinaryIO,
+        max_buffer_bytes: int = MAX_WRITE_BUFFER_BYTES,
+    ):
+        """Initialize the writer over a text or binary stream."""
+
+        self._stream = getattr(stream, "buffer", stream)
+        self.max_buffer_bytes = max_buffer_bytes
+        self._pending: list[bytes] = []
+        self._size = 0
+        self._scheduled = False
+
+    def write_line(self, line: str):
+        """Queue ``line``; it is written at the end of the current loop turn."""
+
+        data = line.encode() + b"\n"
+        self._pending.append(data)
+        self._size += len(data)
+        if self._size >= self.max_buffer_bytes:
+            self.flush()
+            return
+        if self._scheduled:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        self._scheduled = True
+        loop.call_soon(self.flush)
+
+    def flush(self):
+        """Write all queued lines with a single write and flush."""
+
+        self._scheduled = False
+        if not self._pending:
+            return
+        data = b"".join(self._pending)
+        self._pending.clear()
+        self._size = 0
+        self._stream.write(data)
+        self._stream.flush()
+
+
+async def open_line_reader(
+    stream: TextIO | BinaryIO = sys.stdin, limit: int = MAX_LINE_BYTES
+) -> asyncio.StreamReader | None:
+    """Attach a non-blocking reader to ``stream``.
+
+    Returns ``None`` when the stream cannot be watched by the event loop
+    (regular files, some Windows consoles); callers then fall back to
+    blocking reads in an executor.
+    """
+
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=limit)
+    try:
+        await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), stream
+        )
+    except (ValueError, OSError, NotImplementedError):
+        return None
+    return reader
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Replay synthetic request traces against ModelEvictionManager strategies.
+
+Each request targets one model from a catalogue of differently sized models
+with different load times. A request for a model that is not resident stalls
+for its load time, after the manager picks which resident models to evict to
+fit it under the memory budget. Popularity drifts between phases so the
+working set keeps changing and the budget stays under pressure.
+
+    python benchmarks/simulate_eviction.py --requests 20000 --budget-gb 40
+"""
+
+import argparse
+import importlib.util
+import logging
+import random
+import time
+from datetime import datetime
+from pathlib import Path
+
+_MODULE_PATH = (
+    Path(__file__).resolve().parents[1] / "src" / "mlx" / "resource_monitor.py"
+)
+_spec = importlib.util.spec_from_file_location("resource_monitor", _MODULE_PATH)
+resource_monitor = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(resource_monitor)
+
+EvictionStrategy = resource_monitor.EvictionStrategy
+
+# name -> (resident GB, load seconds)
+CATALOGUE = {
+    "embed-small": (0.5, 1.0),
+    "phi3-mini": (2.0, 3.0),
+    "gemma-2b": (2.5, 4.0),
+    "mistral-7b": (7.0, 10.0),
+    "llama-8b": (8.0, 12.0),
+    "llava-13b": (13.0, 25.0),
+    "qwen-instruct-30b": (17.0, 45.0),
+    "qwen-coder-32b": (18.0, 60.0),
+}
+
+
+class SimClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_trace(
+    requests: int, seed: int, phase_length: int, mean_gap_s: float
+) -> list[tuple[float, str]]:
+    """Zipf-distributed requests whose popularity order is reshuffled per phase."""
+    rng = random.Random(seed)
+    names = list(CATALOGUE)
+    weights = [1 / rank for rank in range(1, len(names) + 1)]
+    trace = []
+    now = 0.0
+    for i in range(requests):
+        if i % phase_length == 0:
+            rng.shuffle(names)
+        now += rng.expovariate(1 / mean_gap_s)
+        trace.append((now, rng.choices(names, weights)[0]))
+    return trace
+
+
+def replay(
+    trace: list[tuple[float, str]], strategy, budget_gb: float, window_s: float
+) -> dict[str, float]:
+    clock = SimClock()
+    config = resource_monitor.ResourceConfig(
+        eviction_strategy=strategy,
+        eviction_hysteresis_gb=0.0,
+        models_to_keep_minimum=0,
+        reuse_window_seconds=window_s,
+    )
+    manager = resource_monitor.ModelEvictionManager(config, clock=clock)
+    reloads = evictions = 0
+    stall_s = plan_s = 0.0
+
+    for arrival, name in trace:
+        clock.now = max(clock.now, arrival)
+        if name not in manager.loaded_models:
+            memory_gb, load_s = CATALOGUE[name]
+            started = time.perf_counter()
+            victims = manager.get_models_to_evict(budget_gb - memory_gb)
+            plan_s += time.perf_counter() - started
+            for victim in victims:
+                manager.unregister_model(victim)
+            evictions += len(victims)
+            reloads += 1
+            stall_s += load_s
+            clock.now += load_s
+            manager.register_model(name, "mlx", memory_gb, load_time_seconds=load_s)
+        manager.update_model_usage(name)
+        # Keep LRU ordering on simulated rather than wall-clock time
+        manager.loaded_models[name].last_used = datetime.fromtimestamp(clock.now)
+
+    return {
+        "reloads": reloads,
+        "evictions": evictions,
+        "stall_s": stall_s,
+        "plan_us": plan_s / max(reloads, 1) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--budget-gb", type=float, default=40.0)
+    parser.add_argument("--phase-length", type=int, default=2000)
+    parser.add_argument("--mean-gap-s", type=float, default=2.0)
+    parser.add_argument("--window-s", type=float, default=300.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    trace = make_trace(args.requests, args.seed, args.phase_length, args.mean_gap_s)
+    print(
+        f"{args.requests} requests over {len(CATALOGUE)} models "
+        f"({sum(gb for gb, _ in CATALOGUE.values()):.1f}GB), "
+        f"budget {args.budget_gb:.1f}GB"
+    )
+    print(
+        f"{'strategy':>15} {'reloads':>8} {'evictions':>10} {'stall s':>9} {'plan us':>8}"
+    )
+    for strategy in EvictionStrategy:
+        result = replay(trace, strategy, args.budget_gb, args.window_s)
+        print(
+            f"{strategy.value:>15} {result['reloads']:>8} {result['evictions']:>10}"
+            f" {result['stall_s']:>9.0f} {result['plan_us']:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -18,12 +18,15 @@ License: MIT
 """
 
 import asyncio
+import heapq
+import itertools
 import json
 import logging
 import os
 import platform
 import subprocess
 import time
+from collections import deque
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -73,6 +76,7 @@ class EvictionStrategy(Enum):
     SIZE_BASED = "size_based"  # Largest models first
     USAGE_BASED = "usage_based"  # Least used models
     PRIORITY_BASED = "priority_based"  # Based on model priority
+    COST_AWARE = "cost_aware"  # Minimum expected reload cost per byte freed
 
 
 @dataclass
@@ -183,6 +187,7 @@ class ModelInfo:
     usage_count: int
     priority: int = 1  # 1-10 scale, higher = more important
     is_evictable: bool = True
+    load_time_seconds: float = 0.0  # Measured (or estimated) time to reload
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -193,6 +198,7 @@ class ModelInfo:
             "usage_count": self.usage_count,
             "priority": self.priority,
             "is_evictable": self.is_evictable,
+            "load_time_seconds": self.load_time_seconds,
         }
 
 
@@ -203,6 +209,7 @@ class ResourceConfig:
     # Monitoring intervals
     monitoring_interval_seconds: float = 1.0
     activity_monitor_sync_seconds: float = 5.0
+    history_size: int = 100  # Snapshots kept in the ring buffer
 
     # Memory pressure thresholds
     memory_normal_threshold: float = 0.70  # 70%
@@ -215,10 +222,12 @@ class ResourceConfig:
     cpu_critical_threshold: float = 0.95  # 95%
 
     # Model eviction settings
-    eviction_strategy: EvictionStrategy = EvictionStrategy.LRU
+    eviction_strategy: EvictionStrategy = EvictionStrategy.COST_AWARE
     eviction_memory_threshold: float = 0.85  # Trigger eviction at 85%
     models_to_keep_minimum: int = 1  # Always keep at least 1 model
     eviction_hysteresis_gb: float = 2.0  # 2GB hysteresis
+    reuse_window_seconds: float = 300.0  # Horizon for reload cost estimates
+    estimated_load_seconds_per_gb: float = 1.5  # Until a load time is measured
 
     # Activity Monitor integration
     activity_monitor_enabled: bool = True
@@ -226,6 +235,7 @@ class ResourceConfig:
     process_name_filter: list[str] = field(
         default_factory=lambda: ["mlx", "python", "cortex"]
     )
+    track_current_process: bool = True  # Sample this process alongside managed ones
 
     # Performance settings
     enable_background_monitoring: bool = True
@@ -255,6 +265,11 @@ class ResourceConfig:
         if any(t < 0.5 or t > 1.0 for t in thresholds):
             raise ValueError("Memory thresholds must be between 0.5-1.0")
 
+        if self.monitoring_interval_seconds <= 0:
+            raise ValueError("Monitoring interval must be positive")
+        if self.history_size < 2:
+            raise ValueError("History size must be at least 2")
+
         return True
 
 
@@ -446,18 +461,636 @@ class ActivityMonitorIntegration:
             logger.debug(f"Failed to export metrics to Activity Monitor: {e}")
 
 
+@dataclass
+class _CounterSnapshot:
+    """Cumulative counters from one sample, used to compute deltas."""
+
+    monotonic: float
+    cpu_busy: float
+    cpu_total: float
+    disk_read_bytes: int
+    disk_write_bytes: int
+    net_sent_bytes: int
+    net_recv_bytes: int
+    process_cpu_seconds: dict[int, float]
+
+
+_PROC_STATES = {
+    "R": "running",
+    "S": "sleeping",
+    "D": "disk-sleep",
+    "Z": "zombie",
+    "T": "stopped",
+    "t": "tracing-stop",
+    "I": "idle",
+    "X": "dead",
+}
+
+# Virtual block devices whose I/O is already counted on the backing disk
+_VIRTUAL_DISK_PREFIXES = ("loop", "ram", "zram", "dm-", "md", "sr")
+_DISKSTATS_SECTOR_BYTES = 512
+
+
+class ResourceSampler:
+    """
+    Non-blocking system sampler producing per-interval rates.
+
+    Each call to :meth:`sample` reads cumulative counters (procfs on Linux,
+    psutil elsewhere) and reports CPU utilization, disk and network
+    throughput as deltas since the previous call. Only explicitly tracked
+    processes are inspected; nothing walks the full process table.
+    """
+
+    def __init__(
+        self,
+        tracked_pids: list[int] | None = None,
+        proc_root: str = "/proc",
+        sys_root: str = "/sys",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.proc_root = proc_root
+        self.sys_root = sys_root
+        self.use_procfs = os.path.exists(os.path.join(proc_root, "stat"))
+        self._tracked_pids: set[int] = set(tracked_pids or [])
+        self._previous: _CounterSnapshot | None = None
+        self._cpu_count = os.cpu_count() or 1
+        self._clock = clock
+
+        if self.use_procfs:
+            self._clock_ticks = os.sysconf("SC_CLK_TCK")
+            self._page_size = os.sysconf("SC_PAGE_SIZE")
+            self._boot_time = self._read_boot_time()
+            self._disks = self._list_physical_disks()
+
+    @property
+    def tracked_pids(self) -> set[int]:
+        return set(self._tracked_pids)
+
+    def track_process(self, pid: int) -> None:
+        """Include ``pid`` in per-process sampling."""
+        self._tracked_pids.add(pid)
+
+    def untrack_process(self, pid: int) -> None:
+        """Stop sampling ``pid``."""
+        self._tracked_pids.discard(pid)
+
+    def sample(self) -> SystemResources:
+        """Read counters and return a snapshot with rates since the last sample."""
+        resources = SystemResources(cpu_count=self._cpu_count)
+        if self.use_procfs:
+            counters = self._sample_procfs(resources)
+        elif PSUTIL_AVAILABLE:
+            counters = self._sample_psutil(resources)
+        else:
+            return resources
+
+        previous, self._previous = self._previous, counters
+        if previous is None:
+            # First sample: CPU utilization averages since boot, rates are unknown
+            previous = _CounterSnapshot(0.0, 0.0, 0.0, 0, 0, 0, 0, {})
+            elapsed = 0.0
+        else:
+            elapsed = counters.monotonic - previous.monotonic
+
+        total = counters.cpu_total - previous.cpu_total
+        if total > 0:
+            busy = counters.cpu_busy - previous.cpu_busy
+            resources.cpu_percent = min(max(busy / total * 100, 0.0), 100.0)
+
+        if elapsed > 0:
+            resources.disk_read_mb_per_sec = _rate_mb(
+                counters.disk_read_bytes, previous.disk_read_bytes, elapsed
+            )
+            resources.disk_write_mb_per_sec = _rate_mb(
+                counters.disk_write_bytes, previous.disk_write_bytes, elapsed
+            )
+            resources.network_sent_mb_per_sec = _rate_mb(
+                counters.net_sent_bytes, previous.net_sent_bytes, elapsed
+            )
+            resources.network_recv_mb_per_sec = _rate_mb(
+                counters.net_recv_bytes, previous.net_recv_bytes, elapsed
+            )
+            for process in resources.mlx_processes:
+                before = previous.process_cpu_seconds.get(process.pid)
+                if before is not None:
+                    used = counters.process_cpu_seconds[process.pid] - before
+                    process.cpu_percent = max(used / elapsed * 100, 0.0)
+
+        return resources
+
+    # procfs
+
+    def _sample_procfs(self, resources: SystemResources) -> _CounterSnapshot:
+        cpu_busy, cpu_total = self._read_cpu_ticks()
+
+        meminfo = self._read_meminfo()
+        total = meminfo.get("MemTotal", 0)
+        available = meminfo.get("MemAvailable", meminfo.get("MemFree", 0))
+        resources.memory_total_gb = total / (1024**3)
+        resources.memory_available_gb = available / (1024**3)
+        resources.memory_used_gb = (total - available) / (1024**3)
+        resources.memory_percent = (total - available) / total * 100 if total else 0.0
+        swap_total = meminfo.get("SwapTotal", 0)
+        resources.swap_total_gb = swap_total / (1024**3)
+        resources.swap_used_gb = (swap_total - meminfo.get("SwapFree", 0)) / (1024**3)
+
+        with open(os.path.join(self.proc_root, "loadavg")) as f:
+            resources.load_average = [float(v) for v in f.read().split()[:3]]
+        resources.active_processes = sum(
+            1 for entry in os.listdir(self.proc_root) if entry.isdigit()
+        )
+
+        disk_read, disk_write = self._read_disk_bytes()
+        net_sent, net_recv = self._read_net_bytes()
+
+        process_cpu: dict[int, float] = {}
+        for pid in list(self._tracked_pids):
+            try:
+                info, cpu_seconds = self._read_process(pid, total)
+            except (FileNotFoundError, ProcessLookupError):
+                # Process exited; stop tracking it
+                self._tracked_pids.discard(pid)
+                continue
+            except (OSError, ValueError, IndexError) as e:
+                logger.debug(f"Failed to sample process {pid}: {e}")
+                continue
+            resources.mlx_processes.append(info)
+            process_cpu[pid] = cpu_seconds
+
+        return _CounterSnapshot(
+            monotonic=self._clock(),
+            cpu_busy=cpu_busy,
+            cpu_total=cpu_total,
+            disk_read_bytes=disk_read,
+            disk_write_bytes=disk_write,
+            net_sent_bytes=net_sent,
+            net_recv_bytes=net_recv,
+            process_cpu_seconds=process_cpu,
+        )
+
+    def _read_cpu_ticks(self) -> tuple[float, float]:
+        with open(os.path.join(self.proc_root, "stat")) as f:
+            fields = f.readline().split()
+        # user nice system idle iowait irq softirq steal (guest is inside user)
+        ticks = [float(v) for v in fields[1:9]]
+        total = sum(ticks)
+        idle = ticks[3] + (ticks[4] if len(ticks) > 4 else 0.0)
+        return total - idle, total
+
+    def _read_boot_time(self) -> float:
+        try:
+            with open(os.path.join(self.proc_root, "stat")) as f:
+                for line in f:
+                    if line.startswith("btime"):
+                        return float(line.split()[1])
+        except OSError:
+            pass
+        return 0.0
+
+    def _read_meminfo(self) -> dict[str, int]:
+        meminfo: dict[str, int] = {}
+        with open(os.path.join(self.proc_root, "meminfo")) as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                parts = value.split()
+                if parts:
+                    meminfo[key] = int(parts[0]) * 1024
+        return meminfo
+
+    def _list_physical_disks(self) -> set[str] | None:
+        try:
+            devices = os.listdir(os.path.join(self.sys_root, "block"))
+        except OSError:
+            return None
+        return {d for d in devices if not d.startswith(_VIRTUAL_DISK_PREFIXES)}
+
+    def _read_disk_bytes(self) -> tuple[int, int]:
+        read_sectors = write_sectors = 0
+        with open(os.path.join(self.proc_root, "diskstats")) as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) < 10:
+                    continue
+                name = fields[2]
+                if self._disks is not None:
+                    if name not in self._disks:
+                        continue
+                elif name.startswith(_VIRTUAL_DISK_PREFIXES) or name[-1].isdigit():
+                    continue
+                read_sectors += int(fields[5])
+                write_sectors += int(fields[9])
+        return (
+            read_sectors * _DISKSTATS_SECTOR_BYTES,
+            write_sectors * _DISKSTATS_SECTOR_BYTES,
+        )
+
+    def _read_net_bytes(self) -> tuple[int, int]:
+        sent = recv = 0
+        with open(os.path.join(self.proc_root, "net", "dev")) as f:
+            for line in f.readlines()[2:]:
+                iface, _, data = line.partition(":")
+                if iface.strip() == "lo":
+                    continue
+                fields = data.split()
+                recv += int(fields[0])
+                sent += int(fields[8])
+        return sent, recv
+
+    def _read_process(self, pid: int, mem_total: int) -> tuple[ProcessInfo, float]:
+        with open(os.path.join(self.proc_root, str(pid), "stat")) as f:
+            stat = f.read()
+        # The command name may contain spaces or parentheses
+        name = stat[stat.index("(") + 1 : stat.rindex(")")]
+        fields = stat[stat.rindex(")") + 2 :].split()
+        cpu_seconds = (int(fields[11]) + int(fields[12])) / self._clock_ticks
+        rss_bytes = int(fields[21]) * self._page_size
+        info = ProcessInfo(
+            pid=pid,
+            name=name,
+            cpu_percent=0.0,
+            memory_mb=rss_bytes / (1024 * 1024),
+            memory_percent=rss_bytes / mem_total * 100 if mem_total else 0.0,
+            status=_PROC_STATES.get(fields[0], fields[0]),
+            create_time=self._boot_time + int(fields[19]) / self._clock_ticks,
+        )
+        return info, cpu_seconds
+
+    # psutil fallback (macOS and other platforms without procfs)
+
+    def _sample_psutil(self, resources: SystemResources) -> _CounterSnapshot:
+        cpu_times = psutil.cpu_times()
+        cpu_total = sum(cpu_times)
+        cpu_idle = cpu_times.idle + getattr(cpu_times, "iowait", 0.0)
+
+        memory = psutil.virtual_memory()
+        resources.memory_total_gb = memory.total / (1024**3)
+        resources.memory_available_gb = memory.available / (1024**3)
+        resources.memory_used_gb = memory.used / (1024**3)
+        resources.memory_percent = memory.percent
+        swap = psutil.swap_memory()
+        resources.swap_total_gb = swap.total / (1024**3)
+        resources.swap_used_gb = swap.used / (1024**3)
+        resources.load_average = (
+            list(psutil.getloadavg()) if hasattr(psutil, "getloadavg") else []
+        )
+        resources.active_processes = len(psutil.pids())
+
+        disk_io = psutil.disk_io_counters()
+        net_io = psutil.net_io_counters(pernic=True) or {}
+        nics = [io for nic, io in net_io.items() if not nic.startswith("lo")]
+
+        process_cpu: dict[int, float] = {}
+        for pid in list(self._tracked_pids):
+            try:
+                proc = psutil.Process(pid)
+                with proc.oneshot():
+                    times = proc.cpu_times()
+                    memory_info = proc.memory_info()
+                    resources.mlx_processes.append(
+                        ProcessInfo(
+                            pid=pid,
+                            name=proc.name(),
+                            cpu_percent=0.0,
+                            memory_mb=memory_info.rss / (1024 * 1024),
+                            memory_percent=memory_info.rss / memory.total * 100,
+                            status=proc.status(),
+                            create_time=proc.create_time(),
+                        )
+                    )
+                process_cpu[pid] = times.user + times.system
+            except psutil.NoSuchProcess:
+                self._tracked_pids.discard(pid)
+            except psutil.AccessDenied:
+                continue
+
+        return _CounterSnapshot(
+            monotonic=self._clock(),
+            cpu_busy=cpu_total - cpu_idle,
+            cpu_total=cpu_total,
+            disk_read_bytes=disk_io.read_bytes if disk_io else 0,
+            disk_write_bytes=disk_io.write_bytes if disk_io else 0,
+            net_sent_bytes=sum(io.bytes_sent for io in nics),
+            net_recv_bytes=sum(io.bytes_recv for io in nics),
+            process_cpu_seconds=process_cpu,
+        )
+
+
+def _rate_mb(current: int, previous: int, elapsed: float) -> float:
+    # Counters can reset (device hot-plug, wrap); report zero rather than negative
+    return max(current - previous, 0) / (1024**2) / elapsed
+
+
+# Branch-and-bound nodes explored per plan before settling for the incumbent
+PLAN_SEARCH_NODE_LIMIT = 50_000
+# Renormalize decayed usage weights before 2 ** exponent overflows
+_MAX_DECAY_EXPONENT = 512.0
+
+
+@dataclass
+class _PlannerEntry:
+    name: str
+    resident_bytes: int
+    load_seconds: float
+    weight: float = 0.0  # Decayed request count, scaled to the planner epoch
+    version: int = 0
+
+
+@dataclass
+class EvictionCandidate:
+    """A model considered by an eviction plan."""
+
+    name: str
+    resident_bytes: int
+    load_seconds: float
+    reuse_probability: float
+    expected_reload_seconds: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "resident_bytes": self.resident_bytes,
+            "load_seconds": self.load_seconds,
+            "reuse_probability": self.reuse_probability,
+            "expected_reload_seconds": self.expected_reload_seconds,
+        }
+
+
+@dataclass
+class EvictionPlan:
+    """Dry-run answer to "which models should be dropped to free N bytes"."""
+
+    target_bytes: int
+    models: list[str] = field(default_factory=list)
+    freed_bytes: int = 0
+    expected_reload_seconds: float = 0.0
+    satisfied: bool = True
+    optimal: bool = True
+    candidates: list[EvictionCandidate] = field(default_factory=list)
+    created_at: datetime = field(default_factory=datetime.now)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "target_bytes": self.target_bytes,
+            "models": self.models,
+            "freed_bytes": self.freed_bytes,
+            "expected_reload_seconds": self.expected_reload_seconds,
+            "satisfied": self.satisfied,
+            "optimal": self.optimal,
+            "candidates": [c.to_dict() for c in self.candidates],
+            "created_at": self.created_at.isoformat(),
+        }
+
+
+class EvictionPlanner:
+    """
+    Cost-aware eviction planning.
+
+    Every model keeps a request counter that decays with a half-life of
+    ``reuse_window_seconds``. A decayed count ``h`` corresponds to a Poisson
+    request rate whose chance of another request within the window is
+    ``1 - 2 ** -h``; multiplied by the measured load time this is the
+    expected reload cost of evicting the model.
+
+    Weights are stored relative to a shared epoch, so touching one model
+    never rescales the others. A lazily invalidated min-heap keyed on
+    decayed uses times load time per resident byte backs ``ordered_names``.
+    Plans sort the candidates once by expected reload cost per byte and pick
+    the cover of the byte target with minimum total expected reload cost.
+    """
+
+    def __init__(
+        self,
+        reuse_window_seconds: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if reuse_window_seconds <= 0:
+            raise ValueError("reuse_window_seconds must be positive")
+        self.reuse_window_seconds = reuse_window_seconds
+        self._clock = clock
+        self._epoch = clock()
+        self._entries: dict[str, _PlannerEntry] = {}
+        self._heap: list[tuple[float, int, str, int]] = []
+        self._sequence = itertools.count()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, name: str, resident_bytes: int, load_seconds: float) -> None:
+        """Track a newly loaded model; loading counts as one use."""
+        self._entries[name] = _PlannerEntry(name, resident_bytes, load_seconds)
+        self.touch(name)
+
+    def remove(self, name: str) -> None:
+        """Stop tracking a model; its heap entry is discarded lazily."""
+        self._entries.pop(name, None)
+
+    def touch(self, name: str) -> None:
+        """Record a use of ``name``."""
+        entry = self._entries.get(name)
+        if entry is None:
+            return
+        # May renormalize every weight, so evaluate it before reading this one
+        increment = 2.0 ** self._exponent(self._clock())
+        entry.weight += increment
+        self._push(entry)
+
+    def update_load_time(self, name: str, load_seconds: float) -> None:
+        """Replace the load time estimate with a measurement."""
+        entry = self._entries.get(name)
+        if entry is not None:
+            entry.load_seconds = load_seconds
+            self._push(entry)
+
+    def candidate(self, name: str, now: float | None = None) -> EvictionCandidate:
+        """Expected reload cost of evicting ``name`` at ``now``."""
+        entry = self._entries[name]
+        now = self._clock() if now is None else now
+        decayed_uses = entry.weight * 2.0 ** -self._exponent(now)
+        reuse = 1.0 - 2.0**-decayed_uses
+        return EvictionCandidate(
+            name=entry.name,
+            resident_bytes=entry.resident_bytes,
+            load_seconds=entry.load_seconds,
+            reuse_probability=reuse,
+            expected_reload_seconds=reuse * entry.load_seconds,
+        )
+
+    def ordered_names(self) -> list[str]:
+        """Model names from cheapest to most expensive to evict per byte."""
+        heap = list(self._heap)
+        names = []
+        while heap:
+            _, _, name, version = heapq.heappop(heap)
+            entry = self._entries.get(name)
+            if entry is not None and entry.version == version:
+                names.append(name)
+        return names
+
+    def plan(
+        self,
+        target_bytes: int,
+        max_models: int | None = None,
+        exclude: set[str] | frozenset[str] = frozenset(),
+    ) -> EvictionPlan:
+        """Choose models whose eviction frees ``target_bytes`` most cheaply.
+
+        Nothing is evicted; callers act on the returned plan. When the target
+        cannot be met within ``max_models`` the plan frees as much as allowed
+        (the largest models) and is marked unsatisfied.
+        """
+        now = self._clock()
+        # Cheapest expected reload per byte first: the order the search needs
+        candidates = sorted(
+            (
+                self.candidate(name, now)
+                for name in self._entries
+                if name not in exclude
+            ),
+            key=lambda c: c.expected_reload_seconds / max(c.resident_bytes, 1),
+        )
+        plan = EvictionPlan(target_bytes=target_bytes, candidates=candidates)
+        if target_bytes <= 0:
+            return plan
+        limit = len(candidates) if max_models is None else max(0, max_models)
+        largest = heapq.nlargest(limit, candidates, key=lambda c: c.resident_bytes)
+
+        if sum(c.resident_bytes for c in largest) < target_bytes:
+            chosen = largest
+            plan.satisfied = False
+            plan.optimal = False
+        else:
+            # Greedy cover in cost-per-byte order gives the incumbent when within limit
+            chosen: list[EvictionCandidate] = []
+            freed = 0
+            for candidate in candidates:
+                if freed >= target_bytes:
+                    break
+                chosen.append(candidate)
+                freed += candidate.resident_bytes
+            if len(chosen) > limit:
+                chosen = largest
+            chosen, plan.optimal = self._min_cost_cover(
+                candidates, target_bytes, limit, chosen
+            )
+
+        plan.models = [c.name for c in chosen]
+        plan.freed_bytes = sum(c.resident_bytes for c in chosen)
+        plan.expected_reload_seconds = sum(c.expected_reload_seconds for c in chosen)
+        return plan
+
+    def _min_cost_cover(
+        self,
+        candidates: list[EvictionCandidate],
+        target_bytes: int,
+        limit: int,
+        incumbent: list[EvictionCandidate],
+    ) -> tuple[list[EvictionCandidate], bool]:
+        """Branch and bound over ``candidates``, already sorted by cost per byte."""
+        items = [c for c in candidates if c.resident_bytes > 0]
+        best_cost = sum(c.expected_reload_seconds for c in incumbent)
+        best = list(incumbent)
+        selected: list[EvictionCandidate] = []
+        nodes = 0
+
+        def lower_bound(start: int, remaining: int) -> float:
+            # Fractional relaxation: cheapest cost per byte first
+            bound = 0.0
+            for item in items[start:]:
+                if item.resident_bytes >= remaining:
+                    return (
+                        bound
+                        + item.expected_reload_seconds * remaining / item.resident_bytes
+                    )
+                bound += item.expected_reload_seconds
+                remaining -= item.resident_bytes
+            return float("inf")
+
+        def search(index: int, cost: float, freed: int) -> None:
+            nonlocal best, best_cost, nodes
+            nodes += 1
+            if freed >= target_bytes:
+                if cost < best_cost:
+                    best, best_cost = list(selected), cost
+                return
+            if (
+                index == len(items)
+                or len(selected) >= limit
+                or nodes > PLAN_SEARCH_NODE_LIMIT
+                or cost + lower_bound(index, target_bytes - freed) >= best_cost
+            ):
+                return
+            item = items[index]
+            selected.append(item)
+            search(
+                index + 1,
+                cost + item.expected_reload_seconds,
+                freed + item.resident_bytes,
+            )
+            selected.pop()
+            search(index + 1, cost, freed)
+
+        search(0, 0.0, 0)
+        return best, nodes <= PLAN_SEARCH_NODE_LIMIT
+
+    def _exponent(self, now: float) -> float:
+        exponent = (now - self._epoch) / self.reuse_window_seconds
+        if exponent > _MAX_DECAY_EXPONENT:
+            self._renormalize(now)
+            exponent = 0.0
+        return exponent
+
+    def _renormalize(self, now: float) -> None:
+        scale = 2.0 ** -((now - self._epoch) / self.reuse_window_seconds)
+        self._epoch = now
+        self._heap.clear()
+        for entry in self._entries.values():
+            entry.weight *= scale
+            self._push(entry)
+
+    def _push(self, entry: _PlannerEntry) -> None:
+        entry.version += 1
+        key = entry.weight * entry.load_seconds / max(entry.resident_bytes, 1)
+        heapq.heappush(
+            self._heap, (key, next(self._sequence), entry.name, entry.version)
+        )
+        # Drop stale entries once they dominate the heap
+        if len(self._heap) > 4 * len(self._entries) + 64:
+            self._heap = [
+                item
+                for item in self._heap
+                if item[2] in self._entries
+                and self._entries[item[2]].version == item[3]
+            ]
+            heapq.heapify(self._heap)
+
+
 class ModelEvictionManager:
     """Manages model eviction strategies."""
 
-    def __init__(self, config: ResourceConfig):
+    def __init__(
+        self, config: ResourceConfig, clock: Callable[[], float] = time.monotonic
+    ):
         self.config = config
         self.loaded_models: dict[str, ModelInfo] = {}
-        self._eviction_history: list[dict[str, Any]] = []
+        self._eviction_history: deque[dict[str, Any]] = deque(
+            maxlen=config.history_size
+        )
+        self.planner = EvictionPlanner(config.reuse_window_seconds, clock)
 
     def register_model(
-        self, name: str, backend: str, memory_gb: float, priority: int = 1
+        self,
+        name: str,
+        backend: str,
+        memory_gb: float,
+        priority: int = 1,
+        load_time_seconds: float | None = None,
     ) -> None:
         """Register a loaded model."""
+        if load_time_seconds is None:
+            load_time_seconds = memory_gb * self.config.estimated_load_seconds_per_gb
         self.loaded_models[name] = ModelInfo(
             name=name,
             backend=backend,
@@ -466,7 +1099,9 @@ class ModelEvictionManager:
             usage_count=0,
             priority=priority,
             is_evictable=True,
+            load_time_seconds=load_time_seconds,
         )
+        self.planner.add(name, int(memory_gb * 1024**3), load_time_seconds)
 
         logger.info(f"Registered model {name} ({memory_gb:.1f}GB)")
 
@@ -476,13 +1111,32 @@ class ModelEvictionManager:
             model = self.loaded_models[name]
             model.last_used = datetime.now()
             model.usage_count += 1
+            self.planner.touch(name)
+
+    def record_load_time(self, name: str, load_time_seconds: float) -> None:
+        """Record a measured load time for a registered model."""
+        if name in self.loaded_models:
+            self.loaded_models[name].load_time_seconds = load_time_seconds
+            self.planner.update_load_time(name, load_time_seconds)
 
     def unregister_model(self, name: str) -> None:
         """Unregister a model (when manually unloaded)."""
         if name in self.loaded_models:
             del self.loaded_models[name]
+            self.planner.remove(name)
             logger.info(f"Unregistered model {name}")
 
+    def plan_eviction(self, memory_to_free_gb: float) -> EvictionPlan:
+        """Dry-run a cost-aware eviction freeing ``memory_to_free_gb``."""
+        pinned = {
+            name for name, model in self.loaded_models.items() if not model.is_evictable
+        }
+        return self.planner.plan(
+            int(memory_to_free_gb * 1024**3),
+            max_models=len(self.loaded_models) - self.config.models_to_keep_minimum,
+            exclude=pinned,
+        )
+
     def get_models_to_evict(self, target_memory_gb: float) -> list[str]:
         """Get list of models to evict to free target memory."""
         if not self.loaded_models:
@@ -497,6 +1151,19 @@ class ModelEvictionManager:
         if memory_to_free <= 0:
             return []
 
+        if self.config.eviction_strategy == EvictionStrategy.COST_AWARE:
+            plan = self.plan_eviction(memory_to_free)
+            if not plan.satisfied:
+                logger.warning("Not enough evictable models to meet memory target")
+            if plan.models:
+                self._eviction_history.append(plan.to_dict())
+                logger.info(
+                    f"Selected {len(plan.models)} models for eviction "
+                    f"(freeing {plan.freed_bytes / 1024**3:.1f}GB, expected reload "
+                    f"cost {plan.expected_reload_seconds:.1f}s)"
+                )
+            return plan.models
+
         # Get candidate models for eviction
         candidates = [
             model for model in self.loaded_models.values() if model.is_evictable
@@ -595,9 +1262,16 @@ class ResourceMonitor:
         # Component managers
         self.activity_monitor = ActivityMonitorIntegration(self.config)
         self.eviction_manager = ModelEvictionManager(self.config)
+        self.sampler = ResourceSampler(
+            [os.getpid()] if self.config.track_current_process else []
+        )
 
-        # State tracking
-        self._resource_history: list[SystemResources] = []
+        # State tracking (fixed-size ring buffer of snapshots)
+        self._resource_history: deque[SystemResources] = deque(
+            maxlen=self.config.history_size
+        )
+        self._gpu_metrics: dict[str, float] | None = None
+        self._gpu_metrics_at = 0.0
         self._baseline_resources: SystemResources | None = None
         self._last_pressure_check = datetime.now()
 
@@ -703,15 +1377,17 @@ class ResourceMonitor:
         logger.info("Resource monitoring stopped")
 
     async def _background_monitor(self) -> None:
-        """Background monitoring loop."""
+        """Background sampling loop running at a fixed cadence."""
         logger.info("Background resource monitoring started")
 
+        loop = asyncio.get_running_loop()
+        interval = self.config.monitoring_interval_seconds
+        next_tick = loop.time()
+
         while self.is_monitoring and not self._shutdown_event.is_set():
             try:
-                start_time = time.time()
-
-                # Get system resources
-                resources = await self.get_system_resources()
+                # Sample system resources
+                resources = await self._sample()
                 await self._process_resource_metrics(resources)
 
                 # Export to Activity Monitor
@@ -720,80 +1396,48 @@ class ResourceMonitor:
                         resources
                     )
 
-                # Track performance
-                monitor_time_ms = (time.time() - start_time) * 1000
-                self._update_performance_stats(monitor_time_ms)
-
                 # Export metrics
                 self._export_metrics(resources)
 
-                # Sleep for monitoring interval
-                await asyncio.sleep(self.config.monitoring_interval_seconds)
-
             except Exception as e:
                 logger.error(f"Background resource monitoring error: {e}")
-                await asyncio.sleep(2.0)  # Back off on error
+                next_tick = loop.time() + 2.0 - interval  # Back off on error
+
+            # Wait for the next tick; skip ticks missed by a slow sample
+            next_tick += interval
+            delay = next_tick - loop.time()
+            if delay < 0:
+                next_tick = loop.time()
+                delay = 0
+            try:
+                await asyncio.wait_for(self._shutdown_event.wait(), timeout=delay)
+            except TimeoutError:
+                pass
 
         logger.info("Background resource monitoring stopped")
 
     async def get_system_resources(self) -> SystemResources:
-        """Get comprehensive system resource snapshot."""
+        """
+        Get the latest system resource snapshot.
+
+        While background monitoring runs this returns the most recent sample
+        without doing any I/O. Otherwise a fresh sample is taken; CPU, disk and
+        network figures are deltas since the previous sample.
+        """
+        if self._monitor_task is not None and self._resource_history:
+            return self.current_resources
+        return await self._sample()
+
+    async def _sample(self) -> SystemResources:
+        """Take one sample, classify it and make it current."""
         start_time = time.time()
 
         try:
-            resources = SystemResources()
-
-            if PSUTIL_AVAILABLE:
-                # CPU metrics
-                resources.cpu_count = psutil.cpu_count()
-                resources.cpu_percent = psutil.cpu_percent(interval=0.1)
-                resources.load_average = (
-                    list(psutil.getloadavg()) if hasattr(psutil, "getloadavg") else []
-                )
-
-                # Memory metrics
-                memory = psutil.virtual_memory()
-                resources.memory_total_gb = memory.total / (1024**3)
-                resources.memory_available_gb = memory.available / (1024**3)
-                resources.memory_used_gb = memory.used / (1024**3)
-                resources.memory_percent = memory.percent
-
-                # Swap memory
-                swap = psutil.swap_memory()
-                resources.swap_total_gb = swap.total / (1024**3)
-                resources.swap_used_gb = swap.used / (1024**3)
-
-                # Disk I/O
-                disk_io = psutil.disk_io_counters()
-                if disk_io:
-                    # Calculate rates (approximate)
-                    resources.disk_read_mb_per_sec = (
-                        disk_io.read_bytes / (1024**2) / 60
-                    )  # Rough estimate
-                    resources.disk_write_mb_per_sec = (
-                        disk_io.write_bytes / (1024**2) / 60
-                    )
-
-                # Network I/O
-                net_io = psutil.net_io_counters()
-                if net_io:
-                    resources.network_sent_mb_per_sec = (
-                        net_io.bytes_sent / (1024**2) / 60
-                    )
-                    resources.network_recv_mb_per_sec = (
-                        net_io.bytes_recv / (1024**2) / 60
-                    )
-
-                # Process count
-                resources.active_processes = len(psutil.pids())
-
-                # Get MLX processes
-                resources.mlx_processes = (
-                    await self.activity_monitor.get_system_processes()
-                )
+            # procfs reads are quick but still file I/O; keep them off the loop
+            resources = await asyncio.to_thread(self.sampler.sample)
 
             # GPU metrics (Apple Silicon specific)
-            gpu_metrics = await self.activity_monitor.get_gpu_utilization()
+            gpu_metrics = await self._get_gpu_metrics()
             resources.gpu_utilization_percent = gpu_metrics["utilization_percent"]
             resources.gpu_memory_used_gb = gpu_metrics["memory_used_gb"]
             resources.gpu_memory_total_gb = gpu_metrics["memory_total_gb"]
@@ -823,6 +1467,25 @@ class ResourceMonitor:
             logger.error(f"Failed to get system resources: {e}")
             return SystemResources()  # Return empty/default resources
 
+    async def _get_gpu_metrics(self) -> dict[str, float]:
+        """Get GPU metrics, refreshed at most every Activity Monitor sync period."""
+        now = time.monotonic()
+        if (
+            self._gpu_metrics is None
+            or now - self._gpu_metrics_at >= self.config.activity_monitor_sync_seconds
+        ):
+            self._gpu_metrics = await self.activity_monitor.get_gpu_utilization()
+            self._gpu_metrics_at = now
+        return self._gpu_metrics
+
+    def track_process(self, pid: int) -> None:
+        """Include a managed process (e.g. a model worker) in sampling."""
+        self.sampler.track_process(pid)
+
+    def untrack_process(self, pid: int) -> None:
+        """Stop sampling a managed process."""
+        self.sampler.untrack_process(pid)
+
     def _classify_memory_pressure(self, memory_percent: float) -> MemoryPressureLevel:
         """Classify memory pressure level."""
         if memory_percent >= self.config.memory_critical_threshold * 100:
@@ -887,10 +1550,8 @@ class ResourceMonitor:
 
     async def _process_resource_metrics(self, resources: SystemResources) -> None:
         """Process resource metrics and trigger actions."""
-        # Add to history (keep last 100 readings)
+        # Add to history (ring buffer drops the oldest reading)
         self._resource_history.append(resources)
-        if len(self._resource_history) > 100:
-            self._resource_history.pop(0)
 
         # Check for memory pressure changes
         await self._check_memory_pressure(resources)
@@ -980,10 +1641,25 @@ class ResourceMonitor:
         self._eviction_callbacks.append(callback)
 
     def register_model(
-        self, name: str, backend: str, memory_gb: float, priority: int = 1
+        self,
+        name: str,
+        backend: str,
+        memory_gb: float,
+        priority: int = 1,
+        load_time_seconds: float | None = None,
     ) -> None:
         """Register a loaded model for eviction management."""
-        self.eviction_manager.register_model(name, backend, memory_gb, priority)
+        self.eviction_manager.register_model(
+            name, backend, memory_gb, priority, load_time_seconds
+        )
+
+    def record_model_load_time(self, name: str, load_time_seconds: float) -> None:
+        """Record how long a model took to load, for reload cost estimates."""
+        self.eviction_manager.record_load_time(name, load_time_seconds)
+
+    def plan_eviction(self, memory_to_free_gb: float) -> EvictionPlan:
+        """Dry-run which models a cost-aware eviction would drop."""
+        return self.eviction_manager.plan_eviction(memory_to_free_gb)
 
     def unregister_model(self, name: str) -> None:
         """Unregister a model."""
@@ -1067,9 +1743,9 @@ class ResourceMonitor:
 
     def get_resource_history(self, limit: int = 50) -> list[dict[str, Any]]:
         """Get recent resource history."""
-        history = (
-            self._resource_history[-limit:] if limit > 0 else self._resource_history
-        )
+        history = list(self._resource_history)
+        if limit > 0:
+            history = history[-limit:]
         return [resources.to_dict() for resources in history]
 
     def get_activity_monitor_data(self) -> dict[str, Any]:
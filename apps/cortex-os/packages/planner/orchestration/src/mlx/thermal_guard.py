@@ -1,5 +1,5 @@
 """
-Thermal management system for MLX inference on Apple Silicon.
+Thermal management system for MLX inference on Apple Silicon and Linux.
 
 Provides real-time GPU temperature monitoring, intelligent throttling at 85°C,
 and graceful CPU-only fallback at 90°C to prevent thermal damage while
@@ -16,6 +16,7 @@ License: MIT
 """
 
 import asyncio
+import importlib.util
 import logging
 import os
 import platform
@@ -27,6 +28,7 @@ from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from pathlib import Path
 from typing import Any
 
 # Add safe subprocess for security
@@ -39,6 +41,45 @@ except ImportError:
     safe_run = subprocess.run
     SYSTEM_INFO_COMMANDS = None
 
+
+def _register_cortex_py() -> None:
+    """Make ``cortex_py`` importable from the sibling checkout if not installed.
+
+    Only the package itself is registered: cortex-py's ``src`` also holds
+    top-level ``mlx``, ``thermal`` and ``middleware`` packages, which must not
+    shadow the real ones on ``sys.path``.
+    """
+    if "cortex_py" in sys.modules or importlib.util.find_spec("cortex_py") is not None:
+        return
+    package_dir = os.path.join(
+        os.path.dirname(__file__), "../../../../../../cortex-py/src/cortex_py"
+    )
+    init_path = os.path.join(package_dir, "__init__.py")
+    if not os.path.exists(init_path):
+        return
+    spec = importlib.util.spec_from_file_location(
+        "cortex_py", init_path, submodule_search_locations=[package_dir]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["cortex_py"] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules["cortex_py"]
+        raise
+
+
+# Closed-loop throttling and RAPL power shared with cortex-py
+try:
+    _register_cortex_py()
+    from cortex_py.thermal import ThermalProbeError
+    from cortex_py.thermal_control import RaplPowerProbe, ThermalPowerController
+except ImportError:
+    # Fallback to the discrete throttle actions and no power reading
+    ThermalProbeError = Exception
+    RaplPowerProbe = None
+    ThermalPowerController = None
+
 try:
     import psutil
 except ImportError:
@@ -122,6 +163,8 @@ class ThermalConfig:
     throttle_recovery_hysteresis: float = 3.0  # 3°C hysteresis for recovery
     batch_size_reduction_factor: float = 0.5
     inference_rate_reduction_factor: float = 0.7
+    min_throttle_scale: float = 0.1  # Floor of the closed-loop load scale
+    power_budget_watts: float | None = None  # Also throttle above this draw
 
     # Emergency settings
     emergency_shutdown_temp: float = 100.0
@@ -415,6 +458,87 @@ class AppleSiliconThermalMonitor:
         )
 
 
+class LinuxThermalMonitor:
+    """Linux thermal monitoring from sysfs thermal zones and RAPL counters."""
+
+    def __init__(
+        self,
+        thermal_root: str = "/sys/class/thermal",
+        powercap_root: str = "/sys/class/powercap",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.thermal_root = thermal_root
+        self.powercap_root = powercap_root
+        self._power_probe = (
+            RaplPowerProbe(Path(powercap_root), clock=clock)
+            if RaplPowerProbe is not None
+            else None
+        )
+        self._last_power = 0.0
+
+    def is_available(self) -> bool:
+        """Check whether any thermal zone can be read."""
+        return bool(self._read_zone_temperatures())
+
+    async def get_thermal_metrics(self) -> ThermalMetrics:
+        """Read thermal zones and package power without blocking the loop."""
+        return await asyncio.to_thread(self.read_metrics)
+
+    def read_metrics(self) -> ThermalMetrics:
+        """Read current thermal metrics synchronously."""
+        temperatures = self._read_zone_temperatures()
+        cpu_temps = [t for name, t in temperatures if "gpu" not in name]
+        gpu_temps = [t for name, t in temperatures if "gpu" in name]
+        cpu_temp = max(cpu_temps, default=0.0)
+        gpu_temp = max(gpu_temps, default=cpu_temp)
+        return ThermalMetrics(
+            gpu_temp_celsius=gpu_temp,
+            cpu_temp_celsius=cpu_temp,
+            power_draw_watts=self._read_package_power(),
+        )
+
+    def _read_zone_temperatures(self) -> list[tuple[str, float]]:
+        readings = []
+        if not os.path.isdir(self.thermal_root):
+            return readings
+        for entry in sorted(os.listdir(self.thermal_root)):
+            if not entry.startswith("thermal_zone"):
+                continue
+            zone = os.path.join(self.thermal_root, entry)
+            try:
+                with open(os.path.join(zone, "temp")) as f:
+                    millidegrees = int(f.read().strip())
+                with open(os.path.join(zone, "type")) as f:
+                    zone_type = f.read().strip().lower()
+            except (OSError, ValueError):
+                continue
+            if millidegrees > 0:
+                readings.append((zone_type, millidegrees / 1000.0))
+        return readings
+
+    def _read_package_power(self) -> float:
+        """Average package power since the previous read, from RAPL energy."""
+        if self._power_probe is None:
+            return 0.0
+        try:
+            watts = self._power_probe.read_watts()
+        except ThermalProbeError:
+            return 0.0
+        if watts is not None:
+            self._last_power = watts
+        return self._last_power
+
+
+def create_thermal_monitor() -> "AppleSiliconThermalMonitor | LinuxThermalMonitor":
+    """Pick the thermal backend for the current platform."""
+    if platform.system() == "Linux":
+        monitor = LinuxThermalMonitor()
+        if monitor.is_available():
+            return monitor
+        logger.warning("No readable sysfs thermal zones found")
+    return AppleSiliconThermalMonitor()
+
+
 class ThermalGuard:
     """
     Comprehensive thermal management system for MLX inference.
@@ -431,7 +555,7 @@ class ThermalGuard:
         self.config = config or ThermalConfig()
         self.config.validate()
 
-        self.monitor = AppleSiliconThermalMonitor()
+        self.monitor = create_thermal_monitor()
         self.is_monitoring = False
         self.is_throttling = False
         self.current_metrics = ThermalMetrics()
@@ -442,6 +566,19 @@ class ThermalGuard:
         self._smoothed_temperature = 0.0
         self._consecutive_hot_readings = 0
 
+        # Closed-loop load scale; limits are passed in by each caller
+        self.controller = (
+            ThermalPowerController(
+                max_batch_size=1,
+                max_concurrency=1,
+                target_c=self.config.temp_warm_max,
+                power_budget_w=self.config.power_budget_watts,
+                min_scale=self.config.min_throttle_scale,
+            )
+            if ThermalPowerController is not None
+            else None
+        )
+
         # Callbacks for thermal events
         self._throttle_callbacks: list[
             Callable[[ThermalState, ThrottleAction], None]
@@ -608,6 +745,16 @@ class ThermalGuard:
         new_state = self._classify_thermal_state(self._smoothed_temperature)
         old_state = self.current_metrics.thermal_state
 
+        if self.controller is not None:
+            # The controller smooths raw readings itself
+            self.controller.update(
+                max_temp if max_temp > 0 else None,
+                metrics.power_draw_watts or None,
+                warning_c=self.config.temp_hot_max,
+                critical_c=self.config.temp_critical_max,
+                status="critical" if new_state == ThermalState.CRITICAL else "nominal",
+            )
+
         # Handle state transitions
         if new_state != old_state:
             await self._handle_state_transition(old_state, new_state)
@@ -792,6 +939,9 @@ class ThermalGuard:
             "is_monitoring": self.is_monitoring,
             "is_throttling": self.is_throttling,
             "thermal_history_size": len(self._thermal_history),
+            "throttle_scale": (
+                self.controller.decision.scale if self.controller is not None else 1.0
+            ),
         }
 
     def get_thermal_history(self, limit: int = 50) -> list[dict[str, Any]]:
@@ -807,8 +957,13 @@ class ThermalGuard:
             ThermalState.CRITICAL,
         ]
 
+    def _use_controller(self) -> bool:
+        return self.controller is not None and self.config.thermal_protection_enabled
+
     def get_recommended_batch_size(self, normal_batch_size: int) -> int:
         """Get recommended batch size based on thermal state."""
+        if self._use_controller():
+            return self.controller.scaled(normal_batch_size)
         if not self.should_throttle_inference():
             return normal_batch_size
 
@@ -823,6 +978,21 @@ class ThermalGuard:
         else:
             return normal_batch_size
 
+    def get_recommended_concurrency(self, normal_concurrency: int) -> int:
+        """Get recommended number of concurrent inferences."""
+        if self._use_controller():
+            return self.controller.scaled(normal_concurrency)
+        if not self.should_throttle_inference():
+            return normal_concurrency
+        if self.current_metrics.throttle_action in [
+            ThrottleAction.SWITCH_TO_CPU,
+            ThrottleAction.EMERGENCY_STOP,
+        ]:
+            return 1
+        return max(
+            1, int(normal_concurrency * self.config.batch_size_reduction_factor)
+        )
+
     def get_recommended_inference_rate(self, normal_rate: float) -> float:
         """Get recommended inference rate based on thermal state."""
         if not self.should_throttle_inference():
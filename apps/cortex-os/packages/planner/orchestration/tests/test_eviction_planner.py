@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import itertools
+import random
+
+import pytest
+
+from resource_monitor import EvictionPlanner, ModelEvictionManager, ResourceConfig
+
+GB = 1024**3
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _brute_force(
+    planner: EvictionPlanner, target: int, limit: int, exclude: set[str]
+) -> float | None:
+    """Cheapest expected reload cost over every cover within ``limit``."""
+    candidates = [planner.candidate(name) for name in planner.ordered_names()]
+    candidates = [c for c in candidates if c.name not in exclude]
+    best = None
+    for size in range(limit + 1):
+        for subset in itertools.combinations(candidates, size):
+            if sum(c.resident_bytes for c in subset) < target:
+                continue
+            cost = sum(c.expected_reload_seconds for c in subset)
+            best = cost if best is None else min(best, cost)
+    return best
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_plan_matches_brute_force_minimum_cost_cover(seed: int) -> None:
+    rng = random.Random(seed)
+    clock = _Clock()
+    planner = EvictionPlanner(reuse_window_seconds=60.0, clock=clock)
+    names = [f"m{i}" for i in range(rng.randint(1, 8))]
+    for name in names:
+        planner.add(name, rng.randint(1, 16) * GB, rng.uniform(1.0, 40.0))
+    for _ in range(30):
+        clock.now += rng.uniform(0.0, 30.0)
+        planner.touch(rng.choice(names))
+
+    total = sum(planner.candidate(name).resident_bytes for name in names)
+    exclude = set(rng.sample(names, rng.randint(0, len(names) // 3)))
+    for _ in range(5):
+        target = rng.randint(1, total)
+        limit = rng.randint(0, len(names))
+        plan = planner.plan(target, max_models=limit, exclude=exclude)
+        expected = _brute_force(planner, target, limit, exclude)
+
+        assert not set(plan.models) & exclude
+        assert len(plan.models) <= limit
+        if expected is None:
+            assert not plan.satisfied
+        else:
+            assert plan.satisfied and plan.optimal
+            assert plan.freed_bytes >= target
+            assert plan.expected_reload_seconds == pytest.approx(expected)
+
+
+def test_unsatisfiable_plan_frees_as_much_as_allowed() -> None:
+    planner = EvictionPlanner(clock=_Clock())
+    for name, size in (("small", 1), ("medium", 2), ("large", 4)):
+        planner.add(name, size * GB, 10.0)
+
+    everything = planner.plan(100 * GB)
+    assert not everything.satisfied
+    assert not everything.optimal
+    assert sorted(everything.models) == ["large", "medium", "small"]
+
+    # Only one model may go: the largest frees the most
+    one = planner.plan(5 * GB, max_models=1)
+    assert not one.satisfied
+    assert one.models == ["large"]
+
+    assert planner.plan(0).models == []
+
+
+def test_plan_reaches_a_cover_outside_the_heap_order() -> None:
+    clock = _Clock()
+    planner = EvictionPlanner(clock=clock)
+    planner.add("idle-small", 1 * GB, 1.0)
+    planner.add("busy-large", 8 * GB, 5.0)
+    for _ in range(5):
+        planner.touch("busy-large")
+
+    assert planner.ordered_names()[0] == "idle-small"
+    plan = planner.plan(4 * GB, max_models=1)
+    assert plan.satisfied
+    assert plan.models == ["busy-large"]
+
+
+def _manager(**overrides) -> ModelEvictionManager:
+    clock = _Clock()
+    manager = ModelEvictionManager(ResourceConfig(**overrides), clock)
+    for name, size, load in (
+        ("cheap", 4.0, 1.0),
+        ("medium", 4.0, 10.0),
+        ("costly", 4.0, 60.0),
+        ("huge", 16.0, 90.0),
+    ):
+        manager.register_model(name, "mlx", size, load_time_seconds=load)
+    return manager
+
+
+def test_pinned_models_are_never_planned() -> None:
+    manager = _manager(models_to_keep_minimum=0)
+    assert manager.plan_eviction(4.0).models == ["cheap"]
+
+    manager.loaded_models["cheap"].is_evictable = False
+    plan = manager.plan_eviction(4.0)
+    assert plan.models == ["medium"]
+    assert all(c.name != "cheap" for c in plan.candidates)
+
+    plan = manager.plan_eviction(30.0)
+    assert not plan.satisfied
+    assert "cheap" not in plan.models
+
+
+def test_models_to_keep_minimum_limits_the_plan() -> None:
+    manager = _manager(models_to_keep_minimum=2)
+
+    # Freeing 8 GB from 4 GB models needs two of the four
+    assert sorted(manager.plan_eviction(8.0).models) == ["cheap", "medium"]
+
+    plan = manager.plan_eviction(12.0)
+    # Three 4 GB models would exceed the limit; the 16 GB one alone fits
+    assert plan.satisfied
+    assert len(plan.models) <= 2
+    assert "huge" in plan.models
+
+    plan = manager.plan_eviction(24.0)
+    assert not plan.satisfied
+    assert len(plan.models) == 2
+
+
+def test_decay_weights_are_renormalized_before_overflow() -> None:
+    clock = _Clock()
+    planner = EvictionPlanner(reuse_window_seconds=1.0, clock=clock)
+    planner.add("idle", GB, 10.0)
+    planner.add("busy", GB, 10.0)
+
+    # Far past 2 ** 1024: only renormalization keeps the weights finite
+    for _ in range(10):
+        clock.now += 300.0
+        planner.touch("busy")
+    clock.now += 1.0
+    planner.touch("busy")
+
+    busy = planner.candidate("busy")
+    # One use a window ago plus one now
+    assert busy.reuse_probability == pytest.approx(1 - 2**-1.5)
+    assert busy.expected_reload_seconds == pytest.approx(10 * (1 - 2**-1.5))
+    assert planner.candidate("idle").reuse_probability == pytest.approx(0.0)
+    assert planner.ordered_names() == ["idle", "busy"]
+
+
+def test_stale_heap_entries_are_compacted() -> None:
+    planner = EvictionPlanner(clock=_Clock())
+    for i in range(4):
+        planner.add(f"m{i}", GB, 1.0)
+
+    for _ in range(1_000):
+        planner.touch("m0")
+        assert len(planner._heap) <= 4 * len(planner) + 64 + 1
+    planner.remove("m1")
+    planner.update_load_time("m2", 0.1)
+
+    names = planner.ordered_names()
+    assert sorted(names) == ["m0", "m2", "m3"]
+    assert names[0] == "m2"
+    assert names[-1] == "m0"
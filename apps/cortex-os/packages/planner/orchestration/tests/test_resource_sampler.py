@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from resource_monitor import ResourceSampler
+
+MB = 1024**2
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+BOOT_TIME = 1_700_000_000
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 50.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeProcfs:
+    """Minimal /proc and /sys/block trees with settable counters."""
+
+    def __init__(self, root: Path) -> None:
+        self.proc = root / "proc"
+        self.sys = root / "sys"
+        for disk in ("sda", "nvme0n1", "loop0"):
+            (self.sys / "block" / disk).mkdir(parents=True)
+        (self.proc / "net").mkdir(parents=True)
+        self._write(
+            "meminfo",
+            "MemTotal:       16777216 kB\n"
+            "MemFree:         1048576 kB\n"
+            "MemAvailable:    4194304 kB\n"
+            "SwapTotal:       2097152 kB\n"
+            "SwapFree:        1048576 kB\n",
+        )
+        self._write("loadavg", "0.50 0.40 0.30 2/300 4242\n")
+        self.set_cpu(busy=0, idle=0)
+        self.set_disks(read_sectors=0, written_sectors=0)
+        self.set_net(recv=0, sent=0)
+
+    def _write(self, relative: str, text: str) -> None:
+        path = self.proc / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+    def set_cpu(self, busy: int, idle: int) -> None:
+        # user nice system idle iowait irq softirq steal guest guest_nice
+        user, system = busy // 2, busy - busy // 2
+        self._write(
+            "stat",
+            f"cpu  {user} 0 {system} {idle} 0 0 0 0 0 0\n"
+            f"cpu0 {user} 0 {system} {idle} 0 0 0 0 0 0\n"
+            f"btime {BOOT_TIME}\n",
+        )
+
+    def set_disks(self, read_sectors: int, written_sectors: int) -> None:
+        lines = []
+        for major, minor, name in (
+            (8, 0, "sda"),
+            (8, 1, "sda1"),  # partition: already counted in sda
+            (259, 0, "nvme0n1"),
+            (7, 0, "loop0"),  # virtual
+        ):
+            lines.append(
+                f"{major:4d} {minor:7d} {name} 10 0 {read_sectors} 5 20 0 "
+                f"{written_sectors} 7 0 12 12 0 0 0 0"
+            )
+        self._write("diskstats", "\n".join(lines) + "\n")
+
+    def set_net(self, recv: int, sent: int) -> None:
+        header = (
+            "Inter-|   Receive                                                |  Transmit\n"
+            " face |bytes    packets errs drop fifo frame compressed multicast|"
+            "bytes    packets errs drop fifo colls carrier compressed\n"
+        )
+        row = "{:>6}: {} 10 0 0 0 0 0 0 {} 10 0 0 0 0 0 0\n"
+        self._write(
+            "net/dev",
+            header
+            + row.format("lo", 10**9, 10**9)
+            + row.format("eth0", recv, sent)
+            + row.format("wlan0", recv, sent),
+        )
+
+    def set_process(
+        self, pid: int, name: str, cpu_ticks: int, rss_pages: int, state: str = "S"
+    ) -> None:
+        utime, stime = cpu_ticks // 2, cpu_ticks - cpu_ticks // 2
+        fields = [state, "1", str(pid), str(pid), "0", "-1", "4194304"]
+        fields += ["0"] * 4 + [str(utime), str(stime), "0", "0", "20", "0", "4", "0"]
+        fields += [str(30 * CLOCK_TICKS), "123456789", str(rss_pages)]
+        self._write(f"{pid}/stat", f"{pid} ({name}) {' '.join(fields)}\n")
+
+    def kill(self, pid: int) -> None:
+        for child in (self.proc / str(pid)).iterdir():
+            child.unlink()
+        (self.proc / str(pid)).rmdir()
+
+
+@pytest.fixture
+def procfs(tmp_path: Path) -> FakeProcfs:
+    return FakeProcfs(tmp_path)
+
+
+def _sampler(procfs: FakeProcfs, pids: list[int], clock: _Clock) -> ResourceSampler:
+    return ResourceSampler(
+        pids, proc_root=str(procfs.proc), sys_root=str(procfs.sys), clock=clock
+    )
+
+
+def test_parses_procfs_counters_and_process_stat(procfs: FakeProcfs) -> None:
+    procfs.set_cpu(busy=300, idle=700)
+    procfs.set_process(4242, "mlx (worker) x", cpu_ticks=CLOCK_TICKS, rss_pages=1024)
+    sampler = _sampler(procfs, [4242], _Clock())
+    assert sampler.use_procfs
+
+    resources = sampler.sample()
+
+    # The first sample averages CPU since boot and has no rates yet
+    assert resources.cpu_percent == pytest.approx(30.0)
+    assert resources.disk_read_mb_per_sec == 0.0
+    assert resources.memory_total_gb == pytest.approx(16.0)
+    assert resources.memory_available_gb == pytest.approx(4.0)
+    assert resources.memory_percent == pytest.approx(75.0)
+    assert resources.swap_used_gb == pytest.approx(1.0)
+    assert resources.load_average == [0.5, 0.4, 0.3]
+    assert resources.active_processes == 1
+
+    [process] = resources.mlx_processes
+    assert process.pid == 4242
+    assert process.name == "mlx (worker) x"
+    assert process.status == "sleeping"
+    assert process.memory_mb == pytest.approx(1024 * PAGE_SIZE / MB)
+    assert process.create_time == pytest.approx(BOOT_TIME + 30)
+
+
+def test_rates_are_deltas_over_the_sample_interval(procfs: FakeProcfs) -> None:
+    procfs.set_disks(read_sectors=1_000, written_sectors=2_000)
+    procfs.set_net(recv=5 * MB, sent=MB)
+    procfs.set_process(7, "python3", cpu_ticks=0, rss_pages=1)
+    clock = _Clock()
+    sampler = _sampler(procfs, [7], clock)
+    sampler.sample()
+
+    clock.now += 2.0
+    procfs.set_cpu(busy=150, idle=50)
+    # sda and nvme0n1 each: +4 MiB read, +2 MiB written
+    procfs.set_disks(read_sectors=1_000 + 8192, written_sectors=2_000 + 4096)
+    # eth0 and wlan0 each: +3 MiB received, +1 MiB sent
+    procfs.set_net(recv=8 * MB, sent=2 * MB)
+    procfs.set_process(7, "python3", cpu_ticks=CLOCK_TICKS, rss_pages=1)
+    resources = sampler.sample()
+
+    assert resources.cpu_percent == pytest.approx(75.0)
+    assert resources.disk_read_mb_per_sec == pytest.approx(4.0)
+    assert resources.disk_write_mb_per_sec == pytest.approx(2.0)
+    assert resources.network_recv_mb_per_sec == pytest.approx(3.0)
+    assert resources.network_sent_mb_per_sec == pytest.approx(1.0)
+    # One CPU second over two wall seconds
+    assert resources.mlx_processes[0].cpu_percent == pytest.approx(50.0)
+
+
+def test_counter_resets_clamp_rates_to_zero(procfs: FakeProcfs) -> None:
+    procfs.set_cpu(busy=500, idle=500)
+    procfs.set_disks(read_sectors=10_000, written_sectors=10_000)
+    procfs.set_net(recv=10 * MB, sent=10 * MB)
+    procfs.set_process(7, "python3", cpu_ticks=10 * CLOCK_TICKS, rss_pages=1)
+    clock = _Clock()
+    sampler = _sampler(procfs, [7], clock)
+    sampler.sample()
+
+    clock.now += 1.0
+    procfs.set_cpu(busy=10, idle=10)
+    procfs.set_disks(read_sectors=0, written_sectors=0)
+    procfs.set_net(recv=0, sent=0)
+    procfs.set_process(7, "python3", cpu_ticks=0, rss_pages=1)
+    resources = sampler.sample()
+
+    assert resources.cpu_percent == 0.0
+    assert resources.disk_read_mb_per_sec == 0.0
+    assert resources.disk_write_mb_per_sec == 0.0
+    assert resources.network_recv_mb_per_sec == 0.0
+    assert resources.network_sent_mb_per_sec == 0.0
+    assert resources.mlx_processes[0].cpu_percent == 0.0
+
+    # Rates resume from the new baseline
+    clock.now += 1.0
+    procfs.set_disks(read_sectors=2048, written_sectors=0)
+    assert sampler.sample().disk_read_mb_per_sec == pytest.approx(2.0)
+
+
+def test_exited_processes_are_untracked(procfs: FakeProcfs) -> None:
+    procfs.set_process(7, "python3", cpu_ticks=0, rss_pages=1)
+    procfs.set_process(8, "mlx_lm.server", cpu_ticks=0, rss_pages=1, state="R")
+    sampler = _sampler(procfs, [7, 8, 9], _Clock())
+
+    first = sampler.sample()
+    assert sorted(p.pid for p in first.mlx_processes) == [7, 8]
+    assert sampler.tracked_pids == {7, 8}
+
+    procfs.kill(7)
+    second = sampler.sample()
+    assert [(p.pid, p.status) for p in second.mlx_processes] == [(8, "running")]
+    assert sampler.tracked_pids == {8}
+    assert second.active_processes == 1
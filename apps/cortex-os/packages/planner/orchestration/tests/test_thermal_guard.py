@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+import thermal_guard
+from thermal_guard import LinuxThermalMonitor, ThermalConfig, ThermalGuard, ThermalMetrics
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _write(path: Path, value: object) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"{value}\n")
+
+
+def _sysfs(root: Path) -> tuple[Path, Path]:
+    thermal = root / "thermal"
+    _write(thermal / "thermal_zone0" / "temp", 61000)
+    _write(thermal / "thermal_zone0" / "type", "x86_pkg_temp")
+    _write(thermal / "thermal_zone1" / "temp", 55000)
+    _write(thermal / "thermal_zone1" / "type", "gpu-thermal")
+    _write(thermal / "cooling_device0" / "type", "Processor")
+    powercap = root / "powercap"
+    _write(powercap / "intel-rapl:0" / "energy_uj", 999_000_000)
+    _write(powercap / "intel-rapl:0" / "max_energy_range_uj", 1_000_000_000)
+    # Subzones are already counted in their package
+    _write(powercap / "intel-rapl:0:0" / "energy_uj", 0)
+    return thermal, powercap
+
+
+def test_linux_monitor_reads_zones_and_rapl_power(tmp_path: Path) -> None:
+    thermal, powercap = _sysfs(tmp_path)
+    clock = _Clock()
+    monitor = LinuxThermalMonitor(str(thermal), str(powercap), clock=clock)
+
+    first = monitor.read_metrics()
+    assert (first.cpu_temp_celsius, first.gpu_temp_celsius) == (61.0, 55.0)
+    assert first.power_draw_watts == 0.0  # the first read primes the counters
+
+    # 3 J over 2 s across the counter wrap
+    clock.now += 2.0
+    _write(powercap / "intel-rapl:0" / "energy_uj", 2_000_000)
+    _write(powercap / "intel-rapl:0:0" / "energy_uj", 50_000_000)
+    assert monitor.read_metrics().power_draw_watts == pytest.approx(1.5)
+
+    # A read without elapsed time keeps the last value
+    assert monitor.read_metrics().power_draw_watts == pytest.approx(1.5)
+
+
+def test_linux_monitor_without_powercap_reports_no_power(tmp_path: Path) -> None:
+    thermal, _ = _sysfs(tmp_path)
+    monitor = LinuxThermalMonitor(str(thermal), str(tmp_path / "missing"))
+
+    assert monitor.is_available()
+    assert monitor.read_metrics().power_draw_watts == 0.0
+
+
+def _feed(guard: ThermalGuard, temperature: float) -> None:
+    metrics = ThermalMetrics(gpu_temp_celsius=temperature, cpu_temp_celsius=temperature)
+    asyncio.run(guard._process_thermal_metrics(metrics))
+
+
+def test_guard_scales_batches_and_concurrency_with_the_controller() -> None:
+    guard = ThermalGuard(ThermalConfig(background_monitoring=False))
+    clock = _Clock()
+    guard.controller._clock = clock
+
+    _feed(guard, 60.0)
+    assert guard.get_recommended_batch_size(32) == 32
+    assert guard.get_recommended_concurrency(8) == 8
+
+    sizes = []
+    for _ in range(5):
+        clock.now += 1.0
+        _feed(guard, 92.0)
+        sizes.append(guard.get_recommended_batch_size(32))
+    # Throttling starts above temp_warm_max, before the discrete HOT state
+    assert sizes[0] < 32
+    assert sizes == sorted(sizes, reverse=True)
+    assert 1 <= guard.get_recommended_concurrency(8) < 8
+    assert guard.get_performance_stats()["throttle_scale"] < 1.0
+
+    for _ in range(30):
+        clock.now += 1.0
+        _feed(guard, 50.0)
+    assert guard.get_recommended_batch_size(32) == 32
+
+
+def test_guard_falls_back_to_discrete_actions(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(thermal_guard, "ThermalPowerController", None)
+    guard = ThermalGuard(ThermalConfig(background_monitoring=False))
+
+    assert guard.controller is None
+    assert guard.get_recommended_batch_size(32) == 32
+    assert guard.get_recommended_concurrency(8) == 8
+
+
+def test_cortex_py_import_does_not_put_its_src_on_sys_path() -> None:
+    # cortex-py's src also holds top-level mlx/thermal/middleware packages
+    assert not any(Path(entry).parts[-2:] == ("cortex-py", "src") for entry in sys.path)
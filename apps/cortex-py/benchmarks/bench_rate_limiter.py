@@ -0,0 +1,120 @@
+"""Measure client rate limiter throughput and memory at a million client keys.
+
+Usage: python benchmarks/bench_rate_limiter.py [--clients 1000000]
+
+"before" is the unbounded ``defaultdict`` of ``TokenBucket`` objects the
+limiter used to keep; "after" is the lock-striped :class:`RateLimiter`,
+once sized to hold every client and once at the default bound. The 1000/day
+rows are the worst case for memory: no bucket refills during the run, so
+nothing expires. At 120/minute buckets refill within half a second and idle
+entries drain away. Memory is the traced allocation growth while the table
+fills. The middleware section times requests rejected by
+:class:`RateLimitMiddleware` before reaching the app.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from middleware.rate_limiter import (  # noqa: E402
+    DEFAULT_MAX_CLIENTS,
+    RateLimiter,
+    RateLimitMiddleware,
+    TokenBucket,
+)
+
+
+class LegacyRateLimiter:
+    def __init__(self, rate: int, per_seconds: int = 60):
+        refill_rate = rate / per_seconds
+        self.buckets = defaultdict(lambda: TokenBucket(rate, refill_rate))
+
+    def allow_request(self, client_id: str) -> bool:
+        if not client_id:
+            return False
+        return self.buckets[client_id].consume(1.0)
+
+
+def run(limiter, keys: list[str]) -> float:
+    allow = limiter.allow_request
+    start = time.perf_counter()
+    for key in keys:
+        allow(key)
+    return len(keys) / (time.perf_counter() - start)
+
+
+def measure(factory: Callable[[], object], keys: list[str]) -> tuple[float, float, float]:
+    """(first-touch checks/s, repeat checks/s, MiB retained)."""
+    limiter = factory()
+    first = run(limiter, keys)
+    repeat = run(limiter, keys)
+    del limiter
+    gc.collect()
+
+    tracemalloc.start()
+    limiter = factory()
+    run(limiter, keys)
+    retained = tracemalloc.get_traced_memory()[0] / 2**20
+    tracemalloc.stop()
+    return first, repeat, retained
+
+
+async def bench_rejections(requests: int) -> float:
+    calls = []
+
+    async def app(scope, receive, send):
+        calls.append(scope["path"])
+
+    async def send(message):
+        return None
+
+    middleware = RateLimitMiddleware(app, RateLimiter(1, 60))
+    scope = {"type": "http", "path": "/embed", "client": ("10.0.0.1", 1234)}
+    await middleware(scope, None, send)  # spends the only token
+    start = time.perf_counter()
+    for _ in range(requests):
+        await middleware(scope, None, send)
+    rate = requests / (time.perf_counter() - start)
+    assert len(calls) == 1, "rejected requests must not reach the app"
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=1_000_000)
+    parser.add_argument("--rejections", type=int, default=200_000)
+    args = parser.parse_args()
+    keys = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}:{i}" for i in range(args.clients)]
+
+    day = 86_400
+    variants = {
+        "before, 1000/day": lambda: LegacyRateLimiter(1000, day),
+        "after, all clients, 1000/day": lambda: RateLimiter(
+            1000, day, max_clients=args.clients
+        ),
+        f"after, {DEFAULT_MAX_CLIENTS} max, 1000/day": lambda: RateLimiter(1000, day),
+        "before, 120/minute": lambda: LegacyRateLimiter(120),
+        f"after, {DEFAULT_MAX_CLIENTS} max, 120/minute": lambda: RateLimiter(120),
+    }
+    print(f"{args.clients} distinct clients")
+    print(f"{'limiter':<34} {'first k/s':>10} {'repeat k/s':>11} {'MiB':>8}")
+    for name, factory in variants.items():
+        first, repeat, retained = measure(factory, keys)
+        print(f"{name:<34} {first / 1e3:>10.0f} {repeat / 1e3:>11.0f} {retained:>8.1f}")
+
+    rate = asyncio.run(bench_rejections(args.rejections))
+    print(f"\nmiddleware early rejections: {rate / 1e3:.0f}k requests/s")
+
+
+if __name__ == "__main__":
+    main()
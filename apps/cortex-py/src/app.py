@@ -54,6 +54,8 @@ from cortex_py.services import (  # noqa: E402
     ServiceError,
     ServiceValidationError,
 )
+from cortex_py.thermal_control import ThermalPowerController  # noqa: E402
+from middleware.rate_limiter import RateLimiter, RateLimitMiddleware  # noqa: E402
 
 # Phase 5: Operational health checks and graceful shutdown
 try:
@@ -133,10 +135,24 @@ def create_app(
     max_chars = int(os.getenv("EMBED_MAX_CHARS", "8192"))
     cache_size = int(os.getenv("EMBED_CACHE_SIZE", "256"))
     rate_limit = int(os.getenv("EMBED_RATE_LIMIT_PER_MINUTE", "120"))
+    client_rate_limit = int(os.getenv("EMBED_CLIENT_RATE_LIMIT_PER_MINUTE", "60"))
+    client_rate_limit_max_clients = int(
+        os.getenv("EMBED_CLIENT_RATE_LIMIT_MAX_CLIENTS", "100000")
+    )
 
     def current_generator() -> Any:
         return getattr(app, "embedding_generator", resolved_generator)
 
+    # Closed-loop thermal control of embedding batch size and concurrency.
+    # Opt-in: probing may shell out (powermetrics on macOS) on every interval.
+    thermal_controller: ThermalPowerController | None = None
+    if os.getenv("EMBED_THERMAL_CONTROL", "0") == "1":
+        thermal_controller = ThermalPowerController(
+            max_batch_size=int(os.getenv("EMBED_MAX_BATCH_SIZE", "32")),
+            max_concurrency=int(os.getenv("EMBED_MAX_CONCURRENCY", "8")),
+        )
+    app.state.thermal_controller = thermal_controller
+
     embedding_service = service or EmbeddingService(
         resolved_generator,
         generator_provider=current_generator,
@@ -144,9 +160,37 @@ def create_app(
         cache_size=cache_size,
         rate_limit_per_minute=rate_limit,
         audit_logger=logger.getChild("service"),
+        throttle=thermal_controller,
     )
     app.embedding_service = embedding_service  # type: ignore[attr-defined]
 
+    if thermal_controller is not None:
+        thermal_stop = asyncio.Event()
+        thermal_interval = float(os.getenv("EMBED_THERMAL_INTERVAL_SECONDS", "1"))
+
+        @app.on_event("startup")
+        async def start_thermal_control() -> None:
+            thermal_stop.clear()
+            app.state.thermal_task = asyncio.create_task(
+                thermal_controller.run(thermal_interval, thermal_stop)
+            )
+
+        @app.on_event("shutdown")
+        async def stop_thermal_control() -> None:
+            thermal_stop.set()
+            task = getattr(app.state, "thermal_task", None)
+            if task is not None:
+                await task
+
+    # Per-client limits on the embedding endpoints, rejected before routing
+    if client_rate_limit > 0:
+        app.add_middleware(
+            RateLimitMiddleware,
+            limiter=RateLimiter(
+                client_rate_limit, 60, max_clients=client_rate_limit_max_clients
+            ),
+        )
+
     # Initialize A2A bus for cross-language communication
     # Check if we should use real A2A core integration via stdio bridge
     use_real_core = (
@@ -14,10 +14,12 @@ __all__ = [
     "ServiceError",
     "ServiceValidationError",
     "ThermalMonitor",
+    "ThermalPowerController",
     "ThermalProbe",
     "ThermalProbeError",
     "ThermalReading",
     "ThermalStatus",
+    "ThrottleDecision",
     "create_thermal_event_from_status",
 ]
 
@@ -30,10 +32,12 @@ _EXPORTS = {
     "ServiceError": ("cortex_py.services", "ServiceError"),
     "ServiceValidationError": ("cortex_py.services", "ServiceValidationError"),
     "ThermalMonitor": ("cortex_py.thermal", "ThermalMonitor"),
+    "ThermalPowerController": ("cortex_py.thermal_control", "ThermalPowerController"),
     "ThermalProbe": ("cortex_py.thermal", "ThermalProbe"),
     "ThermalProbeError": ("cortex_py.thermal", "ThermalProbeError"),
     "ThermalReading": ("cortex_py.thermal", "ThermalReading"),
     "ThermalStatus": ("cortex_py.thermal", "ThermalStatus"),
+    "ThrottleDecision": ("cortex_py.thermal_control", "ThrottleDecision"),
     "create_thermal_event_from_status": (
         "cortex_py.thermal",
         "create_thermal_event_from_status",
@@ -59,6 +63,7 @@ if TYPE_CHECKING:  # pragma: no cover - import-time convenience for type checker
         ThermalStatus,
         create_thermal_event_from_status,
     )
+    from .thermal_control import ThermalPowerController, ThrottleDecision  # noqa: F401
 
 
 def __getattr__(name: str) -> Any:
@@ -5,11 +5,12 @@ import threading
 import time
 from collections import OrderedDict, deque
 from collections.abc import Callable, Iterable, Sequence
+from contextlib import AbstractContextManager, nullcontext
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import Any
 
-# Import brAInwav thermal monitoring
+from .thermal_control import AdaptiveConcurrencyLimit, ThermalPowerController
 
 logger = logging.getLogger(__name__)
 
@@ -82,6 +83,7 @@ class EmbeddingService:
         rate_limit_per_minute: int = 120,
         audit_logger: logging.Logger | None = None,
         rate_window_seconds: float = 60.0,
+        throttle: ThermalPowerController | None = None,
     ) -> None:
         self._generator = generator
         self._generator_provider = generator_provider
@@ -90,6 +92,14 @@ class EmbeddingService:
         self.rate_limit_per_minute = max(rate_limit_per_minute, 0)
         self.audit_logger = audit_logger or logger.getChild("audit")
         self.rate_window_seconds = rate_window_seconds
+        # Thermal control: batch size and concurrent model calls follow the
+        # controller's current limits
+        self.throttle = throttle
+        self._model_calls = (
+            AdaptiveConcurrencyLimit(lambda: throttle.concurrency)
+            if throttle is not None
+            else None
+        )
 
         self._cache: OrderedDict[
             tuple[str, bool], tuple[list[float], dict[str, Any]]
@@ -142,13 +152,14 @@ class EmbeddingService:
         self._audit("embedding.single", [sanitized])
 
         try:
-            if seed is not None:
-                try:
-                    embedding = generator.generate_embedding(sanitized, seed=seed)
-                except TypeError:
+            with self._model_call():
+                if seed is not None:
+                    try:
+                        embedding = generator.generate_embedding(sanitized, seed=seed)
+                    except TypeError:
+                        embedding = generator.generate_embedding(sanitized)
+                else:
                     embedding = generator.generate_embedding(sanitized)
-            else:
-                embedding = generator.generate_embedding(sanitized)
         except Exception as exc:  # pragma: no cover - delegated failure
             raise ServiceError(f"embedding generation failed: {exc}") from exc
 
@@ -195,13 +206,23 @@ class EmbeddingService:
         if pending:
             self._enforce_rate_limit()
             self._audit("embedding.batch", sanitized_items)
-            try:
-                payload = [item[1] for item in pending]
-                computed = generator.generate_embeddings(payload, normalize=normalize)
-            except TypeError:
-                computed = generator.generate_embeddings([item[1] for item in pending])
-            except Exception as exc:  # pragma: no cover - delegated failure
-                raise ServiceError(f"batch embedding generation failed: {exc}") from exc
+            computed: list[Sequence[float]] = []
+            chunk_size = self.throttle.batch_size if self.throttle else len(pending)
+            for start in range(0, len(pending), chunk_size):
+                payload = [item[1] for item in pending[start : start + chunk_size]]
+                try:
+                    with self._model_call():
+                        try:
+                            chunk = generator.generate_embeddings(
+                                payload, normalize=normalize
+                            )
+                        except TypeError:
+                            chunk = generator.generate_embeddings(payload)
+                except Exception as exc:  # pragma: no cover - delegated failure
+                    raise ServiceError(
+                        f"batch embedding generation failed: {exc}"
+                    ) from exc
+                computed.extend(chunk)
 
             for (idx, _sanitized, key), vector in zip(pending, computed, strict=True):
                 metadata = self._build_metadata(generator, vector, cached=False)
@@ -282,6 +303,9 @@ class EmbeddingService:
             if any(token in lower for token in self._SECURITY_BLOCKLIST):
                 raise SecurityViolation("text contains disallowed patterns")
 
+    def _model_call(self) -> AbstractContextManager[Any]:
+        return self._model_calls if self._model_calls is not None else nullcontext()
+
     def _enforce_rate_limit(self) -> None:
         if not self.rate_limit_per_minute:
             return
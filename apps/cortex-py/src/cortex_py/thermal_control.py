@@ -0,0 +1,335 @@
+"""Closed-loop thermal and power control for cortex-py inference paths."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .thermal import ThermalMonitor, ThermalProbeError
+
+# Degrees below the sensor warning trip point the controller aims for
+TARGET_MARGIN_C = 5.0
+
+
+class RaplPowerProbe:
+    """Package power derived from RAPL energy counters in /sys/class/powercap."""
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._root = root or Path("/sys/class/powercap")
+        self._clock = clock
+        self._ranges: Dict[str, int] = {}
+        self._last: Optional[Tuple[float, Dict[str, int]]] = None
+
+    def available(self) -> bool:
+        return bool(self._domains())
+
+    def read_watts(self) -> Optional[float]:
+        """Return average package power since the previous call.
+
+        The first call only primes the counters and returns ``None``.
+        """
+
+        now = self._clock()
+        energies: Dict[str, int] = {}
+        for domain in self._domains():
+            try:
+                energies[domain.name] = int((domain / "energy_uj").read_text().strip())
+            except PermissionError as exc:
+                raise ThermalProbeError(f"RAPL counters not readable: {exc}") from exc
+            except (FileNotFoundError, ValueError):
+                continue
+            if domain.name not in self._ranges:
+                self._ranges[domain.name] = self._read_range(domain)
+
+        if not energies:
+            raise ThermalProbeError("no RAPL energy counters available")
+
+        previous, self._last = self._last, (now, energies)
+        if previous is None or now <= previous[0]:
+            return None
+
+        consumed_uj = 0
+        for name, energy in energies.items():
+            before = previous[1].get(name)
+            if before is None:
+                continue
+            delta = energy - before
+            if delta < 0:
+                # Counter wrapped at max_energy_range_uj
+                delta += self._ranges.get(name, 0)
+            if delta >= 0:
+                consumed_uj += delta
+        return consumed_uj / 1e6 / (now - previous[0])
+
+    def _domains(self) -> List[Path]:
+        if not self._root.exists():
+            return []
+        # Package domains only: subzones such as intel-rapl:0:0 are counted within them
+        return sorted(
+            path
+            for path in self._root.glob("intel-rapl:*")
+            if path.name.count(":") == 1 and (path / "energy_uj").exists()
+        )
+
+    @staticmethod
+    def _read_range(domain: Path) -> int:
+        try:
+            return int((domain / "max_energy_range_uj").read_text().strip())
+        except (OSError, ValueError):
+            return 0
+
+
+class ExponentialSmoother:
+    """Exponentially weighted moving average."""
+
+    def __init__(self, alpha: float) -> None:
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError("alpha must be in (0, 1]")
+        self.alpha = alpha
+        self.value: Optional[float] = None
+
+    def update(self, sample: float) -> float:
+        if self.value is None:
+            self.value = sample
+        else:
+            self.value += self.alpha * (sample - self.value)
+        return self.value
+
+
+@dataclass(slots=True)
+class ThrottleDecision:
+    """Limits chosen by one controller step."""
+
+    scale: float
+    batch_size: int
+    concurrency: int
+    status: str
+    temperature_c: Optional[float]
+    power_w: Optional[float]
+    target_c: Optional[float]
+
+
+class ThermalPowerController:
+    """Feedback controller sizing batches and concurrency to thermal headroom.
+
+    Temperature comes from a :class:`~cortex_py.thermal.ThermalMonitor` (sysfs
+    thermal zones on Linux) and power from RAPL counters when present. Both are
+    smoothed, then turned into a normalized error: how far the temperature sits
+    above ``target_c`` relative to the critical trip point, or the power above
+    ``power_budget_w``, whichever is larger. A PID loop maps that error to a
+    scale in ``[min_scale, 1]`` applied to ``max_batch_size`` and
+    ``max_concurrency``. The derivative term reacts to a rising trend before
+    the hardware throttles; the integral only accumulates above target, so a
+    cool device returns to full load quickly.
+
+    :meth:`step` reads the sensors itself; callers with their own sampling
+    (such as the orchestration ``ThermalGuard``) feed readings to
+    :meth:`update` instead.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_batch_size: int,
+        max_concurrency: int,
+        monitor: Optional[ThermalMonitor] = None,
+        power_probe: Optional[RaplPowerProbe] = None,
+        target_c: Optional[float] = None,
+        power_budget_w: Optional[float] = None,
+        min_scale: float = 0.1,
+        smoothing: float = 0.3,
+        kp: float = 1.0,
+        ki: float = 0.05,
+        kd: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_batch_size < 1 or max_concurrency < 1:
+            raise ValueError("max_batch_size and max_concurrency must be >= 1")
+        if not 0.0 < min_scale <= 1.0:
+            raise ValueError("min_scale must be in (0, 1]")
+
+        self.max_batch_size = max_batch_size
+        self.max_concurrency = max_concurrency
+        self.target_c = target_c
+        self.power_budget_w = power_budget_w
+        self.min_scale = min_scale
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self._monitor = monitor or ThermalMonitor()
+        self._power_probe = power_probe if power_probe is not None else RaplPowerProbe()
+        self._clock = clock
+        self._temperature = ExponentialSmoother(smoothing)
+        self._power = ExponentialSmoother(smoothing)
+        self._integral = 0.0
+        self._last_error: Optional[float] = None
+        self._last_time: Optional[float] = None
+        self._decision = ThrottleDecision(
+            scale=1.0,
+            batch_size=max_batch_size,
+            concurrency=max_concurrency,
+            status="unknown",
+            temperature_c=None,
+            power_w=None,
+            target_c=target_c,
+        )
+
+    @property
+    def decision(self) -> ThrottleDecision:
+        return self._decision
+
+    @property
+    def batch_size(self) -> int:
+        return self._decision.batch_size
+
+    @property
+    def concurrency(self) -> int:
+        return self._decision.concurrency
+
+    def step(self) -> ThrottleDecision:
+        """Sample sensors, update the control loop and return the new limits."""
+
+        status = self._monitor.collect()
+        return self.update(
+            status.temperature_c,
+            self._read_power(),
+            warning_c=status.warning_c,
+            critical_c=status.critical_c,
+            status=status.status,
+        )
+
+    def update(
+        self,
+        temperature_c: Optional[float],
+        power_w: Optional[float],
+        *,
+        warning_c: float,
+        critical_c: float,
+        status: str = "nominal",
+    ) -> ThrottleDecision:
+        """Feed one raw sensor sample (from any source) into the control loop."""
+
+        now = self._clock()
+        temperature = (
+            self._temperature.update(temperature_c)
+            if temperature_c is not None
+            else self._temperature.value
+        )
+        power = self._power.update(power_w) if power_w is not None else self._power.value
+        target = self.target_c
+        if target is None:
+            target = warning_c - TARGET_MARGIN_C
+
+        errors: List[float] = []
+        if temperature is not None:
+            span = max(critical_c - target, 1.0)
+            errors.append((temperature - target) / span)
+        if power is not None and self.power_budget_w:
+            errors.append((power - self.power_budget_w) / self.power_budget_w)
+
+        if not errors:
+            # No signal: hold the current limits
+            scale = self._decision.scale
+        elif status == "critical":
+            scale = self.min_scale
+            self._integral = 1.0 / self.ki if self.ki else 0.0
+        else:
+            scale = self._update_loop(max(errors), now)
+
+        self._decision = ThrottleDecision(
+            scale=scale,
+            batch_size=self.scaled(self.max_batch_size, scale),
+            concurrency=self.scaled(self.max_concurrency, scale),
+            status=status,
+            temperature_c=temperature,
+            power_w=power,
+            target_c=target,
+        )
+        return self._decision
+
+    def scaled(self, limit: int, scale: Optional[float] = None) -> int:
+        """``limit`` scaled by the current (or given) scale, at least 1."""
+
+        return max(1, round(limit * (self._decision.scale if scale is None else scale)))
+
+    async def run(
+        self, interval_seconds: float = 1.0, stop: Optional[asyncio.Event] = None
+    ) -> None:
+        """Step the controller every ``interval_seconds`` until ``stop`` is set."""
+
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            await asyncio.to_thread(self.step)
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    def _update_loop(self, error: float, now: float) -> float:
+        derivative = 0.0
+        if self._last_time is not None and now > self._last_time:
+            dt = now - self._last_time
+            if self._last_error is not None:
+                derivative = (error - self._last_error) / dt
+            # Anti-windup: integrate heat above target only, bounded to full throttle
+            upper = 1.0 / self.ki if self.ki else 0.0
+            self._integral = min(max(self._integral + error * dt, 0.0), upper)
+        self._last_error = error
+        self._last_time = now
+
+        output = self.kp * error + self.ki * self._integral + self.kd * derivative
+        return min(max(1.0 - output, self.min_scale), 1.0)
+
+    def _read_power(self) -> Optional[float]:
+        try:
+            return self._power_probe.read_watts()
+        except ThermalProbeError:
+            return None
+
+
+class AdaptiveConcurrencyLimit:
+    """Blocking gate whose capacity follows ``limit()``, e.g. a controller.
+
+    Used as a context manager around inference calls from worker threads. A
+    lowered limit takes effect as in-flight calls finish; nothing is
+    interrupted.
+    """
+
+    def __init__(self, limit: Callable[[], int]) -> None:
+        self._limit = limit
+        self._active = 0
+        self._condition = threading.Condition()
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    def __enter__(self) -> "AdaptiveConcurrencyLimit":
+        with self._condition:
+            # A waiter always has an active call ahead of it that will notify
+            self._condition.wait_for(lambda: self._active < max(1, self._limit()))
+            self._active += 1
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+
+
+__all__ = [
+    "AdaptiveConcurrencyLimit",
+    "ExponentialSmoother",
+    "RaplPowerProbe",
+    "ThermalPowerController",
+    "ThrottleDecision",
+]
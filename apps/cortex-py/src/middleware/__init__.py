@@ -6,7 +6,10 @@ Provides rate limiting, throttling, and request middleware.
 
 from .rate_limiter import (
     RateLimiter,
+    RateLimitMiddleware,
+    RateLimitResult,
     TokenBucket,
+    client_key_from_scope,
     create_429_response,
     get_rate_limit_headers,
     get_retry_after_seconds,
@@ -14,7 +17,10 @@ from .rate_limiter import (
 
 __all__ = [
     "RateLimiter",
+    "RateLimitMiddleware",
+    "RateLimitResult",
     "TokenBucket",
+    "client_key_from_scope",
     "create_429_response",
     "get_rate_limit_headers",
     "get_retry_after_seconds",
@@ -1,7 +1,8 @@
 """
 Rate Limiter for Cortex-Py (Phase 7.3)
 
-Implements token bucket rate limiting for API endpoints.
+Implements token bucket rate limiting for API endpoints, with a bounded,
+lock-striped client table and ASGI middleware for early rejection.
 
 Following CODESTYLE.md:
 - snake_case naming
@@ -11,9 +12,21 @@ Following CODESTYLE.md:
 - brAInwav branding in error messages
 """
 
+import json
+import math
+import threading
 import time
-from collections import defaultdict
-from typing import Dict, Any
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, NamedTuple
+
+DEFAULT_MAX_CLIENTS = 100_000
+DEFAULT_SHARDS = 16
+# Idle entries expired from the front of a stripe per new client
+EXPIRE_BATCH = 8
+
+DEFAULT_LIMITED_PATHS = ("/embed", "/embeddings")
+
+ASGIApp = Callable[[Dict[str, Any], Any, Any], Awaitable[None]]
 
 
 class TokenBucket:
@@ -68,66 +81,183 @@ class TokenBucket:
         return True
 
 
+class RateLimitResult(NamedTuple):
+    """Outcome of a rate limit check for one client."""
+
+    allowed: bool
+    remaining: int
+    retry_after: float  # seconds until the request would be admitted
+    reset_after: float  # seconds until the bucket is full again
+
+
+class _Shard:
+    """
+    One stripe of the client table, guarded by its own lock.
+
+    Each client stores a single float: the monotonic time at which its
+    bucket will be full again. Tokens are derived from it on access (lazy
+    refill), and a client whose bucket is already full carries no state, so
+    idle entries can be dropped without changing any decision.
+    """
+
+    __slots__ = ("lock", "full_at", "capacity")
+
+    def __init__(self, capacity: int):
+        self.lock = threading.Lock()
+        self.full_at: OrderedDict[str, float] = OrderedDict()  # LRU first
+        self.capacity = capacity
+
+
 class RateLimiter:
     """
-    Rate limiter using token bucket algorithm.
-    
+    Per-client token bucket rate limiter with bounded memory.
+
+    Clients are spread over ``shards`` lock-striped tables holding at most
+    ``max_clients`` entries in total. Each new client expires a few refilled
+    buckets from the least recently used end of its stripe, so idle clients
+    drain away without timers or full scans; when a stripe is still full, the
+    least recently seen client is evicted and starts again with a full bucket.
+
     Following CODESTYLE.md: Per-client tracking
     """
 
-    def __init__(self, rate: int, per_seconds: int = 60):
+    def __init__(
+        self,
+        rate: int,
+        per_seconds: int = 60,
+        *,
+        burst: float | None = None,
+        max_clients: int = DEFAULT_MAX_CLIENTS,
+        shards: int = DEFAULT_SHARDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
         """
         Initialize rate limiter.
-        
+
         Args:
             rate: Number of requests allowed
             per_seconds: Time period in seconds
+            burst: Bucket capacity (defaults to ``rate``)
+            max_clients: Upper bound on tracked clients
+            shards: Number of lock stripes (rounded up to a power of two)
+            clock: Monotonic time source
         """
+        if rate <= 0 or per_seconds <= 0:
+            raise ValueError("brAInwav: rate and per_seconds must be positive")
         self.rate = rate
         self.per_seconds = per_seconds
         self.refill_rate = rate / per_seconds
-        
-        # Per-client buckets
-        self.buckets: Dict[str, TokenBucket] = defaultdict(
-            lambda: TokenBucket(rate, self.refill_rate)
-        )
+        self.capacity = float(burst if burst is not None else rate)
+        self._interval = 1.0 / self.refill_rate
+        self._window = self.capacity * self._interval
+        self.max_clients = max_clients
+        self.clock = clock
+
+        stripes = 1 << max(0, int(shards) - 1).bit_length()
+        per_shard = max(1, -(-max_clients // stripes))
+        self._mask = stripes - 1
+        self._shards = [_Shard(per_shard) for _ in range(stripes)]
+
+    def __len__(self) -> int:
+        return sum(len(shard.full_at) for shard in self._shards)
+
+    def check(self, client_id: str, cost: float = 1.0) -> RateLimitResult:
+        """
+        Try to consume ``cost`` tokens for ``client_id``.
+
+        Args:
+            client_id: Client identifier
+            cost: Tokens the request consumes
+
+        Returns:
+            Decision with remaining tokens and retry timing
+        """
+        allowed, owed = self._consume(client_id, cost)
+        if math.isinf(owed):
+            return RateLimitResult(False, 0, math.inf, 0.0)
+
+        remaining = int(self.capacity - owed / self._interval + 1e-9)
+        if allowed:
+            return RateLimitResult(True, remaining, 0.0, owed)
+        retry_after = owed + cost * self._interval - self._window
+        return RateLimitResult(False, remaining, retry_after, owed)
+
+    def _consume(self, client_id: str, cost: float) -> tuple[bool, float]:
+        """
+        Admit or refuse a request.
+
+        Returns:
+            (allowed, seconds of refill owed afterwards); owed is inf for
+            requests that can never pass
+
+        Following CODESTYLE.md: Guard clauses
+        """
+        # Guard: anonymous or oversized requests never pass
+        if not client_id or cost > self.capacity:
+            return False, math.inf
+
+        now = self.clock()
+        shard = self._shards[hash(client_id) & self._mask]
+        with shard.lock:
+            table = shard.full_at
+            full_at = table.get(client_id)
+            owed = 0.0 if full_at is None or full_at < now else full_at - now
+            debt = owed + cost * self._interval
+            if debt - self._window > 1e-9:
+                return False, owed
+
+            table[client_id] = now + debt
+            if full_at is not None:
+                table.move_to_end(client_id)
+            else:
+                # Only new entries grow the table, so only they drain it
+                self._expire(table, now)
+                if len(table) > shard.capacity:
+                    table.popitem(last=False)
+        return True, debt
+
+    @staticmethod
+    def _expire(table: "OrderedDict[str, float]", now: float) -> None:
+        for _ in range(EXPIRE_BATCH):
+            oldest = next(iter(table), None)
+            if oldest is None or table[oldest] > now:
+                return
+            del table[oldest]
 
     def allow_request(self, client_id: str) -> bool:
         """
         Check if request is allowed.
-        
+
         Args:
             client_id: Client identifier
-        
+
         Returns:
             True if allowed
-        
+
         Following CODESTYLE.md: Guard clauses
         """
-        # Guard: validate client_id
-        if not client_id:
-            return False
-
-        bucket = self.buckets[client_id]
-        return bucket.consume(1.0)
+        return self._consume(client_id, 1.0)[0]
 
     def get_remaining(self, client_id: str) -> int:
         """
         Get remaining requests for client.
-        
+
         Args:
             client_id: Client identifier
-        
+
         Returns:
             Remaining requests
-        
+
         Following CODESTYLE.md: Simple accessor
         """
-        bucket = self.buckets.get(client_id)
-        if bucket is None:
-            return self.rate
-        
-        return int(bucket.tokens)
+        shard = self._shards[hash(client_id) & self._mask]
+        with shard.lock:
+            full_at = shard.full_at.get(client_id)
+        if full_at is None:
+            return int(self.capacity)
+
+        owed = max(0.0, full_at - self.clock()) * self.refill_rate
+        return int(self.capacity - owed + 1e-9)
 
 
 def create_429_response(
@@ -201,3 +331,100 @@ def get_retry_after_seconds(reset_time: float) -> int:
     
     # Guard: minimum 0 seconds
     return max(0, seconds)
+
+
+def client_key_from_scope(scope: Dict[str, Any]) -> str:
+    """
+    Rate limit key for an ASGI connection: the client address.
+
+    Args:
+        scope: ASGI connection scope
+
+    Returns:
+        Client host, or "unknown" when the server does not report one
+    """
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware enforcing per-client limits on selected paths.
+
+    Over-limit requests are answered with 429 before the body is read or the
+    route runs; admitted responses carry ``X-RateLimit-*`` headers.
+
+    Following CODESTYLE.md: Guard clauses
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: RateLimiter,
+        paths: Iterable[str] = DEFAULT_LIMITED_PATHS,
+        key_func: Callable[[Dict[str, Any]], str] = client_key_from_scope,
+    ):
+        """
+        Initialize middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            limiter: Per-client rate limiter
+            paths: Exact request paths to limit
+            key_func: Maps an ASGI scope to a client identifier
+        """
+        self.app = app
+        self.limiter = limiter
+        self.paths = frozenset(paths)
+        self.key_func = key_func
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        # Guard: only HTTP requests to limited paths are checked
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        result = self.limiter.check(self.key_func(scope))
+        headers = [
+            (name.lower().encode(), value.encode())
+            for name, value in get_rate_limit_headers(
+                self.limiter.rate,
+                result.remaining,
+                int(time.time() + result.reset_after),
+            ).items()
+        ]
+        if not result.allowed:
+            await self._reject(scope["path"], result, headers, send)
+            return
+
+        async def send_with_headers(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), *headers]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    async def _reject(
+        self,
+        path: str,
+        result: RateLimitResult,
+        headers: list[tuple[bytes, bytes]],
+        send: Any,
+    ) -> None:
+        retry_after = math.ceil(min(result.retry_after, self.limiter.per_seconds))
+        body = json.dumps(
+            create_429_response(retry_after, self.limiter.rate, path)
+        ).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(retry_after).encode()),
+                    *headers,
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from middleware.rate_limiter import RateLimiter, RateLimitMiddleware
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_bucket_refills_lazily_on_access() -> None:
+    clock = _Clock()
+    limiter = RateLimiter(10, 60, clock=clock)
+
+    assert all(limiter.allow_request("a") for _ in range(10))
+    denied = limiter.check("a")
+    assert not denied.allowed
+    assert denied.retry_after == pytest.approx(6.0)
+    assert limiter.get_remaining("a") == 0
+
+    clock.now += 12.0  # two tokens' worth
+    assert limiter.get_remaining("a") == 2
+    assert limiter.check("a").remaining == 1
+    assert limiter.allow_request("a")
+    assert not limiter.allow_request("a")
+    assert not limiter.allow_request("")
+
+
+def test_table_is_bounded_and_idle_buckets_expire() -> None:
+    clock = _Clock()
+    limiter = RateLimiter(60, 60, max_clients=1024, shards=4, clock=clock)
+
+    for i in range(10_000):
+        limiter.allow_request(f"client-{i}")
+    assert len(limiter) == 1024
+
+    clock.now += 120.0  # every bucket has refilled
+    for i in range(400):
+        limiter.allow_request(f"late-{i}")
+    # Accesses drained the idle entries; only the new clients remain
+    assert len(limiter) == 400
+    assert all(limiter.get_remaining(f"client-{i}") == 60 for i in range(10_000))
+
+
+def test_concurrent_clients_never_exceed_their_budget() -> None:
+    limiter = RateLimiter(100, 3600, shards=8)
+    admitted: dict[str, int] = {}
+    lock = threading.Lock()
+
+    def worker(offset: int) -> None:
+        counts: dict[str, int] = {}
+        for i in range(2_000):
+            client = f"c{(i + offset) % 20}"
+            counts[client] = counts.get(client, 0) + limiter.allow_request(client)
+        with lock:
+            for client, count in counts.items():
+                admitted[client] = admitted.get(client, 0) + count
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Refill during the run is at most a token or two per client
+    assert all(100 <= count <= 102 for count in admitted.values())
+
+
+def _app(limiter: RateLimiter) -> tuple[FastAPI, list[str]]:
+    app = FastAPI()
+    handled: list[str] = []
+
+    @app.post("/embed")
+    def embed(body: dict) -> dict:
+        handled.append("embed")
+        return {"embedding": [0.0]}
+
+    @app.get("/health")
+    def health() -> dict:
+        return {"status": "ok"}
+
+    app.add_middleware(RateLimitMiddleware, limiter=limiter)
+    return app, handled
+
+
+def test_middleware_rejects_before_the_route_runs() -> None:
+    app, handled = _app(RateLimiter(2, 60))
+    client = TestClient(app)
+
+    ok = client.post("/embed", json={"text": "hi"})
+    assert ok.status_code == 200
+    assert ok.headers["X-RateLimit-Limit"] == "2"
+    assert ok.headers["X-RateLimit-Remaining"] == "1"
+    client.post("/embed", json={"text": "hi"})
+
+    rejected = client.post("/embed", json={"text": "hi"})
+    assert rejected.status_code == 429
+    assert rejected.headers["Retry-After"] == "30"
+    assert rejected.json()["error"]["code"] == "rate_limit_exceeded"
+    assert handled == ["embed", "embed"]
+    # Other paths are not limited
+    assert all(client.get("/health").status_code == 200 for _ in range(5))
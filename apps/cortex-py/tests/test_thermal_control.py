@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from cortex_py.services import EmbeddingService
+from cortex_py.thermal import LinuxSysfsProbe, ThermalMonitor, ThermalProbeError
+from cortex_py.thermal_control import (
+    ExponentialSmoother,
+    RaplPowerProbe,
+    ThermalPowerController,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _FakeSysfs:
+    """Minimal /sys/class/thermal and /sys/class/powercap tree."""
+
+    def __init__(self, root: Path) -> None:
+        self.thermal = root / "thermal"
+        self.powercap = root / "powercap"
+        zone = self.thermal / "thermal_zone0"
+        zone.mkdir(parents=True)
+        (zone / "type").write_text("x86_pkg_temp\n")
+        (zone / "trip_point_0_temp").write_text("80000\n")
+        (zone / "trip_point_1_temp").write_text("100000\n")
+        self.set_temperature(50.0)
+
+        for name, energy in (("intel-rapl:0", 0), ("intel-rapl:0:0", 0)):
+            domain = self.powercap / name
+            domain.mkdir(parents=True)
+            (domain / "max_energy_range_uj").write_text("1000000000\n")
+            (domain / "energy_uj").write_text(f"{energy}\n")
+
+    def set_temperature(self, celsius: float) -> None:
+        (self.thermal / "thermal_zone0" / "temp").write_text(f"{int(celsius * 1000)}\n")
+
+    def set_energy_uj(self, value: int, domain: str = "intel-rapl:0") -> None:
+        (self.powercap / domain / "energy_uj").write_text(f"{value}\n")
+
+
+@pytest.fixture
+def sysfs(tmp_path: Path) -> _FakeSysfs:
+    return _FakeSysfs(tmp_path)
+
+
+def _controller(sysfs: _FakeSysfs, clock: _Clock, **kwargs) -> ThermalPowerController:
+    return ThermalPowerController(
+        max_batch_size=32,
+        max_concurrency=8,
+        monitor=ThermalMonitor(probes=[LinuxSysfsProbe(sysfs.thermal)]),
+        power_probe=RaplPowerProbe(sysfs.powercap, clock=clock),
+        clock=clock,
+        **kwargs,
+    )
+
+
+def test_rapl_probe_reports_package_power_and_handles_wrap(sysfs: _FakeSysfs) -> None:
+    clock = _Clock()
+    probe = RaplPowerProbe(sysfs.powercap, clock=clock)
+    sysfs.set_energy_uj(999_000_000)
+    assert probe.read_watts() is None
+
+    clock.now = 2.0
+    # Wrapped past max_energy_range_uj; subzone intel-rapl:0:0 must not be added
+    sysfs.set_energy_uj(59_000_000)
+    sysfs.set_energy_uj(10_000_000, domain="intel-rapl:0:0")
+    assert probe.read_watts() == pytest.approx(30.0)
+
+
+def test_rapl_probe_without_counters_raises(tmp_path: Path) -> None:
+    probe = RaplPowerProbe(tmp_path / "missing")
+    assert not probe.available()
+    with pytest.raises(ThermalProbeError):
+        probe.read_watts()
+
+
+def test_exponential_smoother() -> None:
+    smoother = ExponentialSmoother(0.5)
+    assert smoother.update(10.0) == 10.0
+    assert smoother.update(20.0) == 15.0
+    with pytest.raises(ValueError):
+        ExponentialSmoother(0.0)
+
+
+def test_controller_runs_at_full_load_when_cool(sysfs: _FakeSysfs) -> None:
+    clock = _Clock()
+    controller = _controller(sysfs, clock)
+
+    decision = controller.step()
+
+    assert decision.target_c == pytest.approx(75.0)  # warning trip minus margin
+    assert (decision.batch_size, decision.concurrency) == (32, 8)
+    assert decision.status == "nominal"
+
+
+def test_controller_backs_off_while_heating_and_recovers(sysfs: _FakeSysfs) -> None:
+    clock = _Clock()
+    controller = _controller(sysfs, clock, smoothing=1.0)
+    sysfs.set_temperature(66.0)
+    controller.step()
+
+    batch_sizes = []
+    for temperature in (68.0, 70.0, 72.0, 74.0, 76.0, 78.0):
+        clock.now += 1.0
+        sysfs.set_temperature(temperature)
+        batch_sizes.append(controller.step().batch_size)
+
+    # Monotone back-off that starts before the 75°C target is crossed
+    assert batch_sizes == sorted(batch_sizes, reverse=True)
+    assert batch_sizes[3] < 32
+    assert batch_sizes[-1] < 24
+    assert controller.concurrency < 8
+
+    for _ in range(60):
+        clock.now += 1.0
+        sysfs.set_temperature(60.0)
+        controller.step()
+    assert (controller.batch_size, controller.concurrency) == (32, 8)
+
+
+def test_controller_clamps_to_minimum_when_critical(sysfs: _FakeSysfs) -> None:
+    clock = _Clock()
+    controller = _controller(sysfs, clock, min_scale=0.25)
+    sysfs.set_temperature(101.0)
+
+    decision = controller.step()
+
+    assert decision.status == "critical"
+    assert (decision.batch_size, decision.concurrency) == (8, 2)
+
+
+def test_controller_respects_power_budget(sysfs: _FakeSysfs) -> None:
+    clock = _Clock()
+    controller = _controller(sysfs, clock, power_budget_w=20.0, smoothing=1.0)
+    controller.step()
+
+    clock.now = 1.0
+    sysfs.set_energy_uj(30_000_000)  # 30 W against a 20 W budget
+    decision = controller.step()
+
+    assert decision.power_w == pytest.approx(30.0)
+    assert decision.batch_size < 32
+
+
+def test_controller_holds_limits_without_sensor_data(tmp_path: Path) -> None:
+    clock = _Clock()
+    controller = ThermalPowerController(
+        max_batch_size=16,
+        max_concurrency=4,
+        monitor=ThermalMonitor(probes=[LinuxSysfsProbe(tmp_path / "none")]),
+        power_probe=RaplPowerProbe(tmp_path / "none", clock=clock),
+        clock=clock,
+    )
+
+    decision = controller.step()
+
+    assert decision.status == "unknown"
+    assert (decision.batch_size, decision.concurrency) == (16, 4)
+
+
+class _RecordingGenerator:
+    def __init__(self) -> None:
+        self.batches: list[int] = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def generate_embeddings(self, texts, normalize=True):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.batches.append(len(texts))
+        time.sleep(0.01)
+        with self._lock:
+            self.active -= 1
+        return [[float(len(text))] for text in texts]
+
+    def get_model_info(self) -> dict:
+        return {"model_name": "recording", "dimensions": 1}
+
+
+def test_embedding_service_follows_controller_limits(sysfs: _FakeSysfs) -> None:
+    clock = _Clock()
+    controller = _controller(sysfs, clock, min_scale=0.25)
+    sysfs.set_temperature(101.0)
+    controller.step()  # critical: batch 8, concurrency 2
+    generator = _RecordingGenerator()
+    service = EmbeddingService(generator, rate_limit_per_minute=0, throttle=controller)
+
+    result = service.generate_batch([f"text {i}" for i in range(20)])
+    assert result.embeddings == [[float(len(f"text {i}"))] for i in range(20)]
+    assert generator.batches == [8, 8, 4]
+
+    threads = [
+        threading.Thread(target=service.generate_batch, args=([f"other {i}"],))
+        for i in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert generator.peak <= 2
+
+
+def test_update_accepts_external_readings() -> None:
+    clock = _Clock()
+    controller = ThermalPowerController(
+        max_batch_size=32, max_concurrency=8, smoothing=1.0, clock=clock
+    )
+
+    assert controller.update(60.0, None, warning_c=85.0, critical_c=95.0).scale == 1.0
+    clock.now += 1.0
+    hot = controller.update(88.0, None, warning_c=85.0, critical_c=95.0)
+
+    assert hot.target_c == pytest.approx(80.0)
+    assert 0.1 <= hot.scale < 1.0
+    assert controller.scaled(10) == max(1, round(10 * hot.scale))
@@ -10,10 +10,10 @@ ai_generated_by: automated-tooling
 ai_provenance_hash: combined-gpl-service-features
 """
 
+import asyncio
 import logging
 import os
 import re
-import subprocess
 import tempfile
 from pathlib import Path
 from typing import Any, Sequence
@@ -22,6 +22,16 @@ import uvicorn
 from fastapi import FastAPI, File, Form, HTTPException, UploadFile
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field, validator
+from tool_pool import (
+    PoolSaturatedError,
+    RenderCache,
+    ToolExecutionPool,
+    ToolResult,
+    ToolTimeoutError,
+    hash_image_bytes,
+    hash_image_file,
+    render_cache_key,
+)
 
 # Input validation helpers
 ALLOWED_TOOLS = {
@@ -73,6 +83,18 @@ SAFE_IMAGE_DIR = Path(safe_image_dir_env).resolve()
 # Ensure the safe directory exists
 SAFE_IMAGE_DIR.mkdir(parents=True, exist_ok=True)
 
+# Subprocess pool and render cache; tool runs never block the event loop
+TOOL_POOL = ToolExecutionPool(
+    max_concurrency=int(os.environ.get("GPL_TOOLS_MAX_CONCURRENCY", os.cpu_count() or 4)),
+    max_queue=int(os.environ.get("GPL_TOOLS_MAX_QUEUE", "64")),
+    timeout=float(os.environ.get("GPL_TOOLS_TIMEOUT", "30")),
+)
+RENDER_CACHE = RenderCache(
+    max_entries=int(os.environ.get("GPL_TOOLS_CACHE_MAX_ENTRIES", "1024")),
+    max_bytes=int(os.environ.get("GPL_TOOLS_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+)
+HEALTH_CHECK_TIMEOUT = 5.0
+
 app = FastAPI(
     title="GPL Terminal Tools API",
     version="1.0.0",
@@ -119,54 +141,51 @@ def validate_image_path(image_path: str) -> Path:
         raise HTTPException(status_code=400, detail=f"Invalid image path: {e}") from e
 
 
-def execute_tool(
+def build_tool_command(tool: str, image_path: Path, options: dict[str, Any]) -> list[str]:
+    """Build the argument vector for a GPL tool invocation."""
+    if tool == "viu":
+        return [
+            "viu",
+            "--transparent",
+            "--width",
+            str(options.get("width", 80)),
+            str(image_path),
+        ]
+    if tool == "chafa":
+        return [
+            "chafa",
+            "--format",
+            options.get("format", "symbols"),
+            "--size",
+            f"{options.get('width', 80)}x{options.get('height', 24)}",
+            str(image_path),
+        ]
+    if tool == "timg":
+        return [
+            "timg",
+            "-g",
+            f"{options.get('width', 80)}x{options.get('height', 24)}",
+            str(image_path),
+        ]
+    raise HTTPException(status_code=400, detail=f"Unsupported tool: {tool}")
+
+
+async def execute_tool(
     tool: str, image_path: Path, options: dict[str, Any]
-) -> subprocess.CompletedProcess:
-    """Execute GPL tool with proper security and error handling"""
+) -> ToolResult:
+    """Execute GPL tool on the subprocess pool with proper security and error handling"""
 
     try:
-        if tool == "viu":
-            cmd = [
-                "viu",
-                "--transparent",
-                "--width",
-                str(options.get("width", 80)),
-                str(image_path),
-            ]
-
-        elif tool == "chafa":
-            cmd = [
-                "chafa",
-                "--format",
-                options.get("format", "symbols"),
-                "--size",
-                f"{options.get('width', 80)}x{options.get('height', 24)}",
-                str(image_path),
-            ]
-
-        elif tool == "timg":
-            cmd = [
-                "timg",
-                "-g",
-                f"{options.get('width', 80)}x{options.get('height', 24)}",
-                str(image_path),
-            ]
-        else:
-            raise HTTPException(status_code=400, detail=f"Unsupported tool: {tool}")
-
+        cmd = _sanitize_command(build_tool_command(tool, image_path, options))
         logger.info(f"Executing command: {' '.join(cmd)}")
-
-        result = _run_allowlisted_command(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=30,
-            cwd=SAFE_IMAGE_DIR,  # Run in safe directory
-        )
-
-        return result
-
-    except subprocess.TimeoutExpired as e:
+        # Run in safe directory
+        return await TOOL_POOL.run(cmd, cwd=SAFE_IMAGE_DIR)
+
+    except HTTPException:
+        raise
+    except PoolSaturatedError as e:
+        raise HTTPException(status_code=503, detail="Tool queue is full, retry later") from e
+    except ToolTimeoutError as e:
         raise HTTPException(status_code=408, detail="Tool execution timeout") from e
     except FileNotFoundError as e:
         raise HTTPException(
@@ -177,6 +196,16 @@ def execute_tool(
         raise HTTPException(status_code=500, detail=f"Processing error: {e!s}") from e
 
 
+async def render_cached(
+    tool: str, image_path: Path, image_digest: str, options: dict[str, Any]
+) -> tuple[ToolResult, bool]:
+    """Serve a render from the content-addressed cache, executing the tool on a miss."""
+    key = render_cache_key(image_digest, tool, options)
+    return await RENDER_CACHE.get_or_render(
+        key, lambda: execute_tool(tool, image_path, options)
+    )
+
+
 @app.post("/visualize")
 async def visualize_image(request: VisualizationRequest):
     """Process image with specified GPL tool"""
@@ -185,8 +214,11 @@ async def visualize_image(request: VisualizationRequest):
     # Validate and resolve image path
     resolved_image_path = validate_image_path(request.image_path)
 
-    # Execute tool
-    result = execute_tool(request.tool, resolved_image_path, request.options)
+    # Execute tool (or serve an identical earlier render)
+    image_digest = await asyncio.to_thread(hash_image_file, resolved_image_path)
+    result, cached = await render_cached(
+        request.tool, resolved_image_path, image_digest, request.options
+    )
 
     if result.returncode != 0:
         logger.error(f"Tool execution failed: {result.stderr}")
@@ -199,6 +231,7 @@ async def visualize_image(request: VisualizationRequest):
         "output": result.stdout,
         "tool": request.tool,
         "options": request.options,
+        "cached": cached,
         "success": True,
     }
 
@@ -223,22 +256,25 @@ async def upload_and_visualize(
         raise HTTPException(status_code=400, detail="File must be an image")
 
     try:
-        # Create temporary file in safe directory
-        with tempfile.NamedTemporaryFile(
-            delete=False,
-            suffix=Path(file.filename or "image").suffix,
-            dir=SAFE_IMAGE_DIR,
-        ) as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_path = Path(temp_file.name)
-
-        # Process image
+        content = await file.read()
         options = {"width": width, "height": height, "format": format}
-        result = execute_tool(tool, temp_path, options)
-
-        # Clean up
-        temp_path.unlink()
+        key = render_cache_key(hash_image_bytes(content), tool, options)
+
+        async def render() -> ToolResult:
+            # Create temporary file in safe directory only when the tool must run
+            with tempfile.NamedTemporaryFile(
+                delete=False,
+                suffix=Path(file.filename or "image").suffix,
+                dir=SAFE_IMAGE_DIR,
+            ) as temp_file:
+                temp_file.write(content)
+                temp_path = Path(temp_file.name)
+            try:
+                return await execute_tool(tool, temp_path, options)
+            finally:
+                temp_path.unlink(missing_ok=True)
+
+        result, cached = await RENDER_CACHE.get_or_render(key, render)
 
         if result.returncode != 0:
             raise HTTPException(
@@ -250,13 +286,13 @@ async def upload_and_visualize(
             "tool": tool,
             "filename": file.filename,
             "options": options,
+            "cached": cached,
             "success": True,
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
-        # Clean up on error
-        if "temp_path" in locals() and temp_path.exists():
-            temp_path.unlink()
         logger.error(f"Upload processing error: {e}")
         raise HTTPException(status_code=500, detail=f"Processing error: {e!s}") from e
 
@@ -265,21 +301,24 @@ async def upload_and_visualize(
 async def health_check():
     """Health check endpoint - verify tool availability and service status"""
     tools = ["viu", "chafa", "timg"]
-    available_tools = []
-    tool_versions = {}
 
-    for tool in tools:
+    async def probe(tool: str) -> ToolResult | None:
+        # Run tool with --version on the pool so the event loop never blocks
         try:
-            # Try to run tool with --version to check availability
-        result = _run_allowlisted_command(
-            [tool, "--version"], capture_output=True, text=True, timeout=5
-        )
-            if result.returncode == 0:
-                available_tools.append(tool)
-                tool_versions[tool] = result.stdout.strip()
-        except (FileNotFoundError, subprocess.TimeoutExpired):
+            return await TOOL_POOL.run(
+                _sanitize_command([tool, "--version"]), timeout=HEALTH_CHECK_TIMEOUT
+            )
+        except (FileNotFoundError, ToolTimeoutError, PoolSaturatedError):
             logger.warning(f"Tool '{tool}' not available")
-            continue
+            return None
+
+    results = await asyncio.gather(*(probe(tool) for tool in tools))
+    available_tools = []
+    tool_versions = {}
+    for tool, result in zip(tools, results, strict=True):
+        if result is not None and result.returncode == 0:
+            available_tools.append(tool)
+            tool_versions[tool] = result.stdout.strip()
 
     status = "healthy" if available_tools else "unhealthy"
 
@@ -300,6 +339,12 @@ async def health_check():
     return health_info
 
 
+@app.get("/metrics")
+async def metrics():
+    """Subprocess pool queueing metrics and render cache statistics"""
+    return {"pool": TOOL_POOL.stats(), "render_cache": RENDER_CACHE.stats()}
+
+
 @app.get("/tools")
 async def list_tools():
     """List available GPL tools and their capabilities"""
@@ -339,7 +384,13 @@ async def root():
         "version": "1.0.0",
         "description": "Isolated GPL-licensed terminal visualization tools",
         "license_compliance": "GPL tools isolated via HTTP API boundary",
-        "endpoints": ["/visualize", "/upload-and-visualize", "/health", "/tools"],
+        "endpoints": [
+            "/visualize",
+            "/upload-and-visualize",
+            "/health",
+            "/metrics",
+            "/tools",
+        ],
         "documentation": "/docs",
     }
 
@@ -352,8 +403,8 @@ if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8765, log_level="info", access_log=True)
 
 # © 2025 brAInwav LLC — every line reduces barriers, enhances security, and supports resilient AI engineering.
-def _run_allowlisted_command(cmd: Sequence[str], **kwargs) -> subprocess.CompletedProcess:
-    """Execute a predefined command after validating each argument."""
+def _sanitize_command(cmd: Sequence[str]) -> list[str]:
+    """Validate each argument of a predefined command."""
 
     if not cmd:
         raise HTTPException(status_code=500, detail="Empty command is not allowed")
@@ -365,10 +416,4 @@ def _run_allowlisted_command(cmd: Sequence[str], **kwargs) -> subprocess.Complet
         if any(token in part for token in ("|", "&", ";", "$", "`")):
             raise HTTPException(status_code=400, detail="Unsafe token in command part")
         sanitized.append(part)
-
-    # nosemgrep: semgrep.owasp-top-10-2021-a03-injection-command - command arguments validated against allowlist
-    return subprocess.run(
-        sanitized,
-        shell=False,
-        **kwargs,
-    )
+    return sanitized
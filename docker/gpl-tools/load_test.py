@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+file_path: docker/gpl-tools/load_test.py
+description: Load test for the GPL tools subprocess pool and render cache using stand-in tool binaries
+maintainer: @jamiescottcraik
+last_updated: 2026-10-18
+version: 1.0.0
+status: active
+
+Usage: python load_test.py [--requests 64] [--concurrency 4] [--tool-delay 0.2]
+
+Stand-in ``viu``/``chafa``/``timg`` scripts that sleep and echo are placed on a
+temporary directory, so no GPL binaries are needed. The test reports event-loop
+heartbeat lag while renders run (a blocking executor would show lag close to the
+tool delay), pool queueing metrics and cold vs. cached render throughput.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import stat
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from tool_pool import (
+    PoolSaturatedError,
+    RenderCache,
+    ToolExecutionPool,
+    hash_image_bytes,
+    render_cache_key,
+)
+
+STAND_IN_TOOL = """#!/bin/sh
+sleep {delay}
+echo "rendered $*"
+"""
+
+
+def install_stand_in_tools(bin_dir: Path, delay: float) -> None:
+    for tool in ("viu", "chafa", "timg"):
+        path = bin_dir / tool
+        path.write_text(STAND_IN_TOOL.format(delay=delay))
+        path.chmod(path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+
+async def heartbeat(stop: asyncio.Event, interval: float, lags: list[float]) -> None:
+    """Measure how late the event loop wakes up while work is in flight."""
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def run_phase(
+    pool: ToolExecutionPool,
+    cache: RenderCache,
+    bin_dir: Path,
+    images: list[bytes],
+    requests: int,
+) -> dict:
+    async def one(i: int) -> bool:
+        content = images[i % len(images)]
+        options = {"width": 80, "height": 24, "format": "symbols"}
+        key = render_cache_key(hash_image_bytes(content), "chafa", options)
+        cmd = [str(bin_dir / "chafa"), "--size", "80x24", f"image-{i % len(images)}.png"]
+        try:
+            _, cached = await cache.get_or_render(key, lambda: pool.run(cmd))
+        except PoolSaturatedError:
+            return False
+        return cached
+
+    stop = asyncio.Event()
+    lags: list[float] = []
+    beat = asyncio.create_task(heartbeat(stop, 0.01, lags))
+    started = time.perf_counter()
+    results = await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await beat
+    return {
+        "requests": requests,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 1) if elapsed else None,
+        "served_from_cache": sum(results),
+        "max_loop_lag_ms": round(max(lags, default=0.0) * 1000, 2),
+    }
+
+
+async def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--queue", type=int, default=256)
+    parser.add_argument("--images", type=int, default=8)
+    parser.add_argument("--tool-delay", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bin_dir = Path(tmp)
+        install_stand_in_tools(bin_dir, args.tool_delay)
+        pool = ToolExecutionPool(max_concurrency=args.concurrency, max_queue=args.queue)
+        cache = RenderCache()
+        images = [os.urandom(4096) for _ in range(args.images)]
+
+        cold = await run_phase(pool, cache, bin_dir, images, args.requests)
+        warm = await run_phase(pool, cache, bin_dir, images, args.requests)
+
+        report = {
+            "cold": cold,
+            "warm": warm,
+            "pool": pool.stats(),
+            "render_cache": cache.stats(),
+        }
+        print(json.dumps(report, indent=2))
+
+        # A blocking executor would stall the loop for roughly one tool delay
+        if cold["max_loop_lag_ms"] > args.tool_delay * 1000 / 2:
+            print("FAIL: event loop was blocked during tool execution", file=sys.stderr)
+            return 1
+        if warm["served_from_cache"] != args.requests:
+            print("FAIL: repeated renders were not served from cache", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1:])))
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+file_path: docker/gpl-tools/tool_pool.py
+description: Asyncio subprocess pool and content-addressed render cache for GPL tools
+maintainer: @jamiescottcraik
+last_updated: 2026-10-18
+version: 1.0.0
+status: active
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Sequence
+
+
+@dataclass(frozen=True)
+class ToolResult:
+    """Outcome of a tool invocation (mirrors ``subprocess.CompletedProcess``)."""
+
+    args: tuple[str, ...]
+    returncode: int
+    stdout: str
+    stderr: str
+
+
+class PoolSaturatedError(RuntimeError):
+    """Raised when the pool queue is full and a new job cannot be admitted."""
+
+
+class ToolTimeoutError(RuntimeError):
+    """Raised when a tool does not finish within the configured timeout."""
+
+
+class ToolExecutionPool:
+    """Run tool subprocesses without blocking the event loop.
+
+    At most ``max_concurrency`` processes run at once; up to ``max_queue``
+    further jobs wait for a slot and anything beyond that is rejected so a
+    burst cannot pile up unbounded work.
+    """
+
+    def __init__(self, max_concurrency: int = 4, max_queue: int = 64, timeout: float = 30.0):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.total_queue_wait = 0.0
+        self.max_queue_wait = 0.0
+        self.total_run_time = 0.0
+
+    async def run(
+        self, cmd: Sequence[str], cwd: Path | None = None, timeout: float | None = None
+    ) -> ToolResult:
+        """Execute ``cmd`` once a slot is free and capture its text output.
+
+        ``timeout`` overrides the pool-wide limit for this call.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        if self.queued >= self.max_queue:
+            self.rejected += 1
+            raise PoolSaturatedError(
+                f"Tool queue full ({self.queued} waiting, {self.running} running)"
+            )
+
+        enqueued_at = time.perf_counter()
+        self.queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+        waited = time.perf_counter() - enqueued_at
+        self.total_queue_wait += waited
+        self.max_queue_wait = max(self.max_queue_wait, waited)
+
+        self.running += 1
+        started_at = time.perf_counter()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                cwd=cwd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(), timeout=timeout
+                )
+            except asyncio.TimeoutError as e:
+                await _kill(process)
+                self.timeouts += 1
+                raise ToolTimeoutError(f"{cmd[0]} exceeded {timeout}s") from e
+            except BaseException:
+                # A cancelled caller frees its slot, so the tool must not outlive it
+                await _kill(process)
+                raise
+            result = ToolResult(
+                args=tuple(cmd),
+                returncode=process.returncode or 0,
+                stdout=stdout.decode("utf-8", errors="replace"),
+                stderr=stderr.decode("utf-8", errors="replace"),
+            )
+            if result.returncode == 0:
+                self.completed += 1
+            else:
+                self.failed += 1
+            return result
+        except ToolTimeoutError:
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.running -= 1
+            self.total_run_time += time.perf_counter() - started_at
+            self._slots.release()
+
+    def stats(self) -> dict[str, Any]:
+        finished = self.completed + self.failed + self.timeouts
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "queued": self.queued,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "avg_queue_wait_s": self.total_queue_wait / finished if finished else 0.0,
+            "max_queue_wait_s": self.max_queue_wait,
+            "avg_run_time_s": self.total_run_time / finished if finished else 0.0,
+        }
+
+
+async def _kill(process: asyncio.subprocess.Process) -> None:
+    if process.returncode is None:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+    await process.wait()
+
+
+def render_cache_key(image_digest: str, tool: str, options: dict[str, Any]) -> str:
+    """Content address for a render: image hash + tool + canonical options."""
+    canonical = json.dumps(options, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{image_digest}\0{tool}\0{canonical}".encode()).hexdigest()
+
+
+def hash_image_bytes(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def hash_image_file(path: Path) -> str:
+    with path.open("rb") as fh:
+        return hashlib.file_digest(fh, "sha256").hexdigest()
+
+
+class _RenderAbandoned(Exception):
+    """The coalesced render was cancelled before it produced a result."""
+
+
+class RenderCache:
+    """Byte- and entry-bounded LRU of successful renders.
+
+    Identical renders that are already in flight are coalesced so only one
+    subprocess runs per key.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, ToolResult] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self._inflight: dict[str, asyncio.Future[ToolResult]] = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> ToolResult | None:
+        result = self._entries.get(key)
+        if result is None:
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def put(self, key: str, result: ToolResult) -> None:
+        size = len(result.stdout) + len(result.stderr)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self.bytes -= self._sizes.pop(key)
+            del self._entries[key]
+        self._entries[key] = result
+        self._sizes[key] = size
+        self.bytes += size
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            old_key, _ = self._entries.popitem(last=False)
+            self.bytes -= self._sizes.pop(old_key)
+            self.evictions += 1
+
+    async def get_or_render(self, key: str, render) -> tuple[ToolResult, bool]:
+        """Return ``(result, cached)``; ``render`` is an async callable.
+
+        If the caller whose render is being shared is cancelled, the callers
+        waiting on it start over instead of being cancelled with it.
+        """
+        while True:
+            cached = self.get(key)
+            if cached is not None:
+                self.hits += 1
+                return cached, True
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(pending), True
+            except _RenderAbandoned:
+                self.coalesced -= 1
+
+        self.misses += 1
+        future: asyncio.Future[ToolResult] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await render()
+        except asyncio.CancelledError:
+            future.set_exception(_RenderAbandoned(key))
+            future.exception()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so waiter-less failures are not logged as unhandled
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        if result.returncode == 0:
+            self.put(key, result)
+        future.set_result(result)
+        return result, False
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
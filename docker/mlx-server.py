@@ -10,11 +10,9 @@ import os
 from datetime import datetime
 from typing import Any
 
-# Remove conflicting imports - using local classes instead
-# import memory_manager
-# import model_manager
 import uvicorn
 from fastapi import BackgroundTasks, FastAPI, HTTPException
+from production_model_manager import MLXModelManager
 from pydantic import BaseModel
 
 # Configure logging
@@ -24,10 +22,15 @@ logger = logging.getLogger(__name__)
 app = FastAPI()
 
 
-# Mock managers for development when MLX is not available
+# Fixed memory budget for development when psutil-based tracking is unavailable
 class MemoryManager:
+    def __init__(self, budget_mb: int = int(os.getenv("MLX_MEMORY_LIMIT", "28672"))):
+        self.budget_mb = budget_mb
+        self.model_memory: dict[str, int] = {}
+
     def get_memory_stats(self):
-        return {"available": 8000, "used": 2000}
+        used = sum(self.model_memory.values())
+        return {"available": self.budget_mb - used, "used": used}
 
     def can_load_model(self, model):
         return True
@@ -36,38 +39,21 @@ class MemoryManager:
         return {"strategy": "mock"}
 
     def get_available_memory(self):
-        return 8000
-
-
-class ModelManager:
-    def __init__(self):
-        self.total_inferences = 0
-
-    def is_model_loaded(self, model):
-        return False
-
-    async def load_model(self, model):
-        return True
-
-    async def generate(self, **kwargs):
-        return {"text": "Mock response", "tokens": 10}
+        return self.budget_mb - sum(self.model_memory.values())
 
-    async def unload_model(self, model):
-        return True
-
-    def get_performance_metrics(self):
-        return {"requests": self.total_inferences}
+    def can_load_model_size(self, required_mb):
+        return required_mb <= self.get_available_memory()
 
-    def get_uptime(self):
-        return 3600
+    def register_model_memory(self, model_name, memory_mb):
+        self.model_memory[model_name] = memory_mb
 
-    async def execute_model_swap(self, strategy):
-        return True
+    def free_model_memory(self, model_name, memory_mb):
+        self.model_memory.pop(model_name, None)
 
 
-# Initialize managers
+# Initialize managers; /metrics reports the manager's own per-model statistics
 memory_manager = MemoryManager()
-model_manager = ModelManager()
+model_manager = MLXModelManager(memory_manager)
 
 
 class InferenceRequest(BaseModel):
@@ -99,6 +85,17 @@ class InferenceResponse(BaseModel):
     memory_usage: dict[str, Any]
 
 
+@app.on_event("startup")
+async def start_preloader():
+    """Warm the predicted next model in the background while serving"""
+    model_manager.start_preloader()
+
+
+@app.on_event("shutdown")
+async def stop_preloader():
+    await model_manager.stop_preloader()
+
+
 @app.post("/infer", response_model=InferenceResponse)
 async def generate_text(request: InferenceRequest):
     """Generate text using specified MLX model"""
@@ -210,10 +207,11 @@ async def unload_model(model_name: str):
 
 @app.get("/metrics")
 async def get_metrics():
-    """Get performance metrics for monitoring"""
+    """Get performance metrics for monitoring (bounded per-model statistics)"""
     return {
         "memory": memory_manager.get_memory_stats(),
         "models": model_manager.get_performance_metrics(),
+        "preload": model_manager.get_preload_metrics(),
         "system": {
             "timestamp": datetime.now().isoformat(),
             "uptime": model_manager.get_uptime(),
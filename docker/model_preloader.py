@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Predictive model preloading for the MLX model manager.
+
+``UsageHistory`` tracks per-model request arrivals over sliding windows plus an
+hour-of-day profile, and ``ModelPreloader`` uses it to warm the model most
+likely to be requested next while memory allows. Speculative loads are lower
+priority than on-demand loads: a request for a different model cancels a
+warm-up that is still queued for the loader. A warm-up that already started
+loading cannot be interrupted and finishes first, because loads are serialized.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Sliding windows (seconds) and their weight in the blended arrival score.
+DEFAULT_WINDOWS: dict[int, float] = {60: 0.5, 300: 0.3, 3600: 0.2}
+
+
+class UsageHistory:
+    """Per-model arrival history with sliding-window rates and a daily profile."""
+
+    def __init__(
+        self,
+        windows: dict[int, float] | None = None,
+        max_events_per_model: int = 4096,
+        time_of_day_weight: float = 0.25,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.windows = dict(windows or DEFAULT_WINDOWS)
+        self.horizon = max(self.windows)
+        self.max_events_per_model = max_events_per_model
+        self.time_of_day_weight = time_of_day_weight
+        self.clock = clock
+        self._events: dict[str, deque[float]] = {}
+        self._hourly: dict[str, list[int]] = {}
+
+    def record(self, model: str, ts: float | None = None) -> None:
+        """Record one request for ``model``."""
+        now = self.clock() if ts is None else ts
+        events = self._events.get(model)
+        if events is None:
+            events = deque(maxlen=self.max_events_per_model)
+            self._events[model] = events
+            self._hourly[model] = [0] * 24
+        events.append(now)
+        self._hourly[model][datetime.fromtimestamp(now).hour] += 1
+        self._prune(events, now)
+
+    def _prune(self, events: deque[float], now: float) -> None:
+        cutoff = now - self.horizon
+        while events and events[0] < cutoff:
+            events.popleft()
+
+    def arrival_rate(self, model: str, window: int, now: float | None = None) -> float:
+        """Requests per second for ``model`` over the trailing ``window`` seconds."""
+        events = self._events.get(model)
+        if not events or window <= 0:
+            return 0.0
+        now = self.clock() if now is None else now
+        cutoff = now - window
+        count = 0
+        for ts in reversed(events):
+            if ts < cutoff:
+                break
+            count += 1
+        return count / window
+
+    def hourly_share(self, model: str, hour: int) -> float:
+        """Fraction of all requests seen in ``hour`` that targeted ``model``."""
+        total = sum(profile[hour] for profile in self._hourly.values())
+        if total == 0 or model not in self._hourly:
+            return 0.0
+        return self._hourly[model][hour] / total
+
+    def scores(self, now: float | None = None) -> dict[str, float]:
+        """Blend window rates and the time-of-day profile into a score per model."""
+        now = self.clock() if now is None else now
+        hour = datetime.fromtimestamp(now).hour
+        rates: dict[str, float] = {}
+        for model, events in self._events.items():
+            self._prune(events, now)
+            rates[model] = sum(
+                weight * self.arrival_rate(model, window, now)
+                for window, weight in self.windows.items()
+            )
+        peak = max(rates.values(), default=0.0)
+        result: dict[str, float] = {}
+        for model, rate in rates.items():
+            normalized = rate / peak if peak > 0 else 0.0
+            result[model] = (
+                1 - self.time_of_day_weight
+            ) * normalized + self.time_of_day_weight * self.hourly_share(model, hour)
+        return result
+
+    def predict_next(self, exclude: Iterable[str] = ()) -> str | None:
+        """Return the model most likely to be requested next, if any."""
+        skip = set(exclude)
+        ranked = sorted(
+            ((score, model) for model, score in self.scores().items() if model not in skip),
+            key=lambda item: (-item[0], item[1]),
+        )
+        if not ranked or ranked[0][0] <= 0:
+            return None
+        return ranked[0][1]
+
+
+class ModelPreloader:
+    """Background task that warms the predicted next model when memory allows."""
+
+    def __init__(
+        self,
+        manager: Any,
+        history: UsageHistory,
+        interval: float = 5.0,
+        min_score: float = 0.1,
+    ) -> None:
+        self.manager = manager
+        self.history = history
+        self.interval = interval
+        self.min_score = min_score
+        self.warming: str | None = None
+        self._warm_task: asyncio.Task[bool] | None = None
+        self._loop_task: asyncio.Task[None] | None = None
+        self._warmed: set[str] = set()
+        self._last_prediction: str | None = None
+        self.stats: dict[str, float] = {
+            "predictions": 0,
+            "prediction_hits": 0,
+            "warmups_started": 0,
+            "warmups_completed": 0,
+            "warmups_cancelled": 0,
+            "warmups_skipped_memory": 0,
+            "preload_hits": 0,
+            "preload_wasted": 0,
+            "cold_start_seconds_avoided": 0.0,
+        }
+
+    # ------------------------------------------------------------------ lifecycle
+    def start(self) -> None:
+        """Start the background prediction loop on the running event loop."""
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background loop and abandon any in-flight warm-up."""
+        self.cancel_warmup()
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # pragma: no cover - defensive
+                logger.warning("Preloader iteration failed: %s", exc)
+            await asyncio.sleep(self.interval)
+
+    # ------------------------------------------------------------------ decisions
+    def _candidate(self) -> str | None:
+        scores = self.history.scores()
+        loaded = set(self.manager.loaded_models)
+        for model in sorted(scores, key=lambda m: (-scores[m], m)):
+            if model in loaded or model not in self.manager.model_configs:
+                continue
+            if scores[model] < self.min_score:
+                return None
+            return model
+        return None
+
+    async def run_once(self) -> str | None:
+        """Run one prediction round; return the model warmed, if any."""
+        if self._warm_task is not None and not self._warm_task.done():
+            return None
+        candidate = self._candidate()
+        # Scored (and counted) by the next request, see note_request
+        self._last_prediction = candidate
+        if candidate is None:
+            return None
+
+        ram_needed_mb = self.manager.model_configs[candidate]["ram_gb"] * 1024
+        if not self.manager.memory_manager.can_load_model_size(ram_needed_mb):
+            self.stats["warmups_skipped_memory"] += 1
+            return None
+
+        self.warming = candidate
+        self.stats["warmups_started"] += 1
+        self._warm_task = asyncio.create_task(
+            self.manager._load_model(candidate, speculative=True)
+        )
+        try:
+            loaded = await self._warm_task
+        except asyncio.CancelledError:
+            # Only a load still queued for the loader is abandoned; one that
+            # had started ran to completion before the cancellation landed
+            current = asyncio.current_task()
+            if current is not None and current.cancelling():
+                raise  # the preloader itself is stopping
+            loaded = candidate in self.manager.loaded_models
+            if not loaded:
+                self.stats["warmups_cancelled"] += 1
+                logger.info("Cancelled speculative load of %s", candidate)
+                return None
+        finally:
+            self.warming = None
+            self._warm_task = None
+        if loaded:
+            self._warmed.add(candidate)
+            self.stats["warmups_completed"] += 1
+            logger.info("Preloaded %s ahead of demand", candidate)
+            return candidate
+        return None
+
+    def cancel_warmup(self) -> bool:
+        """Cancel the in-flight warm-up, if any.
+
+        The manager only abandons a warm-up still waiting for the loader; a
+        started load holds the loader until it finishes.
+        """
+        if self._warm_task is not None and not self._warm_task.done():
+            self._warm_task.cancel()
+            return True
+        return False
+
+    async def join_warmup(self, model: str) -> bool:
+        """Wait for an in-flight warm-up of ``model``; False if none is running."""
+        task = self._warm_task
+        if self.warming != model or task is None or task.done():
+            return False
+        try:
+            return bool(await asyncio.shield(task))
+        except asyncio.CancelledError:
+            return False
+
+    # ------------------------------------------------------------------ feedback
+    def note_request(self, model: str) -> None:
+        """Record an inference request and score the previous prediction."""
+        self.history.record(model)
+        if self._last_prediction is not None:
+            # One prediction per request that follows it, however many
+            # rounds re-predicted the same thing in between
+            self.stats["predictions"] += 1
+            if self._last_prediction == model:
+                self.stats["prediction_hits"] += 1
+            self._last_prediction = None
+        if model in self._warmed:
+            self._warmed.discard(model)
+            self.stats["preload_hits"] += 1
+            load_time = self.manager.performance_metrics.get(model, {}).get(
+                "load_time", 0.0
+            )
+            self.stats["cold_start_seconds_avoided"] += load_time
+
+    def note_unload(self, model: str) -> None:
+        """Account for a preloaded model that was unloaded before being used."""
+        if model in self._warmed:
+            self._warmed.discard(model)
+            self.stats["preload_wasted"] += 1
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Return preloader counters plus derived hit rates."""
+        predictions = self.stats["predictions"]
+        warmed = self.stats["warmups_completed"]
+        return {
+            **self.stats,
+            "prediction_hit_rate": (
+                self.stats["prediction_hits"] / predictions if predictions else 0.0
+            ),
+            "preload_hit_rate": self.stats["preload_hits"] / warmed if warmed else 0.0,
+            "warming": self.warming,
+            "pending_preloaded": sorted(self._warmed),
+        }
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Fixed-memory inference statistics for the MLX model manager.
+
+Each model keeps a ring buffer of recent samples, P² streaming quantile
+estimators for p50/p95/p99 and an exponentially time-decayed tokens/sec rate,
+so memory and snapshot cost stay constant no matter how long the server runs.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+
+class P2Quantile:
+    """Streaming quantile estimate using the P² algorithm (Jain & Chlamtac)."""
+
+    __slots__ = ("q", "_heights", "_positions", "_desired", "_increments", "count")
+
+    def __init__(self, q: float) -> None:
+        if not 0 < q < 1:
+            raise ValueError(f"quantile must be in (0, 1), got {q}")
+        self.q = q
+        self.count = 0
+        self._heights: list[float] = []
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [1, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5]
+        self._increments = [0, q / 2, q, (1 + q) / 2, 1]
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        heights = self._heights
+        if len(heights) < 5:
+            heights.append(x)
+            heights.sort()
+            return
+
+        if x < heights[0]:
+            heights[0] = x
+            k = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= heights[k + 1]:
+                k += 1
+
+        positions = self._positions
+        for i in range(k + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        for i in range(1, 4):
+            d = self._desired[i] - positions[i]
+            if (d >= 1 and positions[i + 1] - positions[i] > 1) or (
+                d <= -1 and positions[i - 1] - positions[i] < -1
+            ):
+                step = 1 if d > 0 else -1
+                candidate = self._parabolic(i, step)
+                if not heights[i - 1] < candidate < heights[i + 1]:
+                    candidate = self._linear(i, step)
+                heights[i] = candidate
+                positions[i] += step
+
+    def _parabolic(self, i: int, d: int) -> float:
+        n, h = self._positions, self._heights
+        return h[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i: int, d: int) -> float:
+        n, h = self._positions, self._heights
+        return h[i] + d * (h[i + d] - h[i]) / (n[i + d] - n[i])
+
+    def value(self) -> float | None:
+        if not self._heights:
+            return None
+        if self.count <= 5:
+            ordered = sorted(self._heights)
+            index = min(len(ordered) - 1, max(0, math.ceil(self.q * len(ordered)) - 1))
+            return ordered[index]
+        return self._heights[2]
+
+
+class DecayingRate:
+    """Tokens/sec rate where older observations decay with a fixed half-life."""
+
+    __slots__ = ("half_life", "_clock", "_tokens", "_seconds", "_last")
+
+    def __init__(
+        self, half_life: float = 60.0, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.half_life = half_life
+        self._clock = clock
+        self._tokens = 0.0
+        self._seconds = 0.0
+        self._last: float | None = None
+
+    def _decay(self, now: float) -> None:
+        if self._last is not None:
+            factor = 0.5 ** ((now - self._last) / self.half_life)
+            self._tokens *= factor
+            self._seconds *= factor
+        self._last = now
+
+    def add(self, tokens: int, seconds: float) -> None:
+        self._decay(self._clock())
+        self._tokens += tokens
+        self._seconds += seconds
+
+    def value(self) -> float:
+        if self._seconds <= 0:
+            return 0.0
+        return self._tokens / self._seconds
+
+
+class ModelStats:
+    """Bounded per-model inference statistics."""
+
+    def __init__(
+        self,
+        window: int = 256,
+        quantiles: tuple[float, ...] = DEFAULT_QUANTILES,
+        rate_half_life: float = 60.0,
+    ) -> None:
+        self.recent_latencies: deque[float] = deque(maxlen=window)
+        self.recent_token_rates: deque[float] = deque(maxlen=window)
+        self.latency_quantiles = {q: P2Quantile(q) for q in quantiles}
+        self.token_rate = DecayingRate(rate_half_life)
+        self.count = 0
+        self.total_tokens = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def record(self, latency: float, tokens: int) -> None:
+        self.count += 1
+        self.total_tokens += tokens
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        self.recent_latencies.append(latency)
+        for estimator in self.latency_quantiles.values():
+            estimator.add(latency)
+        if latency > 0:
+            self.recent_token_rates.append(tokens / latency)
+            self.token_rate.add(tokens, latency)
+
+    def snapshot(self) -> dict[str, Any]:
+        recent = self.recent_token_rates
+        latencies = self.recent_latencies
+        return {
+            "inference_count": self.count,
+            "total_tokens": self.total_tokens,
+            "latency_mean": self.total_latency / self.count if self.count else 0.0,
+            "latency_max": self.max_latency,
+            "latency_quantiles": {
+                f"p{round(q * 100)}": est.value()
+                for q, est in self.latency_quantiles.items()
+            },
+            "recent_latency_mean": (
+                sum(latencies) / len(latencies) if latencies else 0.0
+            ),
+            "tokens_per_second": self.token_rate.value(),
+            "recent_tokens_per_second_mean": sum(recent) / len(recent) if recent else 0.0,
+        }
+
+
+def count_tokens(tokenizer: Any, text: str) -> int:
+    """Count tokens with the model tokenizer, falling back to whitespace words."""
+    if tokenizer is not None:
+        encode = getattr(tokenizer, "encode", None)
+        if encode is not None:
+            try:
+                return len(encode(text))
+            except Exception:
+                pass
+    return len(text.split())
@@ -11,12 +11,17 @@ Controlled via the ``MODEL_MANAGER_ENV`` environment variable:
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import gc
 import logging
 import os
 from datetime import datetime
 from typing import Any
 
+from model_preloader import ModelPreloader, UsageHistory
+from model_stats import ModelStats, count_tokens
+
 try:
     from mlx_lm import generate as mlx_generate
     from mlx_lm import load as mlx_load  # type: ignore
@@ -27,18 +32,12 @@ except Exception:  # pragma: no cover - executed when MLX is missing
 
 ENV = os.getenv("MODEL_MANAGER_ENV", "dev").lower()
 USE_REAL_MLX = ENV == "prod" and MLX_AVAILABLE
+PRELOAD_INTERVAL_S = float(os.getenv("MODEL_PRELOAD_INTERVAL", "5"))
+# Simulated load latency for mock models so preloading can be exercised in dev
+MOCK_LOAD_DELAY_S = float(os.getenv("MODEL_MANAGER_MOCK_LOAD_DELAY", "0"))
 
 logger = logging.getLogger(__name__)
 
-_LOAD_LOCK = None
-try:
-    import asyncio
-
-    _LOAD_LOCK = asyncio.Lock()
-except Exception as e:
-    logger.debug(f"Failed to initialize asyncio lock: {e}")
-    # Lock will remain None for fallback behavior
-
 
 class MLXModelManager:
     """Manages MLX models with intelligent loading and memory optimization."""
@@ -46,8 +45,11 @@ class MLXModelManager:
     def __init__(self, memory_manager: Any) -> None:
         self.memory_manager = memory_manager
         self.loaded_models: dict[str, Any] = {}
+        # Serializes loads; mlx weights init is blocking and memory-heavy
+        self._load_lock = asyncio.Lock()
         self.model_configs = self._load_model_configs()
         self.performance_metrics: dict[str, dict[str, Any]] = {}
+        self.model_stats: dict[str, ModelStats] = {}
         self.total_inferences = 0
         self.start_time = datetime.now()
         self.models_cache_dir = os.path.expanduser("~/.cache/mlx-models")
@@ -70,6 +72,11 @@ class MLXModelManager:
         os.environ.setdefault("PYTHONHASHSEED", str(self.seed))
         # Registry-driven defaults
         self.always_loaded = self._load_registry_always_loaded()
+        # Usage-driven speculative loading (started explicitly via start_preloader)
+        self.usage_history = UsageHistory()
+        self.preloader = ModelPreloader(
+            self, self.usage_history, interval=PRELOAD_INTERVAL_S
+        )
 
     def snapshot_meta(self, model: str, prompt: str) -> dict[str, Any]:
         import hashlib
@@ -135,33 +142,78 @@ class MLXModelManager:
         except Exception:
             return set()
 
+    def start_preloader(self) -> None:
+        """Start background preloading of the predicted next model."""
+        self.preloader.start()
+
+    async def stop_preloader(self) -> None:
+        """Stop background preloading and abandon any in-flight warm-up."""
+        await self.preloader.stop()
+
     async def load_model(self, model_name: str) -> bool:
-        """Load a specific MLX model."""
+        """Load a specific MLX model on demand.
+
+        On-demand loads take priority over speculative ones: a warm-up of the
+        same model is joined, and a warm-up of any other model is cancelled if
+        it is still queued. A warm-up that already started loading runs to
+        completion first, since loads are serialized.
+        """
         if model_name in self.loaded_models:
             logger.info("Model %s already loaded", model_name)
             return True
+        if self.preloader.warming == model_name:
+            if await self.preloader.join_warmup(model_name):
+                return True
+        elif self.preloader.cancel_warmup():
+            logger.info("Cancelled warm-up in favour of %s", model_name)
+        return await self._load_model(model_name)
+
+    async def _load_model(self, model_name: str, speculative: bool = False) -> bool:
+        """Load ``model_name``; ``speculative`` marks preloader-initiated loads.
+
+        Loads are serialized and the memory check happens under the lock, so
+        it sees every model registered by earlier loads. Cancelling the caller
+        only abandons a load that is still waiting for the lock.
+        """
+        if model_name in self.loaded_models:
+            return True
 
         if model_name not in self.model_configs:
             raise ValueError(f"Unknown model: {model_name}")
 
-        config = self.model_configs[model_name]
-        ram_needed_mb = config["ram_gb"] * 1024
-
-        if not self.memory_manager.can_load_model_size(ram_needed_mb):
-            logger.warning("Insufficient memory to load %s", model_name)
-            return False
-
+        async with self._load_lock:
+            if model_name in self.loaded_models:
+                return True
+            config = self.model_configs[model_name]
+            ram_needed_mb = config["ram_gb"] * 1024
+            if not self.memory_manager.can_load_model_size(ram_needed_mb):
+                logger.warning("Insufficient memory to load %s", model_name)
+                return False
+
+            load = asyncio.ensure_future(
+                self._load_and_register(model_name, config, ram_needed_mb, speculative)
+            )
+            try:
+                return await asyncio.shield(load)
+            except asyncio.CancelledError:
+                # The MLX loader thread cannot be interrupted: keep the lock
+                # until it returns so no second load overlaps it
+                while not load.done():
+                    with contextlib.suppress(asyncio.CancelledError):
+                        await asyncio.shield(load)
+                raise
+
+    async def _load_and_register(
+        self,
+        model_name: str,
+        config: dict[str, Any],
+        ram_needed_mb: int,
+        speculative: bool,
+    ) -> bool:
         try:
             load_start = datetime.now()
             if USE_REAL_MLX:
-                # serialize loads; mlx weights init is blocking
-                if _LOAD_LOCK:
-                    async with _LOAD_LOCK:
-                        model, tokenizer = await asyncio.to_thread(
-                            mlx_load, config["id"]
-                        )  # type: ignore
-                else:
-                    model, tokenizer = mlx_load(config["id"])  # type: ignore
+                model, tokenizer = await asyncio.to_thread(mlx_load, config["id"])  # type: ignore
                 model_info = {
                     "name": model_name,
                     "config": config,
@@ -171,8 +223,11 @@ class MLXModelManager:
                     "inference_count": 0,
                     "total_tokens": 0,
                     "mlx_real": True,
+                    "speculative": speculative,
                 }
             else:
+                if MOCK_LOAD_DELAY_S > 0:
+                    await asyncio.sleep(MOCK_LOAD_DELAY_S)
                 model_info = {
                     "name": model_name,
                     "config": config,
@@ -180,6 +235,7 @@ class MLXModelManager:
                     "inference_count": 0,
                     "total_tokens": 0,
                     "mlx_real": False,
+                    "speculative": speculative,
                 }
 
             self.loaded_models[model_name] = model_info
@@ -188,11 +244,15 @@ class MLXModelManager:
             load_time = (datetime.now() - load_start).total_seconds()
             self.performance_metrics[model_name] = {
                 "load_time": load_time,
-                "inference_times": [],
-                "token_rates": [],
                 "memory_usage": ram_needed_mb,
             }
-            logger.info("Successfully loaded %s in %.2fs", model_name, load_time)
+            self.model_stats.setdefault(model_name, ModelStats())
+            logger.info(
+                "Successfully loaded %s in %.2fs%s",
+                model_name,
+                load_time,
+                " (speculative)" if speculative else "",
+            )
             return True
         except (ImportError, RuntimeError, OSError) as exc:  # pragma: no cover
             logger.error("Failed to load %s: %s", model_name, exc)
@@ -216,6 +276,7 @@ class MLXModelManager:
 
             del self.loaded_models[model_name]
             self.memory_manager.free_model_memory(model_name, ram_freed)
+            self.preloader.note_unload(model_name)
             logger.info("Unloaded %s, freed %d MB", model_name, ram_freed)
             return True
         except (KeyError, TypeError, ValueError) as exc:
@@ -239,6 +300,7 @@ class MLXModelManager:
 
         start_time = datetime.now()
         model_info = self.loaded_models[model]
+        self.preloader.note_request(model)
 
         try:
             if model_info.get("mlx_real") and MLX_AVAILABLE:
@@ -278,7 +340,9 @@ class MLXModelManager:
                     response_text = await asyncio.to_thread(_run_generate_stream)  # type: ignore
                 else:
                     response_text = await asyncio.to_thread(_run_generate_once)  # type: ignore
-                tokens_generated = len(str(response_text).split())
+                tokens_generated = count_tokens(
+                    model_info.get("tokenizer"), str(response_text)
+                )
             else:
                 response_text = f"[{model}] Mock response to: {prompt[:50]}..."
                 tokens_generated = min(max_tokens, len(response_text.split()) * 2)
@@ -288,14 +352,9 @@ class MLXModelManager:
             model_info["total_tokens"] += tokens_generated
             self.total_inferences += 1
 
-            if model in self.performance_metrics:
-                self.performance_metrics[model]["inference_times"].append(
-                    inference_time
-                )
-                if inference_time > 0:
-                    self.performance_metrics[model]["token_rates"].append(
-                        tokens_generated / inference_time
-                    )
+            self.model_stats.setdefault(model, ModelStats()).record(
+                inference_time, tokens_generated
+            )
 
             return {
                 "text": response_text,
@@ -382,8 +441,18 @@ class MLXModelManager:
         ]
 
     def get_performance_metrics(self) -> dict[str, Any]:
-        """Get performance metrics for loaded models."""
-        return self.performance_metrics
+        """Get bounded performance statistics per model."""
+        return {
+            name: {
+                **self.performance_metrics.get(name, {}),
+                **stats.snapshot(),
+            }
+            for name, stats in self.model_stats.items()
+        }
+
+    def get_preload_metrics(self) -> dict[str, Any]:
+        """Get prediction hit rate and cold-start latency avoided by preloading."""
+        return self.preloader.get_metrics()
 
     def get_model_recommendations(self) -> list[str]:
         """Recommend models based on priority and current load."""
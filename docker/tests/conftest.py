@@ -0,0 +1,11 @@
+"""Test configuration for the docker model-manager scripts."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+DOCKER_DIR = Path(__file__).resolve().parents[1]
+
+if str(DOCKER_DIR) not in sys.path:
+    sys.path.insert(0, str(DOCKER_DIR))
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+
+import pytest
+
+LOAD_DELAY_S = 0.05
+
+
+class FakeMemoryManager:
+    """Fixed MLX budget that records the peak registered usage."""
+
+    def __init__(self, capacity_mb: int) -> None:
+        self.capacity_mb = capacity_mb
+        self.model_memory: dict[str, int] = {}
+        self.peak_mb = 0
+
+    def can_load_model_size(self, required_mb: int) -> bool:
+        return sum(self.model_memory.values()) + required_mb <= self.capacity_mb
+
+    def register_model_memory(self, model_name: str, memory_mb: int) -> None:
+        self.model_memory[model_name] = memory_mb
+        self.peak_mb = max(self.peak_mb, sum(self.model_memory.values()))
+
+    def free_model_memory(self, model_name: str, memory_mb: int) -> None:
+        self.model_memory.pop(model_name, None)
+
+
+@pytest.fixture
+def make_manager(monkeypatch):
+    monkeypatch.setenv("MODEL_MANAGER_ENV", "dev")
+    monkeypatch.setenv("MODEL_MANAGER_MOCK_LOAD_DELAY", str(LOAD_DELAY_S))
+    import production_model_manager
+
+    module = importlib.reload(production_model_manager)
+
+    def make(capacity_gb: int = 8):
+        manager = module.MLXModelManager(FakeMemoryManager(capacity_gb * 1024))
+        manager.model_configs = {
+            name: {"id": f"mlx/{name}", "ram_gb": 4, "priority": "medium"}
+            for name in ("a", "b", "c")
+        }
+        return manager
+
+    return make
+
+
+def test_demand_load_joins_warmup_of_same_model(make_manager) -> None:
+    async def scenario():
+        manager = make_manager()
+        manager.usage_history.record("a")
+        warmup = asyncio.create_task(manager.preloader.run_once())
+        await asyncio.sleep(0)
+        assert manager.preloader.warming == "a"
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        assert await manager.load_model("a")
+        elapsed = loop.time() - started
+        assert await warmup == "a"
+        return manager, elapsed
+
+    manager, elapsed = asyncio.run(scenario())
+    assert elapsed < 1.5 * LOAD_DELAY_S
+    assert manager.preloader.stats["warmups_completed"] == 1
+
+
+def test_started_warmup_finishes_before_other_demand_load(make_manager) -> None:
+    async def scenario():
+        # Room for one 4 GB model only
+        manager = make_manager(capacity_gb=6)
+        manager.usage_history.record("a")
+        warmup = asyncio.create_task(manager.preloader.run_once())
+        await asyncio.sleep(LOAD_DELAY_S / 2)  # the warm-up is mid-load
+
+        loaded_b = await manager.load_model("b")
+        return manager, loaded_b, await warmup
+
+    manager, loaded_b, warmed = asyncio.run(scenario())
+    # The demand load waited for the warm-up and then saw the memory it used
+    assert warmed == "a"
+    assert not loaded_b
+    assert set(manager.loaded_models) == {"a"}
+    assert manager.memory_manager.peak_mb <= manager.memory_manager.capacity_mb
+    assert manager.preloader.stats["warmups_cancelled"] == 0
+
+
+def test_queued_warmup_is_cancelled_for_demand_load(make_manager) -> None:
+    async def scenario():
+        manager = make_manager(capacity_gb=12)
+        first = asyncio.create_task(manager.load_model("c"))
+        await asyncio.sleep(0)
+        manager.usage_history.record("a")
+        warmup = asyncio.create_task(manager.preloader.run_once())
+        await asyncio.sleep(0)
+        assert manager.preloader.warming == "a"  # queued behind "c"
+
+        assert await manager.load_model("b")
+        await first
+        return manager, await warmup
+
+    manager, warmed = asyncio.run(scenario())
+    assert warmed is None
+    assert set(manager.loaded_models) == {"b", "c"}
+    assert manager.preloader.stats["warmups_cancelled"] == 1
+
+
+def test_predictions_are_counted_once_per_request(make_manager) -> None:
+    async def scenario():
+        manager = make_manager(capacity_gb=2)  # too small to warm anything
+        manager.usage_history.record("a")
+        for _ in range(5):
+            await manager.preloader.run_once()
+        idle = dict(manager.preloader.stats)
+        manager.preloader.note_request("a")
+        return manager, idle
+
+    manager, idle = asyncio.run(scenario())
+    assert idle["predictions"] == 0
+    metrics = manager.get_preload_metrics()
+    assert metrics["predictions"] == 1
+    assert metrics["prediction_hit_rate"] == 1.0
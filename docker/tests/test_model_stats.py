@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import importlib.util
+import math
+import random
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from model_stats import DEFAULT_QUANTILES, ModelStats
+
+
+def _exact(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+@pytest.mark.parametrize(
+    "draw",
+    [
+        lambda rng: rng.lognormvariate(-3.0, 0.8),  # long-tailed latencies
+        lambda rng: rng.uniform(0.01, 0.5),
+        lambda rng: rng.expovariate(20.0),
+    ],
+    ids=["lognormal", "uniform", "exponential"],
+)
+def test_streaming_quantiles_track_exact_sorted_quantiles(draw) -> None:
+    rng = random.Random(7)
+    stats = ModelStats(window=64)
+    samples = [draw(rng) for _ in range(20_000)]
+    for latency in samples:
+        stats.record(latency, tokens=32)
+
+    snapshot = stats.snapshot()
+    for q in DEFAULT_QUANTILES:
+        estimate = snapshot["latency_quantiles"][f"p{round(q * 100)}"]
+        assert estimate == pytest.approx(_exact(samples, q), rel=0.05)
+    assert snapshot["inference_count"] == len(samples)
+    assert snapshot["latency_max"] == max(samples)
+    assert snapshot["latency_mean"] == pytest.approx(sum(samples) / len(samples))
+    # Recent samples stay bounded by the window
+    assert len(stats.recent_latencies) == 64
+
+
+def test_quantiles_are_exact_until_the_estimator_is_primed() -> None:
+    stats = ModelStats()
+    samples = [0.4, 0.1, 0.3]
+    for latency in samples:
+        stats.record(latency, tokens=1)
+
+    quantiles = stats.snapshot()["latency_quantiles"]
+    assert quantiles == {f"p{round(q * 100)}": _exact(samples, q) for q in DEFAULT_QUANTILES}
+    assert ModelStats().snapshot()["latency_quantiles"]["p50"] is None
+
+
+def _load_server():
+    path = Path(__file__).resolve().parents[1] / "mlx-server.py"
+    spec = importlib.util.spec_from_file_location("mlx_server", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_metrics_endpoint_reports_the_model_manager_statistics(monkeypatch) -> None:
+    monkeypatch.setenv("MODEL_MANAGER_ENV", "dev")
+    server = _load_server()
+    server.model_manager.model_configs = {
+        "tiny": {"id": "mlx/tiny", "ram_gb": 1, "priority": "high"}
+    }
+    client = TestClient(server.app)
+
+    for _ in range(3):
+        response = client.post("/infer", json={"model": "tiny", "prompt": "hello"})
+        assert response.status_code == 200
+
+    metrics = client.get("/metrics").json()
+    tiny = metrics["models"]["tiny"]
+    assert tiny["inference_count"] == 3
+    assert tiny["memory_usage"] == 1024
+    assert tiny["latency_quantiles"]["p50"] is not None
+    assert metrics["system"]["total_inferences"] == 3
+    assert metrics["memory"]["used"] == 1024
+
+
+def test_server_runs_the_preloader_for_its_lifetime(monkeypatch) -> None:
+    monkeypatch.setenv("MODEL_MANAGER_ENV", "dev")
+    server = _load_server()
+    preloader = server.model_manager.preloader
+
+    with TestClient(server.app) as client:
+        assert preloader._loop_task is not None and not preloader._loop_task.done()
+        preload = client.get("/metrics").json()["preload"]
+        assert preload["predictions"] == 0
+        assert preload["warming"] is None
+
+    assert preloader._loop_task is None
@@ -1,5 +1,5 @@
-__all__ = ["MemoriesClient", "Memory"]
+__all__ = ["AsyncMemoriesClient", "MemoriesClient", "Memory"]
 __version__ = "0.1.0"
 
-from .client import MemoriesClient
+from .client import AsyncMemoriesClient, MemoriesClient
 from .models import Memory
@@ -1,7 +1,15 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from typing import TypeVar
+
 import httpx
 
+from .codec import memory_from_wire, memory_to_wire
 from .models import Memory
 
+T = TypeVar("T")
+R = TypeVar("R")
+
 
 class MemoriesClient:
     def __init__(self, base_url: str, token: str | None = None):
@@ -26,3 +34,119 @@ class MemoriesClient:
             return None
         r.raise_for_status()
         return Memory(**r.json())
+
+
+class AsyncMemoriesClient:
+    """Async client sharing one pooled connection set across requests.
+
+    ``save_many``/``get_many`` keep up to ``max_concurrency`` requests in flight
+    over keep-alive connections. When the server exposes a bulk endpoint, pass
+    ``batch_path`` and ``save_many`` posts ``batch_size`` memories per request
+    (a JSON array in, a JSON array out). With ``compact_vectors`` embeddings are
+    sent as base64 float32 in ``vector_b64``, trading precision for size.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        token: str | None = None,
+        *,
+        max_concurrency: int = 16,
+        batch_size: int = 100,
+        batch_path: str | None = None,
+        compact_vectors: bool = False,
+        timeout: float = 30,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        self.base_url = base_url.rstrip("/")
+        self.headers = {"Authorization": f"Bearer {token}"} if token else {}
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+        self.batch_path = batch_path
+        self.compact_vectors = compact_vectors
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+            ),
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> "AsyncMemoriesClient":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def save(self, m: Memory) -> Memory:
+        r = await self._client.post(
+            "/memories", json=memory_to_wire(m, self.compact_vectors)
+        )
+        r.raise_for_status()
+        return memory_from_wire(r.json())
+
+    async def get(self, id: str) -> Memory | None:
+        r = await self._client.get(f"/memories/{id}")
+        if r.status_code == 404:
+            return None
+        r.raise_for_status()
+        return memory_from_wire(r.json())
+
+    async def save_many(self, memories: Iterable[Memory]) -> list[Memory]:
+        """Save ``memories`` and return the stored copies in input order."""
+        items = list(memories)
+        if self.batch_path is None:
+            return await self._bounded(self.save, items)
+        chunks = [
+            items[start : start + self.batch_size]
+            for start in range(0, len(items), self.batch_size)
+        ]
+        saved = await self._bounded(self._save_batch, chunks)
+        return [m for chunk in saved for m in chunk]
+
+    async def get_many(self, ids: Iterable[str]) -> list[Memory | None]:
+        """Fetch ``ids`` in input order; missing memories come back as ``None``."""
+        return await self._bounded(self.get, list(ids))
+
+    async def _save_batch(self, chunk: list[Memory]) -> list[Memory]:
+        assert self.batch_path is not None
+        r = await self._client.post(
+            self.batch_path,
+            json=[memory_to_wire(m, self.compact_vectors) for m in chunk],
+        )
+        r.raise_for_status()
+        return [memory_from_wire(item) for item in r.json()]
+
+    async def _bounded(
+        self, fn: Callable[[T], Awaitable[R]], items: list[T]
+    ) -> list[R]:
+        # A fixed set of workers pulls from a shared iterator, so large inputs
+        # do not create one pending coroutine per item.
+        results: list[R] = [None] * len(items)  # type: ignore[list-item]
+        pending = iter(enumerate(items))
+
+        async def worker() -> None:
+            for index, item in pending:
+                results[index] = await fn(item)
+
+        workers = [
+            asyncio.ensure_future(worker())
+            for _ in range(min(self.max_concurrency, len(items)))
+        ]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            for task in workers:
+                task.cancel()
+            raise
+        return results
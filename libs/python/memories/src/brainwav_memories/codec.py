@@ -0,0 +1,40 @@
+import base64
+import sys
+from array import array
+from typing import Any
+
+from .models import Memory
+
+# Wire field carrying a base64 little-endian float32 vector in place of ``vector``
+VECTOR_B64_FIELD = "vector_b64"
+
+
+def encode_vector(vector: list[float]) -> str:
+    packed = array("f", vector)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return base64.b64encode(packed.tobytes()).decode("ascii")
+
+
+def decode_vector(data: str) -> list[float]:
+    packed = array("f")
+    packed.frombytes(base64.b64decode(data))
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tolist()
+
+
+def memory_to_wire(m: Memory, compact_vectors: bool = False) -> dict[str, Any]:
+    payload = m.model_dump()
+    if compact_vectors and payload.get("vector") is not None:
+        payload[VECTOR_B64_FIELD] = encode_vector(payload.pop("vector"))
+        payload["vector"] = None
+    return payload
+
+
+def memory_from_wire(data: dict[str, Any]) -> Memory:
+    encoded = data.get(VECTOR_B64_FIELD)
+    if encoded is not None:
+        data = {**data, "vector": decode_vector(encoded)}
+        del data[VECTOR_B64_FIELD]
+    return Memory(**data)
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+from brainwav_memories.client import AsyncMemoriesClient
+from brainwav_memories.codec import decode_vector, encode_vector
+from brainwav_memories.models import Memory
+
+
+class StandInServer(ThreadingHTTPServer):
+    """In-process memories API with an optional bulk endpoint."""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.store: dict[str, dict] = {}
+        self.connections = 0
+        self.requests: list[tuple[str, str, dict]] = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StandInServer
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def _reply(self, status: int, body: object) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.server.lock:
+            self.server.requests.append(("POST", self.path, dict(self.headers)))
+            items = body if isinstance(body, list) else [body]
+            for item in items:
+                self.server.store[item["id"]] = item
+        self._reply(200, body)
+
+    def do_GET(self) -> None:
+        memory_id = self.path.rsplit("/", 1)[-1]
+        with self.server.lock:
+            self.server.requests.append(("GET", self.path, dict(self.headers)))
+            item = self.server.store.get(memory_id)
+        if item is None:
+            self._reply(404, {"detail": "not found"})
+        else:
+            self._reply(200, item)
+
+
+@pytest.fixture
+def server() -> Iterator[StandInServer]:
+    srv = StandInServer()
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _memory(i: int, vector: list[float] | None = None) -> Memory:
+    return Memory(
+        id=f"m{i}",
+        kind="embedding" if vector else "note",
+        text=f"memory {i}",
+        vector=vector,
+        createdAt="2025-01-01T00:00:00Z",
+        updatedAt="2025-01-01T00:00:00Z",
+        provenance={"source": "agent"},
+    )
+
+
+def test_save_many_reuses_pooled_connections(server):
+    memories = [_memory(i) for i in range(60)]
+
+    async def scenario():
+        async with AsyncMemoriesClient(server.url, token="t", max_concurrency=4) as client:
+            saved = await client.save_many(memories)
+            fetched = await client.get_many(["m0", "m59", "missing"])
+        return saved, fetched
+
+    saved, fetched = asyncio.run(scenario())
+
+    assert [m.id for m in saved] == [m.id for m in memories]
+    assert fetched[0] == memories[0]
+    assert fetched[1] == memories[59]
+    assert fetched[2] is None
+    assert len(server.store) == 60
+    assert server.connections <= 4
+    assert all(headers["Authorization"] == "Bearer t" for _, _, headers in server.requests)
+
+
+def test_save_many_uses_batch_endpoint(server):
+    memories = [_memory(i) for i in range(25)]
+
+    async def scenario():
+        async with AsyncMemoriesClient(
+            server.url, batch_path="/memories/batch", batch_size=10
+        ) as client:
+            return await client.save_many(memories)
+
+    saved = asyncio.run(scenario())
+
+    assert [m.id for m in saved] == [m.id for m in memories]
+    posts = [path for method, path, _ in server.requests if method == "POST"]
+    assert posts == ["/memories/batch"] * 3
+    assert len(server.store) == 25
+
+
+def test_compact_vectors_travel_as_base64(server):
+    vector = [0.5, -1.25, 3.0]
+
+    async def scenario():
+        async with AsyncMemoriesClient(server.url, compact_vectors=True) as client:
+            saved = await client.save(_memory(1, vector))
+            fetched = await client.get("m1")
+        return saved, fetched
+
+    saved, fetched = asyncio.run(scenario())
+
+    stored = server.store["m1"]
+    assert stored["vector"] is None
+    assert decode_vector(stored["vector_b64"]) == vector
+    assert saved.vector == vector
+    assert fetched is not None and fetched.vector == vector
+
+
+def test_save_many_propagates_http_errors():
+    async def failing():
+        transport = httpx.MockTransport(lambda request: httpx.Response(500, json={}))
+        async with AsyncMemoriesClient("http://stand-in", transport=transport) as client:
+            await client.save_many([_memory(i) for i in range(5)])
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(failing())
+
+
+def test_vector_codec_roundtrip():
+    vector = [0.0, 1.0, -2.5, 1e-3]
+    decoded = decode_vector(encode_vector(vector))
+    assert decoded == pytest.approx(vector, rel=1e-6)
+    assert len(encode_vector([0.0] * 384)) < len(json.dumps([0.123456789] * 384))
@@ -6,6 +6,7 @@ import base64
 import json
 import hmac
 from dataclasses import dataclass
+from datetime import datetime
 from hashlib import sha256
 from pathlib import Path
 from typing import Iterable, List, Optional
@@ -87,10 +88,12 @@ def load_connectors_manifest(manifest_path: Optional[str | Path] = None) -> Conn
     )
 
 
-def build_connector_service_map(manifest: ConnectorsManifest) -> ConnectorServiceMapPayload:
+def build_connector_service_map(
+    manifest: ConnectorsManifest, *, now: Optional[datetime] = None
+) -> ConnectorServiceMapPayload:
     """Create the unsigned service-map payload from a validated manifest."""
 
-    return build_service_map_payload(manifest)
+    return build_service_map_payload(manifest, now=now)
 
 
 def sign_connector_service_map(service_map: ConnectorServiceMapPayload, secret: str) -> str:
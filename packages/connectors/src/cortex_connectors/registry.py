@@ -2,13 +2,30 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
 from dataclasses import dataclass
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 from prometheus_client import Gauge
 
-from .manifest import build_connector_service_map, load_connectors_manifest, sign_connector_service_map
+try:  # optional: inotify/FSEvents backed watching
+    from watchfiles import awatch
+except ImportError:  # pragma: no cover - exercised when watchfiles is absent
+    awatch = None
+
+from .manifest import (
+    ConnectorsManifestError,
+    build_connector_service_map,
+    load_connectors_manifest,
+    sign_connector_service_map,
+)
 from .models import BRAND, ConnectorManifestEntry, ConnectorsManifest, determine_enabled
 
 _CONNECTOR_GAUGE = Gauge(
@@ -17,6 +34,10 @@ _CONNECTOR_GAUGE = Gauge(
     ["connector"],
 )
 
+logger = logging.getLogger(__name__)
+
+_FileStamp = Tuple[int, int, int]
+
 
 @dataclass
 class ConnectorRecord:
@@ -26,26 +47,128 @@ class ConnectorRecord:
     enabled: bool
 
 
-class ConnectorRegistry:
-    """Manifest-backed registry that powers HTTP + SSE routes."""
+@dataclass(frozen=True)
+class ServiceMapSnapshot:
+    """Signed service map pre-serialized for one manifest version.
 
-    def __init__(self, manifest_path: Path, signature_key: str) -> None:
+    ``refresh_at`` is the wall-clock time after which the snapshot is rebuilt,
+    or ``None`` when the manifest pins ``generatedAt``.
+    """
+
+    version: int
+    payload: Dict[str, object]
+    body: bytes
+    etag: str
+    refresh_at: Optional[float] = None
+
+
+class ConnectorRegistry:
+    """Manifest-backed registry that powers HTTP + SSE routes.
+
+    The manifest file is re-parsed only when its stat stamp (inode, mtime, size)
+    changes, and the signed service map is memoized per manifest version as
+    ready-to-send bytes with an ETag. When the manifest does not pin
+    ``generatedAt`` the map is stamped with the build time, so the snapshot is
+    re-signed once half its TTL has elapsed; clients computing
+    ``generatedAt + ttlSeconds`` always receive at least half a TTL of validity.
+    """
+
+    def __init__(
+        self,
+        manifest_path: Path,
+        signature_key: str,
+        *,
+        poll_interval: float = 1.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
         self._manifest_path = manifest_path
         self._signature_key = signature_key
         self._manifest: Optional[ConnectorsManifest] = None
         self._gauge_cache: Dict[str, int] = {}
+        self._version = 0
+        self._poll_interval = poll_interval
+        self._clock = clock
+        self._stamp: Optional[_FileStamp] = None
+        self._last_checked = 0.0
+        self._snapshot: Optional[ServiceMapSnapshot] = None
+        self.last_reload_error: Optional[str] = None
 
     @property
     def manifest(self) -> ConnectorsManifest:
         if self._manifest is None:
-            self._manifest = load_connectors_manifest(self._manifest_path)
-            self._update_metrics()
+            self.refresh()
+        else:
+            self.check_for_changes()
+        if self._manifest is None:
+            raise ConnectorsManifestError(f"Connectors manifest not loaded from {self._manifest_path}")
         return self._manifest
 
+    @property
+    def version(self) -> int:
+        """Monotonic counter bumped every time a manifest is (re)loaded."""
+
+        return self._version
+
     def refresh(self) -> None:
+        stamp = self._file_stamp()
         self._manifest = load_connectors_manifest(self._manifest_path)
+        self._stamp = stamp
+        self._last_checked = time.monotonic()
+        self._version += 1
+        self._snapshot = None
+        self.last_reload_error = None
         self._update_metrics()
 
+    def _file_stamp(self) -> Optional[_FileStamp]:
+        try:
+            stat = os.stat(self._manifest_path)
+        except (OSError, TypeError):
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def check_for_changes(self, *, force: bool = False) -> bool:
+        """Reload the manifest if the file changed; return True when reloaded.
+
+        Stat calls are throttled to one per ``poll_interval`` unless ``force`` is
+        set. An invalid new manifest keeps the last good one in service.
+        """
+
+        now = time.monotonic()
+        if not force and now - self._last_checked < self._poll_interval:
+            return False
+        self._last_checked = now
+        stamp = self._file_stamp()
+        if stamp is None or stamp == self._stamp:
+            return False
+        try:
+            self.refresh()
+        except (FileNotFoundError, ValueError, ConnectorsManifestError) as exc:
+            self._stamp = stamp  # do not retry the same broken file on every request
+            self.last_reload_error = str(exc)
+            logger.warning("Connectors manifest reload failed; keeping previous version: %s", exc)
+            return False
+        return True
+
+    async def watch(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Reload on file changes until ``stop`` is set.
+
+        Uses ``watchfiles`` (inotify/FSEvents) when installed and falls back to
+        stat polling every ``poll_interval`` seconds.
+        """
+
+        stop = stop or asyncio.Event()
+        if awatch is not None and self._manifest_path:
+            directory = Path(self._manifest_path).expanduser().resolve().parent
+            if directory.exists():
+                async for _ in awatch(directory, stop_event=stop):
+                    self.check_for_changes(force=True)
+                return
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self._poll_interval)
+            except asyncio.TimeoutError:
+                self.check_for_changes(force=True)
+
     def _update_metrics(self) -> None:
         manifest = self._manifest
         if manifest is None:
@@ -79,7 +202,39 @@ class ConnectorRegistry:
         return [record for record in self.records() if record.enabled]
 
     def service_map(self) -> Dict[str, object]:
-        payload = build_connector_service_map(self.manifest)
+        """Return the signed service map; the returned dict is shared and read-only."""
+
+        return self.service_map_snapshot().payload
+
+    def service_map_snapshot(self) -> ServiceMapSnapshot:
+        manifest = self.manifest
+        now = self._clock()
+        snapshot = self._snapshot
+        if (
+            snapshot is not None
+            and snapshot.version == self._version
+            and (snapshot.refresh_at is None or now < snapshot.refresh_at)
+        ):
+            return snapshot
+
+        service_map = self._build_service_map(manifest, datetime.fromtimestamp(now, timezone.utc))
+        body = json.dumps(service_map, separators=(",", ":")).encode("utf-8")
+        refresh_at = None
+        if manifest.generated_at is None:
+            # generatedAt is "now"; re-sign before clients see the map as expired
+            refresh_at = now + service_map["payload"]["ttlSeconds"] / 2
+        snapshot = ServiceMapSnapshot(
+            version=self._version,
+            payload=service_map,
+            body=body,
+            etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+            refresh_at=refresh_at,
+        )
+        self._snapshot = snapshot
+        return snapshot
+
+    def _build_service_map(self, manifest: ConnectorsManifest, now: datetime) -> Dict[str, object]:
+        payload = build_connector_service_map(manifest, now=now)
         signature = sign_connector_service_map(payload, self._signature_key)
         payload_dict = payload.model_dump(by_alias=True, mode="json", exclude_none=True)
         metadata = payload_dict.setdefault("metadata", {"brand": BRAND})
@@ -92,4 +247,4 @@ class ConnectorRegistry:
         }
 
 
-__all__ = ["ConnectorRegistry", "ConnectorRecord"]
+__all__ = ["ConnectorRegistry", "ConnectorRecord", "ServiceMapSnapshot"]
@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 import os
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any, AsyncIterator, Callable, Optional
+from typing import Any, Callable, Optional
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse, Response, StreamingResponse
@@ -17,7 +17,7 @@ from .auth import APIKeyAuthenticator
 from .manifest import ConnectorsManifestError
 from .registry import ConnectorRegistry
 from .settings import Settings
-from .sse import connector_status_stream
+from .sse import ServiceMapBroadcaster
 from .telemetry import configure_logging, configure_tracing
 
 
@@ -57,6 +57,12 @@ def _refresh_registry_best_effort(registry: ConnectorRegistry) -> None:
         pass
 
 
+def _parse_if_none_match(header: Optional[str]) -> set[str]:
+    if not header:
+        return set()
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
 def _brand_detail(message: str) -> str:
     message = message.strip()
     return message if message.startswith(f"[{BRAND}") else f"[{BRAND}] {message}"
@@ -86,22 +92,39 @@ def _register_core_routes(
         return {"status": "ok", "brand": BRAND, "timestamp": datetime.now(UTC).isoformat()}
 
     @app.get("/v1/connectors/service-map")
-    async def service_map() -> dict[str, Any]:
+    async def service_map(request: Request) -> Response:
         try:
-            return registry.service_map()
+            snapshot = registry.service_map_snapshot()
         except (FileNotFoundError, ValueError, ConnectorsManifestError) as exc:
             raise HTTPException(status_code=503, detail=_brand_detail(str(exc))) from exc
 
+        headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+        if snapshot.etag in _parse_if_none_match(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=headers)
+        return Response(snapshot.body, media_type="application/json", headers=headers)
+
+    broadcaster = ServiceMapBroadcaster(registry, interval=sse_interval)
+    app.state.broadcaster = broadcaster
+    stop_watching = asyncio.Event()
+
+    @app.on_event("startup")
+    async def start_manifest_watch() -> None:
+        app.state.manifest_watch = asyncio.create_task(registry.watch(stop_watching))
+
+    @app.on_event("shutdown")
+    async def stop_background_tasks() -> None:
+        stop_watching.set()
+        watch_task = getattr(app.state, "manifest_watch", None)
+        if watch_task is not None:
+            watch_task.cancel()
+        await broadcaster.aclose()
+
     @app.get("/v1/connectors/stream")
     async def connectors_stream() -> StreamingResponse:
-        async def event_generator() -> AsyncIterator[bytes]:
-            async for event in connector_status_stream(
-                registry, interval=sse_interval, max_events=sse_max_events
-            ):
-                chunk = f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
-                yield chunk.encode("utf-8")
-
-        return StreamingResponse(event_generator(), media_type="text/event-stream")
+        return StreamingResponse(
+            broadcaster.subscribe(max_events=sse_max_events),
+            media_type="text/event-stream",
+        )
 
 
 def _register_metrics_route(
@@ -3,29 +3,199 @@
 from __future__ import annotations
 
 import asyncio
+import json
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
-from typing import AsyncGenerator, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
 
+from .manifest import ConnectorsManifestError
 from .registry import ConnectorRegistry
 
 
-async def connector_status_stream(
-    registry: ConnectorRegistry, interval: float = 15.0, max_events: Optional[int] = None
-) -> AsyncGenerator[dict, None]:
-    """Yield periodic connector status snapshots."""
+def encode_sse(event: str, data: Dict[str, Any]) -> bytes:
+    """Encode a single SSE frame."""
 
-    count = 0
-    while max_events is None or count < max_events:
-        payload = registry.service_map()
-        yield {
-            "event": "status",
-            "data": {
-                "timestamp": datetime.now(UTC).isoformat(),
-                "payload": payload,
-            },
-        }
-        count += 1
-        await asyncio.sleep(interval)
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
 
 
-__all__ = ["connector_status_stream"]
+def _status_frame(payload_json: str) -> bytes:
+    """``encode_sse("status", ...)`` around a pre-serialized service map."""
+
+    timestamp = json.dumps(datetime.now(UTC).isoformat())
+    return f'event: status\ndata: {{"timestamp": {timestamp}, "payload": {payload_json}}}\n\n'.encode(
+        "utf-8"
+    )
+
+
+def _connectors_by_id(service_map: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    connectors = service_map.get("payload", {}).get("connectors", [])
+    return {connector["id"]: connector for connector in connectors}
+
+
+def service_map_delta(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Describe how ``current`` differs from ``previous`` at connector granularity."""
+
+    before = _connectors_by_id(previous)
+    after = _connectors_by_id(current)
+    upserted = [entry for key, entry in after.items() if before.get(key) != entry]
+    removed = sorted(key for key in before if key not in after)
+    payload = {key: value for key, value in current["payload"].items() if key != "connectors"}
+    return {
+        "payload": payload,
+        "signature": current["signature"],
+        "upserted": upserted,
+        "removed": removed,
+    }
+
+
+@dataclass(eq=False)
+class _Subscriber:
+    queue: "asyncio.Queue[Optional[bytes]]"
+    dropped: bool = False
+
+
+@dataclass
+class BroadcasterStats:
+    """Counters describing broadcaster fan-out behaviour."""
+
+    snapshots_built: int = 0
+    deltas_sent: int = 0
+    heartbeats_sent: int = 0
+    dropped_subscribers: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+class ServiceMapBroadcaster:
+    """Fan out one signed service-map snapshot to every SSE subscriber.
+
+    The service map is built, signed and serialized once per registry snapshot
+    and shared by all clients. New subscribers receive a ``status`` frame with
+    that payload and their own connect ``timestamp``; afterwards only ``delta``
+    frames are published when the snapshot changes (a manifest reload or a
+    re-signed ``generatedAt``), with lightweight heartbeat comments in between.
+    Clients whose bounded queue fills up are dropped instead of slowing others.
+    """
+
+    def __init__(
+        self,
+        registry: ConnectorRegistry,
+        *,
+        interval: float = 15.0,
+        queue_size: int = 32,
+    ) -> None:
+        self._registry = registry
+        self._interval = interval
+        self._queue_size = queue_size
+        self._subscribers: Set[_Subscriber] = set()
+        self._task: Optional[asyncio.Task[None]] = None
+        self._service_map: Optional[Dict[str, Any]] = None
+        self._payload_json: Optional[str] = None
+        self.stats = BroadcasterStats()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def _refresh_snapshot(self) -> tuple[str, Optional[bytes]]:
+        """Return the serialized service map and a delta frame if it changed.
+
+        The registry memoizes the signed map, so an unchanged snapshot is the
+        same object and costs no re-serialization.
+        """
+
+        service_map = self._registry.service_map()  # raises if no manifest is available
+        previous = self._service_map
+        if service_map is previous and self._payload_json is not None:
+            return self._payload_json, None
+
+        self._service_map = service_map
+        self._payload_json = json.dumps(service_map)
+        self.stats.snapshots_built += 1
+        if previous is None or previous == service_map:
+            return self._payload_json, None
+        delta = service_map_delta(previous, service_map)
+        delta["timestamp"] = datetime.now(UTC).isoformat()
+        return self._payload_json, encode_sse("delta", delta)
+
+    def _publish(self, frame: bytes) -> None:
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                self._drop(subscriber)
+
+    def _drop(self, subscriber: _Subscriber) -> None:
+        subscriber.dropped = True
+        self._subscribers.discard(subscriber)
+        self.stats.dropped_subscribers += 1
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(None)
+
+    async def _run(self) -> None:
+        while self._subscribers:
+            await asyncio.sleep(self._interval)
+            try:
+                _, frame = self._refresh_snapshot()
+            except (FileNotFoundError, ValueError, ConnectorsManifestError) as exc:
+                self.stats.errors = [*self.stats.errors[-9:], str(exc)]
+                continue
+            if frame is not None:
+                self.stats.deltas_sent += 1
+                self._publish(frame)
+            else:
+                self.stats.heartbeats_sent += 1
+                self._publish(f": heartbeat {datetime.now(UTC).isoformat()}\n\n".encode("utf-8"))
+
+    def _ensure_running(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def subscribe(self, max_events: Optional[int] = None) -> AsyncIterator[bytes]:
+        """Yield encoded SSE frames for one client, starting with the full snapshot."""
+
+        try:
+            payload_json, delta = self._refresh_snapshot()
+        except (FileNotFoundError, ValueError, ConnectorsManifestError) as exc:
+            yield encode_sse("error", {"detail": str(exc)})
+            return
+        if delta is not None:
+            # Existing subscribers must not miss a change noticed by a new one
+            self.stats.deltas_sent += 1
+            self._publish(delta)
+
+        # Register before the first yield so no delta published meanwhile is missed
+        subscriber = _Subscriber(queue=asyncio.Queue(maxsize=self._queue_size))
+        self._subscribers.add(subscriber)
+        if max_events is None or max_events > 1:
+            self._ensure_running()
+        try:
+            yield _status_frame(payload_json)
+            sent = 1
+            while max_events is None or sent < max_events:
+                frame = await subscriber.queue.get()
+                if frame is None:
+                    return
+                yield frame
+                sent += 1
+        finally:
+            self._subscribers.discard(subscriber)
+
+    async def aclose(self) -> None:
+        for subscriber in list(self._subscribers):
+            self._drop(subscriber)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+__all__ = [
+    "BroadcasterStats",
+    "ServiceMapBroadcaster",
+    "encode_sse",
+    "service_map_delta",
+]
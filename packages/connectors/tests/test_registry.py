@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import json
+import os
 from pathlib import Path
 from typing import Dict
 
@@ -71,3 +73,115 @@ def test_registry_rejects_disabled_connector_proxy(manifest_file: Path) -> None:
     registry = ConnectorRegistry(manifest_file, "secret")
     with pytest.raises(ValueError):
         registry.get_instructor_proxy("beta")
+
+
+@pytest.fixture
+def schema_agnostic(monkeypatch) -> None:
+    # The shared fixture predates the JSON schema; these tests exercise reload mechanics only.
+    monkeypatch.setattr("cortex_connectors.manifest.validate_manifest_document", lambda document: None)
+
+
+def _rewrite(manifest_file: Path, payload: Dict[str, object]) -> None:
+    manifest_file.write_text(json.dumps(payload), encoding="utf-8")
+    stat = manifest_file.stat()
+    # Guarantee a distinct mtime even on coarse-grained filesystems
+    os.utime(manifest_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_registry_memoizes_service_map_snapshot(manifest_file: Path, schema_agnostic) -> None:
+    registry = ConnectorRegistry(manifest_file, "secret", poll_interval=0)
+
+    first = registry.service_map_snapshot()
+    second = registry.service_map_snapshot()
+
+    assert first is second
+    assert json.loads(first.body) == first.payload
+    assert first.etag.startswith('"')
+
+
+def test_registry_reloads_only_when_file_changes(
+    manifest_file: Path, manifest_payload: Dict[str, object], schema_agnostic
+) -> None:
+    registry = ConnectorRegistry(manifest_file, "secret", poll_interval=0)
+    before = registry.service_map_snapshot()
+    version = registry.version
+
+    assert registry.check_for_changes() is False
+    assert registry.version == version
+
+    manifest_payload["connectors"] = manifest_payload["connectors"][:1]
+    _rewrite(manifest_file, manifest_payload)
+
+    assert registry.check_for_changes() is True
+    after = registry.service_map_snapshot()
+    assert registry.version == version + 1
+    assert after.etag != before.etag
+    assert [c["id"] for c in after.payload["payload"]["connectors"]] == ["alpha"]
+
+
+def test_registry_keeps_last_good_manifest_on_invalid_update(
+    manifest_file: Path, schema_agnostic
+) -> None:
+    registry = ConnectorRegistry(manifest_file, "secret", poll_interval=0)
+    before = registry.service_map_snapshot()
+
+    manifest_file.write_text("{not json", encoding="utf-8")
+    os.utime(manifest_file, ns=(0, manifest_file.stat().st_mtime_ns + 1_000_000_000))
+
+    assert registry.check_for_changes() is False
+    assert registry.last_reload_error
+    assert registry.service_map_snapshot() is before
+
+
+def test_registry_throttles_stat_calls(manifest_file: Path, manifest_payload, schema_agnostic) -> None:
+    registry = ConnectorRegistry(manifest_file, "secret", poll_interval=3600)
+    registry.service_map_snapshot()
+
+    manifest_payload["connectors"] = manifest_payload["connectors"][:1]
+    _rewrite(manifest_file, manifest_payload)
+
+    assert registry.check_for_changes() is False
+    assert registry.check_for_changes(force=True) is True
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_registry_resigns_unpinned_service_map_before_ttl_expires(
+    manifest_file: Path, manifest_payload: Dict[str, object], schema_agnostic
+) -> None:
+    del manifest_payload["generatedAt"]
+    _rewrite(manifest_file, manifest_payload)
+    clock = _Clock()
+    registry = ConnectorRegistry(manifest_file, "secret", poll_interval=3600, clock=clock)
+
+    first = registry.service_map_snapshot()
+    ttl = first.payload["payload"]["ttlSeconds"]
+    assert ttl == 300
+    assert first.payload["payload"]["generatedAt"] == "2023-11-14T22:13:20Z"
+
+    clock.now += ttl / 2 - 1
+    assert registry.service_map_snapshot() is first
+
+    clock.now += 1
+    second = registry.service_map_snapshot()
+    assert second is not first
+    assert second.etag != first.etag
+    assert second.payload["payload"]["generatedAt"] == "2023-11-14T22:15:50Z"
+    assert registry.version == first.version
+
+
+def test_registry_keeps_pinned_service_map_past_ttl(manifest_file: Path, schema_agnostic) -> None:
+    clock = _Clock()
+    registry = ConnectorRegistry(manifest_file, "secret", poll_interval=3600, clock=clock)
+
+    first = registry.service_map_snapshot()
+    clock.now += 10 * first.payload["payload"]["ttlSeconds"]
+
+    assert registry.service_map_snapshot() is first
+    assert first.payload["payload"]["generatedAt"] == "2025-01-01T00:00:00Z"
@@ -115,3 +115,21 @@ async def test_manifest_missing_returns_503(settings: Settings, tmp_path) -> Non
             headers={"Authorization": f"Bearer {settings.api_key}"},
         )
         assert response.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_service_map_conditional_request(settings: Settings, monkeypatch) -> None:
+    monkeypatch.setattr("cortex_connectors.manifest.validate_manifest_document", lambda document: None)
+    app = create_app(settings=settings, sse_interval=0.01, sse_max_events=1)
+    headers = {"Authorization": f"Bearer {settings.api_key}"}
+    async with build_client(app) as client:
+        response = await client.get("/v1/connectors/service-map", headers=headers)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+
+        response = await client.get(
+            "/v1/connectors/service-map",
+            headers={**headers, "If-None-Match": etag},
+        )
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime
+from typing import Any, Dict, List
+
+import pytest
+
+from cortex_connectors.sse import ServiceMapBroadcaster, service_map_delta
+
+
+class FakeRegistry:
+    """Registry stand-in that memoizes the map per version and counts builds."""
+
+    def __init__(self, connectors: List[Dict[str, Any]]) -> None:
+        self.connectors = connectors
+        self.version = 1
+        self.builds = 0
+        self._built: tuple[int, Dict[str, Any]] | None = None
+
+    def service_map(self) -> Dict[str, Any]:
+        if self._built is None or self._built[0] != self.version:
+            self.builds += 1
+            self._built = (
+                self.version,
+                {
+                    "payload": {"id": "map", "connectors": [dict(c) for c in self.connectors]},
+                    "signature": f"sig-{self.version}",
+                },
+            )
+        return self._built[1]
+
+
+def _parse(frame: bytes) -> tuple[str, Dict[str, Any]]:
+    event_line, data_line = frame.decode("utf-8").strip().split("\n")
+    return event_line.removeprefix("event: "), json.loads(data_line.removeprefix("data: "))
+
+
+@pytest.mark.asyncio
+async def test_snapshot_built_once_for_many_subscribers() -> None:
+    registry = FakeRegistry([{"id": "alpha", "enabled": True}])
+    broadcaster = ServiceMapBroadcaster(registry, interval=60)
+
+    frames = []
+    for _ in range(5):
+        async for frame in broadcaster.subscribe(max_events=1):
+            frames.append(frame)
+
+    assert registry.builds == 1
+    assert broadcaster.stats.snapshots_built == 1
+    parsed = [_parse(frame) for frame in frames]
+    assert {event for event, _ in parsed} == {"status"}
+    assert all(data["payload"]["signature"] == "sig-1" for _, data in parsed)
+
+
+@pytest.mark.asyncio
+async def test_status_timestamp_is_per_subscriber() -> None:
+    broadcaster = ServiceMapBroadcaster(FakeRegistry([{"id": "alpha"}]), interval=60)
+
+    async def connect() -> str:
+        async for frame in broadcaster.subscribe(max_events=1):
+            return _parse(frame)[1]["timestamp"]
+        raise AssertionError("no status frame")
+
+    first = await connect()
+    await asyncio.sleep(0.01)
+    second = await connect()
+
+    assert datetime.fromisoformat(second) > datetime.fromisoformat(first)
+
+
+@pytest.mark.asyncio
+async def test_new_subscriber_publishes_pending_delta_to_others() -> None:
+    registry = FakeRegistry([{"id": "alpha", "enabled": True}])
+    broadcaster = ServiceMapBroadcaster(registry, interval=60)
+    existing = broadcaster.subscribe()
+    await existing.__anext__()
+
+    # A re-signed map (new generatedAt) is noticed by the next subscriber first
+    registry.version = 2
+    async for _ in broadcaster.subscribe(max_events=1):
+        pass
+
+    event, data = _parse(await asyncio.wait_for(existing.__anext__(), timeout=1))
+    await existing.aclose()
+    await broadcaster.aclose()
+
+    assert event == "delta"
+    assert data["signature"] == "sig-2"
+    assert data["upserted"] == []
+
+
+@pytest.mark.asyncio
+async def test_delta_published_after_version_change() -> None:
+    registry = FakeRegistry([{"id": "alpha", "enabled": True}, {"id": "beta", "enabled": True}])
+    broadcaster = ServiceMapBroadcaster(registry, interval=0.01)
+
+    stream = broadcaster.subscribe(max_events=3)
+    first_event, _ = _parse(await stream.__anext__())
+    assert first_event == "status"
+
+    registry.connectors = [{"id": "alpha", "enabled": False}]
+    registry.version = 2
+
+    frame = await asyncio.wait_for(stream.__anext__(), timeout=1)
+    while frame.startswith(b":"):
+        frame = await asyncio.wait_for(stream.__anext__(), timeout=1)
+    event, data = _parse(frame)
+    await stream.aclose()
+    await broadcaster.aclose()
+
+    assert event == "delta"
+    assert data["upserted"] == [{"id": "alpha", "enabled": False}]
+    assert data["removed"] == ["beta"]
+    assert data["signature"] == "sig-2"
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_dropped() -> None:
+    registry = FakeRegistry([{"id": "alpha", "enabled": True}])
+    broadcaster = ServiceMapBroadcaster(registry, interval=0.001, queue_size=2)
+
+    stream = broadcaster.subscribe()
+    await stream.__anext__()
+    assert broadcaster.subscriber_count == 1
+
+    # Never consume: heartbeats fill the bounded queue and the client is dropped.
+    for _ in range(100):
+        if broadcaster.stats.dropped_subscribers:
+            break
+        await asyncio.sleep(0.005)
+
+    assert broadcaster.stats.dropped_subscribers == 1
+    assert broadcaster.subscriber_count == 0
+    with pytest.raises(StopAsyncIteration):
+        await stream.__anext__()
+    await broadcaster.aclose()
+
+
+def test_service_map_delta_reports_changes() -> None:
+    previous = {"payload": {"connectors": [{"id": "a", "v": 1}, {"id": "b", "v": 1}]}, "signature": "x"}
+    current = {"payload": {"connectors": [{"id": "a", "v": 2}, {"id": "c", "v": 1}], "ttlSeconds": 5}, "signature": "y"}
+
+    delta = service_map_delta(previous, current)
+
+    assert delta["upserted"] == [{"id": "a", "v": 2}, {"id": "c", "v": 1}]
+    assert delta["removed"] == ["b"]
+    assert delta["payload"] == {"ttlSeconds": 5}
@@ -1,13 +1,25 @@
 #!/usr/bin/env python3
+"""Retrieval regression suites with cached corpus embeddings.
+
+Each corpus is embedded once per model and the vectors are cached under
+``--cache-dir``; every query of a suite is scored with one matrix product.
+Suites run in parallel and report wall time and embedding-call counts.
+"""
+
 from __future__ import annotations
 
 import argparse
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
+from cortex_mlx.retrieval import EmbeddingCache, RetrievalEngine
 from cortex_mlx.router import ModelRouter
 
+DEFAULT_CACHE_DIR = Path(__file__).with_name(".cache") / "embeddings"
+
 
 def load_corpus(path: Path) -> List[Tuple[str, str]]:
     docs: List[Tuple[str, str]] = []
@@ -21,43 +33,32 @@ def load_corpus(path: Path) -> List[Tuple[str, str]]:
     return docs
 
 
-def cosine(a: list[float], b: list[float]) -> float:
-    import math
-
-    dot = sum(x * y for x, y in zip(a, b))
-    na = math.sqrt(sum(x * x for x in a))
-    nb = math.sqrt(sum(x * x for x in b))
-    denom = (na * nb) or 1e-9
-    return dot / denom
-
-
-def retrieve(router: ModelRouter, query: str, docs: List[Tuple[str, str]], top_k: int) -> List[str]:
-    q = router.embed(query)["embedding"]
-    scored: List[Tuple[str, float]] = []
-    for doc_id, text in docs:
-        e = router.embed(text)["embedding"]
-        scored.append((doc_id, cosine(q, e)))
-    scored.sort(key=lambda x: x[1], reverse=True)
-    return [doc_id for doc_id, _ in scored[:top_k]]
+def run_suite(
+    name: str, router: ModelRouter, cache: Optional[EmbeddingCache], batch_size: int
+) -> dict:
+    start = time.perf_counter()
+    engine = RetrievalEngine(router, cache, batch_size)
+    suite_path = Path(__file__).with_name("traces").joinpath("v1", f"{name}.json")
+    suite = json.loads(suite_path.read_text())
 
+    # Group cases by corpus so each corpus is scored in one batch
+    by_corpus: dict[str, list[dict]] = {}
+    for case in suite:
+        by_corpus.setdefault(case["corpus"], []).append(case)
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--suite", default="rag", help="suite name under traces/v1 (default: rag)")
-    ap.add_argument("--out", default=None, help="write JSON results to this file")
-    args = ap.parse_args()
+    predictions: dict[int, List[str]] = {}
+    for corpus, cases in by_corpus.items():
+        index = engine.index(corpus, load_corpus(Path(__file__).parent / corpus))
+        top_k = max(int(case.get("topK", 1)) for case in cases)
+        ranked = engine.search(index, [case["query"] for case in cases], top_k)
+        for case, ids in zip(cases, ranked):
+            predictions[id(case)] = ids[: int(case.get("topK", 1))]
 
-    router = ModelRouter()
-    suite_path = Path(__file__).with_name("traces").joinpath("v1", f"{args.suite}.json")
-    suite = json.loads(Path(suite_path).read_text())
     results = []
     failures = 0
     for case in suite:
-        corpus_path = Path(__file__).with_name(case["corpus"])
-        corpus = load_corpus(corpus_path)
-        top_k = int(case.get("topK", 1))
-        predicted = retrieve(router, case["query"], corpus, top_k)
-        ok = predicted and predicted[0] == case["expectedTopId"]
+        predicted = predictions[id(case)]
+        ok = bool(predicted) and predicted[0] == case["expectedTopId"]
         if not ok:
             failures += 1
         results.append(
@@ -69,10 +70,46 @@ def main():
             }
         )
 
+    wall_ms = (time.perf_counter() - start) * 1000
+    print(
+        f"[retrieval:{name}] completed with {failures} failures in {wall_ms:.0f} ms "
+        f"({engine.stats.calls} embedding calls, {engine.stats.texts} texts, "
+        f"{engine.stats.cache_hits} cache hits)"
+    )
+    return {
+        "suite": name,
+        "failures": failures,
+        "wall_ms": round(wall_ms, 1),
+        "embedding": engine.stats.as_dict(),
+        "results": results,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument(
+        "--suite",
+        default="rag",
+        help="comma-separated suite names under traces/v1 (default: rag)",
+    )
+    ap.add_argument("--out", default=None, help="write JSON results to this file")
+    ap.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR)
+    ap.add_argument("--no-cache", action="store_true", help="do not read or write the cache")
+    ap.add_argument("--batch-size", type=int, default=64)
+    ap.add_argument("--workers", type=int, default=None, help="suites run in parallel")
+    args = ap.parse_args()
+
+    router = ModelRouter()
+    cache = None if args.no_cache else EmbeddingCache(args.cache_dir)
+    names = [name.strip() for name in args.suite.split(",") if name.strip()]
+
+    with ThreadPoolExecutor(max_workers=args.workers) as ex:
+        reports = list(ex.map(lambda name: run_suite(name, router, cache, args.batch_size), names))
+
+    failures = sum(report["failures"] for report in reports)
     if args.out:
-        Path(args.out).write_text(
-            json.dumps({"suite": "rag", "failures": failures, "results": results}, indent=2)
-        )
+        payload = reports[0] if len(reports) == 1 else {"failures": failures, "suites": reports}
+        Path(args.out).write_text(json.dumps(payload, indent=2))
     print(f"[retrieval] completed with {failures} failures")
     return 1 if failures else 0
 
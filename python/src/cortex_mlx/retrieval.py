@@ -0,0 +1,180 @@
+"""Embedding cache and vectorized retrieval for evaluation suites.
+
+Corpus documents are embedded once per model, in batches, and kept on disk
+in a content-addressed cache keyed by model and text hash, so repeated runs
+only embed new or changed documents. Queries are scored against a whole
+corpus with one matrix product and ``argpartition`` top-k selection.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from .router import ModelRouter
+
+DEFAULT_BATCH_SIZE = 64
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+class EmbeddingCache:
+    """Vectors stored as ``<root>/<model digest>/<xx>/<text digest>.npy``.
+
+    Entries are written to a temporary file and renamed into place, so
+    several processes or threads can share a cache directory.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+
+    def _path(self, model: str, text: str) -> Path:
+        digest = _digest(text)
+        return self.root / _digest(model)[:16] / digest[:2] / f"{digest}.npy"
+
+    def get(self, model: str, text: str) -> Optional[np.ndarray]:
+        try:
+            return np.load(self._path(model, text), allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, model: str, text: str, vector: np.ndarray) -> None:
+        path = self._path(model, text)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.asarray(vector, dtype=np.float32), allow_pickle=False)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+
+@dataclass
+class EmbeddingStats:
+    """Work done by one :class:`RetrievalEngine`."""
+
+    calls: int = 0  # embedding requests sent to the router
+    texts: int = 0  # texts embedded by the model
+    cache_hits: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {"calls": self.calls, "texts": self.texts, "cache_hits": self.cache_hits}
+
+
+@dataclass
+class CorpusIndex:
+    """Unit-normalized document vectors, one row per document."""
+
+    ids: list[str]
+    vectors: np.ndarray = field(repr=False)
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class RetrievalEngine:
+    """Embed corpora once and rank documents for batches of queries."""
+
+    def __init__(
+        self,
+        router: ModelRouter,
+        cache: Optional[EmbeddingCache] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        self.router = router
+        self.cache = cache
+        self.batch_size = batch_size
+        self.stats = EmbeddingStats()
+        self._model: Optional[str] = None
+        self._indexes: dict[str, CorpusIndex] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def model(self) -> str:
+        if self._model is None:
+            self._model = self.router.embedding_model()
+        return self._model
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Unit-normalized embeddings of ``texts``, one row each."""
+        model = self.model
+        vectors: list[Optional[np.ndarray]] = [None] * len(texts)
+        if self.cache is not None:
+            for i, text in enumerate(texts):
+                vectors[i] = self.cache.get(model, text)
+            self.stats.cache_hits += sum(v is not None for v in vectors)
+
+        # Duplicate texts are embedded once
+        missing = list(dict.fromkeys(t for t, v in zip(texts, vectors) if v is None))
+        embedded: dict[str, np.ndarray] = {}
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start : start + self.batch_size]
+            result = self.router.embed_batch(batch)
+            if result["model"] != model:
+                # Vectors from different models are not comparable
+                raise RuntimeError(
+                    f"Embedding model changed from {model} to {result['model']}"
+                )
+            self.stats.calls += 1
+            self.stats.texts += len(batch)
+            for text, vector in zip(batch, result["embeddings"]):
+                embedded[text] = np.asarray(vector, dtype=np.float32)
+                if self.cache is not None:
+                    self.cache.put(model, text, embedded[text])
+
+        rows = [v if v is not None else embedded[t] for t, v in zip(texts, vectors)]
+        if not rows:
+            return np.zeros((0, 0), dtype=np.float32)
+        return _normalize(np.vstack(rows).astype(np.float32, copy=False))
+
+    def index(self, key: str, docs: Sequence[tuple[str, str]]) -> CorpusIndex:
+        """Embed ``(doc_id, text)`` pairs, reusing the index built for ``key``."""
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None:
+                vectors = self.embed([text for _, text in docs])
+                index = CorpusIndex([doc_id for doc_id, _ in docs], vectors)
+                self._indexes[key] = index
+            return index
+
+    def search(self, index: CorpusIndex, queries: Sequence[str], top_k: int) -> list[list[str]]:
+        """Ids of the ``top_k`` most similar documents for each query."""
+        if not queries:
+            return []
+        if not index.ids:
+            return [[] for _ in queries]
+        scores = self.embed(queries) @ index.vectors.T
+        k = min(top_k, len(index.ids))
+        if k < len(index.ids):
+            candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.broadcast_to(np.arange(k), (len(queries), k))
+        results = []
+        for row, cols in zip(scores, candidates):
+            # Highest score first; ties keep corpus order
+            ranked = cols[np.lexsort((cols, -row[cols]))]
+            results.append([index.ids[i] for i in ranked])
+        return results
+
+
+__all__ = [
+    "CorpusIndex",
+    "EmbeddingCache",
+    "EmbeddingStats",
+    "RetrievalEngine",
+]
@@ -4,6 +4,7 @@ import logging
 import math
 import os
 import time
+import zlib
 from collections import Counter
 from dataclasses import dataclass
 from typing import Any, Dict, Optional, Protocol
@@ -34,6 +35,20 @@ class ModelAdapter(Protocol):
     def rerank(self, query: str, docs: list[str], timeout: float) -> list[int]: ...
 
 
+class BatchEmbedder(Protocol):
+    """Adapters that embed many texts per call.
+
+    ``embed_model`` names the model ``embed_batch`` tries first;
+    ``embed_batch`` returns the model that actually answered with the vectors.
+    """
+
+    embed_model: str
+
+    def embed_batch(
+        self, texts: list[str], timeout: float
+    ) -> tuple[str, list[list[float]]]: ...
+
+
 @dataclass
 class RouterConfig:
     """Configuration for :class:`ModelRouter`."""
@@ -47,6 +62,7 @@ class MLXAdapter:
     """Adapter using local MLX models when available."""
 
     name = "mlx"
+    embed_model = "bow-128"
 
     def __init__(self) -> None:
         self._ok = False
@@ -101,11 +117,15 @@ class MLXAdapter:
         vec = [0.0] * dim
         counts = Counter(text.lower().split())
         for token, c in counts.items():
-            idx = hash(token) % dim
+            # crc32 rather than hash(): str hashes are salted per process
+            idx = zlib.crc32(token.encode()) % dim
             vec[idx] += float(c)
         norm = math.sqrt(sum(x * x for x in vec)) or 1.0
         return [x / norm for x in vec]
 
+    def embed_batch(self, texts: list[str], timeout: float) -> tuple[str, list[list[float]]]:
+        return self.embed_model, [self.embed(text, timeout) for text in texts]
+
     def rerank(self, query: str, docs: list[str], timeout: float) -> list[int]:
         """Rerank documents by cosine similarity to the query."""
 
@@ -179,6 +199,10 @@ class OllamaAdapter:
         else:
             self._client = OpenAI(base_url=f"{base_url}/v1", api_key=api_key)
 
+    @property
+    def embed_model(self) -> str:
+        return self.embed_models[0]
+
     def available(self) -> bool:
         try:
             r = httpx.get(self.base_url + "/api/tags", timeout=1.5)
@@ -225,6 +249,22 @@ class OllamaAdapter:
                 logger.warning("embed model %s failed: %s", model, exc)
         raise RuntimeError(f"All embed models failed: {last_err}")
 
+    def embed_batch(self, texts: list[str], timeout: float) -> tuple[str, list[list[float]]]:
+        last_err: Exception | None = None
+        for model in self.embed_models:
+            try:
+                res = self._client.embeddings.create(
+                    model=model,
+                    input=texts,
+                    timeout=timeout,
+                )
+                data = sorted(res.data, key=lambda d: d.index)
+                return model, [d.embedding for d in data]
+            except Exception as exc:  # pragma: no cover - depends on model availability
+                last_err = exc
+                logger.warning("embed model %s failed: %s", model, exc)
+        raise RuntimeError(f"All embed models failed: {last_err}")
+
     def rerank(self, query: str, docs: list[str], timeout: float) -> list[int]:
         q = self.embed(query, timeout)
 
@@ -287,6 +327,31 @@ class ModelRouter:
         vec = adapter.embed(text, self.config.timeout_seconds)
         return {"adapter": adapter.name, "embedding": vec}
 
+    def embedding_model(self) -> str:
+        """Identifier of the model ``embed_batch`` will try first."""
+        adapter = self._first_available()
+        if adapter is None:
+            raise RuntimeError("No adapters available")
+        model = getattr(adapter, "embed_model", None)
+        return f"{adapter.name}:{model}" if model else adapter.name
+
+    def embed_batch(self, texts: list[str]) -> Dict[str, Any]:
+        """Embed ``texts`` in one adapter call where the adapter supports it.
+
+        ``model`` in the result identifies the model that produced the vectors,
+        in the same form as :meth:`embedding_model`.
+        """
+        adapter = self._first_available()
+        if adapter is None:
+            raise RuntimeError("No adapters available")
+        timeout = self.config.timeout_seconds
+        if hasattr(adapter, "embed_batch"):
+            model, vecs = adapter.embed_batch(texts, timeout)
+            model = f"{adapter.name}:{model}"
+        else:
+            model, vecs = adapter.name, [adapter.embed(text, timeout) for text in texts]
+        return {"adapter": adapter.name, "model": model, "embeddings": vecs}
+
     def rerank(self, query: str, docs: list[str]) -> Dict[str, Any]:
         adapter = self._first_available()
         if adapter is None:
@@ -296,6 +361,7 @@ class ModelRouter:
 
 
 __all__ = [
+    "BatchEmbedder",
     "ModelRouter",
     "RouterConfig",
     "MLXAdapter",
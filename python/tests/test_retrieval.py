@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import math
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from cortex_mlx.retrieval import EmbeddingCache, RetrievalEngine
+from cortex_mlx.router import MLXAdapter, ModelRouter
+
+
+class CountingAdapter:
+    """Bag-of-words embeddings via :class:`MLXAdapter`, counting model calls."""
+
+    name = "counting"
+
+    def __init__(self, embed_model: str = "bow-128") -> None:
+        self.embed_model = embed_model
+        self.calls = 0
+        self.texts = 0
+        self._bow = MLXAdapter.__new__(MLXAdapter)
+
+    def available(self) -> bool:
+        return True
+
+    def embed(self, text: str, timeout: float) -> list[float]:  # pragma: no cover
+        raise AssertionError("retrieval should embed in batches")
+
+    def embed_batch(self, texts: list[str], timeout: float) -> tuple[str, list[list[float]]]:
+        self.calls += 1
+        self.texts += len(texts)
+        return self.embed_model, [self._bow.embed(text, timeout) for text in texts]
+
+
+def _corpus(n: int, seed: int = 0) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(400)]
+    return [(f"doc{i}", " ".join(rng.choices(words, k=12))) for i in range(n)]
+
+
+def _reference(query: list[float], docs: list[list[float]], top_k: int) -> list[int]:
+    # The per-document cosine loop the eval runner used to run
+    def cosine(a: list[float], b: list[float]) -> float:
+        dot = sum(x * y for x, y in zip(a, b))
+        denom = (math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(x * x for x in b))) or 1e-9
+        return dot / denom
+
+    scored = sorted(enumerate(docs), key=lambda d: cosine(query, d[1]), reverse=True)
+    return [i for i, _ in scored[:top_k]]
+
+
+def test_corpus_is_embedded_once_in_batches() -> None:
+    adapter = CountingAdapter()
+    engine = RetrievalEngine(ModelRouter(adapters=[adapter]), batch_size=64)
+    docs = _corpus(300)
+
+    index = engine.index("corpus", docs)
+    for _ in range(5):
+        assert engine.index("corpus", docs) is index
+    engine.search(index, [text for _, text in docs[:20]], top_k=3)
+
+    assert adapter.calls == math.ceil(300 / 64) + 1
+    assert engine.stats.texts == adapter.texts == 320
+
+
+def test_search_matches_per_document_cosine_ranking() -> None:
+    engine = RetrievalEngine(ModelRouter(adapters=[CountingAdapter()]))
+    docs = _corpus(500, seed=1)
+    queries = [text for _, text in _corpus(30, seed=2)]
+    bow = MLXAdapter.__new__(MLXAdapter)
+    doc_vectors = [bow.embed(text, 1.0) for _, text in docs]
+
+    ranked = engine.search(engine.index("c", docs), queries, top_k=5)
+
+    for query, ids in zip(queries, ranked):
+        scores = np.array(doc_vectors) @ np.array(bow.embed(query, 1.0))
+        expected = _reference(bow.embed(query, 1.0), doc_vectors, 5)
+        # Same ranking, up to the order of documents with tied scores
+        assert scores[[int(i[3:]) for i in ids]] == pytest.approx(scores[expected])
+
+    assert len(engine.search(engine.index("c", docs), ["x"], top_k=1000)[0]) == 500
+    assert engine.search(engine.index("empty", []), ["x"], top_k=1) == [[]]
+
+
+def test_disk_cache_is_keyed_by_model_and_text(tmp_path: Path) -> None:
+    cache = EmbeddingCache(tmp_path)
+    docs = _corpus(50)
+
+    first = CountingAdapter()
+    RetrievalEngine(ModelRouter(adapters=[first]), cache).index("c", docs)
+    # A later run (or a parallel suite) reuses the vectors
+    second = CountingAdapter()
+    engine = RetrievalEngine(ModelRouter(adapters=[second]), cache)
+    engine.index("c", docs + [("new", "a brand new document")])
+    # A different model never sees another model's vectors
+    other = CountingAdapter("bow-other")
+    RetrievalEngine(ModelRouter(adapters=[other]), cache).index("c", docs)
+
+    assert (first.texts, second.texts, other.texts) == (50, 1, 50)
+    assert engine.stats.cache_hits == 50
+    assert len(list(tmp_path.rglob("*.npy"))) == 101
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_vectors_from_a_fallback_model_are_rejected() -> None:
+    class FallbackAdapter(CountingAdapter):
+        def embed_batch(self, texts: list[str], timeout: float):
+            _, vectors = super().embed_batch(texts, timeout)
+            return "fallback-model", vectors
+
+    engine = RetrievalEngine(ModelRouter(adapters=[FallbackAdapter()]))
+    with pytest.raises(RuntimeError, match="Embedding model changed"):
+        engine.index("c", _corpus(3))
+
+
+def test_bag_of_words_embedding_is_stable_across_processes() -> None:
+    code = (
+        "from cortex_mlx.router import MLXAdapter;"
+        "print(MLXAdapter.__new__(MLXAdapter).embed('stable tokens hash', 1.0)[:128])"
+    )
+    src = str(Path(__file__).resolve().parents[1] / "src")
+    outputs = {
+        subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={"PYTHONPATH": src, "PYTHONHASHSEED": seed},
+        ).stdout
+        for seed in ("1", "2")
+    }
+    assert len(outputs) == 1
@@ -368,3 +368,62 @@ def test_cli_emits_brainwav_branding(fixture_repo: Path, tmp_path: Path) -> None
     assert "brAInwav codemap" in result.stdout
     assert json_path.exists()
     assert md_path.exists()
+
+
+def _cached_run(
+    codemap_module: ModuleType,
+    repo: Path,
+    tmp_path: Path,
+    analyzed: list[str],
+) -> dict[str, object]:
+    analyzed.clear()
+    data = codemap_module.generate_codemap(
+        repo_path=repo,
+        json_path=tmp_path / "codemap.json",
+        markdown_path=tmp_path / "codemap.md",
+        since_days=30,
+        extra_ignores=None,
+        scope="repo",
+        sections=None,
+        tools=("lizard",),
+        cache_path=tmp_path / "codemap-cache.json",
+        jobs=1,
+    )
+    return data["notes"]["file_cache"]
+
+
+def test_file_cache_only_reanalyzes_changed_files(
+    codemap_module: ModuleType,
+    fixture_repo: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    monkeypatch.setattr(
+        codemap_module,
+        "run_command",
+        _stubbed_run_factory(fixture_repo, []),
+    )
+    analyzed: list[str] = []
+    analyze_file = codemap_module.analyze_file
+
+    def recording_analyze(path_str: str, rel: str, known_digest: str | None = None):
+        analyzed.append(rel)
+        return analyze_file(path_str, rel, known_digest)
+
+    monkeypatch.setattr(codemap_module, "analyze_file", recording_analyze)
+
+    cold = _cached_run(codemap_module, fixture_repo, tmp_path, analyzed)
+    assert cold["reused"] == 0
+    assert cold["analyzed"] == len(analyzed) > 1
+
+    warm = _cached_run(codemap_module, fixture_repo, tmp_path, analyzed)
+    assert analyzed == []
+    assert warm["reused"] == cold["analyzed"]
+    assert (warm["analyzed"], warm["rehashed"]) == (0, 0)
+
+    router = fixture_repo / "apps/api/src/router.ts"
+    router.write_text(router.read_text(encoding="utf-8") + "\nexport const extra = 1;\n", encoding="utf-8")
+    changed = _cached_run(codemap_module, fixture_repo, tmp_path, analyzed)
+    assert analyzed == ["apps/api/src/router.ts"]
+    assert (changed["analyzed"], changed["rehashed"]) == (1, 0)
+    assert changed["reused"] == cold["analyzed"] - 1
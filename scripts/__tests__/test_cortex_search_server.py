@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import sys
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SCRIPTS_DIR = REPO_ROOT / "scripts"
+
+pytest.importorskip("fastapi")
+
+
+def _load_module() -> ModuleType:
+    if str(SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR))
+    return importlib.import_module("cortex_search_server")
+
+
+DOCUMENTS = [
+    {"id": "a", "title": "Auth", "text": "token refresh flow for the auth gateway"},
+    {"id": "b", "title": "Gateway", "text": "gateway routing gateway retries"},
+    {"id": "c", "title": "Memories", "text": "memories store with vector search"},
+]
+
+
+def test_search_index_ranks_and_intersects_terms() -> None:
+    module = _load_module()
+    index = module.SearchIndex(DOCUMENTS)
+
+    top, total = index.search("gateway", limit=1)
+    assert total == 2
+    assert [index.documents[position]["id"] for _, position in top] == ["b"]
+
+    top, total = index.search("Auth gateway", limit=10)
+    assert total == 1
+    assert index.documents[top[0][1]]["id"] == "a"
+
+    assert index.search("missing gateway", limit=10) == ([], 0)
+    assert index.by_id["c"]["title"] == "Memories"
+
+
+def test_search_scores_match_bm25_over_documents_with_every_term() -> None:
+    module = _load_module()
+    documents = [
+        {"id": i, "text": "common " * (1 + i % 3) + ("rare" if i % 50 == 0 else "filler")}
+        for i in range(500)
+    ]
+    index = module.SearchIndex(documents)
+    terms = ["rare", "common"]
+
+    expected = {}
+    for position, entry in enumerate(documents):
+        tokens = module.tokenize(entry["text"])
+        if not all(term in tokens for term in terms):
+            continue
+        norm = 1 - module.BM25_B + module.BM25_B * len(tokens) / index.avg_doc_length
+        expected[position] = sum(
+            index._idf(term)
+            * tokens.count(term)
+            * (module.BM25_K1 + 1)
+            / (tokens.count(term) + module.BM25_K1 * norm)
+            for term in terms
+        )
+
+    top, total = index.search("common rare", limit=len(documents))
+    assert total == len(expected) == 10
+    assert {position: score for score, position in top} == pytest.approx(expected)
+
+
+def test_file_backed_index_reloads_when_file_changes(tmp_path: Path) -> None:
+    module = _load_module()
+    data_file = tmp_path / "index.json"
+    data_file.write_text(json.dumps(DOCUMENTS[:1]), encoding="utf-8")
+    loads: list[Path] = []
+
+    def loader(path: Path):
+        loads.append(path)
+        return module._load_index(path)
+
+    holder = module.FileBacked(lambda: data_file, loader)
+    first = holder.get()
+    assert holder.get() is first
+    assert len(loads) == 1
+
+    data_file.write_text(json.dumps(DOCUMENTS), encoding="utf-8")
+    stat = data_file.stat()
+    os.utime(data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    second = holder.get()
+    assert second is not first
+    assert len(second.documents) == 3
+    assert len(loads) == 2
+
+    data_file.unlink()
+    assert holder.get() is None
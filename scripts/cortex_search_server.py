@@ -1,34 +1,151 @@
 from __future__ import annotations
 
+import heapq
 import json
+import math
+import re
+import threading
+from collections import Counter
+from collections.abc import Callable
 from pathlib import Path
-from typing import Any
+from typing import Any, Generic, TypeVar
 
-from fastapi import Depends, FastAPI, HTTPException, Query, Request, status
+from fastapi import FastAPI, HTTPException, Query, Request, status
 from fastapi.responses import JSONResponse
 
 DATA_FILE = Path("data/cortex-search-index.json")
 API_KEY_FILE = Path("config/cortex-search.key")
 
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+T = TypeVar("T")
+
 app = FastAPI(title="Cortex Search", version="1.0.0")
 
 
-def ensure_dataset() -> list[dict[str, Any]]:
-    if not DATA_FILE.exists():
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class SearchIndex:
+    """Inverted index with BM25 ranking and an id -> document map."""
+
+    def __init__(self, documents: list[dict[str, Any]]) -> None:
+        self.documents = documents
+        self.by_id: dict[Any, dict[str, Any]] = {}
+        # term -> {position: frequency}, so later AND terms are probed, not walked
+        self.postings: dict[str, dict[int, int]] = {}
+        self.doc_lengths: list[int] = []
+        for position, entry in enumerate(documents):
+            doc_id = entry.get("id")
+            if doc_id is not None:
+                self.by_id.setdefault(doc_id, entry)
+            terms = tokenize(entry.get("text", ""))
+            self.doc_lengths.append(len(terms))
+            for term, frequency in Counter(terms).items():
+                self.postings.setdefault(term, {})[position] = frequency
+        total_length = sum(self.doc_lengths)
+        self.avg_doc_length = total_length / len(documents) if documents else 0.0
+
+    def _idf(self, term: str) -> float:
+        df = len(self.postings.get(term, ()))
+        n = len(self.documents)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, limit: int) -> tuple[list[tuple[float, int]], int]:
+        """Return the top ``limit`` ``(score, position)`` pairs and the match count.
+
+        A document matches when it contains every query term; matches are
+        ranked by BM25 and only the top ``limit`` are materialized.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or any(term not in self.postings for term in terms):
+            return [], 0
+
+        # Walk the rarest posting list, then probe the others for its candidates
+        terms.sort(key=lambda term: len(self.postings[term]))
+        avg_doc_length = self.avg_doc_length or 1
+        scores: dict[int, float] = dict.fromkeys(self.postings[terms[0]], 0.0)
+        for term in terms:
+            idf = self._idf(term)
+            postings = self.postings[term]
+            next_scores: dict[int, float] = {}
+            for position, score in scores.items():
+                frequency = postings.get(position)
+                if frequency is None:
+                    continue
+                length_norm = 1 - BM25_B + BM25_B * (self.doc_lengths[position] / avg_doc_length)
+                weight = idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * length_norm)
+                next_scores[position] = score + weight
+            scores = next_scores
+            if not scores:
+                return [], 0
+
+        top = heapq.nlargest(limit, ((score, position) for position, score in scores.items()))
+        return top, len(scores)
+
+
+class FileBacked(Generic[T]):
+    """Value derived from a file, rebuilt atomically when the file's mtime changes."""
+
+    def __init__(self, path_getter: Callable[[], Path], loader: Callable[[Path], T]) -> None:
+        self._path_getter = path_getter
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._stamp: tuple[Path, int, int] | None = None
+        self._value: T | None = None
+
+    def get(self) -> T | None:
+        """Return the current value, or ``None`` when the file does not exist."""
+        path = self._path_getter()
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        stamp = (path, stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return self._value
+        with self._lock:
+            if stamp != self._stamp:
+                # Build fully before publishing so readers never see a partial index
+                value = self._loader(path)
+                self._value, self._stamp = value, stamp
+            return self._value
+
+
+def _load_index(path: Path) -> SearchIndex:
+    with path.open("r", encoding="utf-8") as handle:
+        return SearchIndex(json.load(handle))
+
+
+def _load_api_key(path: Path) -> str:
+    return path.read_text(encoding="utf-8").strip()
+
+
+_index = FileBacked(lambda: DATA_FILE, _load_index)
+_api_key = FileBacked(lambda: API_KEY_FILE, _load_api_key)
+
+
+def ensure_dataset() -> SearchIndex:
+    index = _index.get()
+    if index is None:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Search index missing. Upload data/cortex-search-index.json",
         )
-    with DATA_FILE.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+    return index
 
 
 def require_api_key(request: Request) -> None:
-    if not API_KEY_FILE.exists():
+    expected = _api_key.get()
+    if expected is None:
         # When no key is configured, operate in open mode (internal-only).
         return
     token = (request.headers.get("Authorization") or "").removeprefix("Bearer ").strip()
-    expected = API_KEY_FILE.read_text(encoding="utf-8").strip()
     if token != expected:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key")
 
@@ -45,26 +162,26 @@ def search(
     limit: int = Query(10, ge=1, le=50),
 ) -> JSONResponse:
     require_api_key(request)
-    documents = ensure_dataset()
-    lowered = q.lower()
+    index = ensure_dataset()
+    top, total_found = index.search(q, limit)
     results: list[dict[str, Any]] = []
-    for entry in documents:
+    for score, position in top:
+        entry = index.documents[position]
         text = entry.get("text", "")
-        if lowered in text.lower():
-            results.append(
-                {
-                    "id": entry.get("id"),
-                    "title": entry.get("title"),
-                    "snippet": entry.get("snippet") or text[:200],
-                    "url": entry.get("url", ""),
-                    "source": entry.get("source", "cortex"),
-                    "score": entry.get("score", 0.5),
-                }
-            )
+        results.append(
+            {
+                "id": entry.get("id"),
+                "title": entry.get("title"),
+                "snippet": entry.get("snippet") or text[:200],
+                "url": entry.get("url", ""),
+                "source": entry.get("source", "cortex"),
+                "score": round(score, 4),
+            }
+        )
     payload = {
         "query": q,
-        "results": results[:limit],
-        "total_found": len(results),
+        "results": results,
+        "total_found": total_found,
     }
     return JSONResponse(payload)
 
@@ -72,18 +189,17 @@ def search(
 @app.get("/documents/{doc_id}")
 def fetch_document(request: Request, doc_id: str) -> JSONResponse:
     require_api_key(request)
-    documents = ensure_dataset()
-    for entry in documents:
-        if entry.get("id") == doc_id:
-            payload = {
-                "id": entry.get("id"),
-                "title": entry.get("title"),
-                "text": entry.get("text", ""),
-                "metadata": entry.get("metadata", {}),
-                "url": entry.get("url", ""),
-            }
-            return JSONResponse(payload)
-    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
+    entry = ensure_dataset().by_id.get(doc_id)
+    if entry is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
+    payload = {
+        "id": entry.get("id"),
+        "title": entry.get("title"),
+        "text": entry.get("text", ""),
+        "metadata": entry.get("metadata", {}),
+        "url": entry.get("url", ""),
+    }
+    return JSONResponse(payload)
 
 
 if __name__ == "__main__":
@@ -2,15 +2,20 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import io
 import json
 import os
 import re
 import subprocess
 import sys
 from collections import Counter, defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import ExitStack
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Iterable, Iterator, Sequence
 
 BRAND = "brAInwav"
 IGNORE_DIRS_DEFAULT = {
@@ -80,6 +85,17 @@ HTTP_PATTERNS = (
 OPTIONAL_TOOLS = ("lizard", "madge", "depcheck")
 SECTION_KEYS = ("languages", "size", "git", "complexity", "tests", "apis", "ops", "analysis")
 SKIP_SUFFIXES = {".png", ".jpg", ".jpeg", ".gif", ".bmp", ".ico", ".pdf", ".zip", ".tar", ".gz", ".7z", ".min.js", ".min.css"}
+LIZARD_SUFFIXES = {
+    ".py", ".go", ".js", ".jsx", ".ts", ".tsx", ".java", ".kt", ".rb", ".rs",
+    ".c", ".h", ".cpp", ".hpp", ".cs", ".php", ".scala", ".swift",
+}
+LOC_LIMIT_BYTES = 2_000_000
+ENDPOINT_LIMIT_BYTES = 200_000
+CACHE_VERSION = 1
+# Below this many changed files a process pool costs more than it saves
+PARALLEL_SCAN_THRESHOLD = 64
+# Above this many changed files lizard is re-run over the whole scan root
+LIZARD_INCREMENTAL_LIMIT = 200
 
 
 def run_command(command: Sequence[str], cwd: Path | None = None) -> tuple[int, str, str]:
@@ -302,24 +318,35 @@ def compute_complexity(
     scan_root: Path,
     ignore_dirs: set[str],
     requested_tools: set[str],
-) -> tuple[dict[str, object], dict[str, int]]:
+    targets: Sequence[Path] | None = None,
+    cached: dict[str, dict[str, float]] | None = None,
+) -> tuple[dict[str, object], dict[str, dict[str, float]]]:
+    """Run lizard over ``targets`` (default: the whole scan root).
+
+    ``cached`` holds per-file records for files that were not re-analysed;
+    they are merged under the fresh lizard output before ranking.
+    """
     info: dict[str, object] = {"tool": "lizard", "available": False}
     if "lizard" not in requested_tools:
         info["reason"] = "not requested"
         return info, {}
-    command = ("lizard", "-j", *_create_lizard_excludes(ignore_dirs), str(scan_root))
-    code, out, err = run_command(command, cwd=repo)
-    if code != 0:
-        info["error"] = err or out
-        return info, {}
-    payload = _safe_load_json(out)
-    if payload is None:
-        info["error"] = "failed to parse lizard JSON output"
-        return info, {}
+    records: dict[str, dict[str, float]] = {}
+    if targets is None or targets:
+        paths = [str(target) for target in targets] if targets is not None else [str(scan_root)]
+        command = ("lizard", "-j", *_create_lizard_excludes(ignore_dirs), *paths)
+        code, out, err = run_command(command, cwd=repo)
+        if code != 0:
+            info["error"] = err or out
+            return info, {}
+        payload = _safe_load_json(out)
+        if payload is None:
+            info["error"] = "failed to parse lizard JSON output"
+            return info, {}
+        records, _ = _parse_lizard_records(repo, payload)
     info["available"] = True
-    records, nloc_map = _parse_lizard_records(repo, payload)
-    info["worst_files"] = _rank_complexity(records)
-    return info, nloc_map
+    merged = {**(cached or {}), **records}
+    info["worst_files"] = _rank_complexity(merged)
+    return info, merged
 
 
 def _normalize_relative_path(repo: Path, path: Path) -> str:
@@ -329,7 +356,7 @@ def _normalize_relative_path(repo: Path, path: Path) -> str:
         return str(path)
 
 
-def _count_lines(path: Path, limit_bytes: int = 2_000_000) -> int:
+def _count_lines(path: Path, limit_bytes: int = LOC_LIMIT_BYTES) -> int:
     try:
         if path.stat().st_size > limit_bytes:
             return 0
@@ -339,7 +366,7 @@ def _count_lines(path: Path, limit_bytes: int = 2_000_000) -> int:
         return 0
 
 
-def scan_http_endpoints(files: Sequence[Path], repo: Path, max_bytes: int = 200000) -> list[dict[str, object]]:
+def scan_http_endpoints(files: Sequence[Path], repo: Path, max_bytes: int = ENDPOINT_LIMIT_BYTES) -> list[dict[str, object]]:
     endpoints: list[dict[str, object]] = []
     for path in files:
         try:
@@ -348,13 +375,22 @@ def scan_http_endpoints(files: Sequence[Path], repo: Path, max_bytes: int = 2000
             text = path.read_text(encoding="utf-8", errors="ignore")
         except OSError:
             continue
-        rel = _normalize_relative_path(repo, path)
-        for pattern, kind in HTTP_PATTERNS:
-            for match in pattern.finditer(text):
-                endpoints.extend(_describe_endpoint(rel, kind, match))
+        endpoints.extend(_endpoints_in_text(text, _normalize_relative_path(repo, path)))
+    return endpoints
+
+
+def _endpoints_in_text(text: str, rel: str) -> list[dict[str, object]]:
+    endpoints: list[dict[str, object]] = []
+    for pattern, kind in HTTP_PATTERNS:
+        for match in pattern.finditer(text):
+            endpoints.extend(_describe_endpoint(rel, kind, match))
     return endpoints
 
 
+def _is_k8s_manifest(text: str) -> bool:
+    return "apiVersion:" in text and "kind:" in text
+
+
 def _describe_endpoint(rel: str, kind: str, match: re.Match[str]) -> list[dict[str, object]]:
     method = match.group(1) if match.groups() else "get"
     path_value = match.group(2) if match.lastindex and match.lastindex >= 2 else match.group(1)
@@ -371,7 +407,11 @@ def _describe_endpoint(rel: str, kind: str, match: re.Match[str]) -> list[dict[s
     return [{"file": rel, "method": entry, "path": path_value, "via": via} for entry in methods]
 
 
-def detect_ops(files: Sequence[Path], repo: Path) -> dict[str, list[str]]:
+def detect_ops(
+    files: Sequence[Path],
+    repo: Path,
+    k8s_files: set[Path] | None = None,
+) -> dict[str, list[str]]:
     ops: defaultdict[str, list[str]] = defaultdict(list)
     for path in files:
         rel = _normalize_relative_path(repo, path)
@@ -381,11 +421,14 @@ def detect_ops(files: Sequence[Path], repo: Path) -> dict[str, list[str]]:
         if lower in {"docker-compose.yml", "docker-compose.yaml", "compose.yml", "compose.yaml"}:
             ops["compose"].append(rel)
         if path.suffix.lower() in {".yml", ".yaml"}:
-            try:
-                text = path.read_text(encoding="utf-8", errors="ignore")
-            except OSError:
-                text = ""
-            if "apiVersion:" in text and "kind:" in text:
+            if k8s_files is not None:
+                is_k8s = path in k8s_files
+            else:
+                try:
+                    is_k8s = _is_k8s_manifest(path.read_text(encoding="utf-8", errors="ignore"))
+                except OSError:
+                    is_k8s = False
+            if is_k8s:
                 ops["k8s"].append(rel)
         if lower.startswith(".env") or ".env" in lower:
             ops["env_files"].append(rel)
@@ -409,6 +452,184 @@ def detect_tests(files: Sequence[Path], repo: Path) -> dict[str, object]:
     return {"count": len(detected), "files": sorted(detected)}
 
 
+def analyze_file(path_str: str, rel: str, known_digest: str | None = None) -> dict[str, object]:
+    """Hash one file and extract its line count, endpoints and k8s marker.
+
+    Runs in worker processes, so it only takes and returns plain data. When the
+    content hash equals ``known_digest`` the scan is skipped and the caller
+    reuses its cached results.
+    """
+    path = Path(path_str)
+    empty: dict[str, object] = {"sha256": None, "loc": 0, "endpoints": [], "k8s": False}
+    try:
+        with path.open("rb") as handle:
+            if os.fstat(handle.fileno()).st_size > LOC_LIMIT_BYTES:
+                digest = hashlib.file_digest(handle, "sha256").hexdigest()
+                data = None
+            else:
+                data = handle.read()
+                digest = hashlib.sha256(data).hexdigest()
+    except OSError:
+        return empty
+    if digest == known_digest:
+        return {"sha256": digest, "unchanged": True}
+    if data is None:
+        return {**empty, "sha256": digest}
+    text = data.decode("utf-8", errors="ignore")
+    return {
+        "sha256": digest,
+        "loc": sum(1 for _ in io.StringIO(text, newline=None)),
+        "endpoints": _endpoints_in_text(text, rel) if len(data) <= ENDPOINT_LIMIT_BYTES else [],
+        "k8s": path.suffix.lower() in {".yml", ".yaml"} and _is_k8s_manifest(text),
+    }
+
+
+class FileCache:
+    """Per-file scan results persisted between runs.
+
+    Entries are keyed by path and validated by size and mtime; when those
+    change the content hash decides whether the file really needs a rescan.
+    Lizard records are stored alongside so unchanged files are not re-measured.
+    """
+
+    def __init__(self, path: Path | None, repo: Path) -> None:
+        self.path = path
+        self.repo = repo
+        self.entries: dict[str, dict[str, object]] = {}
+        self.reused = 0
+        self.rehashed = 0
+        self.analyzed = 0
+        if path is not None:
+            self._load()
+
+    def _load(self) -> None:
+        if self.path is None:
+            return
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return
+        if (
+            isinstance(payload, dict)
+            and payload.get("version") == CACHE_VERSION
+            and payload.get("repo") == str(self.repo)
+            and isinstance(payload.get("files"), dict)
+        ):
+            self.entries = payload["files"]
+
+    def partition(
+        self, files: Sequence[Path], repo: Path
+    ) -> tuple[dict[str, dict[str, object]], list[tuple[Path, str, os.stat_result | None]]]:
+        """Split ``files`` into cached records and ``(path, rel, stat)`` still to scan."""
+        fresh: dict[str, dict[str, object]] = {}
+        stale: list[tuple[Path, str, os.stat_result | None]] = []
+        for path in files:
+            key = str(path)
+            try:
+                stat = path.stat()
+            except OSError:
+                stale.append((path, _normalize_relative_path(repo, path), None))
+                continue
+            entry = self.entries.get(key)
+            if entry and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+                fresh[key] = entry
+                self.reused += 1
+            else:
+                stale.append((path, _normalize_relative_path(repo, path), stat))
+        return fresh, stale
+
+    def complexity_plan(
+        self,
+        fresh: dict[str, dict[str, object]],
+        stale: Sequence[tuple[Path, str, os.stat_result | None]],
+    ) -> tuple[list[Path] | None, dict[str, dict[str, float]] | None]:
+        """Return lizard targets and cached records, or ``(None, None)`` for a full run."""
+        if self.path is None or len(stale) > LIZARD_INCREMENTAL_LIMIT:
+            return None, None
+        if any("complexity" not in entry for entry in fresh.values()):
+            return None, None
+        cached = {
+            str(entry["rel"]): entry["complexity"]
+            for entry in fresh.values()
+            if entry["complexity"]
+        }
+        targets = [path for path, _, _ in stale if path.suffix.lower() in LIZARD_SUFFIXES]
+        return targets, cached
+
+    def scan(
+        self,
+        stale: Sequence[tuple[Path, str, os.stat_result | None]],
+        pool: Executor | None,
+    ) -> Iterator[tuple[str, dict[str, object]]]:
+        """Analyse ``stale`` files, in ``pool`` when given, and record the results.
+
+        Work is submitted to ``pool`` immediately; results are recorded as the
+        returned iterator is consumed.
+        """
+        tasks = [
+            (str(path), rel, self.entries.get(str(path), {}).get("sha256"))
+            for path, rel, _ in stale
+        ]
+        if pool is not None and tasks:
+            chunksize = max(1, len(tasks) // ((os.cpu_count() or 1) * 4))
+            results: Iterable[dict[str, object]] = pool.map(analyze_file, *zip(*tasks, strict=True), chunksize=chunksize)
+        else:
+            results = (analyze_file(*task) for task in tasks)
+        return self._record(stale, results)
+
+    def _record(
+        self,
+        stale: Sequence[tuple[Path, str, os.stat_result | None]],
+        results: Iterable[dict[str, object]],
+    ) -> Iterator[tuple[str, dict[str, object]]]:
+        for (path, rel, stat), result in zip(stale, results, strict=True):
+            key = str(path)
+            if result.pop("unchanged", False):
+                record = dict(self.entries[key])
+                self.rehashed += 1
+            else:
+                record = result
+                self.analyzed += 1
+            record["rel"] = rel
+            if stat is not None and record["sha256"] is not None:
+                record["size"] = stat.st_size
+                record["mtime_ns"] = stat.st_mtime_ns
+                self.entries[key] = record
+            yield key, record
+
+    def save(self, scan_root: Path, current: Iterable[str]) -> None:
+        """Drop vanished files under ``scan_root`` and write the cache atomically."""
+        if self.path is None:
+            return
+        keep = set(current)
+        prefix = str(scan_root) + os.sep
+        self.entries = {
+            key: entry
+            for key, entry in self.entries.items()
+            if key in keep or not key.startswith(prefix)
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        payload = {"version": CACHE_VERSION, "repo": str(self.repo), "files": self.entries}
+        tmp_path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "enabled": self.path is not None,
+            "reused": self.reused,
+            "rehashed": self.rehashed,
+            "analyzed": self.analyzed,
+        }
+
+
+def _make_scan_pool(stale_count: int, jobs: int | None) -> ProcessPoolExecutor | None:
+    workers = jobs or os.cpu_count() or 1
+    if workers <= 1 or stale_count < PARALLEL_SCAN_THRESHOLD:
+        return None
+    return ProcessPoolExecutor(max_workers=workers)
+
+
 def parse_coverage(root: Path) -> dict[str, object]:
     data_path = root / "coverage" / "coverage-summary.json"
     if data_path.exists():
@@ -544,11 +765,15 @@ def _build_size_summary(
     files: Sequence[Path],
     repo: Path,
     nloc_map: dict[str, int],
+    records: dict[str, dict[str, object]] | None = None,
 ) -> dict[str, object]:
     ordered: list[tuple[str, int]] = []
     for path in files:
         rel = _normalize_relative_path(repo, path)
-        loc = nloc_map.get(rel) or _count_lines(path)
+        if records is not None:
+            loc = nloc_map.get(rel) or int(records[str(path)]["loc"])
+        else:
+            loc = nloc_map.get(rel) or _count_lines(path)
         ordered.append((rel, loc))
     ordered.sort(key=lambda item: item[1], reverse=True)
     return {
@@ -596,18 +821,47 @@ def _compute_codemap_payload(
     since_days: int,
     requested_tools: set[str],
     sections: Sequence[str] | None,
+    cache_path: Path | None = None,
+    jobs: int | None = None,
 ) -> tuple[dict[str, object], set[str]]:
     files = list_files(scan_root, ignore_dirs)
     files_set = {path.resolve() for path in files}
     languages = summarize_languages(files)
-    git_info = gather_git_info(repo, files_set, since_days)
-    complexity, nloc_map = compute_complexity(repo, scan_root, ignore_dirs, requested_tools)
-    size = _build_size_summary(files, repo, nloc_map)
+    cache = FileCache(cache_path, repo)
+    records, stale = cache.partition(files, repo)
+    lizard_targets, lizard_cached = cache.complexity_plan(records, stale)
+    with ExitStack() as stack:
+        pool = _make_scan_pool(len(stale), jobs)
+        if pool is not None:
+            stack.enter_context(pool)
+        # Submit the file scan first so worker processes start before any thread
+        scanned = cache.scan(stale, pool)
+        executor = stack.enter_context(ThreadPoolExecutor(max_workers=3))
+        git_future = executor.submit(gather_git_info, repo, files_set, since_days)
+        complexity_future = executor.submit(
+            compute_complexity, repo, scan_root, ignore_dirs, requested_tools, lizard_targets, lizard_cached
+        )
+        analysis_future = executor.submit(build_analysis, repo, scan_root, requested_tools)
+        try:
+            records.update(scanned)
+        except BrokenProcessPool:
+            records.update(cache.scan(stale, None))
+        git_info = git_future.result()
+        complexity, complexity_records = complexity_future.result()
+        analysis = analysis_future.result()
+    if complexity["available"]:
+        measured = records.keys() if lizard_targets is None else [str(path) for path, _, _ in stale]
+        for key in measured:
+            record = records[key]
+            record["complexity"] = complexity_records.get(str(record["rel"]))
+    cache.save(scan_root, records.keys())
+    nloc_map = {rel: int(details.get("nloc", 0)) for rel, details in complexity_records.items()}
+    size = _build_size_summary(files, repo, nloc_map, records)
     tests = _merge_tests_with_coverage(files, repo, scan_root)
-    endpoints = scan_http_endpoints(files, repo)
-    ops = detect_ops(files, repo)
-    analysis = build_analysis(repo, scan_root, requested_tools)
+    endpoints = [endpoint for path in files for endpoint in records[str(path)]["endpoints"]]
+    ops = detect_ops(files, repo, k8s_files={path for path in files if records[str(path)]["k8s"]})
     notes = _build_notes(ignore_dirs, since_days, sections, requested_tools)
+    notes["file_cache"] = cache.stats()
     codemap = _assemble_codemap(
         repo,
         scope_info,
@@ -690,6 +944,8 @@ def generate_codemap(
     scope: str,
     sections: Sequence[str] | None,
     tools: Sequence[str] | None,
+    cache_path: Path | None = None,
+    jobs: int | None = None,
 ) -> dict[str, object]:
     repo = repo_path.resolve()
     projects = load_nx_projects(repo)
@@ -705,6 +961,8 @@ def generate_codemap(
         since_days=since_days,
         requested_tools=requested_tools,
         sections=sections,
+        cache_path=cache_path,
+        jobs=jobs,
     )
     filtered = filter_codemap(codemap, requested_sections)
     _write_outputs(filtered, json_path, markdown_path, requested_sections)
@@ -722,6 +980,9 @@ def build_argument_parser() -> argparse.ArgumentParser:
     parser.add_argument("--sections", help="Comma-separated sections to include (languages,size,git,complexity,tests,apis,ops,analysis)")
     parser.add_argument("--tools", help="Comma-separated optional tools to run (lizard,madge,depcheck,pydeps,go,jdeps)")
     parser.add_argument("--ignore", action="append", help="Additional directories to ignore", default=None)
+    parser.add_argument("--cache", help="Path for the per-file scan cache (default: codemap-cache.json next to --out)")
+    parser.add_argument("--no-cache", action="store_true", help="Rescan every file and skip writing the cache")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes for file scanning (default: CPU count)")
     return parser
 
 
@@ -740,6 +1001,8 @@ def main(argv: Sequence[str] | None = None) -> int:
             scope=args.scope,
             sections=sections,
             tools=tools,
+            cache_path=None if args.no_cache else Path(args.cache or Path(args.out).with_name("codemap-cache.json")),
+            jobs=args.jobs,
         )
     except ValueError as exc:
         print(f"{BRAND} codemap error: {exc}", file=sys.stderr)
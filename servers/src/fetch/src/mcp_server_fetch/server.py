@@ -1,4 +1,10 @@
-from typing import Annotated
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, replace
+from typing import Annotated, Generic, TypeVar
 from urllib.parse import urlparse, urlunparse
 
 import markdownify
@@ -23,6 +29,13 @@ from mcp.types import (
 
 DEFAULT_USER_AGENT_AUTONOMOUS = "ModelContextProtocol/1.0 (Autonomous; +https://github.com/modelcontextprotocol/servers)"
 DEFAULT_USER_AGENT_MANUAL = "ModelContextProtocol/1.0 (User-Specified; +https://github.com/modelcontextprotocol/servers)"
+DEFAULT_PAGE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_PAGE_CACHE_TTL = 300.0
+DEFAULT_ROBOTS_TTL = 3600.0
+DEFAULT_ROBOTS_NEGATIVE_TTL = 600.0
+DEFAULT_ROBOTS_MAX_ENTRIES = 1024
+DEFAULT_MAX_CONNECTIONS = 64
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 8
 
 
 def extract_content_from_html(html: str) -> str:
@@ -64,79 +77,374 @@ def get_robots_txt_url(url: str) -> str:
     return robots_url
 
 
+class HttpPool:
+    """A single pooled ``AsyncClient`` shared for the server lifetime.
+
+    Keep-alive connections are reused across fetches, and requests to any one
+    host are capped at ``max_per_host`` in flight.
+    """
+
+    max_tracked_hosts = 1024
+
+    def __init__(
+        self,
+        proxy_url: str | None = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+    ) -> None:
+        from httpx import AsyncClient, Limits
+
+        self.client = AsyncClient(
+            proxies=proxy_url,
+            limits=Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+        self.max_per_host = max_per_host
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+        self._active: dict[str, int] = {}
+
+    async def get(self, url: str, **kwargs):
+        host = urlparse(url).netloc
+        limit = self._hosts.get(host)
+        if limit is None:
+            limit = self._hosts[host] = asyncio.Semaphore(self.max_per_host)
+        self._active[host] = self._active.get(host, 0) + 1
+        try:
+            async with limit:
+                return await self.client.get(url, **kwargs)
+        finally:
+            self._active[host] -= 1
+            if not self._active[host] and len(self._hosts) > self.max_tracked_hosts:
+                del self._active[host]
+                del self._hosts[host]
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+@asynccontextmanager
+async def _http_scope(
+    http: HttpPool | None, proxy_url: str | None
+) -> AsyncIterator[HttpPool]:
+    """Yield the shared pool, or a throwaway one when none was provided."""
+    if http is not None:
+        yield http
+        return
+    pool = HttpPool(proxy_url)
+    try:
+        yield pool
+    finally:
+        await pool.aclose()
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class _LoadAbandoned(Exception):
+    """The caller running a shared load was cancelled before it finished."""
+
+
+class _SingleFlight(Generic[K, V]):
+    """Share one in-flight load per key between concurrent callers.
+
+    Failures reach every caller waiting on the load, but the cancellation of
+    the caller running it does not: the others start over and one of them
+    runs the load instead.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[K, asyncio.Future[V]] = {}
+
+    async def run(self, key: K, load: Callable[[], Awaitable[V]]) -> V:
+        while (pending := self._inflight.get(key)) is not None:
+            try:
+                return await asyncio.shield(pending)
+            except _LoadAbandoned:
+                continue
+
+        future: asyncio.Future[V] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await load()
+        except asyncio.CancelledError:
+            future.set_exception(_LoadAbandoned())
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        future.set_result(value)
+        return value
+
+
+@dataclass(frozen=True)
+class RobotsRule:
+    """Outcome of fetching one origin's robots.txt."""
+
+    status: int
+    parser: Protego | None = None
+    robot_txt: str = ""
+    expires_at: float = 0.0
+
+
+class RobotsCache:
+    """Per-origin cache of parsed robots.txt rules.
+
+    Successful fetches are kept for ``ttl`` seconds; 4xx answers (both the
+    "no robots.txt, allow all" case and 401/403 denials) are kept for the
+    shorter ``negative_ttl``. Connection failures are never cached. At most
+    ``max_entries`` origins are kept: expired rules go first, then the least
+    recently used.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_ROBOTS_TTL,
+        negative_ttl: float = DEFAULT_ROBOTS_NEGATIVE_TTL,
+        max_entries: int = DEFAULT_ROBOTS_MAX_ENTRIES,
+    ) -> None:
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._rules: OrderedDict[str, RobotsRule] = OrderedDict()
+        self._flights: _SingleFlight[str, RobotsRule] = _SingleFlight()
+
+    def _store(self, robot_txt_url: str, rule: RobotsRule) -> None:
+        self._rules[robot_txt_url] = rule
+        self._rules.move_to_end(robot_txt_url)
+        if len(self._rules) <= self.max_entries:
+            return
+        now = time.monotonic()
+        for url in [url for url, cached in self._rules.items() if cached.expires_at <= now]:
+            del self._rules[url]
+        while len(self._rules) > self.max_entries:
+            self._rules.popitem(last=False)
+
+    async def get(
+        self, robot_txt_url: str, loader: Callable[[], Awaitable[RobotsRule]]
+    ) -> RobotsRule:
+        rule = self._rules.get(robot_txt_url)
+        if rule is not None:
+            if rule.expires_at > time.monotonic():
+                self._rules.move_to_end(robot_txt_url)
+                return rule
+            del self._rules[robot_txt_url]
+        return await self._flights.run(
+            robot_txt_url, lambda: self._load(robot_txt_url, loader)
+        )
+
+    async def _load(
+        self, robot_txt_url: str, loader: Callable[[], Awaitable[RobotsRule]]
+    ) -> RobotsRule:
+        rule = await loader()
+        ttl = self.negative_ttl if rule.status >= 400 else self.ttl
+        rule = replace(rule, expires_at=time.monotonic() + ttl)
+        self._store(robot_txt_url, rule)
+        return rule
+
+
+async def _load_robots_rule(
+    robot_txt_url: str, user_agent: str, http: HttpPool
+) -> RobotsRule:
+    from httpx import HTTPError
+
+    try:
+        response = await http.get(
+            robot_txt_url,
+            follow_redirects=True,
+            headers={"User-Agent": user_agent},
+        )
+    except HTTPError as err:
+        raise McpError(
+            ErrorData(
+                code=INTERNAL_ERROR,
+                message=f"Failed to fetch robots.txt {robot_txt_url} due to a connection issue",
+            )
+        ) from err
+    if 400 <= response.status_code < 500:
+        return RobotsRule(status=response.status_code)
+    robot_txt = response.text
+    processed_robot_txt = "\n".join(
+        line for line in robot_txt.splitlines() if not line.strip().startswith("#")
+    )
+    return RobotsRule(
+        status=response.status_code,
+        parser=Protego.parse(processed_robot_txt),
+        robot_txt=robot_txt,
+    )
+
+
 async def check_may_autonomously_fetch_url(
-    url: str, user_agent: str, proxy_url: str | None = None
+    url: str,
+    user_agent: str,
+    proxy_url: str | None = None,
+    http: HttpPool | None = None,
+    robots_cache: RobotsCache | None = None,
 ) -> None:
     """
     Check if the URL can be fetched by the user agent according to the robots.txt file.
     Raises a McpError if not.
     """
-    from httpx import AsyncClient, HTTPError
-
     robot_txt_url = get_robots_txt_url(url)
 
-    async with AsyncClient(proxies=proxy_url) as client:
-        try:
-            response = await client.get(
+    async with _http_scope(http, proxy_url) as pool:
+        if robots_cache is None:
+            rule = await _load_robots_rule(robot_txt_url, user_agent, pool)
+        else:
+            rule = await robots_cache.get(
                 robot_txt_url,
-                follow_redirects=True,
-                headers={"User-Agent": user_agent},
+                lambda: _load_robots_rule(robot_txt_url, user_agent, pool),
             )
-        except HTTPError as err:
-            raise McpError(
-                ErrorData(
-                    code=INTERNAL_ERROR,
-                    message=f"Failed to fetch robots.txt {robot_txt_url} due to a connection issue",
-                )
-            ) from err
-        if response.status_code in (401, 403):
-            raise McpError(
-                ErrorData(
-                    code=INTERNAL_ERROR,
-                    message=f"When fetching robots.txt ({robot_txt_url}), received status {response.status_code} so assuming that autonomous fetching is not allowed, the user can try manually fetching by using the fetch prompt",
-                )
+
+    if rule.status in (401, 403):
+        raise McpError(
+            ErrorData(
+                code=INTERNAL_ERROR,
+                message=f"When fetching robots.txt ({robot_txt_url}), received status {rule.status} so assuming that autonomous fetching is not allowed, the user can try manually fetching by using the fetch prompt",
             )
-        elif 400 <= response.status_code < 500:
-            return
-        robot_txt = response.text
-    processed_robot_txt = "\n".join(
-        line for line in robot_txt.splitlines() if not line.strip().startswith("#")
-    )
-    robot_parser = Protego.parse(processed_robot_txt)
-    if not robot_parser.can_fetch(str(url), user_agent):
+        )
+    elif rule.parser is None:
+        return
+    if not rule.parser.can_fetch(str(url), user_agent):
         raise McpError(
             ErrorData(
                 code=INTERNAL_ERROR,
                 message=f"The sites robots.txt ({robot_txt_url}), specifies that autonomous fetching of this page is not allowed, "
                 f"<useragent>{user_agent}</useragent>\n"
                 f"<url>{url}</url>"
-                f"<robots>\n{robot_txt}\n</robots>\n"
+                f"<robots>\n{rule.robot_txt}\n</robots>\n"
                 f"The assistant must let the user know that it failed to view the page. The assistant may provide further guidance based on the above information.\n"
                 f"The assistant can tell the user that they can try manually fetching the page by using the fetch prompt within their UI.",
             )
         )
 
 
-async def fetch_url(
-    url: str, user_agent: str, force_raw: bool = False, proxy_url: str | None = None
-) -> tuple[str, str]:
-    """
-    Fetch the URL and return the content in a form ready for the LLM, as well as a prefix string with status information.
+@dataclass(frozen=True)
+class CachedPage:
+    """Extracted page content plus the HTTP validators needed to refresh it."""
+
+    content: str
+    prefix: str
+    etag: str | None = None
+    last_modified: str | None = None
+    fetched_at: float = 0.0
+
+    @property
+    def size(self) -> int:
+        return len(self.content) + len(self.prefix)
+
+
+# (url, user agent, raw flag): servers may answer differently per user agent
+PageKey = tuple[str, str, bool]
+
+
+class PageCache:
+    """Bounded (bytes + TTL) cache of extracted pages keyed by (url, user agent, raw flag).
+
+    Paginated reads of one page become slices of the cached content instead of
+    repeated downloads and HTML extractions. Stale entries are revalidated with
+    ETag/Last-Modified, and concurrent fetches of the same key share one request.
     """
-    from httpx import AsyncClient, HTTPError
 
-    async with AsyncClient(proxies=proxy_url) as client:
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_PAGE_CACHE_MAX_BYTES,
+        ttl: float = DEFAULT_PAGE_CACHE_TTL,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: OrderedDict[PageKey, CachedPage] = OrderedDict()
+        self._flights: _SingleFlight[PageKey, CachedPage] = _SingleFlight()
+        self._bytes = 0
+
+    def _store(self, key: PageKey, page: CachedPage) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.size
+        if page.size > self.max_bytes:
+            return
+        self._entries[key] = page
+        self._bytes += page.size
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+
+    async def get_or_fetch(
+        self,
+        key: PageKey,
+        loader: Callable[[CachedPage | None], Awaitable[CachedPage]],
+    ) -> CachedPage:
+        """Return a fresh page for ``key``, calling ``loader(stale_or_none)`` on a miss."""
+        page = self._entries.get(key)
+        if page is not None and time.monotonic() - page.fetched_at < self.ttl:
+            self._entries.move_to_end(key)
+            return page
+
+        return await self._flights.run(key, lambda: self._load(key, page, loader))
+
+    async def _load(
+        self,
+        key: PageKey,
+        stale: CachedPage | None,
+        loader: Callable[[CachedPage | None], Awaitable[CachedPage]],
+    ) -> CachedPage:
+        page = await loader(stale)
+        self._store(key, page)
+        return page
+
+
+def _process_page(page_raw: str, content_type: str, force_raw: bool) -> tuple[str, str]:
+    is_page_html = (
+        "<html" in page_raw[:100] or "text/html" in content_type or not content_type
+    )
+
+    if is_page_html and not force_raw:
+        return extract_content_from_html(page_raw), ""
+
+    return (
+        page_raw,
+        f"Content type {content_type} cannot be simplified to markdown, but here is the raw content:\n",
+    )
+
+
+async def _fetch_page(
+    url: str,
+    user_agent: str,
+    force_raw: bool = False,
+    proxy_url: str | None = None,
+    stale: CachedPage | None = None,
+    http: HttpPool | None = None,
+) -> CachedPage:
+    """Download and extract ``url``; revalidate ``stale`` with conditional headers if given."""
+    from httpx import HTTPError
+
+    headers = {"User-Agent": user_agent}
+    if stale is not None:
+        if stale.etag:
+            headers["If-None-Match"] = stale.etag
+        if stale.last_modified:
+            headers["If-Modified-Since"] = stale.last_modified
+
+    async with _http_scope(http, proxy_url) as pool:
         try:
-            response = await client.get(
+            response = await pool.get(
                 url,
                 follow_redirects=True,
-                headers={"User-Agent": user_agent},
+                headers=headers,
                 timeout=30,
             )
         except HTTPError as e:
             raise McpError(
                 ErrorData(code=INTERNAL_ERROR, message=f"Failed to fetch {url}: {e!r}")
             ) from e
+        if response.status_code == 304 and stale is not None:
+            return replace(stale, fetched_at=time.monotonic())
         if response.status_code >= 400:
             raise McpError(
                 ErrorData(
@@ -147,18 +455,40 @@ async def fetch_url(
 
         page_raw = response.text
 
-    content_type = response.headers.get("content-type", "")
-    is_page_html = (
-        "<html" in page_raw[:100] or "text/html" in content_type or not content_type
+    content, prefix = _process_page(
+        page_raw, response.headers.get("content-type", ""), force_raw
+    )
+    return CachedPage(
+        content=content,
+        prefix=prefix,
+        etag=response.headers.get("etag"),
+        last_modified=response.headers.get("last-modified"),
+        fetched_at=time.monotonic(),
     )
 
-    if is_page_html and not force_raw:
-        return extract_content_from_html(page_raw), ""
 
-    return (
-        page_raw,
-        f"Content type {content_type} cannot be simplified to markdown, but here is the raw content:\n",
-    )
+async def fetch_url(
+    url: str,
+    user_agent: str,
+    force_raw: bool = False,
+    proxy_url: str | None = None,
+    page_cache: PageCache | None = None,
+    http: HttpPool | None = None,
+) -> tuple[str, str]:
+    """
+    Fetch the URL and return the content in a form ready for the LLM, as well as a prefix string with status information.
+    When a page cache is given, repeated fetches of the same URL with the same user agent are served from it.
+    """
+    if page_cache is None:
+        page = await _fetch_page(url, user_agent, force_raw, proxy_url, http=http)
+    else:
+        page = await page_cache.get_or_fetch(
+            (url, user_agent, force_raw),
+            lambda stale: _fetch_page(
+                url, user_agent, force_raw, proxy_url, stale, http=http
+            ),
+        )
+    return page.content, page.prefix
 
 
 class Fetch(BaseModel):
@@ -195,6 +525,8 @@ async def serve(
     custom_user_agent: str | None = None,
     ignore_robots_txt: bool = False,
     proxy_url: str | None = None,
+    page_cache_max_bytes: int = DEFAULT_PAGE_CACHE_MAX_BYTES,
+    page_cache_ttl: float = DEFAULT_PAGE_CACHE_TTL,
 ) -> None:
     """Run the fetch MCP server.
 
@@ -202,8 +534,13 @@ async def serve(
         custom_user_agent: Optional custom User-Agent string to use for requests
         ignore_robots_txt: Whether to ignore robots.txt restrictions
         proxy_url: Optional proxy URL to use for requests
+        page_cache_max_bytes: Size budget for cached extracted pages
+        page_cache_ttl: Seconds before a cached page is revalidated
     """
     server = Server("mcp-fetch")
+    page_cache = PageCache(max_bytes=page_cache_max_bytes, ttl=page_cache_ttl)
+    robots_cache = RobotsCache()
+    http = HttpPool(proxy_url)
     user_agent_autonomous = custom_user_agent or DEFAULT_USER_AGENT_AUTONOMOUS
     user_agent_manual = custom_user_agent or DEFAULT_USER_AGENT_MANUAL
 
@@ -246,11 +583,20 @@ Although originally you did not have internet access, and were advised to refuse
 
         if not ignore_robots_txt:
             await check_may_autonomously_fetch_url(
-                url, user_agent_autonomous, proxy_url
+                url,
+                user_agent_autonomous,
+                proxy_url,
+                http=http,
+                robots_cache=robots_cache,
             )
 
         content, prefix = await fetch_url(
-            url, user_agent_autonomous, force_raw=args.raw, proxy_url=proxy_url
+            url,
+            user_agent_autonomous,
+            force_raw=args.raw,
+            proxy_url=proxy_url,
+            page_cache=page_cache,
+            http=http,
         )
         original_length = len(content)
         if args.start_index >= original_length:
@@ -282,7 +628,11 @@ Although originally you did not have internet access, and were advised to refuse
 
         try:
             content, prefix = await fetch_url(
-                url, user_agent_manual, proxy_url=proxy_url
+                url,
+                user_agent_manual,
+                proxy_url=proxy_url,
+                page_cache=page_cache,
+                http=http,
             )
             # TODO: after SDK bug is addressed, don't catch the exception
         except McpError as e:
@@ -305,5 +655,8 @@ Although originally you did not have internet access, and were advised to refuse
         )
 
     options = server.create_initialization_options()
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(read_stream, write_stream, options, raise_exceptions=True)
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, options, raise_exceptions=True)
+    finally:
+        await http.aclose()
@@ -0,0 +1,280 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from mcp.shared.exceptions import McpError
+from mcp_server_fetch.server import (
+    CachedPage,
+    HttpPool,
+    PageCache,
+    RobotsCache,
+    RobotsRule,
+    check_may_autonomously_fetch_url,
+    fetch_url,
+)
+
+
+class FakePool:
+    """Stands in for ``HttpPool``, answering from a handler and recording requests."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.requests: list[tuple[str, dict[str, str]]] = []
+
+    async def get(self, url: str, **kwargs):
+        headers = kwargs.get("headers", {})
+        self.requests.append((url, headers))
+        return self.handler(url, headers)
+
+
+def _text(body: str, **headers: str) -> httpx.Response:
+    return httpx.Response(
+        200, text=body, headers={"content-type": "text/plain", **headers}
+    )
+
+
+def _page(content: str) -> CachedPage:
+    return CachedPage(content=content, prefix="", fetched_at=time.monotonic())
+
+
+def test_page_cache_serves_fresh_pages_without_refetching():
+    pool = FakePool(lambda url, headers: _text("hello"))
+    cache = PageCache()
+
+    async def run():
+        return [
+            await fetch_url("https://example.com/a", "ua", page_cache=cache, http=pool)
+            for _ in range(3)
+        ]
+
+    results = asyncio.run(run())
+
+    assert {content for content, _ in results} == {"hello"}
+    assert len(pool.requests) == 1
+
+
+def test_stale_pages_are_revalidated_with_etag_and_last_modified():
+    def handler(url, headers):
+        if headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return _text("hello", etag='"v1"', **{"last-modified": "Mon, 01 Jan 2024"})
+
+    pool = FakePool(handler)
+    cache = PageCache(ttl=0)
+
+    async def run():
+        first = await fetch_url("https://example.com/a", "ua", page_cache=cache, http=pool)
+        second = await fetch_url("https://example.com/a", "ua", page_cache=cache, http=pool)
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first == second
+    _, revalidation = pool.requests[1]
+    assert revalidation["If-None-Match"] == '"v1"'
+    assert revalidation["If-Modified-Since"] == "Mon, 01 Jan 2024"
+
+
+def test_page_cache_evicts_least_recent_pages_past_its_byte_budget():
+    cache = PageCache(max_bytes=10)
+    loads: list[str] = []
+
+    async def get(name: str, content: str) -> CachedPage:
+        async def loader(stale):
+            loads.append(name)
+            return _page(content)
+
+        return await cache.get_or_fetch((name, "ua", False), loader)
+
+    async def run():
+        await get("a", "aaaa")
+        await get("b", "bbbb")
+        await get("a", "aaaa")  # hit, and now the most recent
+        await get("c", "cccc")  # evicts b
+        await get("a", "aaaa")
+        await get("b", "bbbb")
+        await get("huge", "x" * 11)  # larger than the budget, never stored
+        await get("huge", "x" * 11)
+
+    asyncio.run(run())
+
+    assert loads == ["a", "b", "c", "b", "huge", "huge"]
+    assert cache._bytes <= cache.max_bytes
+
+
+def test_pages_are_cached_per_user_agent():
+    pool = FakePool(lambda url, headers: _text(f"for {headers['User-Agent']}"))
+    cache = PageCache()
+
+    async def run():
+        return [
+            await fetch_url("https://example.com/a", ua, page_cache=cache, http=pool)
+            for ua in ("bot", "human", "bot")
+        ]
+
+    results = asyncio.run(run())
+
+    assert [content for content, _ in results] == ["for bot", "for human", "for bot"]
+    assert [headers["User-Agent"] for _, headers in pool.requests] == ["bot", "human"]
+
+
+def test_cancelling_the_leading_fetch_does_not_cancel_coalesced_waiters():
+    cache = PageCache()
+    key = ("https://example.com/a", "ua", False)
+    calls = 0
+
+    async def loader(stale):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return _page(f"load {calls}")
+
+    async def run():
+        leader = asyncio.create_task(cache.get_or_fetch(key, loader))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(cache.get_or_fetch(key, loader)) for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*waiters)
+
+    pages = asyncio.run(run())
+
+    # One waiter took over the load and the others shared it
+    assert [page.content for page in pages] == ["load 2"] * 3
+    assert calls == 2
+
+
+def test_failed_fetches_reach_every_waiter_and_are_not_cached():
+    cache = PageCache()
+    key = ("https://example.com/a", "ua", False)
+    calls = 0
+
+    async def loader(stale):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
+    async def run():
+        return await asyncio.gather(
+            *(cache.get_or_fetch(key, loader) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    errors = asyncio.run(run())
+
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    assert calls == 1
+    with pytest.raises(RuntimeError):
+        asyncio.run(cache.get_or_fetch(key, loader))
+    assert calls == 2
+
+
+def _robots_loader(loads: list[str], name: str, status: int = 200):
+    async def loader():
+        loads.append(name)
+        return RobotsRule(status=status)
+
+    return loader
+
+
+def test_robots_rules_expire_after_their_ttl():
+    loads: list[str] = []
+
+    async def run(cache: RobotsCache):
+        for _ in range(2):
+            await cache.get("https://ok/robots.txt", _robots_loader(loads, "ok"))
+            await cache.get(
+                "https://missing/robots.txt", _robots_loader(loads, "missing", 404)
+            )
+
+    # Successful fetches live for ttl
+    asyncio.run(run(RobotsCache(ttl=3600, negative_ttl=0)))
+    assert loads == ["ok", "missing", "missing"]
+
+    # 4xx answers live for negative_ttl
+    loads.clear()
+    asyncio.run(run(RobotsCache(ttl=0, negative_ttl=3600)))
+    assert loads == ["ok", "missing", "ok"]
+
+
+def test_robots_cache_evicts_expired_then_least_recent_origins():
+    cache = RobotsCache(negative_ttl=0, max_entries=2)
+    loads: list[str] = []
+
+    async def get(name: str, status: int = 200):
+        await cache.get(f"https://{name}/robots.txt", _robots_loader(loads, name, status))
+
+    async def run():
+        await get("expired", 404)
+        await get("a")
+        await get("b")  # drops the expired origin rather than a
+        await get("a")
+        await get("c")  # evicts b, the least recently used
+        await get("a")
+        await get("b")
+
+    asyncio.run(run())
+
+    assert loads == ["expired", "a", "b", "c", "b"]
+    assert len(cache._rules) == 2
+
+
+def test_cancelling_the_leading_robots_fetch_does_not_cancel_waiters():
+    cache = RobotsCache()
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return RobotsRule(status=404)
+
+    async def run():
+        url = "https://example.com/robots.txt"
+        leader = asyncio.create_task(cache.get(url, loader))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get(url, loader))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await waiter
+
+    assert asyncio.run(run()).status == 404
+    assert calls == 2
+
+
+def test_http_pool_is_reused_across_robots_checks_and_fetches():
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        if request.url.path == "/robots.txt":
+            return httpx.Response(200, text="User-agent: *\nDisallow: /private\n")
+        return _text("hello")
+
+    async def run():
+        pool = HttpPool()
+        await pool.client.aclose()
+        pool.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        robots = RobotsCache()
+        for path in ("/a", "/b"):
+            await check_may_autonomously_fetch_url(
+                f"https://example.com{path}", "ua", http=pool, robots_cache=robots
+            )
+        content, _ = await fetch_url("https://example.com/a", "ua", http=pool)
+        with pytest.raises(McpError):
+            await check_may_autonomously_fetch_url(
+                "https://example.com/private", "ua", http=pool, robots_cache=robots
+            )
+        # Borrowed pools are left open for the next request
+        assert not pool.client.is_closed
+        await pool.aclose()
+        return content
+
+    assert asyncio.run(run()) == "hello"
+    assert seen == ["/robots.txt", "/a"]
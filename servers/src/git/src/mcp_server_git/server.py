@@ -1,7 +1,13 @@
+import asyncio
 import logging
-from collections.abc import Sequence
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from pathlib import Path
+from typing import TypeVar
 
 from pydantic import BaseModel, Field
 
@@ -20,6 +26,17 @@ from mcp.types import (
 # Default number of context lines to show in diff output
 DEFAULT_CONTEXT_LINES = 3
 
+# Open Repo handles kept per worker thread
+DEFAULT_REPO_CACHE_SIZE = 16
+
+# Hard caps on the output returned by a single log/diff/show call
+DEFAULT_MAX_OUTPUT_BYTES = 100_000
+DEFAULT_MAX_OUTPUT_LINES = 2_000
+
+CURSOR_DESCRIPTION = "Continuation cursor returned by a previous truncated call; omit to start from the beginning"
+
+T = TypeVar("T")
+
 
 class GitStatus(BaseModel):
     repo_path: str
@@ -28,17 +45,20 @@ class GitStatus(BaseModel):
 class GitDiffUnstaged(BaseModel):
     repo_path: str
     context_lines: int = DEFAULT_CONTEXT_LINES
+    cursor: int = Field(0, ge=0, description=CURSOR_DESCRIPTION)
 
 
 class GitDiffStaged(BaseModel):
     repo_path: str
     context_lines: int = DEFAULT_CONTEXT_LINES
+    cursor: int = Field(0, ge=0, description=CURSOR_DESCRIPTION)
 
 
 class GitDiff(BaseModel):
     repo_path: str
     target: str
     context_lines: int = DEFAULT_CONTEXT_LINES
+    cursor: int = Field(0, ge=0, description=CURSOR_DESCRIPTION)
 
 
 class GitCommit(BaseModel):
@@ -66,6 +86,7 @@ class GitLog(BaseModel):
         None,
         description="End timestamp for filtering commits. Accepts: ISO 8601 format (e.g., '2024-01-15T14:30:25'), relative dates (e.g., '2 weeks ago', 'yesterday'), or absolute dates (e.g., '2024-01-15', 'Jan 15 2024')",
     )
+    cursor: int = Field(0, ge=0, description=CURSOR_DESCRIPTION)
 
 
 class GitCreateBranch(BaseModel):
@@ -82,6 +103,7 @@ class GitCheckout(BaseModel):
 class GitShow(BaseModel):
     repo_path: str
     revision: str
+    cursor: int = Field(0, ge=0, description=CURSOR_DESCRIPTION)
 
 
 class GitInit(BaseModel):
@@ -123,24 +145,196 @@ class GitTools(str, Enum):
     BRANCH = "git_branch"
 
 
+# Tools that modify the index, HEAD or refs; these are serialized per repository
+MUTATING_TOOLS = frozenset(
+    {
+        GitTools.COMMIT,
+        GitTools.ADD,
+        GitTools.RESET,
+        GitTools.CHECKOUT,
+        GitTools.CREATE_BRANCH,
+    }
+)
+
+
+class RepoCache:
+    """LRU cache of open ``git.Repo`` handles, validated by path and git dir mtime.
+
+    GitPython handles keep persistent ``git cat-file`` processes that must not
+    be shared across threads, so every worker thread gets its own LRU.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_REPO_CACHE_SIZE):
+        self.max_size = max_size
+        self._local = threading.local()
+
+    def _entries(self) -> "OrderedDict[str, tuple[git.Repo, int, int]]":
+        entries = getattr(self._local, "entries", None)
+        if entries is None:
+            entries = self._local.entries = OrderedDict()
+        return entries
+
+    @staticmethod
+    def _fingerprint(repo: git.Repo) -> tuple[int, int]:
+        stat = os.stat(repo.git_dir)
+        return stat.st_ino, stat.st_mtime_ns
+
+    def get(self, repo_path: Path) -> git.Repo:
+        key = str(Path(repo_path).resolve())
+        entries = self._entries()
+        cached = entries.get(key)
+        if cached is not None:
+            repo, ino, mtime = cached
+            try:
+                fresh = self._fingerprint(repo) == (ino, mtime)
+            except OSError:
+                fresh = False
+            if fresh:
+                entries.move_to_end(key)
+                return repo
+            del entries[key]
+            repo.close()
+
+        repo = git.Repo(key)
+        # Reads such as status must not take index.lock while a mutation runs
+        repo.git.update_environment(GIT_OPTIONAL_LOCKS="0")
+        entries[key] = (repo, *self._fingerprint(repo))
+        while len(entries) > self.max_size:
+            _, (evicted, _, _) = entries.popitem(last=False)
+            evicted.close()
+        return repo
+
+    def clear(self) -> None:
+        entries = self._entries()
+        while entries:
+            _, (repo, _, _) = entries.popitem()
+            repo.close()
+
+
+class GitExecutor:
+    """Runs blocking GitPython work on a bounded thread pool.
+
+    Mutating tools take a per-repository lock so they never interleave, while
+    read-only tools for the same repository run in parallel.
+    """
+
+    def __init__(
+        self, max_workers: int | None = None, repo_cache: RepoCache | None = None
+    ):
+        self.repo_cache = repo_cache or RepoCache()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers or min(8, (os.cpu_count() or 1) + 2),
+            thread_name_prefix="mcp-git",
+        )
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def run(self, func: Callable[[], T]) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self._pool, func)
+
+    async def run_with_repo(
+        self,
+        repo_path: Path,
+        func: Callable[[git.Repo], T],
+        mutating: bool = False,
+    ) -> T:
+        def work() -> T:
+            return func(self.repo_cache.get(repo_path))
+
+        if not mutating:
+            return await self.run(work)
+        key = str(Path(repo_path).resolve())
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            return await self.run(work)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
 def git_status(repo: git.Repo) -> str:
     return repo.git.status()
 
 
+def stream_git_output(
+    repo: git.Repo,
+    command: str,
+    *args: str,
+    cursor: int = 0,
+    max_lines: int = DEFAULT_MAX_OUTPUT_LINES,
+    max_bytes: int = DEFAULT_MAX_OUTPUT_BYTES,
+) -> tuple[str, int | None]:
+    """Read a git command's output incrementally, stopping at the line/byte caps.
+
+    ``cursor`` is the number of output lines to skip. Returns the text and the
+    cursor to continue from, or ``None`` when the output was exhausted. The git
+    process is killed as soon as enough output has been read.
+    """
+    proc = getattr(repo.git, command)(*args, as_process=True)
+    lines: list[bytes] = []
+    size = 0
+    line_no = 0
+    next_cursor = None
+    try:
+        for raw in proc.stdout:
+            if line_no < cursor:
+                line_no += 1
+                continue
+            if len(lines) >= max_lines or size + len(raw) > max_bytes:
+                if not lines:
+                    # A single oversized line: return its head and move past it
+                    lines.append(raw[:max_bytes] + b"\n")
+                    line_no += 1
+                next_cursor = line_no
+                break
+            lines.append(raw)
+            size += len(raw)
+            line_no += 1
+    finally:
+        if next_cursor is not None:
+            proc.proc.kill()
+            proc.proc.wait()
+    if next_cursor is None:
+        proc.wait()
+    return b"".join(lines).decode("utf-8", errors="replace"), next_cursor
+
+
+def with_continuation(text: str, tool: str, next_cursor: int | None) -> str:
+    if next_cursor is None:
+        return text
+    return (
+        f"{text}\n<truncated>Output truncated. Call {tool} with cursor={next_cursor} "
+        f"to get more.</truncated>"
+    )
+
+
 def git_diff_unstaged(
-    repo: git.Repo, context_lines: int = DEFAULT_CONTEXT_LINES
+    repo: git.Repo, context_lines: int = DEFAULT_CONTEXT_LINES, cursor: int = 0
 ) -> str:
-    return repo.git.diff(f"--unified={context_lines}")
+    diff, next_cursor = stream_git_output(
+        repo, "diff", f"--unified={context_lines}", cursor=cursor
+    )
+    return with_continuation(diff, GitTools.DIFF_UNSTAGED.value, next_cursor)
 
 
-def git_diff_staged(repo: git.Repo, context_lines: int = DEFAULT_CONTEXT_LINES) -> str:
-    return repo.git.diff(f"--unified={context_lines}", "--cached")
+def git_diff_staged(
+    repo: git.Repo, context_lines: int = DEFAULT_CONTEXT_LINES, cursor: int = 0
+) -> str:
+    diff, next_cursor = stream_git_output(
+        repo, "diff", f"--unified={context_lines}", "--cached", cursor=cursor
+    )
+    return with_continuation(diff, GitTools.DIFF_STAGED.value, next_cursor)
 
 
 def git_diff(
-    repo: git.Repo, target: str, context_lines: int = DEFAULT_CONTEXT_LINES
+    repo: git.Repo,
+    target: str,
+    context_lines: int = DEFAULT_CONTEXT_LINES,
+    cursor: int = 0,
 ) -> str:
-    return repo.git.diff(f"--unified={context_lines}", target)
+    diff, next_cursor = stream_git_output(
+        repo, "diff", f"--unified={context_lines}", target, cursor=cursor
+    )
+    return with_continuation(diff, GitTools.DIFF.value, next_cursor)
 
 
 def git_commit(repo: git.Repo, message: str) -> str:
@@ -166,41 +360,44 @@ def git_log(
     max_count: int = 10,
     start_timestamp: str | None = None,
     end_timestamp: str | None = None,
+    cursor: int = 0,
 ) -> list[str]:
-    if start_timestamp or end_timestamp:
-        # Use git log command with date filtering
-        args = []
-        if start_timestamp:
-            args.extend(["--since", start_timestamp])
-        if end_timestamp:
-            args.extend(["--until", end_timestamp])
-        args.extend(["--format=%H%n%an%n%ad%n%s%n"])
-
-        log_output = repo.git.log(*args).split("\n")
-
-        log = []
-        # Process commits in groups of 4 (hash, author, date, message)
-        for i in range(0, len(log_output), 4):
-            if i + 3 < len(log_output) and len(log) < max_count:
-                log.append(
-                    f"Commit: {log_output[i]}\n"
-                    f"Author: {log_output[i + 1]}\n"
-                    f"Date: {log_output[i + 2]}\n"
-                    f"Message: {log_output[i + 3]}\n"
-                )
-        return log
-    else:
-        # Use existing logic for simple log without date filtering
-        commits = list(repo.iter_commits(max_count=max_count))
-        log = []
-        for commit in commits:
-            log.append(
-                f"Commit: {commit.hexsha!r}\n"
-                f"Author: {commit.author!r}\n"
-                f"Date: {commit.authored_datetime}\n"
-                f"Message: {commit.message!r}\n"
-            )
-        return log
+    """Return up to ``max_count`` commits, skipping the first ``cursor`` matches.
+
+    Limits are applied by git itself (``--skip``/``-n``), so only the requested
+    page of history is read. When more commits match, the last entry is a
+    continuation notice carrying the next cursor.
+    """
+    args = [f"--skip={cursor}", f"--max-count={max_count + 1}"]
+    if start_timestamp:
+        args.extend(["--since", start_timestamp])
+    if end_timestamp:
+        args.extend(["--until", end_timestamp])
+    # One record per commit (full message included), fields unit-separated
+    args.append("--format=%x1e%H%x1f%an%x1f%ad%x1f%B")
+
+    log_output, truncated_at = stream_git_output(repo, "log", *args)
+    records = log_output.split("\x1e")[1:]
+    if truncated_at is not None and len(records) > 1:
+        # The output cap cut the last record short; the cursor resumes at it
+        records.pop()
+
+    log = []
+    for record in records[:max_count]:
+        sha, author, date, message = record.split("\x1f", 3)
+        log.append(
+            f"Commit: {sha}\n"
+            f"Author: {author}\n"
+            f"Date: {date}\n"
+            f"Message: {message.rstrip()}\n"
+        )
+    has_more = len(records) > max_count or truncated_at is not None
+    if has_more and log:
+        log.append(
+            f"<truncated>More commits available. Call {GitTools.LOG.value} with "
+            f"cursor={cursor + len(log)} to get more.</truncated>"
+        )
+    return log
 
 
 def git_create_branch(
@@ -225,23 +422,20 @@ def git_init(repo_path: str) -> str:
         return f"Error initializing repository: {e!s}"
 
 
-def git_show(repo: git.Repo, revision: str) -> str:
-    commit = repo.commit(revision)
-    output = [
-        f"Commit: {commit.hexsha!r}\n"
-        f"Author: {commit.author!r}\n"
-        f"Date: {commit.authored_datetime!r}\n"
-        f"Message: {commit.message!r}\n"
-    ]
-    if commit.parents:
-        parent = commit.parents[0]
-        diff = parent.diff(commit, create_patch=True)
-    else:
-        diff = commit.diff(git.NULL_TREE, create_patch=True)
-    for d in diff:
-        output.append(f"\n--- {d.a_path}\n+++ {d.b_path}\n")
-        output.append(d.diff.decode("utf-8"))
-    return "".join(output)
+def git_show(repo: git.Repo, revision: str, cursor: int = 0) -> str:
+    output, next_cursor = stream_git_output(
+        repo,
+        "show",
+        "--patch",
+        # Merges diff against their first parent rather than a combined diff
+        "-m",
+        "--first-parent",
+        "--format=Commit: %H%nAuthor: %an <%ae>%nDate: %ad%nMessage: %B",
+        revision,
+        "--",
+        cursor=cursor,
+    )
+    return with_continuation(output, GitTools.SHOW.value, next_cursor)
 
 
 def git_branch(
@@ -278,6 +472,94 @@ def git_branch(
     return branch_info
 
 
+def dispatch_tool(repo: git.Repo, name: str, arguments: dict) -> list[TextContent]:
+    """Run a repository tool synchronously; called from the worker pool."""
+    match name:
+        case GitTools.STATUS:
+            status = git_status(repo)
+            return [TextContent(type="text", text=f"Repository status:\n{status}")]
+
+        case GitTools.DIFF_UNSTAGED:
+            diff = git_diff_unstaged(
+                repo,
+                arguments.get("context_lines", DEFAULT_CONTEXT_LINES),
+                arguments.get("cursor", 0),
+            )
+            return [TextContent(type="text", text=f"Unstaged changes:\n{diff}")]
+
+        case GitTools.DIFF_STAGED:
+            diff = git_diff_staged(
+                repo,
+                arguments.get("context_lines", DEFAULT_CONTEXT_LINES),
+                arguments.get("cursor", 0),
+            )
+            return [TextContent(type="text", text=f"Staged changes:\n{diff}")]
+
+        case GitTools.DIFF:
+            diff = git_diff(
+                repo,
+                arguments["target"],
+                arguments.get("context_lines", DEFAULT_CONTEXT_LINES),
+                arguments.get("cursor", 0),
+            )
+            return [
+                TextContent(
+                    type="text", text=f"Diff with {arguments['target']}:\n{diff}"
+                )
+            ]
+
+        case GitTools.COMMIT:
+            result = git_commit(repo, arguments["message"])
+            return [TextContent(type="text", text=result)]
+
+        case GitTools.ADD:
+            result = git_add(repo, arguments["files"])
+            return [TextContent(type="text", text=result)]
+
+        case GitTools.RESET:
+            result = git_reset(repo)
+            return [TextContent(type="text", text=result)]
+
+        # Update the LOG case:
+        case GitTools.LOG:
+            log = git_log(
+                repo,
+                arguments.get("max_count", 10),
+                arguments.get("start_timestamp"),
+                arguments.get("end_timestamp"),
+                arguments.get("cursor", 0),
+            )
+            return [
+                TextContent(type="text", text="Commit history:\n" + "\n".join(log))
+            ]
+
+        case GitTools.CREATE_BRANCH:
+            result = git_create_branch(
+                repo, arguments["branch_name"], arguments.get("base_branch")
+            )
+            return [TextContent(type="text", text=result)]
+
+        case GitTools.CHECKOUT:
+            result = git_checkout(repo, arguments["branch_name"])
+            return [TextContent(type="text", text=result)]
+
+        case GitTools.SHOW:
+            result = git_show(repo, arguments["revision"], arguments.get("cursor", 0))
+            return [TextContent(type="text", text=result)]
+
+        case GitTools.BRANCH:
+            result = git_branch(
+                repo,
+                arguments.get("branch_type", "local"),
+                arguments.get("contains"),
+                arguments.get("not_contains"),
+            )
+            return [TextContent(type="text", text=result)]
+
+        case _:
+            raise ValueError(f"Unknown tool: {name}")
+
+
 async def serve(repository: Path | None) -> None:
     logger = logging.getLogger(__name__)
 
@@ -394,97 +676,27 @@ async def serve(repository: Path | None) -> None:
         root_repos = await by_roots()
         return [*root_repos, *cmd_repos]
 
+    executor = GitExecutor()
+
     @server.call_tool()
     async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         repo_path = Path(arguments["repo_path"])
 
         # Handle git init separately since it doesn't require an existing repo
         if name == GitTools.INIT:
-            result = git_init(str(repo_path))
+            result = await executor.run(lambda: git_init(str(repo_path)))
             return [TextContent(type="text", text=result)]
 
         # For all other commands, we need an existing repo
-        repo = git.Repo(repo_path)
-
-        match name:
-            case GitTools.STATUS:
-                status = git_status(repo)
-                return [TextContent(type="text", text=f"Repository status:\n{status}")]
-
-            case GitTools.DIFF_UNSTAGED:
-                diff = git_diff_unstaged(
-                    repo, arguments.get("context_lines", DEFAULT_CONTEXT_LINES)
-                )
-                return [TextContent(type="text", text=f"Unstaged changes:\n{diff}")]
-
-            case GitTools.DIFF_STAGED:
-                diff = git_diff_staged(
-                    repo, arguments.get("context_lines", DEFAULT_CONTEXT_LINES)
-                )
-                return [TextContent(type="text", text=f"Staged changes:\n{diff}")]
-
-            case GitTools.DIFF:
-                diff = git_diff(
-                    repo,
-                    arguments["target"],
-                    arguments.get("context_lines", DEFAULT_CONTEXT_LINES),
-                )
-                return [
-                    TextContent(
-                        type="text", text=f"Diff with {arguments['target']}:\n{diff}"
-                    )
-                ]
-
-            case GitTools.COMMIT:
-                result = git_commit(repo, arguments["message"])
-                return [TextContent(type="text", text=result)]
-
-            case GitTools.ADD:
-                result = git_add(repo, arguments["files"])
-                return [TextContent(type="text", text=result)]
-
-            case GitTools.RESET:
-                result = git_reset(repo)
-                return [TextContent(type="text", text=result)]
-
-            # Update the LOG case:
-            case GitTools.LOG:
-                log = git_log(
-                    repo,
-                    arguments.get("max_count", 10),
-                    arguments.get("start_timestamp"),
-                    arguments.get("end_timestamp"),
-                )
-                return [
-                    TextContent(type="text", text="Commit history:\n" + "\n".join(log))
-                ]
-
-            case GitTools.CREATE_BRANCH:
-                result = git_create_branch(
-                    repo, arguments["branch_name"], arguments.get("base_branch")
-                )
-                return [TextContent(type="text", text=result)]
-
-            case GitTools.CHECKOUT:
-                result = git_checkout(repo, arguments["branch_name"])
-                return [TextContent(type="text", text=result)]
-
-            case GitTools.SHOW:
-                result = git_show(repo, arguments["revision"])
-                return [TextContent(type="text", text=result)]
-
-            case GitTools.BRANCH:
-                result = git_branch(
-                    repo,
-                    arguments.get("branch_type", "local"),
-                    arguments.get("contains"),
-                    arguments.get("not_contains"),
-                )
-                return [TextContent(type="text", text=result)]
-
-            case _:
-                raise ValueError(f"Unknown tool: {name}")
+        return await executor.run_with_repo(
+            repo_path,
+            lambda repo: dispatch_tool(repo, name, arguments),
+            mutating=name in MUTATING_TOOLS,
+        )
 
     options = server.create_initialization_options()
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(read_stream, write_stream, options, raise_exceptions=True)
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, options, raise_exceptions=True)
+    finally:
+        executor.shutdown()
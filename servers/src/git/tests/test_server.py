@@ -1,8 +1,22 @@
+import asyncio
 import shutil
 from pathlib import Path
 
 import pytest
-from mcp_server_git.server import git_add, git_branch, git_checkout
+from mcp_server_git.server import (
+    DEFAULT_MAX_OUTPUT_LINES,
+    GitExecutor,
+    GitTools,
+    RepoCache,
+    dispatch_tool,
+    git_add,
+    git_branch,
+    git_checkout,
+    git_diff_unstaged,
+    git_log,
+    git_show,
+    stream_git_output,
+)
 
 import git
 
@@ -106,3 +120,179 @@ def test_git_add_specific_files(test_repository):
     assert "file1.txt" in staged_files
     assert "file2.txt" not in staged_files
     assert result == "Files staged successfully"
+
+
+def test_repo_cache_reuses_handle(test_repository):
+    cache = RepoCache()
+    repo_path = Path(test_repository.working_dir)
+
+    assert cache.get(repo_path) is cache.get(repo_path)
+    cache.clear()
+
+
+def test_repo_cache_reopens_after_git_dir_changes(test_repository):
+    cache = RepoCache()
+    repo_path = Path(test_repository.working_dir)
+    first = cache.get(repo_path)
+
+    test_repository.git.branch("touch-refs")
+    (Path(test_repository.git_dir) / "cache-probe").write_text("x")
+
+    assert cache.get(repo_path) is not first
+    cache.clear()
+
+
+def test_repo_cache_evicts_least_recently_used(tmp_path: Path):
+    cache = RepoCache(max_size=1)
+    first_path, second_path = tmp_path / "one", tmp_path / "two"
+    git.Repo.init(first_path)
+    git.Repo.init(second_path)
+
+    first = cache.get(first_path)
+    cache.get(second_path)
+
+    assert cache.get(first_path) is not first
+    cache.clear()
+
+
+def test_git_executor_serializes_mutations_and_runs_reads(test_repository):
+    repo_path = Path(test_repository.working_dir)
+    for i in range(5):
+        (repo_path / f"file{i}.txt").write_text(str(i))
+
+    async def run():
+        executor = GitExecutor(max_workers=4)
+        try:
+            adds = [
+                executor.run_with_repo(
+                    repo_path,
+                    lambda repo, i=i: git_add(repo, [f"file{i}.txt"]),
+                    mutating=True,
+                )
+                for i in range(5)
+            ]
+            status = executor.run_with_repo(
+                repo_path,
+                lambda repo: dispatch_tool(
+                    repo, GitTools.STATUS, {"repo_path": str(repo_path)}
+                ),
+            )
+            return await asyncio.gather(*adds, status)
+        finally:
+            executor.shutdown()
+
+    results = asyncio.run(run())
+
+    assert results[:5] == ["Files staged successfully"] * 5
+    assert "Repository status" in results[5][0].text
+    staged_files = {item.a_path for item in test_repository.index.diff("HEAD")}
+    assert {f"file{i}.txt" for i in range(5)} <= staged_files
+
+
+def _commit_files(repo: git.Repo, count: int) -> None:
+    for i in range(count):
+        path = Path(repo.working_dir) / f"log{i}.txt"
+        path.write_text(str(i))
+        repo.index.add([path.name])
+        repo.index.commit(f"commit {i}")
+
+
+def test_git_log_pages_with_cursor(test_repository):
+    _commit_files(test_repository, 4)
+
+    first = git_log(test_repository, max_count=2)
+    assert len(first) == 3
+    assert "Message: commit 3" in first[0]
+    assert "cursor=2" in first[-1]
+
+    second = git_log(test_repository, max_count=2, cursor=2)
+    assert "Message: commit 1" in second[0]
+
+    last = git_log(test_repository, max_count=2, cursor=4)
+    assert len(last) == 1
+    assert "Message: initial commit" in last[0]
+
+
+def test_git_log_keeps_full_commit_messages(test_repository):
+    Path(test_repository.working_dir, "body.txt").write_text("body")
+    test_repository.index.add(["body.txt"])
+    test_repository.index.commit("subject line\n\nfirst body line\nsecond body line\n")
+
+    first = git_log(test_repository, max_count=1)
+    assert first[0].endswith(
+        "Message: subject line\n\nfirst body line\nsecond body line\n"
+    )
+    assert "cursor=1" in first[-1]
+
+    second = git_log(test_repository, max_count=1, cursor=1)
+    assert second == [second[0]]
+    assert second[0].endswith("Message: initial commit\n")
+
+
+def test_stream_git_output_respects_line_cap(test_repository):
+    _commit_files(test_repository, 5)
+
+    text, next_cursor = stream_git_output(
+        test_repository, "log", "--format=%s", max_lines=2
+    )
+    assert text.splitlines() == ["commit 4", "commit 3"]
+    assert next_cursor == 2
+
+    rest, next_cursor = stream_git_output(
+        test_repository, "log", "--format=%s", cursor=2, max_lines=100
+    )
+    assert rest.splitlines()[0] == "commit 2"
+    assert next_cursor is None
+
+
+def test_stream_git_output_respects_byte_cap(test_repository):
+    _commit_files(test_repository, 5)
+
+    text, next_cursor = stream_git_output(
+        test_repository, "log", "--format=%s", max_bytes=20
+    )
+    assert len(text.encode()) <= 20
+    assert next_cursor == len(text.splitlines())
+
+
+def test_git_diff_unstaged_reports_continuation(test_repository):
+    Path(test_repository.working_dir, "test.txt").write_text(
+        "".join(f"line {i}\n" for i in range(DEFAULT_MAX_OUTPUT_LINES * 2))
+    )
+
+    first = git_diff_unstaged(test_repository)
+    assert "cursor=" in first
+
+    rest = git_diff_unstaged(test_repository, cursor=DEFAULT_MAX_OUTPUT_LINES * 2)
+    assert "cursor=" not in rest
+
+
+def test_git_show_includes_patch(test_repository):
+    result = git_show(test_repository, "HEAD")
+    assert "Message: initial commit" in result
+    assert "+test" in result
+
+
+def test_git_show_diffs_merges_against_first_parent(test_repository):
+    work = Path(test_repository.working_dir)
+    main = test_repository.active_branch
+    side = test_repository.create_head("side")
+    side.checkout()
+    (work / "side.txt").write_text("from side")
+    test_repository.index.add(["side.txt"])
+    side_commit = test_repository.index.commit("side change")
+
+    main.checkout()
+    (work / "main.txt").write_text("from main")
+    test_repository.index.add(["main.txt"])
+    main_commit = test_repository.index.commit("main change")
+    (work / "side.txt").write_text("from side")
+    test_repository.index.add(["side.txt"])
+    test_repository.index.commit("merge side", parent_commits=(main_commit, side_commit))
+
+    result = git_show(test_repository, "HEAD")
+    assert "Message: merge side" in result
+    # Only what the merge brought into the first parent, as one plain diff
+    assert "+from side" in result
+    assert "main.txt" not in result
+    assert result.count("diff --git") == 1
@@ -0,0 +1,91 @@
+"""Benchmark the streaming pipeline on a synthetic CSV.
+
+Usage: python benchmarks/bench_streaming.py [--rows 10000000] [--chunksize 100000]
+
+Writes a synthetic CSV (with ~1% duplicate ids) to a temporary directory,
+streams it to Parquet and reports throughput, peak RSS and the size of the
+de-duplication set. Peak RSS should stay flat as ``--rows`` grows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd  # type: ignore[import-untyped]
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cortex_data_pipeline.streaming import stream_to_parquet  # noqa: E402
+
+
+def write_synthetic_csv(path: Path, rows: int, chunksize: int) -> None:
+    rng = np.random.default_rng(0)
+    for start in range(0, rows, chunksize):
+        count = min(chunksize, rows - start)
+        ids = np.arange(start, start + count)
+        # Re-emit ~1% of earlier ids so cross-chunk de-duplication is exercised
+        dupes = rng.random(count) < 0.01
+        ids[dupes] = rng.integers(0, max(start, 1), int(dupes.sum()))
+        frame = pd.DataFrame(
+            {
+                "id": ids,
+                "value": rng.integers(0, 1_000, count),
+                "email": [f"user{i}@example.com" for i in ids],
+            }
+        )
+        frame.to_csv(path, mode="a", header=start == 0, index=False)
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "synthetic.csv"
+        output = Path(tmp) / "out.parquet"
+        started = time.perf_counter()
+        write_synthetic_csv(source, args.rows, args.chunksize)
+        generated = time.perf_counter() - started
+        rss_before = peak_rss_mb()
+
+        started = time.perf_counter()
+        stats = stream_to_parquet(
+            source, output, lineage_source="bench", chunksize=args.chunksize
+        )
+        elapsed = time.perf_counter() - started
+
+        report = {
+            "rows": args.rows,
+            "chunksize": args.chunksize,
+            "input_mb": round(source.stat().st_size / 1e6, 1),
+            "output_mb": round(output.stat().st_size / 1e6, 1),
+            "generate_s": round(generated, 2),
+            "pipeline_s": round(elapsed, 2),
+            "rows_per_s": round(stats.rows_in / elapsed),
+            "rows_out": stats.rows_out,
+            "duplicates_dropped": stats.duplicates_dropped,
+            "id_set_mb": round(stats.id_set_bytes / 1e6, 1),
+            "peak_rss_mb_before_pipeline": round(rss_before, 1),
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+        }
+        print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
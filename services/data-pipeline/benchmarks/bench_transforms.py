@@ -0,0 +1,107 @@
+"""Compare row throughput of the PII, validation and backfill transforms.
+
+Usage: python benchmarks/bench_transforms.py [--rows 1000000] [--workers N]
+
+"before" re-implements the original per-row versions for reference; "after"
+calls the current vectorized functions in :mod:`cortex_data_pipeline.pipeline`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd  # type: ignore[import-untyped]
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cortex_data_pipeline import pipeline  # noqa: E402
+
+
+def legacy_mask_pii(df: pd.DataFrame) -> pd.DataFrame:
+    out = df.copy()
+
+    def _mask_email(email: Any) -> Any:
+        if isinstance(email, str) and "@" in email:
+            local, _, domain = email.partition("@")
+            hashed = hashlib.sha256(local.encode()).hexdigest()[:8]
+            return f"{hashed}@{domain}"
+        return email
+
+    out["email"] = out["email"].map(_mask_email)
+    return out
+
+
+def legacy_validate(df: pd.DataFrame) -> bool:
+    return bool(df["email"].astype(str).str.match(pipeline.EMAIL_REGEX).all())
+
+
+def legacy_backfill(current: pd.DataFrame, historical: list[dict[str, Any]]) -> pd.DataFrame:
+    combined = pd.concat([current, pd.DataFrame(historical)])
+    return combined.drop_duplicates(subset="id").reset_index(drop=True)
+
+
+def timed(fn: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    users = rng.integers(0, args.rows // 2, args.rows)
+    df = pd.DataFrame(
+        {
+            "id": np.arange(args.rows),
+            "value": rng.integers(0, 1_000, args.rows),
+            "email": [f"user{u}@example.com" for u in users],
+        }
+    )
+    historical = df.sample(frac=0.5, random_state=0).to_dict("records")
+    historical += [
+        {"id": args.rows + i, "value": i, "email": f"new{i}@example.com"}
+        for i in range(args.rows // 10)
+    ]
+
+    cases = {
+        "mask_pii": (
+            lambda: legacy_mask_pii(df),
+            lambda: pipeline.mask_pii(df, workers=args.workers),
+        ),
+        "validate_emails": (
+            lambda: legacy_validate(df),
+            lambda: pipeline._emails_valid(df["email"]),
+        ),
+        "backfill": (
+            lambda: legacy_backfill(df, historical),
+            lambda: pipeline.backfill(df, historical),
+        ),
+    }
+    report: dict[str, dict[str, float]] = {}
+    for name, (before, after) in cases.items():
+        before_s = timed(before)
+        after_s = timed(after)
+        report[name] = {
+            "before_rows_per_s": round(args.rows / before_s),
+            "after_rows_per_s": round(args.rows / after_s),
+            "speedup": round(before_s / after_s, 2),
+        }
+    assert legacy_mask_pii(df).equals(pipeline.mask_pii(df, workers=args.workers))
+    print(json.dumps({"rows": args.rows, "results": report}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
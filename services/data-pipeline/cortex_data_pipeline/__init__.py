@@ -5,11 +5,23 @@ from .pipeline import (
     mask_pii,
     transform,
 )
+from .streaming import (
+    SeenIds,
+    StreamStats,
+    iter_pipeline,
+    read_chunks,
+    stream_to_parquet,
+)
 
 __all__ = [
+    "SeenIds",
+    "StreamStats",
     "add_lineage_metadata",
     "backfill",
     "ingest",
+    "iter_pipeline",
     "mask_pii",
+    "read_chunks",
+    "stream_to_parquet",
     "transform",
 ]
@@ -3,13 +3,19 @@
 from __future__ import annotations
 
 import hashlib
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any
 
 import pandas as pd  # type: ignore[import-untyped]
 
 REQUIRED_COLUMNS = ["id", "value", "email"]
 EMAIL_REGEX = re.compile(r"[^@]+@[^@]+\.[^@]+")
+# Splits at the first "@", matching str.partition; DOTALL keeps newlines in the domain
+EMAIL_SPLIT_PATTERN = r"(?s)^(?P<local>[^@]*)@(?P<domain>.*)$"
+# Distinct local parts below this count are hashed in-process
+PARALLEL_HASH_THRESHOLD = 200_000
 
 
 def ingest(records: list[dict[str, Any]]) -> pd.DataFrame:
@@ -21,27 +27,47 @@ def ingest(records: list[dict[str, Any]]) -> pd.DataFrame:
     """
 
     df = pd.DataFrame(records)
+    validate_frame(df)
+    return df.drop_duplicates(subset="id").reset_index(drop=True)
+
+
+def validate_frame(df: pd.DataFrame) -> None:
+    """Raise ``ValueError`` when ``df`` fails the ingest schema checks."""
+
     missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
     if missing:
         raise ValueError(f"Missing columns: {missing}")
 
     if not df["id"].notna().all():
         raise ValueError("id column contains null values")
-    if not df["email"].astype(str).str.match(EMAIL_REGEX).all():
+    if not _emails_valid(df["email"]):
         raise ValueError("Invalid email format")
 
-    return df.drop_duplicates(subset="id").reset_index(drop=True)
+
+def _emails_valid(emails: pd.Series) -> bool:
+    try:
+        # Arrow-backed strings run the anchored match in RE2 over the whole buffer
+        text = emails.astype("string[pyarrow]")
+    except ImportError:
+        text = emails.astype(str)
+    return bool(text.str.fullmatch(EMAIL_REGEX.pattern).fillna(False).all())
 
 
 def transform(df: pd.DataFrame) -> pd.DataFrame:
     """Apply simple transformation to the ``value`` column."""
 
     out = df.copy()
+    transform_inplace(out)
+    return out
+
+
+def transform_inplace(df: pd.DataFrame) -> None:
+    """In-place variant of :func:`transform` for frames the caller owns."""
+
     try:
-        out["value"] = pd.to_numeric(out["value"], errors="raise").astype(int) * 2
+        df["value"] = pd.to_numeric(df["value"], errors="raise").astype(int) * 2
     except (ValueError, TypeError) as exc:
         raise ValueError("Non-numeric value encountered in 'value' column") from exc
-    return out
 
 
 def add_lineage_metadata(df: pd.DataFrame, source: str) -> pd.DataFrame:
@@ -52,25 +78,112 @@ def add_lineage_metadata(df: pd.DataFrame, source: str) -> pd.DataFrame:
     return out
 
 
-def mask_pii(df: pd.DataFrame) -> pd.DataFrame:
+def mask_pii(df: pd.DataFrame, workers: int | None = None) -> pd.DataFrame:
     """Mask PII such as email addresses while preserving domain information."""
 
     out = df.copy()
+    mask_pii_inplace(out, workers)
+    return out
 
-    def _mask_email(email: Any) -> Any:
-        if isinstance(email, str) and "@" in email:
-            local, _, domain = email.partition("@")
-            hashed = hashlib.sha256(local.encode()).hexdigest()[:8]
-            return f"{hashed}@{domain}"
-        return email
 
-    out["email"] = out["email"].map(_mask_email)
-    return out
+def mask_pii_inplace(df: pd.DataFrame, workers: int | None = None) -> None:
+    """In-place variant of :func:`mask_pii` for frames the caller owns.
+
+    Each distinct local part is hashed once. When there are more than
+    ``PARALLEL_HASH_THRESHOLD`` of them, hashing is spread over ``workers``
+    processes (default: CPU count).
+    """
+
+    df["email"] = mask_emails(df["email"], workers)
+
+
+def mask_emails(emails: pd.Series, workers: int | None = None) -> pd.Series:
+    """Replace the local part of each email with the first 8 hex digits of its SHA-256.
+
+    String columns are split and re-joined with Arrow compute kernels; columns
+    holding non-string values fall back to per-row masking.
+    """
+
+    arrow = _as_arrow_strings(emails)
+    if arrow is None:
+        return emails.map(_mask_email)
+    import pyarrow as pa  # type: ignore[import-untyped]
+    import pyarrow.compute as pc  # type: ignore[import-untyped]
+
+    parts = pc.extract_regex(arrow, EMAIL_SPLIT_PATTERN)
+    local = pc.struct_field(parts, [0])
+    domain = pc.struct_field(parts, [1])
+    encoded = pc.dictionary_encode(local)
+    hashed = pa.array(
+        _hash_locals(pc.cast(encoded.dictionary, pa.binary()).to_pylist(), workers),
+        type=arrow.type,
+    )
+    joined = pc.binary_join_element_wise(
+        hashed.take(encoded.indices), domain, pa.scalar("@", type=arrow.type)
+    )
+    if emails.dtype != object:
+        result = pc.if_else(pc.is_valid(joined), joined, arrow)
+        return pd.Series(pd.array(result, dtype=emails.dtype), index=emails.index, name=emails.name)
+    # Object columns: write back only masked slots so missing values keep their sentinel
+    matched = pc.is_valid(joined).to_numpy(zero_copy_only=False)
+    masked = emails.to_numpy(dtype=object, copy=True)
+    masked[matched] = pc.filter(joined, matched).to_numpy(zero_copy_only=False)
+    return pd.Series(masked, index=emails.index, name=emails.name)
+
+
+def _as_arrow_strings(emails: pd.Series) -> Any:
+    try:
+        import pyarrow as pa  # type: ignore[import-untyped]
+    except ImportError:
+        return None
+    try:
+        arrow = pa.array(emails, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+    if isinstance(arrow, pa.ChunkedArray):
+        arrow = arrow.combine_chunks()
+    if not (pa.types.is_string(arrow.type) or pa.types.is_large_string(arrow.type)):
+        return None
+    return arrow
+
+
+def _mask_email(email: Any) -> Any:
+    if isinstance(email, str) and "@" in email:
+        local, _, domain = email.partition("@")
+        hashed = hashlib.sha256(local.encode()).hexdigest()[:8]
+        return f"{hashed}@{domain}"
+    return email
+
+
+def _hash_locals(locals_: list[bytes], workers: int | None = None) -> list[str]:
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(locals_) > PARALLEL_HASH_THRESHOLD:
+        chunk = -(-len(locals_) // workers)
+        slices = [locals_[i : i + chunk] for i in range(0, len(locals_), chunk)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return [h for part in pool.map(_hash_batch, slices) for h in part]
+    return _hash_batch(locals_)
+
+
+def _hash_batch(locals_: list[bytes]) -> list[str]:
+    sha256 = hashlib.sha256
+    return [sha256(local).hexdigest()[:8] for local in locals_]
 
 
 def backfill(current: pd.DataFrame, historical: list[dict[str, Any]]) -> pd.DataFrame:
-    """Merge historical records while avoiding duplicate ``id`` values."""
+    """Merge historical records while avoiding duplicate ``id`` values.
+
+    Historical rows are anti-joined against the ``id`` index of ``current`` so
+    only genuinely new keys are copied into the result.
+    """
 
+    if not current["id"].is_unique:
+        current = current.drop_duplicates(subset="id")
     hist_df = pd.DataFrame(historical)
-    combined = pd.concat([current, hist_df])
-    return combined.drop_duplicates(subset="id").reset_index(drop=True)
+    if hist_df.empty:
+        return current.reset_index(drop=True)
+    known = pd.Index(current["id"])
+    new_rows = hist_df[~hist_df["id"].isin(known)]
+    if not new_rows["id"].is_unique:
+        new_rows = new_rows.drop_duplicates(subset="id")
+    return pd.concat([current, new_rows], ignore_index=True)
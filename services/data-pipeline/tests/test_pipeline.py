@@ -90,3 +90,54 @@ def test_ingest_invalid_schema_failure() -> None:
 def test_ingest_invalid_email_failure() -> None:
     with pytest.raises(ValueError):
         ingest([{"id": 1, "value": 10, "email": "not-an-email"}])
+
+
+def _legacy_mask(email: object) -> object:
+    import hashlib
+
+    if isinstance(email, str) and "@" in email:
+        local, _, domain = email.partition("@")
+        return f"{hashlib.sha256(local.encode()).hexdigest()[:8]}@{domain}"
+    return email
+
+
+def test_pii_masking_matches_per_row_hashing(monkeypatch: pytest.MonkeyPatch) -> None:
+    from cortex_data_pipeline import pipeline
+
+    emails = ["a@example.com", "b@x.org", "a@other.net", None, 5, "no-at", "x@y@z.io"]
+    df = pd.DataFrame({"id": range(len(emails)), "email": emails})
+    expected = [_legacy_mask(e) for e in emails]
+
+    assert mask_pii(df)["email"].tolist() == expected
+    monkeypatch.setattr(pipeline, "PARALLEL_HASH_THRESHOLD", 1)
+    assert mask_pii(df, workers=2)["email"].tolist() == expected
+    assert df["email"].tolist() == emails
+
+    raw = ["a@example.com", None, "no-at", "x@y@z.io", "ü\n@d"] * 3
+    masked = pipeline.mask_emails(pd.Series(raw, dtype="string"))
+    assert masked.dtype == "string"
+    assert masked.astype(object).where(masked.notna(), None).tolist() == [
+        _legacy_mask(e) for e in raw
+    ]
+
+
+def test_ingest_rejects_trailing_garbage_after_email() -> None:
+    with pytest.raises(ValueError, match="Invalid email format"):
+        ingest([{"id": 1, "value": 10, "email": "a@example.com@evil"}])
+
+
+def test_backfill_anti_join_keeps_first_occurrence() -> None:
+    current = ingest(_sample_records())
+    historical = [
+        {"id": 3, "value": 30, "email": "c@example.com"},
+        {"id": 1, "value": 99, "email": "z@example.com"},
+        {"id": 3, "value": 31, "email": "d@example.com"},
+    ]
+    combined = backfill(current, historical)
+    expected = (
+        pd.concat([current, pd.DataFrame(historical)])
+        .drop_duplicates(subset="id")
+        .reset_index(drop=True)
+    )
+    pd.testing.assert_frame_equal(combined, expected)
+    assert backfill(current, []).equals(current)
@@ -0,0 +1,112 @@
+"""Tests for the chunked streaming pipeline.
+
+Skipped when pandas is unavailable; Parquet cases also need pyarrow.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+try:  # pragma: no cover - guard
+    import pandas as pd  # type: ignore[import-untyped]
+    from cortex_data_pipeline import (  # type: ignore[import-not-found]
+        SeenIds,
+        StreamStats,
+        add_lineage_metadata,
+        backfill,
+        ingest,
+        iter_pipeline,
+        mask_pii,
+        stream_to_parquet,
+        transform,
+    )
+except Exception as import_err:  # pragma: no cover
+    pytest.skip(
+        f"data-pipeline deps unavailable: {import_err}", allow_module_level=True
+    )
+
+
+def _records(ids: list[int]) -> list[dict[str, object]]:
+    return [
+        {"id": i, "value": i * 10, "email": f"user{i}@example.com"} for i in ids
+    ]
+
+
+def _in_memory(current: list[dict[str, object]], historical: list[dict[str, object]]) -> pd.DataFrame:
+    df = backfill(ingest(current), historical)
+    df = transform(df)
+    df = add_lineage_metadata(df, "unit-test")
+    return mask_pii(df)
+
+
+def test_streaming_matches_in_memory_pipeline(tmp_path: Path) -> None:
+    current = _records([1, 2, 3, 2, 4, 5, 1])
+    historical = _records([5, 6, 7, 3])
+    current_path = tmp_path / "current.csv"
+    historical_path = tmp_path / "historical.jsonl"
+    pd.DataFrame(current).to_csv(current_path, index=False)
+    historical_path.write_text("\n".join(json.dumps(r) for r in historical) + "\n")
+
+    stats = StreamStats()
+    chunks = list(
+        iter_pipeline(
+            [current_path, historical_path],
+            lineage_source="unit-test",
+            chunksize=2,
+            stats=stats,
+        )
+    )
+    streamed = pd.concat(chunks, ignore_index=True)
+
+    expected = _in_memory(current, historical)
+    assert streamed["id"].tolist() == expected["id"].tolist()
+    assert streamed["value"].tolist() == expected["value"].tolist()
+    assert streamed["email"].tolist() == expected["email"].tolist()
+    assert (streamed["lineage_source"] == "unit-test").all()
+    assert stats.rows_in == 11
+    assert stats.rows_out == 7
+    assert stats.duplicates_dropped == 4
+    assert max(len(chunk) for chunk in chunks) <= 2
+
+
+def test_stream_to_parquet_writes_all_chunks(tmp_path: Path) -> None:
+    pytest.importorskip("pyarrow")
+    source = tmp_path / "input.csv"
+    pd.DataFrame(_records(list(range(50)) + list(range(25)))).to_csv(source, index=False)
+    output = tmp_path / "out.parquet"
+
+    stats = stream_to_parquet(source, output, lineage_source="batch", chunksize=8)
+
+    written = pd.read_parquet(output)
+    assert stats.rows_out == 50
+    assert written["id"].tolist() == list(range(50))
+    assert written["value"].tolist() == [i * 20 for i in range(50)]
+    assert written["email"].str.endswith("@example.com").all()
+
+
+def test_streaming_validates_every_chunk(tmp_path: Path) -> None:
+    records = _records([1, 2, 3])
+    records[2]["email"] = "not-an-email"
+    source = tmp_path / "bad.csv"
+    pd.DataFrame(records).to_csv(source, index=False)
+
+    chunks = iter_pipeline(source, chunksize=2)
+    next(chunks)
+    with pytest.raises(ValueError, match="Invalid email format"):
+        next(chunks)
+
+
+def test_seen_ids_tracks_first_occurrence_across_batches() -> None:
+    seen = SeenIds()
+    first = seen.first_seen(pd.Series([1, 2, 2, 3]))
+    second = seen.first_seen(pd.Series([3, 4, 1, 5]))
+    third = seen.first_seen(pd.Series(["a", "b", "a"]))
+
+    assert first.tolist() == [True, True, False, True]
+    assert second.tolist() == [False, True, False, True]
+    assert third.tolist() == [True, True, False]
+    assert len(seen) == 7
+    assert seen.nbytes == 7 * 8
@@ -0,0 +1,123 @@
+"""Compare per-request validation cost of the sequential and single-pass scanners.
+
+Usage: python benchmarks/bench_security_scan.py [--sizes 200,2000,20000]
+
+"before" runs each rule family's regexes one after another, as
+``SecurityValidator.validate_input`` used to; "after" runs the single-pass
+:class:`scanner.MultiPatternScanner`. The streaming section validates output
+arriving in small chunks: rescanning the accumulated text after every chunk
+versus :class:`scanner.StreamScan`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from scanner import BANNED_RULES, PII_RULES, MultiPatternScanner  # noqa: E402
+
+COMPILED_BANNED = [re.compile(rule.pattern, re.IGNORECASE) for rule in BANNED_RULES]
+COMPILED_PII = [re.compile(rule.pattern, re.IGNORECASE) for rule in PII_RULES]
+SCANNER = MultiPatternScanner(BANNED_RULES + PII_RULES)
+
+WORDS = (
+    "the model should summarise quarterly revenue for each region and explain "
+    "variance against forecast using the attached tables and notes from 2024"
+).split()
+SENSITIVE = ["123-45-6789", "jane.doe@example.com", "4111 1111 1111 1111"]
+
+
+def legacy_scan(text: str) -> list[str]:
+    issues = []
+    for pattern in COMPILED_BANNED:
+        if pattern.search(text):
+            issues.append(f"Banned content detected: {pattern.pattern}")
+    for pattern in COMPILED_PII:
+        matches = pattern.findall(text)
+        if matches:
+            issues.append(f"PII detected: {len(matches)} instances")
+    return issues
+
+
+def single_pass_scan(text: str) -> list[str]:
+    return [match.rule.name for match in SCANNER.scan(text)]
+
+
+def make_prompt(size: int, rng: random.Random, sensitive: bool) -> str:
+    words: list[str] = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        if sensitive and rng.random() < 0.01:
+            word = rng.choice(SENSITIVE)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:size]
+
+
+def per_call_us(fn: Callable[[str], object], texts: list[str]) -> float:
+    start = time.perf_counter()
+    for text in texts:
+        fn(text)
+    return (time.perf_counter() - start) / len(texts) * 1e6
+
+
+def bench_streaming(size: int, chunk: int, rng: random.Random) -> tuple[float, float]:
+    text = make_prompt(size, rng, sensitive=True)
+    chunks = [text[i : i + chunk] for i in range(0, len(text), chunk)]
+
+    start = time.perf_counter()
+    seen = ""
+    for piece in chunks:
+        seen += piece
+        legacy_scan(seen)
+    rescan_ms = (time.perf_counter() - start) * 1e3
+
+    start = time.perf_counter()
+    stream = SCANNER.stream()
+    for piece in chunks:
+        stream.feed(piece)
+    stream.close()
+    incremental_ms = (time.perf_counter() - start) * 1e3
+    return rescan_ms, incremental_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="200,2000,5000,20000")
+    parser.add_argument("--prompts", type=int, default=200)
+    parser.add_argument("--stream-size", type=int, default=8000)
+    parser.add_argument("--chunk", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    print(
+        f"{'chars':>7} {'sensitive':>9} {'before us':>10} {'after us':>9} {'speedup':>8}"
+    )
+    for size in (int(s) for s in args.sizes.split(",")):
+        for sensitive in (False, True):
+            texts = [make_prompt(size, rng, sensitive) for _ in range(args.prompts)]
+            before = per_call_us(legacy_scan, texts)
+            after = per_call_us(single_pass_scan, texts)
+            print(
+                f"{size:>7} {str(sensitive):>9} {before:>10.1f} {after:>9.1f}"
+                f" {before / after:>7.1f}x"
+            )
+
+    rescan_ms, incremental_ms = bench_streaming(args.stream_size, args.chunk, rng)
+    print(
+        f"\nstreaming {args.stream_size} chars in {args.chunk}-char chunks: "
+        f"rescan {rescan_ms:.1f} ms, incremental {incremental_ms:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import math
 import os
 import time
 from contextlib import asynccontextmanager
@@ -232,7 +233,13 @@ async def check_rate_limit(
     user_id = user.get("user_id") if user else None
 
     if not await rate_limiter.check_rate_limit(request, user_id):
-        raise HTTPException(status_code=429, detail="Rate limit exceeded")
+        headers = None
+        decision = getattr(request.state, "rate_limit", None)
+        if decision is not None and math.isfinite(decision.retry_after):
+            headers = {"Retry-After": str(max(1, math.ceil(decision.retry_after)))}
+        raise HTTPException(
+            status_code=429, detail="Rate limit exceeded", headers=headers
+        )
 
 
 @app.post("/predict", dependencies=[Depends(check_rate_limit)])
@@ -325,6 +332,17 @@ async def predict(
         if inference_response.cached:
             CACHE_HITS.labels(model=MODEL_NAME).inc()
 
+        if monitoring_service:
+            monitoring_service.record_request(
+                method="/predict",
+                status="success",
+                duration=duration,
+                success=True,
+                cache_hit=inference_response.cached,
+                tokens=inference_response.tokens_generated,
+                model=MODEL_NAME,
+            )
+
         logger.info(
             "Inference completed",
             extra={
@@ -342,6 +360,16 @@ async def predict(
         raise
     except Exception as e:
         REQUEST_COUNT.labels(model=MODEL_NAME, status="error").inc()
+        if monitoring_service:
+            monitoring_service.record_request(
+                method="/predict",
+                status="error",
+                duration=time.perf_counter() - start_time,
+                success=False,
+                cache_hit=False,
+                error_type=type(e).__name__,
+                model=MODEL_NAME,
+            )
         logger.error(f"Inference failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
 
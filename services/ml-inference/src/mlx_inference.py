@@ -21,7 +21,7 @@ from error_handling import (
     retry_with_backoff,
 )
 from mlx_lm import generate, load
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
 
@@ -42,7 +42,7 @@ class InferenceRequest(BaseModel):
     """Request for ML inference."""
 
     prompt: str
-    max_tokens: int | None = None
+    max_tokens: int | None = Field(default=None, ge=1)
     temperature: float | None = None
     stream: bool = False
     batch_id: str | None = None
@@ -1,19 +1,35 @@
 """
 Model registry and versioning system for ML inference service.
 Provides model management, A/B testing, and version control capabilities.
+
+Registry state lives in memory, indexed by model id, by name and by
+(environment, name), and is written through to a SQLite store one row at a
+time. Model artifacts are hashed and copied in a worker thread, in a single
+pass with large buffers. Each A/B test is compiled into a bucket -> model
+table when it starts, so routing a request is one hash and one lookup.
 """
 
 import asyncio
 import hashlib
 import json
+import math
+import shutil
 import time
 from dataclasses import asdict, dataclass
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from enum import Enum
 from pathlib import Path
 from typing import Any
 
-import aiofiles
+from registry_store import RegistryStore
+
+DEFAULT_ENVIRONMENT = "production"
+
+# Read size for hashing and copying model artifacts
+HASH_BUFFER_SIZE = 1024 * 1024
+
+# Users are assigned to A/B test arms by md5(test_id:user_id) % SPLIT_BUCKETS
+SPLIT_BUCKETS = 100
 
 
 class ModelStatus(str, Enum):
@@ -87,6 +103,101 @@ class DeploymentConfig:
     created_by: str
 
 
+@dataclass(frozen=True)
+class TrafficSplit:
+    """Precomputed user bucket -> model table for one A/B test."""
+
+    test_id: str
+    models: tuple[str, str]  # (model_a, model_b)
+    table: bytes  # arm index for each bucket
+    expires_at: float  # unix time; inf for open-ended tests
+
+    @classmethod
+    def build(cls, test: ABTestConfig) -> "TrafficSplit":
+        table = bytes(
+            bucket / SPLIT_BUCKETS < test.traffic_split
+            for bucket in range(SPLIT_BUCKETS)
+        )
+        expires_at = test.end_time.timestamp() if test.end_time else math.inf
+        return cls(test.test_id, (test.model_a, test.model_b), table, expires_at)
+
+    def bucket(self, user_id: str) -> int:
+        digest = hashlib.md5(f"{self.test_id}:{user_id}".encode()).digest()
+        return int.from_bytes(digest, "big") % SPLIT_BUCKETS
+
+    def arm(self, user_id: str) -> int:
+        """0 for model A, 1 for model B."""
+        return self.table[self.bucket(user_id)]
+
+    def choose(self, user_id: str) -> str:
+        return self.models[self.arm(user_id)]
+
+
+def calculate_file_hash(path: Path, buffer_size: int = HASH_BUFFER_SIZE) -> str:
+    """SHA256 of a file, read ``buffer_size`` bytes at a time."""
+    digest = hashlib.sha256()
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while size := f.readinto(buffer):
+            digest.update(view[:size])
+    return digest.hexdigest()
+
+
+def copy_and_hash(
+    source: Path, destination: Path, buffer_size: int = HASH_BUFFER_SIZE
+) -> tuple[str, int]:
+    """Copy ``source`` to ``destination`` reading it once; return (sha256, size)."""
+    digest = hashlib.sha256()
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    total = 0
+    with open(source, "rb", buffering=0) as src, open(destination, "wb") as dst:
+        while size := src.readinto(buffer):
+            digest.update(view[:size])
+            dst.write(view[:size])
+            total += size
+    shutil.copystat(source, destination)
+    return digest.hexdigest(), total
+
+
+def _metadata_record(metadata: ModelMetadata) -> dict[str, Any]:
+    return {
+        **asdict(metadata),
+        "created_at": metadata.created_at.isoformat(),
+        "status": metadata.status.value,
+    }
+
+
+def _metadata_from_record(data: dict[str, Any]) -> ModelMetadata:
+    return ModelMetadata(
+        **{
+            **data,
+            "created_at": datetime.fromisoformat(data["created_at"]),
+            "status": ModelStatus(data.get("status", ModelStatus.PENDING)),
+        }
+    )
+
+
+def _ab_test_record(test: ABTestConfig) -> dict[str, Any]:
+    return {
+        **asdict(test),
+        "start_time": test.start_time.isoformat(),
+        "end_time": test.end_time.isoformat() if test.end_time else None,
+    }
+
+
+def _ab_test_from_record(data: dict[str, Any]) -> ABTestConfig:
+    end_time = data.get("end_time")
+    return ABTestConfig(
+        **{
+            **data,
+            "start_time": datetime.fromisoformat(data["start_time"]),
+            "end_time": datetime.fromisoformat(end_time) if end_time else None,
+        }
+    )
+
+
 class ModelRegistry:
     """
     Model registry for managing ML model versions, metadata, and deployments.
@@ -110,102 +221,75 @@ class ModelRegistry:
         ]:
             path.mkdir(parents=True, exist_ok=True)
 
-        self._active_models: dict[str, str] = {}  # model_name -> version
+        # (environment, model_name) -> version
+        self._active_models: dict[tuple[str, str], str] = {}
         self._model_metadata: dict[str, ModelMetadata] = {}
+        # model_name -> version -> metadata
+        self._versions: dict[str, dict[str, ModelMetadata]] = {}
         self._ab_tests: dict[str, ABTestConfig] = {}
+        self._splits: dict[str, TrafficSplit] = {}
+        # model_name -> test_id of the A/B test routing its traffic
+        self._routes: dict[str, str] = {}
         self._deployments: dict[str, DeploymentConfig] = {}
-
-        # Load existing data
-        asyncio.create_task(self._load_registry())
-
-    async def _load_registry(self) -> None:
-        """Load registry data from disk."""
+        self._pending: set[str] = set()
+
+        self.store = RegistryStore(str(self.metadata_path / "registry.db"))
+        if self.store.is_empty():
+            self._import_json_registry()
+        self._load_registry()
+
+    def _load_registry(self) -> None:
+        """Load registry data from the store."""
+        for data in self.store.load_models():
+            self._index(_metadata_from_record(data))
+        for environment, name, version in self.store.load_active():
+            self._active_models[(environment, name)] = version
+        for data in self.store.load_ab_tests():
+            self._add_ab_test(_ab_test_from_record(data))
+
+    def _import_json_registry(self) -> None:
+        """One-off migration from the JSON files older versions rewrote."""
         try:
-            # Load model metadata
             metadata_file = self.metadata_path / "registry.json"
             if metadata_file.exists():
-                async with aiofiles.open(metadata_file) as f:
-                    data = json.loads(await f.read())
-                    for model_data in data.get("models", []):
-                        metadata = ModelMetadata(**model_data)
-                        metadata.created_at = datetime.fromisoformat(
-                            model_data["created_at"]
-                        )
-                        self._model_metadata[f"{metadata.name}:{metadata.version}"] = (
-                            metadata
-                        )
-
-            # Load active models
+                data = json.loads(metadata_file.read_text())
+                self.store.put_models(
+                    [
+                        _metadata_record(_metadata_from_record(model))
+                        for model in data.get("models", [])
+                    ]
+                )
+
             active_file = self.metadata_path / "active_models.json"
             if active_file.exists():
-                async with aiofiles.open(active_file) as f:
-                    self._active_models = json.loads(await f.read())
+                for name, version in json.loads(active_file.read_text()).items():
+                    self.store.set_active(DEFAULT_ENVIRONMENT, name, version)
 
-            # Load A/B tests
             ab_tests_file = self.ab_tests_path / "active_tests.json"
             if ab_tests_file.exists():
-                async with aiofiles.open(ab_tests_file) as f:
-                    data = json.loads(await f.read())
-                    for test_data in data.get("tests", []):
-                        test_config = ABTestConfig(**test_data)
-                        test_config.start_time = datetime.fromisoformat(
-                            test_data["start_time"]
-                        )
-                        if test_data.get("end_time"):
-                            test_config.end_time = datetime.fromisoformat(
-                                test_data["end_time"]
-                            )
-                        self._ab_tests[test_config.test_id] = test_config
+                data = json.loads(ab_tests_file.read_text())
+                for test in data.get("tests", []):
+                    self.store.put_ab_test(_ab_test_record(_ab_test_from_record(test)))
 
         except Exception as e:
-            print(f"Error loading registry: {e}")
+            print(f"Error importing JSON registry: {e}")
 
-    async def _save_registry(self) -> None:
-        """Save registry data to disk."""
-        try:
-            # Save model metadata
-            metadata_data = {
-                "models": [
-                    {**asdict(metadata), "created_at": metadata.created_at.isoformat()}
-                    for metadata in self._model_metadata.values()
-                ]
-            }
-            metadata_file = self.metadata_path / "registry.json"
-            async with aiofiles.open(metadata_file, "w") as f:
-                await f.write(json.dumps(metadata_data, indent=2))
+    def _index(self, metadata: ModelMetadata) -> None:
+        self._model_metadata[metadata.model_id] = metadata
+        self._versions.setdefault(metadata.name, {})[metadata.version] = metadata
 
-            # Save active models
-            active_file = self.metadata_path / "active_models.json"
-            async with aiofiles.open(active_file, "w") as f:
-                await f.write(json.dumps(self._active_models, indent=2))
-
-            # Save A/B tests
-            ab_tests_data = {
-                "tests": [
-                    {
-                        **asdict(test),
-                        "start_time": test.start_time.isoformat(),
-                        "end_time": test.end_time.isoformat()
-                        if test.end_time
-                        else None,
-                    }
-                    for test in self._ab_tests.values()
-                ]
-            }
-            ab_tests_file = self.ab_tests_path / "active_tests.json"
-            async with aiofiles.open(ab_tests_file, "w") as f:
-                await f.write(json.dumps(ab_tests_data, indent=2))
-
-        except Exception as e:
-            print(f"Error saving registry: {e}")
+    def _add_ab_test(self, test: ABTestConfig) -> None:
+        self._ab_tests[test.test_id] = test
+        split = TrafficSplit.build(test)
+        self._splits[test.test_id] = split
+        if split.expires_at > time.time():
+            model_a = self._model_metadata.get(test.model_a)
+            if model_a:
+                self._routes[model_a.name] = test.test_id
 
     def _calculate_file_hash(self, file_path: Path) -> str:
         """Calculate SHA256 hash of a file."""
-        hash_sha256 = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_sha256.update(chunk)
-        return hash_sha256.hexdigest()
+        return calculate_file_hash(file_path)
 
     async def register_model(
         self,
@@ -230,71 +314,89 @@ class ModelRegistry:
         # Generate model ID
         model_id = f"{name}:{version}"
 
-        # Check if version already exists
-        if model_id in self._model_metadata:
+        # Check if version already exists (or is being registered right now)
+        if model_id in self._model_metadata or model_id in self._pending:
             raise ValueError(f"Model version {model_id} already exists")
 
-        # Calculate file hash and size
-        file_hash = self._calculate_file_hash(model_path_obj)
-        file_size = model_path_obj.stat().st_size
-
-        # Create metadata
-        metadata = ModelMetadata(
-            model_id=model_id,
-            version=version,
-            name=name,
-            description=description,
-            model_type=model_type,
-            framework=framework,
-            created_at=datetime.now(UTC),
-            created_by=created_by,
-            tags=tags or [],
-            parameters=parameters or {},
-            performance_metrics=performance_metrics or {},
-            file_hash=file_hash,
-            file_size=file_size,
-            dependencies=dependencies or [],
-            status=ModelStatus.PENDING,
-        )
-
-        # Copy model file to registry
-        registry_model_path = self.models_path / name / version
-        registry_model_path.mkdir(parents=True, exist_ok=True)
-
-        import shutil
-
-        shutil.copy2(model_path, registry_model_path / model_path_obj.name)
-
-        # Store metadata
-        self._model_metadata[model_id] = metadata
-        await self._save_registry()
+        self._pending.add(model_id)
+        try:
+            # Copy model file to registry, hashing it on the way
+            registry_model_path = self.models_path / name / version
+            registry_model_path.mkdir(parents=True, exist_ok=True)
+            file_hash, file_size = await asyncio.to_thread(
+                copy_and_hash,
+                model_path_obj,
+                registry_model_path / model_path_obj.name,
+            )
+
+            # Create metadata
+            metadata = ModelMetadata(
+                model_id=model_id,
+                version=version,
+                name=name,
+                description=description,
+                model_type=model_type,
+                framework=framework,
+                created_at=datetime.now(UTC),
+                created_by=created_by,
+                tags=tags or [],
+                parameters=parameters or {},
+                performance_metrics=performance_metrics or {},
+                file_hash=file_hash,
+                file_size=file_size,
+                dependencies=dependencies or [],
+                status=ModelStatus.PENDING,
+            )
+
+            # Store metadata
+            self.store.put_model(_metadata_record(metadata))
+            self._index(metadata)
+        finally:
+            self._pending.discard(model_id)
 
         return model_id
 
-    async def activate_model(self, model_id: str) -> None:
+    async def activate_model(
+        self, model_id: str, environment: str = DEFAULT_ENVIRONMENT
+    ) -> None:
         """Activate a model version."""
         if model_id not in self._model_metadata:
             raise ValueError(f"Model {model_id} not found")
 
         metadata = self._model_metadata[model_id]
-        self._active_models[metadata.name] = metadata.version
         metadata.status = ModelStatus.ACTIVE
+        self.store.set_active(
+            environment, metadata.name, metadata.version, [_metadata_record(metadata)]
+        )
+        self._active_models[(environment, metadata.name)] = metadata.version
 
-        await self._save_registry()
-
-    async def deactivate_model(self, model_name: str) -> None:
+    async def deactivate_model(
+        self, model_name: str, environment: str = DEFAULT_ENVIRONMENT
+    ) -> None:
         """Deactivate a model."""
-        if model_name in self._active_models:
-            version = self._active_models[model_name]
-            model_id = f"{model_name}:{version}"
-            if model_id in self._model_metadata:
-                self._model_metadata[model_id].status = ModelStatus.DEPRECATED
-            del self._active_models[model_name]
-            await self._save_registry()
-
-    def get_active_model(self, model_name: str) -> str | None:
+        version = self._active_models.pop((environment, model_name), None)
+        if version is None:
+            return
+
+        records = []
+        metadata = self._versions.get(model_name, {}).get(version)
+        if metadata and version not in self._active_versions(model_name):
+            metadata.status = ModelStatus.DEPRECATED
+            records.append(_metadata_record(metadata))
+        self.store.set_active(environment, model_name, None, records)
+
+    def _active_versions(self, model_name: str) -> set[str]:
+        return {
+            version
+            for (_, name), version in self._active_models.items()
+            if name == model_name
+        }
+
+    def get_active_model(
+        self, model_name: str, environment: str = DEFAULT_ENVIRONMENT
+    ) -> str | None:
         """Get the active version of a model."""
-        return self._active_models.get(model_name)
+        return self._active_models.get((environment, model_name))
 
     def get_model_metadata(self, model_id: str) -> ModelMetadata | None:
         """Get metadata for a specific model version."""
@@ -302,9 +404,10 @@ class ModelRegistry:
 
     def list_models(self, model_name: str | None = None) -> list[ModelMetadata]:
         """List all models or models for a specific name."""
-        models = list(self._model_metadata.values())
         if model_name:
-            models = [m for m in models if m.name == model_name]
+            models = list(self._versions.get(model_name, {}).values())
+        else:
+            models = list(self._model_metadata.values())
         return sorted(models, key=lambda x: x.created_at, reverse=True)
 
     async def start_ab_test(
@@ -331,8 +434,6 @@ class ModelRegistry:
         start_time = datetime.now(UTC)
         end_time = None
         if duration_hours:
-            from datetime import timedelta
-
             end_time = start_time + timedelta(hours=duration_hours)
 
         ab_test = ABTestConfig(
@@ -347,14 +448,18 @@ class ModelRegistry:
             min_sample_size=1000,
         )
 
-        self._ab_tests[test_id] = ab_test
-        await self._save_registry()
+        self.store.put_ab_test(_ab_test_record(ab_test))
+        self._add_ab_test(ab_test)
 
     async def stop_ab_test(self, test_id: str) -> None:
         """Stop an A/B test."""
-        if test_id in self._ab_tests:
-            self._ab_tests[test_id].end_time = datetime.now(UTC)
-            await self._save_registry()
+        test = self._ab_tests.get(test_id)
+        if test:
+            test.end_time = datetime.now(UTC)
+            self.store.put_ab_test(_ab_test_record(test))
+            self._splits.pop(test_id, None)
+            for name in [n for n, t in self._routes.items() if t == test_id]:
+                del self._routes[name]
 
     def get_ab_test(self, test_id: str) -> ABTestConfig | None:
         """Get A/B test configuration."""
@@ -371,21 +476,21 @@ class ModelRegistry:
 
     def should_use_model_b(self, test_id: str, user_id: str) -> bool:
         """Determine if a user should see model B in an A/B test."""
-        test = self._ab_tests.get(test_id)
-        if not test:
+        split = self._splits.get(test_id)
+        if not split or split.expires_at < time.time():
             return False
-
-        # Check if test is active
-        now = datetime.now(UTC)
-        if test.end_time and test.end_time < now:
-            return False
-
-        # Use consistent hashing for user assignment
-        hash_input = f"{test_id}:{user_id}"
-        hash_value = int(hashlib.md5(hash_input.encode()).hexdigest(), 16)
-        user_bucket = (hash_value % 100) / 100.0
-
-        return user_bucket < test.traffic_split
+        return split.arm(user_id) == 1
+
+    def route_model(
+        self, model_name: str, user_id: str, environment: str = DEFAULT_ENVIRONMENT
+    ) -> str | None:
+        """Model id serving ``user_id``: the arm of a running A/B test whose
+        model A is ``model_name``, otherwise the active version."""
+        split = self._splits.get(self._routes.get(model_name, ""))
+        if split and split.expires_at >= time.time():
+            return split.choose(user_id)
+        version = self._active_models.get((environment, model_name))
+        return f"{model_name}:{version}" if version else None
 
     async def delete_model(self, model_id: str) -> None:
         """Delete a model version."""
@@ -393,24 +498,27 @@ class ModelRegistry:
             raise ValueError(f"Model {model_id} not found")
 
         metadata = self._model_metadata[model_id]
+        self.store.delete_model(metadata.name, metadata.version)
 
-        # Remove from active models if it's active
-        if (
-            metadata.name in self._active_models
-            and self._active_models[metadata.name] == metadata.version
-        ):
-            del self._active_models[metadata.name]
+        # Remove from active models wherever it's active
+        for key in [
+            key
+            for key, version in self._active_models.items()
+            if key[1] == metadata.name and version == metadata.version
+        ]:
+            del self._active_models[key]
+
+        # Remove metadata
+        del self._model_metadata[model_id]
+        versions = self._versions[metadata.name]
+        del versions[metadata.version]
+        if not versions:
+            del self._versions[metadata.name]
 
         # Remove model files
         model_dir = self.models_path / metadata.name / metadata.version
         if model_dir.exists():
-            import shutil
-
-            shutil.rmtree(model_dir)
-
-        # Remove metadata
-        del self._model_metadata[model_id]
-        await self._save_registry()
+            await asyncio.to_thread(shutil.rmtree, model_dir)
 
     def get_registry_stats(self) -> dict[str, Any]:
         """Get registry statistics."""
@@ -432,6 +540,9 @@ class ModelRegistry:
             / (1024**3),
         }
 
+    def close(self) -> None:
+        self.store.close()
+
 
 class ModelVersionManager:
     """
@@ -454,7 +565,7 @@ class ModelVersionManager:
 
         if strategy == DeploymentStrategy.IMMEDIATE:
             # Immediate deployment - activate model right away
-            await self.registry.activate_model(model_id)
+            await self.registry.activate_model(model_id, environment)
 
         elif strategy == DeploymentStrategy.CANARY:
             # Canary deployment - start with small percentage
@@ -479,9 +590,9 @@ class ModelVersionManager:
 
     async def promote_model(self, model_id: str, from_env: str, to_env: str) -> None:
         """Promote a model from one environment to another."""
-        # This would handle environment-specific model promotion
-        # For now, just activate the model
-        await self.registry.activate_model(model_id)
+        # This would handle environment-specific checks before promotion
+        # For now, just activate the model in the target environment
+        await self.registry.activate_model(model_id, to_env)
 
     def get_model_lineage(self, model_name: str) -> list[ModelMetadata]:
         """Get the version history/lineage for a model."""
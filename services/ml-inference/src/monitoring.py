@@ -6,6 +6,7 @@ Provides detailed performance analytics, alerting, distributed tracing, and real
 
 import asyncio
 import logging
+import time
 from collections import defaultdict, deque
 from collections.abc import Callable
 from dataclasses import dataclass, field
@@ -27,6 +28,8 @@ from prometheus_client import (
     generate_latest,
 )
 
+from sketch import DEFAULT_RELATIVE_ACCURACY, DDSketch
+
 logger = logging.getLogger(__name__)
 
 
@@ -193,12 +196,15 @@ class PrometheusMetrics:
         """Record cache miss."""
         self.cache_misses.inc()
 
-    def update_system_metrics(self):
-        """Update system metrics."""
+    def update_system_metrics(self) -> tuple[float, float] | None:
+        """Update system metrics; returns (memory used bytes, CPU percent)."""
         if PSUTIL_AVAILABLE:
             memory = psutil.virtual_memory()
+            cpu_percent = psutil.cpu_percent()
             self.memory_usage.set(memory.used)
-            self.cpu_usage.set(psutil.cpu_percent())
+            self.cpu_usage.set(cpu_percent)
+            return memory.used, cpu_percent
+        return None
 
     def generate_metrics(self) -> str:
         """Generate Prometheus metrics."""
@@ -303,12 +309,34 @@ class AlertManager:
 
 
 class PerformanceAnalyzer:
-    """Advanced performance analysis."""
+    """Advanced performance analysis.
+
+    Latencies go into a DDSketch per (endpoint, model) for the current
+    window. Every ``window_seconds`` the window is closed and kept in a ring of
+    ``window_size`` windows; percentiles merge the windows' sketches, so they
+    reflect every request rather than per-window averages. System metrics are
+    pushed in by a background sampler instead of being read per request.
+    """
 
-    def __init__(self, window_size: int = 100):
+    def __init__(
+        self,
+        window_size: int = 100,
+        window_seconds: float = 60.0,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        clock: Callable[[], float] = time.monotonic,
+    ):
         self.window_size = window_size
+        self.window_seconds = window_seconds
+        self.relative_accuracy = relative_accuracy
+        self.clock = clock
+        # Closed windows, oldest first
         self.metrics_history: deque = deque(maxlen=window_size)
+        self.latency_history: deque = deque(maxlen=window_size)
+        # Cumulative since start
         self.current_metrics = PerformanceMetrics()
+        self._window_metrics = PerformanceMetrics()
+        self._window_latency: dict[tuple[str, str], DDSketch] = {}
+        self._window_start = clock()
 
     def record_request(
         self,
@@ -317,57 +345,109 @@ class PerformanceAnalyzer:
         cache_hit: bool,
         tokens: int = 0,
         error_type: str | None = None,
+        endpoint: str = "default",
+        model: str = "default",
     ):
         """Record a request for analysis."""
-        self.current_metrics.request_count += 1
-        self.current_metrics.total_latency += latency
-        self.current_metrics.min_latency = min(
-            self.current_metrics.min_latency, latency
-        )
-        self.current_metrics.max_latency = max(
-            self.current_metrics.max_latency, latency
-        )
-
-        if not success:
-            self.current_metrics.error_count += 1
-
-        if cache_hit:
-            self.current_metrics.cache_hits += 1
-        else:
-            self.current_metrics.cache_misses += 1
-
-        self.current_metrics.tokens_generated += tokens
+        self._maybe_rotate()
+        for metrics in (self.current_metrics, self._window_metrics):
+            metrics.request_count += 1
+            metrics.total_latency += latency
+            metrics.min_latency = min(metrics.min_latency, latency)
+            metrics.max_latency = max(metrics.max_latency, latency)
+            if not success:
+                metrics.error_count += 1
+            if cache_hit:
+                metrics.cache_hits += 1
+            else:
+                metrics.cache_misses += 1
+            metrics.tokens_generated += tokens
+
+        sketch = self._window_latency.get((endpoint, model))
+        if sketch is None:
+            sketch = self._window_latency[(endpoint, model)] = DDSketch(
+                self.relative_accuracy
+            )
+        sketch.add(latency)
 
-        # Update system metrics
-        if PSUTIL_AVAILABLE:
-            memory = psutil.virtual_memory()
-            self.current_metrics.memory_usage_mb = memory.used / (1024 * 1024)
-            self.current_metrics.cpu_usage_percent = psutil.cpu_percent()
+    def update_system_metrics(self, memory_usage_mb: float, cpu_usage_percent: float):
+        """Store the latest system metrics sample."""
+        for metrics in (self.current_metrics, self._window_metrics):
+            metrics.memory_usage_mb = memory_usage_mb
+            metrics.cpu_usage_percent = cpu_usage_percent
 
     def get_current_metrics(self) -> PerformanceMetrics:
         """Get current metrics snapshot."""
         return self.current_metrics
 
+    def get_latency_sketch(
+        self,
+        endpoint: str | None = None,
+        model: str | None = None,
+        windows: int | None = None,
+    ) -> DDSketch:
+        """Merge latency sketches matching ``endpoint``/``model`` (None: any).
+
+        Covers the current window plus the last ``windows`` closed windows
+        (all retained windows when None).
+        """
+        self._maybe_rotate()
+        history = list(self.latency_history)
+        if windows is not None:
+            history = history[len(history) - windows :] if windows > 0 else []
+
+        merged = DDSketch(self.relative_accuracy)
+        for window in [*history, self._window_latency]:
+            for (sketch_endpoint, sketch_model), sketch in window.items():
+                if endpoint is not None and sketch_endpoint != endpoint:
+                    continue
+                if model is not None and sketch_model != model:
+                    continue
+                merged.merge(sketch)
+        return merged
+
+    def export_latency_sketches(self) -> list[dict[str, Any]]:
+        """Serialized sketches per (endpoint, model) over all retained windows.
+
+        Other workers' exports can be merged with ``DDSketch.from_dict``.
+        """
+        return [
+            {
+                "endpoint": endpoint,
+                "model": model,
+                "sketch": self.get_latency_sketch(endpoint, model).to_dict(),
+            }
+            for endpoint, model in self._latency_keys()
+        ]
+
     def get_percentiles(
-        self, percentiles: list[float] = [50, 90, 95, 99]
+        self,
+        percentiles: list[float] = [50, 90, 95, 99],
+        endpoint: str | None = None,
+        model: str | None = None,
     ) -> dict[str, float]:
-        """Calculate latency percentiles from recent history."""
-        if not self.metrics_history:
-            return {f"p{p}": 0.0 for p in percentiles}
-
-        latencies = [m.avg_latency for m in self.metrics_history if m.request_count > 0]
-        if not latencies:
-            return {f"p{p}": 0.0 for p in percentiles}
-
-        latencies.sort()
-        result = {}
-
-        for p in percentiles:
-            index = int((p / 100) * len(latencies))
-            index = min(index, len(latencies) - 1)
-            result[f"p{p}"] = latencies[index]
-
-        return result
+        """Calculate latency percentiles over the retained windows."""
+        sketch = self.get_latency_sketch(endpoint, model)
+        values = sketch.quantiles([p / 100 for p in percentiles])
+        return {f"p{p:g}": value for p, value in zip(percentiles, values)}
+
+    def _latency_keys(self) -> list[tuple[str, str]]:
+        keys = {key for window in self.latency_history for key in window}
+        keys.update(self._window_latency)
+        return sorted(keys)
+
+    def _maybe_rotate(self):
+        now = self.clock()
+        if now - self._window_start < self.window_seconds:
+            return
+        self.metrics_history.append(self._window_metrics)
+        self.latency_history.append(self._window_latency)
+        self._window_metrics = PerformanceMetrics(
+            memory_usage_mb=self.current_metrics.memory_usage_mb,
+            cpu_usage_percent=self.current_metrics.cpu_usage_percent,
+        )
+        self._window_latency = {}
+        self._window_start = now
 
     def detect_anomalies(self) -> list[str]:
         """Detect performance anomalies."""
@@ -427,10 +507,21 @@ class PerformanceAnalyzer:
                 "cpu_usage_percent": current.cpu_usage_percent,
             },
             "percentiles": percentiles,
+            "latency_breakdown": {
+                f"{endpoint}/{model}": self._summarize(
+                    self.get_latency_sketch(endpoint, model)
+                )
+                for endpoint, model in self._latency_keys()
+            },
             "anomalies": anomalies,
             "health_score": self._calculate_health_score(current),
         }
 
+    @staticmethod
+    def _summarize(sketch: DDSketch) -> dict[str, float]:
+        p50, p99, p999 = sketch.quantiles([0.5, 0.99, 0.999])
+        return {"count": sketch.count, "p50": p50, "p99": p99, "p99.9": p999}
+
     def _calculate_health_score(self, metrics: PerformanceMetrics) -> float:
         """Calculate overall health score (0-100)."""
         score = 100.0
@@ -519,8 +610,9 @@ def log_alert_handler(alert: Alert):
 class MonitoringService:
     """Comprehensive monitoring service."""
 
-    def __init__(self):
+    def __init__(self, system_metrics_interval: float = 5.0):
         self.prometheus = PrometheusMetrics()
+        self.system_metrics_interval = system_metrics_interval
         self.alert_manager = AlertManager()
         self.performance_analyzer = PerformanceAnalyzer()
 
@@ -531,8 +623,9 @@ class MonitoringService:
         # Add default alert handler
         self.alert_manager.add_handler(log_alert_handler)
 
-        # Background monitoring task
+        # Background monitoring tasks
         self._monitoring_task: asyncio.Task | None = None
+        self._system_metrics_task: asyncio.Task | None = None
         self._running = False
 
     async def start(self):
@@ -542,26 +635,25 @@ class MonitoringService:
 
         self._running = True
         self._monitoring_task = asyncio.create_task(self._monitoring_loop())
+        self._system_metrics_task = asyncio.create_task(self._system_metrics_loop())
         logger.info("Monitoring service started")
 
     async def stop(self):
         """Stop the monitoring service."""
         self._running = False
-        if self._monitoring_task:
-            self._monitoring_task.cancel()
-            try:
-                await self._monitoring_task
-            except asyncio.CancelledError:
-                pass
+        for task in (self._monitoring_task, self._system_metrics_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
         logger.info("Monitoring service stopped")
 
     async def _monitoring_loop(self):
         """Background monitoring loop."""
         while self._running:
             try:
-                # Update system metrics
-                self.prometheus.update_system_metrics()
-
                 # Check for alerts
                 current_metrics = self.performance_analyzer.get_current_metrics()
                 self.alert_manager.check_metric(
@@ -583,6 +675,24 @@ class MonitoringService:
                 logger.error(f"Monitoring loop error: {e}")
                 await asyncio.sleep(5)
 
+    async def _system_metrics_loop(self):
+        """Sample system metrics on a timer, off the request path."""
+        while self._running:
+            try:
+                self.sample_system_metrics()
+            except Exception as e:
+                logger.error(f"System metrics sampling error: {e}")
+            await asyncio.sleep(self.system_metrics_interval)
+
+    def sample_system_metrics(self):
+        """Read system metrics once and publish them."""
+        sample = self.prometheus.update_system_metrics()
+        if sample is not None:
+            memory_used, cpu_percent = sample
+            self.performance_analyzer.update_system_metrics(
+                memory_used / (1024 * 1024), cpu_percent
+            )
+
     def record_request(
         self,
         method: str,
@@ -592,6 +702,7 @@ class MonitoringService:
         cache_hit: bool,
         tokens: int = 0,
         error_type: str | None = None,
+        model: str | None = None,
     ):
         """Record a request across all monitoring systems."""
         # Prometheus metrics
@@ -612,6 +723,8 @@ class MonitoringService:
             cache_hit,
             tokens,
             error_type,
+            endpoint=method,
+            model=model or "default",
         )
 
     def get_metrics_export(self) -> str:
@@ -0,0 +1,241 @@
+"""
+GCRA rate limiting with pluggable storage.
+
+The generic cell rate algorithm keeps one float per key: the theoretical
+arrival time (TAT) at which the key's bucket would be empty again. A request
+of cost ``c`` against a quota with emission interval ``T`` (seconds per cost
+unit) and capacity ``B`` moves the TAT forward by ``c * T`` and is admitted
+while the TAT stays within ``B * T`` of now. Costs can be request counts or
+estimated tokens.
+
+A key whose TAT lies in the past carries no state (its bucket is full), so
+stores drop such keys without changing any decision. Stores also bound the
+table size: the in-process store evicts least recently used keys, the SQLite
+store the keys closest to expiry. The SQLite store lets several uvicorn
+workers on one host share limits.
+"""
+
+import math
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import TypeVar
+
+T = TypeVar("T")
+
+PERIODS = {"second": 1.0, "minute": 60.0, "hour": 3600.0, "day": 86400.0}
+
+DEFAULT_MAX_KEYS = 100_000
+DEFAULT_SWEEP_INTERVAL = 60.0
+
+# Reads the current TAT per key (absent keys omitted) and returns the TATs to
+# store together with the caller's result
+Decide = Callable[[dict[str, float]], tuple[dict[str, float], T]]
+
+
+@dataclass(frozen=True)
+class Quota:
+    """``limit`` cost units per ``period`` seconds, up to ``burst`` at once."""
+
+    limit: float
+    period: float
+    burst: float | None = None
+
+    def __post_init__(self) -> None:
+        if self.limit <= 0 or self.period <= 0:
+            raise ValueError("Quota limit and period must be positive")
+        if self.burst is not None and self.burst <= 0:
+            raise ValueError("Quota burst must be positive")
+
+    @classmethod
+    def parse(cls, spec: str, burst: float | None = None) -> "Quota":
+        """Parse ``"<limit>/<second|minute|hour|day>"``, e.g. ``"10/minute"``."""
+        try:
+            limit, unit = spec.split("/", 1)
+            return cls(float(limit), PERIODS[unit.strip().rstrip("s")], burst)
+        except (KeyError, ValueError) as e:
+            raise ValueError(f"Invalid rate limit spec: {spec!r}") from e
+
+    @property
+    def capacity(self) -> float:
+        return self.limit if self.burst is None else self.burst
+
+    @property
+    def emission_interval(self) -> float:
+        return self.period / self.limit
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    """Outcome of a rate limit check."""
+
+    allowed: bool
+    retry_after: float = 0.0  # seconds; inf when the cost exceeds a capacity
+    limited_by: str | None = None  # key of the first quota that rejected
+
+
+class RateLimitStore(ABC):
+    """Atomic read-modify-write of TATs for a set of keys."""
+
+    # True when transact may block on I/O or other processes
+    blocking = False
+
+    @abstractmethod
+    def transact(self, keys: Sequence[str], now: float, decide: Decide[T]) -> T:
+        """Run ``decide`` on the keys' TATs and store its updates atomically."""
+
+    def close(self) -> None:
+        """Release resources held by the store."""
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """In-process store bounded to ``max_keys`` entries (LRU eviction)."""
+
+    def __init__(
+        self,
+        max_keys: int = DEFAULT_MAX_KEYS,
+        sweep_interval: float = DEFAULT_SWEEP_INTERVAL,
+    ):
+        self.max_keys = max_keys
+        self.sweep_interval = sweep_interval
+        self._tats: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+    def transact(self, keys: Sequence[str], now: float, decide: Decide[T]) -> T:
+        with self._lock:
+            current = {key: self._tats[key] for key in keys if key in self._tats}
+            updates, result = decide(current)
+            for key, tat in updates.items():
+                self._tats[key] = tat
+                self._tats.move_to_end(key)
+
+            if now - self._last_sweep >= self.sweep_interval:
+                self._sweep(now)
+            while len(self._tats) > self.max_keys:
+                self._tats.popitem(last=False)
+            return result
+
+    def _sweep(self, now: float) -> None:
+        self._last_sweep = now
+        for key in [key for key, tat in self._tats.items() if tat <= now]:
+            del self._tats[key]
+
+
+class SQLiteRateLimitStore(RateLimitStore):
+    """Store in a local SQLite database shared by worker processes."""
+
+    blocking = True
+
+    def __init__(
+        self,
+        path: str,
+        max_keys: int = DEFAULT_MAX_KEYS,
+        sweep_interval: float = DEFAULT_SWEEP_INTERVAL,
+        timeout: float = 1.0,
+    ):
+        self.path = path
+        self.max_keys = max_keys
+        self.sweep_interval = sweep_interval
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+        self._conn = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits "
+            "(key TEXT PRIMARY KEY, tat REAL NOT NULL) WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS rate_limits_tat ON rate_limits (tat)"
+        )
+
+    def transact(self, keys: Sequence[str], now: float, decide: Decide[T]) -> T:
+        with self._lock:
+            conn = self._conn
+            # IMMEDIATE takes the write lock up front so workers serialize here
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                placeholders = ",".join("?" * len(keys))
+                rows = conn.execute(
+                    f"SELECT key, tat FROM rate_limits WHERE key IN ({placeholders})",
+                    list(keys),
+                ).fetchall()
+                updates, result = decide(dict(rows))
+                if updates:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO rate_limits (key, tat) VALUES (?, ?)",
+                        list(updates.items()),
+                    )
+                if now - self._last_sweep >= self.sweep_interval:
+                    self._sweep(now)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return result
+
+    def _sweep(self, now: float) -> None:
+        self._last_sweep = now
+        self._conn.execute("DELETE FROM rate_limits WHERE tat <= ?", (now,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM rate_limits").fetchone()
+        if count > self.max_keys:
+            self._conn.execute(
+                "DELETE FROM rate_limits WHERE key IN "
+                "(SELECT key FROM rate_limits ORDER BY tat LIMIT ?)",
+                (count - self.max_keys,),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class GCRALimiter:
+    """Check several quotas at once; a request is admitted only if all pass."""
+
+    def __init__(
+        self,
+        store: RateLimitStore | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.store = store if store is not None else MemoryRateLimitStore()
+        self.clock = clock
+
+    def acquire(self, checks: Sequence[tuple[str, Quota, float]]) -> RateLimitDecision:
+        """Charge ``cost`` against each ``(key, quota, cost)`` or none of them."""
+        for key, quota, cost in checks:
+            if cost < 0:
+                # A negative cost would move the TAT back and refill the quota
+                raise ValueError(f"Rate limit cost must not be negative: {cost!r}")
+            if cost > quota.capacity:
+                return RateLimitDecision(False, math.inf, key)
+        if not checks:
+            return RateLimitDecision(True)
+
+        now = self.clock()
+
+        def decide(
+            current: dict[str, float],
+        ) -> tuple[dict[str, float], RateLimitDecision]:
+            updates: dict[str, float] = {}
+            for key, quota, cost in checks:
+                interval = quota.emission_interval
+                tat = max(updates.get(key, current.get(key, now)), now)
+                new_tat = tat + cost * interval
+                excess = new_tat - now - quota.capacity * interval
+                if excess > 1e-9:  # float slack at exactly full capacity
+                    return {}, RateLimitDecision(False, excess, key)
+                updates[key] = new_tat
+            return updates, RateLimitDecision(True)
+
+        return self.store.transact([key for key, _, _ in checks], now, decide)
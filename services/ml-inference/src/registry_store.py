@@ -0,0 +1,185 @@
+"""
+SQLite storage for the model registry.
+
+Every register, activate, deactivate or A/B test change writes only the rows
+it touches in a single transaction, instead of rewriting the whole registry
+as JSON. Versions are indexed by ``(name, version)`` and ``(name,
+created_at)``, active versions by ``(environment, name)``, so each write costs
+the same however many versions are registered.
+
+Records are the JSON-serializable dicts produced by ``model_registry``; the
+indexed columns are copied out of them on write.
+"""
+
+import json
+import sqlite3
+import threading
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from typing import Any
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS models (
+    model_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    version TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS models_name_version ON models (name, version);
+CREATE INDEX IF NOT EXISTS models_name_created ON models (name, created_at);
+CREATE TABLE IF NOT EXISTS active_models (
+    environment TEXT NOT NULL,
+    name TEXT NOT NULL,
+    version TEXT NOT NULL,
+    PRIMARY KEY (environment, name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS ab_tests (
+    test_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+UPSERT_MODEL = (
+    "INSERT OR REPLACE INTO models "
+    "(model_id, name, version, status, created_at, data) VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+
+class RegistryStore:
+    """Model versions, active versions per environment and A/B tests."""
+
+    def __init__(self, path: str, timeout: float = 5.0):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM models LIMIT 1").fetchone() is None
+
+    def load_models(self) -> list[dict[str, Any]]:
+        """All model records, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM models ORDER BY created_at"
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def load_active(self) -> list[tuple[str, str, str]]:
+        """``(environment, name, version)`` for every active model."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT environment, name, version FROM active_models"
+            ).fetchall()
+
+    def load_ab_tests(self) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM ab_tests").fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def get_model(self, name: str, version: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM models WHERE name = ? AND version = ?",
+                (name, version),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list_versions(self, name: str) -> list[dict[str, Any]]:
+        """Records for ``name``, newest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM models WHERE name = ? ORDER BY created_at DESC",
+                (name,),
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def get_active(self, name: str, environment: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version FROM active_models WHERE environment = ? AND name = ?",
+                (environment, name),
+            ).fetchone()
+        return row[0] if row else None
+
+    def put_models(self, records: Sequence[dict[str, Any]]) -> None:
+        with self._transaction() as conn:
+            conn.executemany(UPSERT_MODEL, [_model_row(r) for r in records])
+
+    def put_model(self, record: dict[str, Any]) -> None:
+        self.put_models([record])
+
+    def set_active(
+        self,
+        environment: str,
+        name: str,
+        version: str | None,
+        records: Sequence[dict[str, Any]] = (),
+    ) -> None:
+        """Point ``environment`` at ``version`` (None clears it) and update
+        ``records`` (status changes) in the same transaction."""
+        with self._transaction() as conn:
+            if version is None:
+                conn.execute(
+                    "DELETE FROM active_models WHERE environment = ? AND name = ?",
+                    (environment, name),
+                )
+            else:
+                conn.execute(
+                    "INSERT OR REPLACE INTO active_models "
+                    "(environment, name, version) VALUES (?, ?, ?)",
+                    (environment, name, version),
+                )
+            conn.executemany(UPSERT_MODEL, [_model_row(r) for r in records])
+
+    def delete_model(self, name: str, version: str) -> None:
+        """Remove a version and any environment it is active in."""
+        with self._transaction() as conn:
+            conn.execute(
+                "DELETE FROM active_models WHERE name = ? AND version = ?",
+                (name, version),
+            )
+            conn.execute(
+                "DELETE FROM models WHERE name = ? AND version = ?", (name, version)
+            )
+
+    def put_ab_test(self, record: dict[str, Any]) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO ab_tests (test_id, data) VALUES (?, ?)",
+                (record["test_id"], json.dumps(record)),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _model_row(record: dict[str, Any]) -> tuple[str, str, str, str, str, str]:
+    return (
+        record["model_id"],
+        record["name"],
+        record["version"],
+        record["status"],
+        record["created_at"],
+        json.dumps(record),
+    )
@@ -0,0 +1,298 @@
+"""
+Single-pass multi-pattern scanning for prompt and output validation.
+
+All rules are compiled into one alternation wrapped in a lookahead, so a
+single ``finditer`` pass visits every start position once and reports the
+first rule matching there. Other rules are then confirmed with an anchored
+``match`` at those (rare) hit positions only. Per rule, the result is the
+same as ``findall`` with that rule's own regex.
+
+Rules may declare literals, one of which must occur in the text (under the
+rule's own flags) for the rule to apply. Rules whose literals are absent are dropped before the pass, and
+the combined automaton for each active subset is compiled once and cached.
+
+``StreamScan`` validates generated text chunk by chunk: each chunk is scanned
+together with a bounded lookback over the previous text, never from the start.
+"""
+
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+# Lookback for rules that do not declare a maximum match length
+DEFAULT_MAX_MATCH_LENGTH = 256
+
+_INLINE_FLAGS = {re.IGNORECASE: "i", re.MULTILINE: "m", re.DOTALL: "s"}
+
+
+@dataclass(frozen=True)
+class ScanRule:
+    """A named pattern belonging to a rule family (e.g. "banned", "pii")."""
+
+    name: str
+    family: str
+    pattern: str
+    flags: int = re.IGNORECASE
+    literals: tuple[str, ...] = ()
+    max_length: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.flags & ~sum(_INLINE_FLAGS):
+            raise ValueError(f"Unsupported flags for rule {self.name}")
+
+
+@dataclass(frozen=True)
+class ScanMatch:
+    """One rule match; offsets are absolute within the scanned text."""
+
+    rule: ScanRule
+    start: int
+    end: int
+    text: str
+
+
+# Content filter rules; literals let the scanner skip rules absent from the text
+BANNED_RULES = (
+    ScanRule(
+        "weapons",
+        "banned",
+        r"\b(?:bomb|explosive|weapon)\b",
+        literals=("bomb", "explosive", "weapon"),
+        max_length=9,
+    ),
+    ScanRule(
+        "cyber",
+        "banned",
+        r"\b(?:hack|exploit|malware)\b",
+        literals=("hack", "exploit", "malware"),
+        max_length=7,
+    ),
+    ScanRule(
+        "drugs",
+        "banned",
+        r"\b(?:drug|narcotic|cocaine)\b",
+        literals=("drug", "narcotic", "cocaine"),
+        max_length=8,
+    ),
+    ScanRule(
+        "self_harm",
+        "banned",
+        r"\b(?:suicide|self-harm)\b",
+        literals=("suicide", "self-harm"),
+        max_length=9,
+    ),
+)
+
+PII_RULES = (
+    ScanRule("ssn", "pii", r"\b\d{3}-\d{2}-\d{4}\b", max_length=11),
+    ScanRule(
+        "credit_card",
+        "pii",
+        r"\b\d{4}[- ]?\d{4}[- ]?\d{4}[- ]?\d{4}\b",
+        max_length=19,
+    ),
+    ScanRule(
+        "email",
+        "pii",
+        r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",
+        literals=("@",),
+        max_length=254,
+    ),
+)
+
+
+class MultiPatternScanner:
+    """Scan text for every rule in one pass."""
+
+    def __init__(
+        self,
+        rules: Iterable[ScanRule],
+        max_match_length: int = DEFAULT_MAX_MATCH_LENGTH,
+    ):
+        self.rules = tuple(rules)
+        if not self.rules:
+            raise ValueError("At least one rule is required")
+        self._compiled = [re.compile(rule.pattern, rule.flags) for rule in self.rules]
+        self._prefiltered = [i for i, rule in enumerate(self.rules) if rule.literals]
+        # Compiled with the rule's own flags so case folding matches the rule
+        self._prefilters = [
+            re.compile("|".join(map(re.escape, rule.literals)), rule.flags)
+            if rule.literals
+            else None
+            for rule in self.rules
+        ]
+        self._automata: dict[tuple[int, ...], re.Pattern[str]] = {}
+        self._all_rules = tuple(range(len(self.rules)))
+        self._max_lengths = [rule.max_length or max_match_length for rule in self.rules]
+        # Starts this close to the end of streamed text are not final yet
+        self.lookback = max(self._max_lengths)
+
+    def scan(self, text: str) -> list[ScanMatch]:
+        """Return all matches of all rules, ordered by start offset."""
+
+        active = self._active_rules(text)
+        if not active:
+            return []
+        return self._scan(text, 0, active, [0] * len(self.rules), final=True)
+
+    def stream(self) -> "StreamScan":
+        """Start an incremental scan over streamed chunks."""
+
+        return StreamScan(self)
+
+    def redact(
+        self,
+        text: str,
+        families: Iterable[str] | None = None,
+        replacement: str = "[REDACTED]",
+    ) -> str:
+        """Replace matches of the given rule families (all if None).
+
+        Rules are applied in rule order, each to the output of the previous
+        one, exactly like a sequence of ``re.sub`` calls: where matches of two
+        rules overlap, the earlier rule wins and the later one only sees what
+        is left. Text without any match costs a single scan.
+        """
+
+        wanted = set(families) if families is not None else None
+        if not any(
+            wanted is None or match.rule.family in wanted for match in self.scan(text)
+        ):
+            return text
+
+        for rule, compiled, prefilter in zip(
+            self.rules, self._compiled, self._prefilters, strict=True
+        ):
+            if wanted is not None and rule.family not in wanted:
+                continue
+            if prefilter is not None and not prefilter.search(text):
+                continue
+            text = compiled.sub(lambda _: replacement, text)
+        return text
+
+    def _active_rules(self, text: str) -> tuple[int, ...]:
+        if not self._prefiltered:
+            return self._all_rules
+        skipped = {i for i in self._prefiltered if not self._prefilters[i].search(text)}
+        return tuple(i for i in self._all_rules if i not in skipped)
+
+    def _automaton(self, active: tuple[int, ...]) -> re.Pattern[str]:
+        automaton = self._automata.get(active)
+        if automaton is None:
+            branches = []
+            for i in active:
+                rule = self.rules[i]
+                flags = "".join(
+                    letter
+                    for flag, letter in _INLINE_FLAGS.items()
+                    if rule.flags & flag
+                )
+                body = f"(?{flags}:{rule.pattern})" if flags else f"(?:{rule.pattern})"
+                branches.append(f"(?P<r{i}>{body})")
+            automaton = re.compile(f"(?=(?:{'|'.join(branches)}))")
+            self._automata[active] = automaton
+        return automaton
+
+    def _scan(
+        self,
+        text: str,
+        pos: int,
+        active: tuple[int, ...],
+        next_start: list[int],
+        final: bool,
+        offset: int = 0,
+    ) -> list[ScanMatch]:
+        """Scan ``text`` from ``pos``.
+
+        ``next_start`` holds, per rule, the absolute offset its next match may
+        start at (keeps each rule's matches non-overlapping, as ``findall``).
+        Unless ``final``, a match is only reported once it starts more than
+        the rule's maximum length before the end of ``text``: closer to the
+        end, more text could still extend it or let an earlier one match.
+        """
+
+        matches: list[ScanMatch] = []
+        end_of_text = len(text)
+        for hit in self._automaton(active).finditer(text, pos):
+            start = hit.start()
+            first = int(hit.lastgroup[1:])
+            candidates = [(first, hit.end(hit.lastgroup))]
+            for i in active:
+                if i > first:
+                    confirmed = self._compiled[i].match(text, start)
+                    if confirmed:
+                        candidates.append((i, confirmed.end()))
+
+            for i, end in candidates:
+                if end == start or start + offset < next_start[i]:
+                    continue
+                if not final and start + self._max_lengths[i] >= end_of_text:
+                    continue
+                next_start[i] = end + offset
+                matches.append(
+                    ScanMatch(
+                        self.rules[i], start + offset, end + offset, text[start:end]
+                    )
+                )
+        return matches
+
+
+class StreamScan:
+    """Incremental scan of text arriving in chunks.
+
+    Each ``feed`` reports matches that can no longer change as more text
+    arrives; ``close`` flushes the rest. Together they report exactly what
+    ``MultiPatternScanner.scan`` reports for the concatenated text, while only
+    the new chunk and a lookback bounded by the longest rule are rescanned.
+    """
+
+    def __init__(self, scanner: MultiPatternScanner):
+        self.scanner = scanner
+        self.matches: list[ScanMatch] = []
+        self._buffer = ""
+        self._offset = 0  # absolute offset of self._buffer[0]
+        self._resume = 0  # absolute offset of the first undecided start
+        self._next_start = [0] * len(scanner.rules)
+        self._closed = False
+
+    @property
+    def position(self) -> int:
+        """Total number of characters fed so far."""
+
+        return self._offset + len(self._buffer)
+
+    def feed(self, chunk: str) -> list[ScanMatch]:
+        """Add ``chunk`` and return the matches it completed."""
+
+        if self._closed:
+            raise RuntimeError("Stream scan already closed")
+        self._buffer += chunk
+        return self._advance(final=False)
+
+    def close(self) -> list[ScanMatch]:
+        """Finish the stream and return any matches held back at its end."""
+
+        if self._closed:
+            return []
+        self._closed = True
+        return self._advance(final=True)
+
+    def _advance(self, final: bool) -> list[ScanMatch]:
+        scanner = self.scanner
+        matches = scanner._scan(
+            self._buffer,
+            self._resume - self._offset,
+            scanner._all_rules,
+            self._next_start,
+            final,
+            self._offset,
+        )
+        self.matches.extend(matches)
+        self._resume = max(self._resume, self.position - scanner.lookback)
+
+        # Keep one character before the resume point so \b and lookbehinds see it
+        keep_from = max(self._resume - self._offset - 1, 0)
+        if keep_from:
+            self._buffer = self._buffer[keep_from:]
+            self._offset += keep_from
+        return matches
@@ -10,8 +10,6 @@ import hashlib
 import logging
 import os
 import re
-import time
-from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any, cast
 
@@ -20,29 +18,39 @@ from fastapi import Request
 from pydantic import BaseModel, Field, field_validator
 
 from cortex_ml.instructor_client import create_async_instructor
-
-# Prefer real slowapi, fallback to lightweight stubs to avoid type/import errors during tooling
-try:  # pragma: no cover - import shim
-    from slowapi import Limiter as _Limiter  # type: ignore[import-not-found]
-    from slowapi.util import (
-        get_remote_address as _get_remote_address,  # type: ignore[import-not-found]
-    )
-except Exception:  # pragma: no cover - fallback types
-    _Limiter = object
-
-    def _get_remote_address(_request: Any) -> str:
-        return "127.0.0.1"
+from rate_limit import (
+    DEFAULT_MAX_KEYS,
+    GCRALimiter,
+    MemoryRateLimitStore,
+    Quota,
+    RateLimitDecision,
+    RateLimitStore,
+    SQLiteRateLimitStore,
+)
+from scanner import (
+    BANNED_RULES,
+    PII_RULES,
+    MultiPatternScanner,
+    ScanMatch,
+    ScanRule,
+    StreamScan,
+)
+
+
+def get_remote_address(request: Any) -> str:
+    """Client address used to key rate limits for anonymous requests."""
+    client = getattr(request, "client", None)
+    return client.host if client and client.host else "127.0.0.1"
 
 
-# Re-export as names used in the module, with broad typing
-Limiter = cast(Any, _Limiter)
-get_remote_address = cast(Any, _get_remote_address)
-
 # Treat instructor module as dynamically typed to avoid stub issues
 instructor = cast(Any, instructor)
 
 logger = logging.getLogger(__name__)
 
+# Completion budget assumed for rate limiting when a request sets no max_tokens
+DEFAULT_MAX_TOKENS = 512
+
 
 class SecurityLevel(str, Enum):
     """Security classification levels."""
@@ -97,28 +105,14 @@ class SecurityValidator:
     """Comprehensive security validation for ML inference."""
 
     def __init__(self) -> None:
-        # Banned content patterns
-        self.banned_patterns = [
-            r"\b(?:bomb|explosive|weapon)\b",
-            r"\b(?:hack|exploit|malware)\b",
-            r"\b(?:drug|narcotic|cocaine)\b",
-            r"\b(?:suicide|self-harm)\b",
-        ]
+        self.banned_rules = list(BANNED_RULES)
+        self.pii_rules = list(PII_RULES)
+        self.banned_patterns = [rule.pattern for rule in self.banned_rules]
+        self.pii_patterns = [rule.pattern for rule in self.pii_rules]
 
-        # PII patterns
-        self.pii_patterns = [
-            r"\b\d{3}-\d{2}-\d{4}\b",  # SSN
-            r"\b\d{4}[- ]?\d{4}[- ]?\d{4}[- ]?\d{4}\b",  # Credit card
-            r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",  # Email
-        ]
-
-        # Compile regex patterns for performance
-        self.compiled_banned = [
-            re.compile(pattern, re.IGNORECASE) for pattern in self.banned_patterns
-        ]
-        self.compiled_pii = [
-            re.compile(pattern, re.IGNORECASE) for pattern in self.pii_patterns
-        ]
+        # One automaton over every rule family, scanned in a single pass
+        self.scanner = MultiPatternScanner(self.banned_rules + self.pii_rules)
+        self.pii_scanner = MultiPatternScanner(self.pii_rules)
 
         # Initialize instructor client for structured validation
         self.instructor_client: Any | None = None
@@ -150,18 +144,10 @@ class SecurityValidator:
         if len(prompt.strip()) == 0:
             issues.append("Empty prompt")
 
-        # Check for banned content
-        for pattern in self.compiled_banned:
-            if pattern.search(prompt):
-                issues.append(f"Banned content detected: {pattern.pattern}")
-
-        # Check for PII
-        pii_found: list[str] = []
-        for pattern in self.compiled_pii:
-            matches = pattern.findall(prompt)
-            if matches:
-                pii_found.extend(matches)
-                issues.append(f"PII detected: {len(matches)} instances")
+        # Banned content and PII in a single pass
+        matches = self.scanner.scan(prompt)
+        issues.extend(self._issues_for(matches))
+        pii_found = [match.text for match in matches if match.rule.family == "pii"]
 
         # Determine security classification
         security_level, content_category, is_safe = self._classify_issues(
@@ -188,6 +174,31 @@ class SecurityValidator:
             recommended_action="block" if not is_safe else "allow",
         )
 
+    def scan_stream(self) -> StreamScan:
+        """Start incremental validation of streamed output.
+
+        Feed generated chunks as they arrive; each ``feed`` returns the rule
+        matches completed so far without rescanning earlier text.
+        """
+        return self.scanner.stream()
+
+    def _issues_for(self, matches: list[ScanMatch]) -> list[str]:
+        """Summarize scanner matches as issues, in rule order."""
+        counts: dict[ScanRule, int] = {}
+        for match in matches:
+            counts[match.rule] = counts.get(match.rule, 0) + 1
+
+        issues: list[str] = []
+        for rule in self.scanner.rules:
+            count = counts.get(rule)
+            if not count:
+                continue
+            if rule.family == "banned":
+                issues.append(f"Banned content detected: {rule.pattern}")
+            else:
+                issues.append(f"PII detected: {count} instances")
+        return issues
+
     def _classify_issues(
         self, issues: list[str], pii_found: list[str]
     ) -> tuple[SecurityLevel, ContentCategory, bool]:
@@ -220,10 +231,7 @@ class SecurityValidator:
     def sanitize_output(self, text: str) -> str:
         """Sanitize output text for safety."""
         # Remove potential PII from output
-        sanitized = text
-
-        for pattern in self.compiled_pii:
-            sanitized = pattern.sub("[REDACTED]", sanitized)
+        sanitized = self.pii_scanner.redact(text)
 
         # Remove excessive whitespace
         sanitized = re.sub(r"\s+", " ", sanitized).strip()
@@ -236,9 +244,20 @@ class SecurityValidator:
 
 
 class RateLimiter:
-    """Advanced rate limiting with multiple tiers."""
+    """Advanced rate limiting with multiple tiers.
 
-    def __init__(self) -> None:
+    Each request is charged against its tenant's request quota, its tenant's
+    token quota (prompt plus requested completion, estimated) and, when
+    configured, a per-model token quota. All are GCRA limits sharing one
+    store; a request is admitted only if every quota has room.
+    """
+
+    def __init__(
+        self,
+        store: RateLimitStore | None = None,
+        model_name: str | None = None,
+        model_limits: dict[str, str] | None = None,
+    ) -> None:
         # Configure rate limits per tier
         self.limits = {
             "free": "10/minute",
@@ -246,14 +265,18 @@ class RateLimiter:
             "premium": "1000/minute",
             "enterprise": "10000/minute",
         }
+        self.token_limits = {
+            "free": "20000/minute",
+            "basic": "200000/minute",
+            "premium": "2000000/minute",
+            "enterprise": "20000000/minute",
+        }
+        # Model name -> token limit shared by all tenants
+        self.model_limits = dict(model_limits or {})
+        self.model_name = model_name or os.getenv("MODEL_NAME")
 
-        # Create limiter instance
-        self.limiter: Any = Limiter(key_func=get_remote_address)
-
-        # Track usage per user
-        self.user_usage: dict[str, list[datetime]] = {}
-        self.cleanup_interval = 3600  # Cleanup old entries every hour
-        self.last_cleanup = time.time()
+        self.gcra = GCRALimiter(store)
+        self._quotas: dict[str, Quota] = {}
 
     def get_user_tier(self, _user_id: str) -> str:
         """Determine user tier (placeholder - would integrate with auth system)."""
@@ -263,43 +286,71 @@ class RateLimiter:
     async def check_rate_limit(
         self, request: Request, user_id: str | None = None
     ) -> bool:
-        """Check if request is within rate limits."""
-        try:
-            await asyncio.sleep(0)
-            # Cleanup old entries periodically
-            current_time = time.time()
-            if current_time - self.last_cleanup > self.cleanup_interval:
-                self._cleanup_old_entries()
-                self.last_cleanup = current_time
+        """Check if request is within rate limits.
 
-            # Get user tier and corresponding limit
+        The decision is also stored on ``request.state.rate_limit`` so callers
+        can report ``Retry-After``.
+        """
+        try:
+            tokens = estimate_tokens(await _read_json(request))
+            tenant = (
+                f"user:{user_id}" if user_id else f"ip:{get_remote_address(request)}"
+            )
             tier = self.get_user_tier(user_id) if user_id else "free"
-            _limit = self.limits.get(tier, "10/minute")
-
-            # Apply rate limit
-            # Note: In production, this would use Redis or similar for distributed rate limiting
-            return True  # Simplified for now
+            decision = await self.acquire(tenant, tier, tokens)
+            request.state.rate_limit = decision
+            return decision.allowed
 
         except Exception as e:
             logger.error(f"Rate limit check failed: {e}")
             return False  # Fail closed
 
-    def _cleanup_old_entries(self) -> None:
-        """Clean up old usage tracking entries."""
-        cutoff = datetime.now() - timedelta(hours=1)
-
-        # Snapshot keys before mutation
-        keys_to_check = list(self.user_usage.keys())
-        for user_id in keys_to_check:
-            self.user_usage[user_id] = [
-                timestamp
-                for timestamp in self.user_usage[user_id]
-                if timestamp > cutoff
-            ]
-
-            # Remove empty entries
-            if not self.user_usage[user_id]:
-                del self.user_usage[user_id]
+    async def acquire(
+        self,
+        tenant: str,
+        tier: str = "free",
+        tokens: int = 0,
+        model: str | None = None,
+    ) -> RateLimitDecision:
+        """Charge one request and ``tokens`` to the tenant's and model's quotas."""
+        model = model or self.model_name
+        checks = [
+            (f"req:{tenant}", self._quota(self.limits.get(tier, "10/minute")), 1.0),
+        ]
+        if tokens:
+            token_limit = self.token_limits.get(tier, self.token_limits["free"])
+            checks.append((f"tok:{tenant}", self._quota(token_limit), float(tokens)))
+            if model and model in self.model_limits:
+                model_quota = self._quota(self.model_limits[model])
+                checks.append((f"model:{model}", model_quota, float(tokens)))
+
+        if self.gcra.store.blocking:
+            return await asyncio.to_thread(self.gcra.acquire, checks)
+        return self.gcra.acquire(checks)
+
+    def _quota(self, spec: str) -> Quota:
+        quota = self._quotas.get(spec)
+        if quota is None:
+            quota = self._quotas[spec] = Quota.parse(spec)
+        return quota
+
+
+def estimate_tokens(body: dict[str, Any] | None) -> int:
+    """Rough token cost of an inference request: prompt plus completion budget."""
+    if not body:
+        return 0
+    prompt = body.get("prompt") or ""
+    max_tokens = body.get("max_tokens") or DEFAULT_MAX_TOKENS
+    # ~4 characters per token for English text
+    return len(prompt) // 4 + 1 + max(int(max_tokens), 0)
+
+
+async def _read_json(request: Request) -> dict[str, Any] | None:
+    try:
+        body = await request.json()
+    except Exception:
+        return None
+    return body if isinstance(body, dict) else None
 
 
 class AuthenticationValidator:
@@ -420,8 +471,26 @@ def create_security_validator() -> SecurityValidator:
 
 
 def create_rate_limiter() -> RateLimiter:
-    """Create a configured rate limiter."""
-    return RateLimiter()
+    """Create a configured rate limiter.
+
+    ``RATE_LIMIT_BACKEND=sqlite`` shares limits between worker processes via
+    ``RATE_LIMIT_SQLITE_PATH``; ``RATE_LIMIT_MODEL_TOKENS`` sets per-model
+    token quotas as ``model=spec`` pairs, e.g. ``llama3=500000/minute``.
+    """
+    max_keys = int(os.getenv("RATE_LIMIT_MAX_KEYS", str(DEFAULT_MAX_KEYS)))
+    store: RateLimitStore
+    if os.getenv("RATE_LIMIT_BACKEND", "memory").lower() == "sqlite":
+        path = os.getenv("RATE_LIMIT_SQLITE_PATH", "/tmp/ml-inference-ratelimit.db")
+        store = SQLiteRateLimitStore(path, max_keys=max_keys)
+    else:
+        store = MemoryRateLimitStore(max_keys=max_keys)
+
+    model_limits = {}
+    for item in os.getenv("RATE_LIMIT_MODEL_TOKENS", "").split(","):
+        if "=" in item:
+            model, spec = item.split("=", 1)
+            model_limits[model.strip()] = spec.strip()
+    return RateLimiter(store=store, model_limits=model_limits)
 
 
 def create_auth_validator(secret_key: str | None = None) -> AuthenticationValidator:
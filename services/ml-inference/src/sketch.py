@@ -0,0 +1,147 @@
+"""
+Mergeable quantile sketch for latency distributions.
+
+A DDSketch maps each positive value ``x`` to bucket ``ceil(log_gamma(x))``
+with ``gamma = (1 + alpha) / (1 - alpha)``. Every quantile it returns is
+within relative error ``alpha`` of the exact one, whatever the distribution.
+Sketches with the same ``alpha`` merge by adding bucket counts, so windows and
+worker processes combine without losing accuracy. See Masson et al.,
+"DDSketch: A Fast and Fully-Mergeable Quantile Sketch with Relative-Error
+Guarantees" (VLDB 2019).
+"""
+
+import math
+from typing import Any
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_BUCKETS = 2048
+
+# Values at or below this are counted in the zero bucket
+MIN_INDEXABLE_VALUE = 1e-9
+
+
+class DDSketch:
+    """Streaming quantile sketch with bounded relative error."""
+
+    def __init__(
+        self,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        max_buckets: int = DEFAULT_MAX_BUCKETS,
+    ):
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Record ``value`` (negative values are clamped to zero)."""
+        if value > MIN_INDEXABLE_VALUE:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[key] = self.buckets.get(key, 0) + count
+            if len(self.buckets) > self.max_buckets:
+                self._collapse()
+        else:
+            value = max(value, 0.0)
+            self.zero_count += count
+        self.count += count
+        self.sum += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Value at quantile ``q`` in [0, 1]; 0.0 when the sketch is empty."""
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs: list[float]) -> list[float]:
+        """Several quantiles with a single pass over the buckets."""
+        if any(not 0.0 <= q <= 1.0 for q in qs):
+            raise ValueError("quantiles must be in [0, 1]")
+        results = [0.0] * len(qs)
+        if not self.count:
+            return results
+
+        keys = iter(sorted(self.buckets))
+        seen = self.zero_count
+        value = 0.0
+        for i in sorted(range(len(qs)), key=qs.__getitem__):
+            rank = qs[i] * (self.count - 1)
+            if rank < self.zero_count:
+                continue
+            while rank >= seen:
+                key = next(keys, None)
+                if key is None:
+                    value = self.max
+                    break
+                seen += self.buckets[key]
+                # Midpoint (in relative terms) of (gamma^(key-1), gamma^key]
+                value = 2 * self.gamma**key / (self.gamma + 1)
+            results[i] = min(max(value, self.min), self.max)
+        return results
+
+    def merge(self, other: "DDSketch") -> None:
+        """Add ``other``'s observations to this sketch."""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def copy(self) -> "DDSketch":
+        sketch = DDSketch(self.relative_accuracy, self.max_buckets)
+        sketch.merge(self)
+        return sketch
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable form for shipping sketches between workers."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "buckets": {str(key): count for key, count in self.buckets.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(
+        cls, data: dict[str, Any], max_buckets: int = DEFAULT_MAX_BUCKETS
+    ) -> "DDSketch":
+        sketch = cls(data["relative_accuracy"], max_buckets)
+        sketch.buckets = {int(key): count for key, count in data["buckets"].items()}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+        if sketch.count:
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+        return sketch
+
+    def _collapse(self) -> None:
+        # Fold the lowest buckets together: only the smallest values lose accuracy
+        keys = sorted(self.buckets)
+        excess = len(keys) - self.max_buckets
+        target = keys[excess]
+        for key in keys[:excess]:
+            self.buckets[target] += self.buckets.pop(key)
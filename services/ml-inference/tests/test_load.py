@@ -32,3 +32,22 @@ async def test_load_concurrency() -> None:
         responses = await asyncio.gather(*tasks)
 
     assert all(r.status_code == 200 for r in responses)
+
+
+@pytest.mark.asyncio
+async def test_load_over_limit_is_shed_with_retry_after(monkeypatch) -> None:
+    import app as app_module
+    from security import RateLimiter
+
+    limiter = RateLimiter()
+    limiter.limits["free"] = "5/minute"
+    monkeypatch.setattr(app_module, "rate_limiter", limiter)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        tasks = [client.post("/predict", json={"prompt": str(i)}) for i in range(20)]
+        responses = await asyncio.gather(*tasks)
+
+    shed = [r for r in responses if r.status_code == 429]
+    assert len(shed) == 15
+    assert all(int(r.headers["Retry-After"]) >= 1 for r in shed)
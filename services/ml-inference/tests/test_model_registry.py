@@ -0,0 +1,151 @@
+import asyncio
+import hashlib
+import json
+from pathlib import Path
+
+import pytest
+
+from model_registry import (
+    HASH_BUFFER_SIZE,
+    ModelRegistry,
+    ModelStatus,
+    ModelVersionManager,
+    calculate_file_hash,
+)
+
+
+def _artifact(tmp_path: Path, size: int = 10) -> Path:
+    path = tmp_path / "model.bin"
+    path.write_bytes(bytes(range(256)) * (size // 256) + b"x" * (size % 256))
+    return path
+
+
+async def _register(registry: ModelRegistry, path: Path, name: str, version: str):
+    return await registry.register_model(
+        str(path), name, version, "test model", "llm", "mlx", "tester"
+    )
+
+
+def test_register_hashes_and_copies_artifact_in_one_pass(tmp_path: Path) -> None:
+    artifact = _artifact(tmp_path, 3 * HASH_BUFFER_SIZE + 17)
+    registry = ModelRegistry(str(tmp_path / "registry"))
+
+    model_id = asyncio.run(_register(registry, artifact, "m", "1"))
+
+    metadata = registry.get_model_metadata(model_id)
+    expected = hashlib.sha256(artifact.read_bytes()).hexdigest()
+    copied = registry.models_path / "m" / "1" / "model.bin"
+    assert metadata.file_hash == expected == calculate_file_hash(copied)
+    assert metadata.file_size == artifact.stat().st_size
+    with pytest.raises(ValueError):
+        asyncio.run(_register(registry, artifact, "m", "1"))
+    registry.close()
+
+
+def test_registry_state_survives_restart(tmp_path: Path) -> None:
+    artifact = _artifact(tmp_path)
+    path = str(tmp_path / "registry")
+
+    async def populate() -> None:
+        registry = ModelRegistry(path)
+        for version in ("1", "2", "3"):
+            await _register(registry, artifact, "m", version)
+        await _register(registry, artifact, "other", "1")
+        await registry.activate_model("m:2")
+        await registry.activate_model("m:3", environment="staging")
+        await registry.start_ab_test("t", "m:2", "m:3", 0.5)
+        await registry.delete_model("other:1")
+        registry.close()
+
+    asyncio.run(populate())
+    registry = ModelRegistry(path)
+
+    assert [m.version for m in registry.list_models("m")] == ["3", "2", "1"]
+    assert registry.get_model_metadata("other:1") is None
+    assert registry.get_active_model("m") == "2"
+    assert registry.get_active_model("m", environment="staging") == "3"
+    assert registry.get_model_metadata("m:2").status is ModelStatus.ACTIVE
+    assert registry.get_ab_test("t").traffic_split == 0.5
+    assert registry.store.get_model("m", "1")["file_size"] == 10
+    assert [r["version"] for r in registry.store.list_versions("m")] == ["3", "2", "1"]
+    registry.close()
+
+
+def test_deactivate_and_promote_across_environments(tmp_path: Path) -> None:
+    artifact = _artifact(tmp_path)
+    registry = ModelRegistry(str(tmp_path / "registry"))
+    manager = ModelVersionManager(registry)
+
+    async def run() -> None:
+        await _register(registry, artifact, "m", "1")
+        await manager.deploy_model("m:1", environment="staging")
+        await manager.promote_model("m:1", "staging", "production")
+        await registry.deactivate_model("m", environment="staging")
+        assert registry.get_model_metadata("m:1").status is ModelStatus.ACTIVE
+        await registry.deactivate_model("m")
+
+    asyncio.run(run())
+
+    assert registry.get_active_model("m") is None
+    assert registry.get_model_metadata("m:1").status is ModelStatus.DEPRECATED
+    assert registry.store.get_active("m", "staging") is None
+    registry.close()
+
+
+def test_traffic_split_matches_per_request_hashing(tmp_path: Path) -> None:
+    artifact = _artifact(tmp_path)
+    registry = ModelRegistry(str(tmp_path / "registry"))
+
+    async def run() -> None:
+        await _register(registry, artifact, "m", "1")
+        await _register(registry, artifact, "m", "2")
+        await registry.activate_model("m:1")
+        await registry.start_ab_test("t", "m:1", "m:2", 0.3)
+
+    asyncio.run(run())
+
+    users = [f"user-{i}" for i in range(2000)]
+    for user in users:
+        # The assignment previous releases computed on every request
+        digest = hashlib.md5(f"t:{user}".encode()).hexdigest()
+        expected = (int(digest, 16) % 100) / 100.0 < 0.3
+        assert registry.should_use_model_b("t", user) is expected
+        assert registry.route_model("m", user) == ("m:2" if expected else "m:1")
+    share = sum(registry.should_use_model_b("t", u) for u in users) / len(users)
+    assert share == pytest.approx(0.3, abs=0.05)
+
+    asyncio.run(registry.stop_ab_test("t"))
+    assert not any(registry.should_use_model_b("t", u) for u in users)
+    assert {registry.route_model("m", u) for u in users} == {"m:1"}
+    assert registry.route_model("unknown", "user-0") is None
+    registry.close()
+
+
+def test_imports_legacy_json_registry(tmp_path: Path) -> None:
+    metadata_path = tmp_path / "registry" / "metadata"
+    metadata_path.mkdir(parents=True)
+    record = {
+        "model_id": "m:1",
+        "version": "1",
+        "name": "m",
+        "description": "",
+        "model_type": "llm",
+        "framework": "mlx",
+        "created_at": "2025-01-01T00:00:00+00:00",
+        "created_by": "tester",
+        "tags": [],
+        "parameters": {},
+        "performance_metrics": {},
+        "file_hash": "abc",
+        "file_size": 1,
+        "dependencies": [],
+        "status": "active",
+    }
+    (metadata_path / "registry.json").write_text(json.dumps({"models": [record]}))
+    (metadata_path / "active_models.json").write_text(json.dumps({"m": "1"}))
+
+    registry = ModelRegistry(str(tmp_path / "registry"))
+
+    assert registry.get_model_metadata("m:1").status is ModelStatus.ACTIVE
+    assert registry.get_active_model("m") == "1"
+    registry.close()
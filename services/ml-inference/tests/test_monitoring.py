@@ -0,0 +1,136 @@
+import json
+import random
+
+import pytest
+
+from monitoring import MonitoringService, PerformanceAnalyzer
+from sketch import DDSketch
+
+QUANTILES = [0.0, 0.5, 0.9, 0.99, 0.999, 1.0]
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _exact(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def _latencies(seed: int, n: int) -> list[float]:
+    rng = random.Random(seed)
+    # Mostly fast requests with a heavy tail, in milliseconds
+    return [
+        (
+            rng.lognormvariate(3.0, 0.5)
+            if rng.random() < 0.98
+            else rng.paretovariate(1.2) * 500
+        )
+        for _ in range(n)
+    ]
+
+
+@pytest.mark.parametrize("alpha", [0.01, 0.02])
+def test_sketch_quantiles_within_relative_error(alpha: float) -> None:
+    values = _latencies(0, 50_000)
+    sketch = DDSketch(alpha)
+    for value in values:
+        sketch.add(value)
+
+    for q, estimate in zip(QUANTILES, sketch.quantiles(QUANTILES)):
+        exact = _exact(values, q)
+        assert abs(estimate - exact) <= alpha * exact, q
+    assert sketch.count == len(values)
+    assert sketch.mean == pytest.approx(sum(values) / len(values))
+
+
+def test_merged_sketches_match_a_single_sketch_over_all_values() -> None:
+    parts = [_latencies(seed, 10_000) for seed in range(4)]
+    merged = DDSketch()
+    for part in parts:
+        worker = DDSketch()
+        for value in part:
+            worker.add(value)
+        # Shipped between workers as JSON
+        merged.merge(DDSketch.from_dict(json.loads(json.dumps(worker.to_dict()))))
+
+    values = [value for part in parts for value in part]
+    for q in QUANTILES:
+        exact = _exact(values, q)
+        assert abs(merged.quantile(q) - exact) <= 0.01 * exact
+
+
+def test_sketch_zero_values_bucket_collapse_and_validation() -> None:
+    sketch = DDSketch(max_buckets=8)
+    for value in [0.0, 0.0, *[10.0**k for k in range(-3, 9)]]:
+        sketch.add(value)
+
+    assert len(sketch.buckets) == 8
+    assert sketch.quantile(0.0) == 0.0
+    # Top of the range keeps full accuracy after collapsing the low buckets
+    assert sketch.quantile(1.0) == pytest.approx(1e8, rel=0.01)
+    assert DDSketch().quantile(0.5) == 0.0
+    with pytest.raises(ValueError):
+        sketch.quantile(1.5)
+    with pytest.raises(ValueError):
+        sketch.merge(DDSketch(0.05))
+
+
+def test_analyzer_percentiles_reflect_requests_not_window_averages() -> None:
+    clock = _Clock()
+    analyzer = PerformanceAnalyzer(window_seconds=60.0, clock=clock)
+    values = _latencies(1, 20_000)
+    for i, value in enumerate(values):
+        clock.now = i * 0.01  # spans several windows
+        endpoint = "/predict" if i % 2 else "/structured"
+        analyzer.record_request(value, True, False, endpoint=endpoint, model="m")
+
+    assert len(analyzer.metrics_history) == 3
+    percentiles = analyzer.get_percentiles([50, 99, 99.9])
+    for key, q in (("p50", 0.5), ("p99", 0.99), ("p99.9", 0.999)):
+        exact = _exact(values, q)
+        assert abs(percentiles[key] - exact) <= 0.01 * exact
+
+    predict = values[1::2]
+    p99 = analyzer.get_percentiles([99], endpoint="/predict")["p99"]
+    assert abs(p99 - _exact(predict, 0.99)) <= 0.01 * _exact(predict, 0.99)
+    assert analyzer.get_latency_sketch(model="other").count == 0
+    assert analyzer.get_latency_sketch(windows=0).count == len(values) - 3 * 6000
+
+
+def test_analyzer_export_and_report_breakdown() -> None:
+    analyzer = PerformanceAnalyzer()
+    analyzer.record_request(10.0, True, True, tokens=5, endpoint="/predict", model="a")
+    analyzer.record_request(30.0, False, False, endpoint="/predict", model="b")
+
+    exported = analyzer.export_latency_sketches()
+    report = analyzer.generate_report()
+
+    assert [(e["endpoint"], e["model"]) for e in exported] == [
+        ("/predict", "a"),
+        ("/predict", "b"),
+    ]
+    assert report["latency_breakdown"]["/predict/b"]["count"] == 1
+    assert report["current_metrics"]["requests"] == 2
+
+
+def test_system_metrics_are_sampled_outside_the_request_path(monkeypatch) -> None:
+    service = MonitoringService()
+    calls = []
+    monkeypatch.setattr(
+        service.prometheus,
+        "update_system_metrics",
+        lambda: calls.append(1) or (512 * 1024 * 1024, 42.0),
+    )
+
+    service.record_request("/predict", "success", 0.02, True, False, model="m")
+    assert calls == []
+
+    service.sample_system_metrics()
+    current = service.performance_analyzer.get_current_metrics()
+    assert (current.memory_usage_mb, current.cpu_usage_percent) == (512.0, 42.0)
@@ -0,0 +1,169 @@
+import math
+import multiprocessing
+import time
+from pathlib import Path
+
+import pytest
+
+from rate_limit import (
+    GCRALimiter,
+    MemoryRateLimitStore,
+    Quota,
+    SQLiteRateLimitStore,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_quota_parse() -> None:
+    quota = Quota.parse("10/minute")
+    assert (quota.limit, quota.period, quota.capacity) == (10, 60, 10)
+    assert quota.emission_interval == pytest.approx(6.0)
+    assert Quota.parse("5/seconds", burst=2).capacity == 2
+    with pytest.raises(ValueError):
+        Quota.parse("ten/minute")
+    with pytest.raises(ValueError):
+        Quota.parse("10/fortnight")
+
+
+def test_gcra_admits_burst_then_steady_rate() -> None:
+    clock = _Clock()
+    limiter = GCRALimiter(clock=clock)
+    check = [("req:a", Quota.parse("10/minute"), 1.0)]
+
+    assert all(limiter.acquire(check).allowed for _ in range(10))
+    denied = limiter.acquire(check)
+    assert not denied.allowed
+    assert denied.limited_by == "req:a"
+    assert denied.retry_after == pytest.approx(6.0)
+
+    clock.now += 6.0
+    assert limiter.acquire(check).allowed
+    assert not limiter.acquire(check).allowed
+
+
+def test_cost_weighted_quota_and_oversized_requests() -> None:
+    clock = _Clock()
+    limiter = GCRALimiter(clock=clock)
+    tokens = Quota.parse("1000/minute")
+
+    assert limiter.acquire([("tok:a", tokens, 600.0)]).allowed
+    denied = limiter.acquire([("tok:a", tokens, 600.0)])
+    assert not denied.allowed
+    assert denied.retry_after == pytest.approx(12.0)  # 200 tokens at 60ms each
+    assert limiter.acquire([("tok:a", tokens, 400.0)]).allowed
+
+    too_big = limiter.acquire([("tok:b", tokens, 1001.0)])
+    assert not too_big.allowed and math.isinf(too_big.retry_after)
+
+
+def test_negative_cost_cannot_refill_a_quota() -> None:
+    clock = _Clock()
+    limiter = GCRALimiter(clock=clock)
+    tokens = Quota.parse("20000/minute")
+
+    assert limiter.acquire([("tok:a", tokens, 20000.0)]).allowed
+    with pytest.raises(ValueError):
+        limiter.acquire([("tok:a", tokens, -1_000_000.0)])
+    assert not limiter.acquire([("tok:a", tokens, 1.0)]).allowed
+
+
+def test_multi_quota_checks_are_all_or_nothing() -> None:
+    clock = _Clock()
+    store = MemoryRateLimitStore()
+    limiter = GCRALimiter(store, clock=clock)
+    model = Quota.parse("1000/minute")
+
+    assert limiter.acquire(
+        [("tok:a", Quota.parse("5000/minute"), 900.0), ("model:m", model, 900.0)]
+    ).allowed
+    denied = limiter.acquire(
+        [("tok:b", Quota.parse("5000/minute"), 200.0), ("model:m", model, 200.0)]
+    )
+
+    assert not denied.allowed and denied.limited_by == "model:m"
+    # Tenant b was not charged for the rejected request
+    assert limiter.acquire([("tok:b", Quota.parse("5000/minute"), 5000.0)]).allowed
+
+
+def test_memory_store_bounds_keys_and_sweeps_idle_entries() -> None:
+    clock = _Clock()
+    store = MemoryRateLimitStore(max_keys=3, sweep_interval=10.0)
+    limiter = GCRALimiter(store, clock=clock)
+    quota = Quota.parse("60/minute")
+
+    for key in "abcde":
+        limiter.acquire([(key, quota, 1.0)])
+    assert len(store) == 3
+
+    clock.now += 30.0  # every bucket has refilled
+    limiter.acquire([("f", quota, 1.0)])
+    assert len(store) == 1
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path: Path) -> None:
+    clock = _Clock()
+    path = str(tmp_path / "limits.db")
+    workers = [GCRALimiter(SQLiteRateLimitStore(path), clock=clock) for _ in range(2)]
+    check = [("req:a", Quota.parse("4/minute"), 1.0)]
+
+    admitted = [workers[i % 2].acquire(check).allowed for i in range(6)]
+
+    assert admitted == [True] * 4 + [False] * 2
+    for worker in workers:
+        worker.store.close()
+
+
+def _hammer(path: str, attempts: int, results) -> None:
+    limiter = GCRALimiter(SQLiteRateLimitStore(path, timeout=10.0))
+    quota = Quota.parse("50/hour")
+    results.put(
+        sum(
+            limiter.acquire([("req:shared", quota, 1.0)]).allowed
+            for _ in range(attempts)
+        )
+    )
+    limiter.store.close()
+
+
+def test_load_over_limit_across_worker_processes(tmp_path: Path) -> None:
+    path = str(tmp_path / "limits.db")
+    SQLiteRateLimitStore(path).close()
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    processes = [
+        context.Process(target=_hammer, args=(path, 100, results)) for _ in range(4)
+    ]
+
+    started = time.monotonic()
+    for process in processes:
+        process.start()
+    admitted = sum(results.get(timeout=60) for _ in processes)
+    for process in processes:
+        process.join(timeout=60)
+
+    # 400 attempts from 4 processes; only the burst (plus at most one refill
+    # for elapsed time at 72 s/request) gets through
+    assert 50 <= admitted <= 50 + math.ceil((time.monotonic() - started) / 72)
+
+
+def test_load_over_limit_sheds_excess_quickly() -> None:
+    limiter = GCRALimiter()
+    quota = Quota.parse("100/minute")
+
+    started = time.perf_counter()
+    decisions = [
+        limiter.acquire([(f"req:{i % 10}", quota, 1.0)]) for i in range(20_000)
+    ]
+    elapsed = time.perf_counter() - started
+
+    assert sum(d.allowed for d in decisions) == 1000
+    assert all(d.retry_after > 0 for d in decisions if not d.allowed)
+    # Rejections are cheap: the whole run stays far below a millisecond each
+    assert elapsed / len(decisions) < 1e-3
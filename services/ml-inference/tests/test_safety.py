@@ -31,3 +31,9 @@ async def test_safety_filter_blocks_prompt() -> None:
 
     assert resp.status_code == 400
     assert resp.json()["detail"] == "Unsafe prompt"
+
+
+def test_estimate_tokens_ignores_negative_completion_budget() -> None:
+    from security import estimate_tokens
+
+    assert estimate_tokens({"prompt": "abcd", "max_tokens": -1_000_000}) == 2
@@ -0,0 +1,118 @@
+import re
+
+import pytest
+
+from scanner import BANNED_RULES, PII_RULES, MultiPatternScanner, ScanRule
+
+RULES = BANNED_RULES + PII_RULES
+
+TEXT = (
+    "Email drug@x.com or Jane.Doe@example.org about the BOMB threat; "
+    "SSN 123-45-6789, card 4111-1111-1111-1111, not 12345-67-8901 or xbomb. "
+    "Ping a@b.cd.ef later"
+)
+
+
+def _expected(text: str) -> list[tuple[str, int, int]]:
+    return sorted(
+        (rule.name, m.start(), m.end())
+        for rule in RULES
+        for m in re.finditer(rule.pattern, text, rule.flags)
+    )
+
+
+def _spans(matches) -> list[tuple[str, int, int]]:
+    return sorted((m.rule.name, m.start, m.end) for m in matches)
+
+
+def test_single_pass_matches_each_rule_like_findall() -> None:
+    scanner = MultiPatternScanner(RULES)
+
+    matches = scanner.scan(TEXT)
+
+    assert _spans(matches) == _expected(TEXT)
+    # Overlapping hits from different families at one offset are all reported
+    assert {"drugs", "email"} <= {m.rule.name for m in matches if m.start == 6}
+    assert all(TEXT[m.start : m.end] == m.text for m in matches)
+
+
+def test_literal_prefilter_skips_absent_rules() -> None:
+    scanner = MultiPatternScanner(RULES)
+
+    assert scanner.scan("quarterly revenue by region") == []
+    assert [m.rule.name for m in scanner.scan("WEAPON")] == ["weapons"]
+
+
+@pytest.mark.parametrize("text", ["suİcide", "exploıt", "ſelf-harm", "Kokain cocaİne"])
+def test_literal_prefilter_folds_case_like_the_rule(text: str) -> None:
+    scanner = MultiPatternScanner(RULES)
+
+    assert _expected(text)
+    assert _spans(scanner.scan(text)) == _expected(text)
+    assert scanner.redact(text) == _sequential_sub(text, RULES)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64])
+def test_stream_scan_matches_full_scan(chunk_size: int) -> None:
+    scanner = MultiPatternScanner(RULES)
+    stream = scanner.stream()
+
+    matches = []
+    for i in range(0, len(TEXT), chunk_size):
+        matches.extend(stream.feed(TEXT[i : i + chunk_size]))
+    matches.extend(stream.close())
+
+    assert _spans(matches) == _expected(TEXT)
+    assert stream.matches == matches
+    assert stream.position == len(TEXT)
+
+
+def test_stream_scan_reports_matches_before_close() -> None:
+    stream = MultiPatternScanner(BANNED_RULES).stream()
+
+    assert stream.feed("build a bo") == []
+    reported = stream.feed("mb at home")
+
+    assert [m.text for m in reported] == ["bomb"]
+    assert stream.close() == []
+    with pytest.raises(RuntimeError):
+        stream.feed("more")
+
+
+def test_redact_merges_overlapping_matches() -> None:
+    scanner = MultiPatternScanner(PII_RULES)
+
+    redacted = scanner.redact("mail a@b.com, ssn 123-45-6789.")
+
+    assert redacted == "mail [REDACTED], ssn [REDACTED]."
+
+
+def _sequential_sub(text: str, rules) -> str:
+    # What sanitize_output did before the single-pass scanner
+    for rule in rules:
+        text = re.sub(rule.pattern, "[REDACTED]", text, flags=rule.flags)
+    return text
+
+
+def test_redact_overlapping_spans_like_sequential_sub() -> None:
+    scanner = MultiPatternScanner(PII_RULES)
+    # The card rule also matches "6789 4111-1111-1111", overlapping the SSN
+    text = "123-45-6789 4111-1111-1111-1111x"
+
+    assert scanner.redact(text) == "[REDACTED] 4111-1111-1111-1111x"
+    assert scanner.redact(text) == _sequential_sub(text, PII_RULES)
+    assert scanner.redact(TEXT) == _sequential_sub(TEXT, PII_RULES)
+
+
+def test_redact_only_touches_requested_families() -> None:
+    scanner = MultiPatternScanner(RULES)
+
+    assert scanner.redact(TEXT, ["banned"]) == _sequential_sub(TEXT, BANNED_RULES)
+    assert scanner.redact("nothing to hide", ["pii"]) == "nothing to hide"
+
+
+def test_rule_rejects_unsupported_flags() -> None:
+    with pytest.raises(ValueError):
+        ScanRule("x", "banned", "x", flags=re.VERBOSE)
+    with pytest.raises(ValueError):
+        MultiPatternScanner([])
@@ -0,0 +1,6 @@
+"""In-process faceted search over docs-api documents."""
+
+from .bitmap import Bitmap
+from .engine import FacetedSearchEngine, IndexedDocument
+
+__all__ = ["Bitmap", "FacetedSearchEngine", "IndexedDocument"]
@@ -0,0 +1,218 @@
+"""Roaring-style compressed bitmap of document positions."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+
+CONTAINER_BITS = 16
+CONTAINER_MASK = (1 << CONTAINER_BITS) - 1
+CONTAINER_BYTES = (1 << CONTAINER_BITS) // 8
+# Containers holding at most this many values are sorted arrays
+ARRAY_MAX_SIZE = 4096
+
+# A container is a sorted ``array('H')`` of low bits or an int bit set
+Container = array | int
+
+
+def _cardinality(container: Container) -> int:
+    return container.bit_count() if isinstance(container, int) else len(container)
+
+
+def _to_bits(values: Iterable[int]) -> int:
+    buffer = bytearray(CONTAINER_BYTES)
+    for value in values:
+        buffer[value >> 3] |= 1 << (value & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _to_array(bits: int) -> array:
+    values = array("H")
+    for index, byte in enumerate(bits.to_bytes(CONTAINER_BYTES, "little")):
+        if byte:
+            base = index << 3
+            values.extend(base + bit for bit in range(8) if byte >> bit & 1)
+    return values
+
+
+def _compact(bits: int) -> Container | None:
+    """Smallest representation of ``bits``, or ``None`` when empty."""
+    if not bits:
+        return None
+    return _to_array(bits) if bits.bit_count() <= ARRAY_MAX_SIZE else bits
+
+
+def _and(a: Container, b: Container) -> Container | None:
+    if isinstance(a, int) and isinstance(b, int):
+        return _compact(a & b)
+    if isinstance(a, int):
+        a, b = b, a
+    if isinstance(b, int):
+        both = array("H", (value for value in a if b >> value & 1))
+    else:
+        small, large = sorted((a, b), key=len)
+        both = array("H", sorted(set(small).intersection(large)))
+    return both or None
+
+
+def _and_count(a: Container, b: Container) -> int:
+    if isinstance(a, int) and isinstance(b, int):
+        return (a & b).bit_count()
+    if isinstance(a, int):
+        a, b = b, a
+    if isinstance(b, int):
+        return sum(b >> value & 1 for value in a)
+    small, large = sorted((a, b), key=len)
+    return len(set(small).intersection(large))
+
+
+def _or(a: Container, b: Container) -> Container:
+    if isinstance(a, int) or isinstance(b, int):
+        return (a if isinstance(a, int) else _to_bits(a)) | (
+            b if isinstance(b, int) else _to_bits(b)
+        )
+    merged = set(a).union(b)
+    if len(merged) > ARRAY_MAX_SIZE:
+        return _to_bits(merged)
+    return array("H", sorted(merged))
+
+
+class Bitmap:
+    """Set of non-negative ints split into 2^16-wide containers.
+
+    As in roaring bitmaps, the high bits of a position select a container and
+    the low bits address a value inside it. Containers with up to
+    ``ARRAY_MAX_SIZE`` values are sorted ``array('H')`` (two bytes per value);
+    denser ones are a Python int used as an 8 KiB bit set. Intersections skip
+    containers missing on either side and pick the cheapest pairwise kernel.
+    """
+
+    __slots__ = ("_containers",)
+
+    def __init__(self, positions: Iterable[int] = ()) -> None:
+        self._containers: dict[int, Container] = {}
+        for position in positions:
+            self.add(position)
+
+    @classmethod
+    def _from_containers(cls, containers: dict[int, Container]) -> Bitmap:
+        bitmap = cls()
+        bitmap._containers = containers
+        return bitmap
+
+    @classmethod
+    def full(cls, size: int) -> Bitmap:
+        """Bitmap containing ``0 .. size - 1``."""
+        containers: dict[int, Container] = {}
+        for key in range((size + CONTAINER_MASK) >> CONTAINER_BITS):
+            width = min(size - (key << CONTAINER_BITS), 1 << CONTAINER_BITS)
+            containers[key] = (
+                array("H", range(width)) if width <= ARRAY_MAX_SIZE else (1 << width) - 1
+            )
+        return cls._from_containers(containers)
+
+    def add(self, position: int) -> None:
+        key = position >> CONTAINER_BITS
+        value = position & CONTAINER_MASK
+        container = self._containers.get(key)
+        if container is None:
+            self._containers[key] = array("H", (value,))
+        elif isinstance(container, int):
+            self._containers[key] = container | 1 << value
+        elif value > container[-1]:
+            # Positions are usually added in ascending order
+            container.append(value)
+        else:
+            index = bisect_left(container, value)
+            if container[index] != value:
+                container.insert(index, value)
+        if isinstance(container, array) and len(container) > ARRAY_MAX_SIZE:
+            self._containers[key] = _to_bits(container)
+
+    def discard(self, position: int) -> None:
+        key = position >> CONTAINER_BITS
+        value = position & CONTAINER_MASK
+        container = self._containers.get(key)
+        if container is None:
+            return
+        if isinstance(container, int):
+            remaining = _compact(container & ~(1 << value))
+        else:
+            index = bisect_left(container, value)
+            if index < len(container) and container[index] == value:
+                del container[index]
+            remaining = container or None
+        if remaining is None:
+            del self._containers[key]
+        else:
+            self._containers[key] = remaining
+
+    def __contains__(self, position: int) -> bool:
+        container = self._containers.get(position >> CONTAINER_BITS)
+        if container is None:
+            return False
+        value = position & CONTAINER_MASK
+        if isinstance(container, int):
+            return bool(container >> value & 1)
+        index = bisect_left(container, value)
+        return index < len(container) and container[index] == value
+
+    def __and__(self, other: Bitmap) -> Bitmap:
+        small, large = sorted((self._containers, other._containers), key=len)
+        containers = {}
+        for key, container in small.items():
+            match = large.get(key)
+            if match is not None:
+                both = _and(container, match)
+                if both is not None:
+                    containers[key] = both
+        return Bitmap._from_containers(containers)
+
+    def __or__(self, other: Bitmap) -> Bitmap:
+        return Bitmap.union((self, other))
+
+    def __len__(self) -> int:
+        return sum(_cardinality(container) for container in self._containers.values())
+
+    def __bool__(self) -> bool:
+        return bool(self._containers)
+
+    def __iter__(self) -> Iterator[int]:
+        for key in sorted(self._containers):
+            base = key << CONTAINER_BITS
+            container = self._containers[key]
+            if isinstance(container, int):
+                container = _to_array(container)
+            for value in container:
+                yield base + value
+
+    def __eq__(self, other: object) -> bool:
+        # Container types follow from cardinality, so equal sets compare equal
+        return isinstance(other, Bitmap) and self._containers == other._containers
+
+    def __repr__(self) -> str:
+        return f"Bitmap(cardinality={len(self)})"
+
+    def intersection_count(self, other: Bitmap) -> int:
+        """``len(self & other)`` without materializing the intersection."""
+        small, large = sorted((self._containers, other._containers), key=len)
+        return sum(
+            _and_count(container, large[key])
+            for key, container in small.items()
+            if key in large
+        )
+
+    @classmethod
+    def union(cls, bitmaps: Iterable[Bitmap]) -> Bitmap:
+        containers: dict[int, Container] = {}
+        for bitmap in bitmaps:
+            for key, container in bitmap._containers.items():
+                current = containers.get(key)
+                # Copy arrays so the result never aliases an input container
+                containers[key] = (
+                    (container if isinstance(container, int) else array("H", container))
+                    if current is None
+                    else _or(current, container)
+                )
+        return cls._from_containers(containers)
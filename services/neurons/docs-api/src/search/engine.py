@@ -0,0 +1,373 @@
+"""Faceted full-text search engine backing ``SearchRequest``/``SearchResponse``."""
+
+from __future__ import annotations
+
+import heapq
+import math
+import re
+import time
+from bisect import bisect_left, bisect_right
+from collections import Counter, OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from schemas.search import SearchDocument, SearchFacet, SearchRequest, SearchResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .bitmap import Bitmap
+
+TOKEN_PATTERN = re.compile(r"\w+")
+MATCH_ALL_QUERY = "*"
+FACET_FIELDS = ("category", "tags", "authors", "status")
+WORDS_PER_MINUTE = 200
+TITLE_BOOST = 3
+BM25_K1 = 1.2
+BM25_B = 0.75
+HIGHLIGHT_CONTEXT = 60
+MAX_HIGHLIGHTS = 3
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _timestamp(value: datetime | None) -> float:
+    return value.timestamp() if value is not None else float("-inf")
+
+
+# sort_by value -> (key, descending)
+SORT_FIELDS: dict[str, tuple[Callable[[IndexedDocument], Any], bool]] = {
+    "updated_at": (lambda doc: _timestamp(doc.updated_at), True),
+    "quality_score": (lambda doc: doc.quality_score or 0.0, True),
+    "word_count": (lambda doc: doc.word_count, False),
+    "title": (lambda doc: doc.title.lower(), False),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedDocument:
+    """Document fields held in memory by the engine."""
+
+    id: str
+    path: str
+    title: str
+    content: str = ""
+    description: str | None = None
+    category: str | None = None
+    tags: tuple[str, ...] = ()
+    authors: tuple[str, ...] = ()
+    status: str | None = None
+    featured: bool = False
+    word_count: int = 0
+    quality_score: float | None = None
+    accessibility_score: float | None = None
+    updated_at: datetime | None = None
+
+    @classmethod
+    def from_model(cls, model: Any) -> IndexedDocument:
+        """Build from a ``models.Document`` row (or any object with the same attributes)."""
+        content = model.content or ""
+        return cls(
+            id=str(model.id),
+            path=model.path,
+            title=model.title,
+            content=content,
+            description=model.description,
+            category=model.category,
+            tags=tuple(model.tags or ()),
+            authors=tuple(model.authors or ()),
+            status=model.status,
+            featured=bool(model.featured),
+            word_count=(
+                model.word_count
+                if model.word_count is not None
+                else len(content.split())
+            ),
+            quality_score=model.quality_score,
+            accessibility_score=model.accessibility_score,
+            updated_at=model.updated_at,
+        )
+
+    def facet_values(self, facet: str) -> tuple[str, ...]:
+        value = getattr(self, facet)
+        if isinstance(value, tuple):
+            return value
+        return () if value is None else (value,)
+
+
+@dataclass
+class _RangeIndex:
+    """Sorted ``(value, position)`` pairs for range filters."""
+
+    values: list[float] = field(default_factory=list)
+    positions: list[int] = field(default_factory=list)
+
+    def select(self, low: float | None, high: float | None) -> Bitmap:
+        start = 0 if low is None else bisect_left(self.values, low)
+        stop = len(self.values) if high is None else bisect_right(self.values, high)
+        return Bitmap(self.positions[start:stop])
+
+
+class FacetedSearchEngine:
+    """In-process search over documents with bitmap facet indexes.
+
+    Text is indexed into per-term posting lists (scored with BM25, title terms
+    boosted) plus a bitmap of matching documents per term. Every facet value,
+    the featured flag and the numeric ranges resolve to bitmaps, so filters are
+    bitmap intersections and facet counts are intersection cardinalities.
+    Responses are memoized per index generation.
+    """
+
+    def __init__(self, *, cache_size: int = 256, max_facet_values: int = 50) -> None:
+        self.cache_size = cache_size
+        self.max_facet_values = max_facet_values
+        self.generation = 0
+        self._cache: OrderedDict[tuple[int, str], SearchResponse] = OrderedDict()
+        self.index([])
+
+    @property
+    def document_count(self) -> int:
+        return len(self._documents)
+
+    def index(self, documents: Iterable[IndexedDocument]) -> None:
+        """Replace the indexed corpus with ``documents``."""
+        docs = list(documents)
+        postings: dict[str, dict[int, int]] = {}
+        term_bitmaps: dict[str, Bitmap] = {}
+        facets: dict[str, dict[str, Bitmap]] = {name: {} for name in FACET_FIELDS}
+        featured = Bitmap()
+        doc_lengths: list[int] = []
+        word_counts: list[tuple[int, int]] = []
+        quality_scores: list[tuple[float, int]] = []
+
+        for position, doc in enumerate(docs):
+            terms = Counter(tokenize(doc.title))
+            for term in terms:
+                terms[term] *= TITLE_BOOST
+            terms.update(tokenize(doc.description or ""))
+            terms.update(tokenize(" ".join(doc.tags)))
+            terms.update(tokenize(doc.content))
+            doc_lengths.append(sum(terms.values()))
+            for term, frequency in terms.items():
+                postings.setdefault(term, {})[position] = frequency
+                term_bitmaps.setdefault(term, Bitmap()).add(position)
+            for name in FACET_FIELDS:
+                for value in doc.facet_values(name):
+                    facets[name].setdefault(value, Bitmap()).add(position)
+            if doc.featured:
+                featured.add(position)
+            word_counts.append((doc.word_count, position))
+            if doc.quality_score is not None:
+                quality_scores.append((doc.quality_score, position))
+
+        word_counts.sort()
+        quality_scores.sort()
+        self._documents = docs
+        self._postings = postings
+        self._term_bitmaps = term_bitmaps
+        self._facets = facets
+        self._featured = featured
+        self._all = Bitmap.full(len(docs))
+        self._doc_lengths = doc_lengths
+        self._avg_doc_length = sum(doc_lengths) / len(docs) if docs else 0.0
+        self._word_count_index = _RangeIndex(
+            [value for value, _ in word_counts], [pos for _, pos in word_counts]
+        )
+        self._quality_index = _RangeIndex(
+            [value for value, _ in quality_scores], [pos for _, pos in quality_scores]
+        )
+        self.generation += 1
+        self._cache.clear()
+
+    async def load(self, session: AsyncSession) -> int:
+        """Index every ``models.Document`` row and return the document count."""
+        from models import Document
+
+        result = await session.execute(select(Document).order_by(Document.path))
+        self.index(IndexedDocument.from_model(row) for row in result.scalars())
+        return self.document_count
+
+    def search(self, request: SearchRequest) -> SearchResponse:
+        started = time.perf_counter()
+        key = (self.generation, request.model_dump_json())
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached.model_copy(
+                update={"cached": True, "response_time_ms": _elapsed_ms(started)}
+            )
+
+        terms = (
+            []
+            if request.query.strip() == MATCH_ALL_QUERY
+            else list(dict.fromkeys(tokenize(request.query)))
+        )
+        if terms:
+            candidates = Bitmap.union(
+                self._term_bitmaps[term] for term in terms if term in self._term_bitmaps
+            )
+        elif request.query.strip() == MATCH_ALL_QUERY:
+            candidates = self._all
+        else:
+            candidates = Bitmap()
+        candidates = self._apply_filters(candidates, request)
+
+        total = len(candidates)
+        facets = {
+            name: self._facet_counts(name, candidates) for name in request.facets or ()
+        }
+        ranked = self._rank(candidates, terms, request)
+        documents = [
+            self._to_result(position, score, terms) for position, score in ranked
+        ]
+
+        response = SearchResponse(
+            total=total,
+            documents=documents,
+            facets=facets,
+            page=request.page,
+            page_size=request.page_size,
+            total_pages=math.ceil(total / request.page_size),
+            response_time_ms=_elapsed_ms(started),
+            cached=False,
+        )
+        self._cache[key] = response
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return response
+
+    def _apply_filters(self, candidates: Bitmap, request: SearchRequest) -> Bitmap:
+        # OR within a facet, AND across facets
+        for name in FACET_FIELDS:
+            values = getattr(request, name)
+            if values:
+                index = self._facets[name]
+                candidates &= Bitmap.union(index[v] for v in values if v in index)
+        if request.featured_only:
+            candidates &= self._featured
+        if request.word_count_min is not None or request.word_count_max is not None:
+            candidates &= self._word_count_index.select(
+                request.word_count_min, request.word_count_max
+            )
+        if request.quality_score_min is not None:
+            candidates &= self._quality_index.select(request.quality_score_min, None)
+        return candidates
+
+    def _facet_counts(self, name: str, candidates: Bitmap) -> list[SearchFacet]:
+        if name == "featured":
+            index = {"true": self._featured}
+        else:
+            index = self._facets.get(name, {})
+        counts = [
+            (count, value)
+            for value, bitmap in index.items()
+            if (count := candidates.intersection_count(bitmap))
+        ]
+        top = heapq.nsmallest(
+            self.max_facet_values, counts, key=lambda item: (-item[0], item[1])
+        )
+        return [SearchFacet(value=value, count=count) for count, value in top]
+
+    def _rank(
+        self, candidates: Bitmap, terms: list[str], request: SearchRequest
+    ) -> list[tuple[int, float | None]]:
+        needed = request.page * request.page_size
+        offset = needed - request.page_size
+        scores = self._bm25(candidates, terms) if terms else {}
+        sort_by = request.sort_by or "relevance"
+
+        if sort_by == "relevance":
+            if scores:
+                top = heapq.nsmallest(
+                    needed, scores.items(), key=lambda item: (-item[1], item[0])
+                )
+                return top[offset:]
+            return [
+                (position, None) for position in _islice(candidates, offset, needed)
+            ]
+
+        try:
+            key, descending = SORT_FIELDS[sort_by]
+        except KeyError:
+            raise ValueError(f"Unsupported sort_by: {sort_by}") from None
+        select_top = heapq.nlargest if descending else heapq.nsmallest
+        docs = self._documents
+        top_positions = select_top(needed, candidates, key=lambda pos: key(docs[pos]))
+        return [(position, scores.get(position)) for position in top_positions[offset:]]
+
+    def _bm25(self, candidates: Bitmap, terms: list[str]) -> dict[int, float]:
+        scores: dict[int, float] = {}
+        total_docs = len(self._documents)
+        avg_length = self._avg_doc_length or 1.0
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(
+                1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5)
+            )
+            for position, frequency in postings.items():
+                if position not in candidates:
+                    continue
+                norm = 1 - BM25_B + BM25_B * self._doc_lengths[position] / avg_length
+                weight = idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * norm)
+                scores[position] = scores.get(position, 0.0) + weight
+        return scores
+
+    def _to_result(
+        self, position: int, score: float | None, terms: list[str]
+    ) -> SearchDocument:
+        doc = self._documents[position]
+        return SearchDocument(
+            id=doc.id,
+            path=doc.path,
+            title=doc.title,
+            description=doc.description,
+            category=doc.category,
+            tags=list(doc.tags),
+            authors=list(doc.authors),
+            word_count=doc.word_count,
+            reading_time_minutes=max(1, math.ceil(doc.word_count / WORDS_PER_MINUTE)),
+            quality_score=doc.quality_score,
+            accessibility_score=doc.accessibility_score,
+            updated_at=doc.updated_at,
+            featured=doc.featured,
+            score=round(score, 4) if score is not None else None,
+            highlights=_highlights(doc, terms) if terms else None,
+        )
+
+
+def _islice(bitmap: Bitmap, start: int, stop: int) -> list[int]:
+    positions = []
+    for index, position in enumerate(bitmap):
+        if index >= stop:
+            break
+        if index >= start:
+            positions.append(position)
+    return positions
+
+
+def _highlights(doc: IndexedDocument, terms: list[str]) -> dict[str, list[str]] | None:
+    pattern = re.compile(
+        r"\b(" + "|".join(map(re.escape, terms)) + r")\b", re.IGNORECASE
+    )
+    highlights: dict[str, list[str]] = {}
+    if pattern.search(doc.title):
+        highlights["title"] = [pattern.sub(r"<em>\1</em>", doc.title)]
+    fragments = []
+    for match in pattern.finditer(doc.content):
+        start = max(0, match.start() - HIGHLIGHT_CONTEXT)
+        end = min(len(doc.content), match.end() + HIGHLIGHT_CONTEXT)
+        fragments.append(pattern.sub(r"<em>\1</em>", doc.content[start:end]))
+        if len(fragments) >= MAX_HIGHLIGHTS:
+            break
+    if fragments:
+        highlights["content"] = fragments
+    return highlights or None
+
+
+def _elapsed_ms(started: float) -> int:
+    return round((time.perf_counter() - started) * 1000)
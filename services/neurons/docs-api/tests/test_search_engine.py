@@ -0,0 +1,209 @@
+import asyncio
+import importlib
+import random
+import sys
+from datetime import datetime
+
+import pytest
+
+from schemas.search import SearchRequest
+from search import Bitmap, FacetedSearchEngine, IndexedDocument
+from search.bitmap import ARRAY_MAX_SIZE
+
+
+def _doc(id, title, content, **fields):
+    return IndexedDocument(
+        id=id, path=f"docs/{id}.md", title=title, content=content, **fields
+    )
+
+
+CORPUS = [
+    _doc(
+        "a",
+        "Install guide",
+        "How to install the agent toolkit on linux.",
+        category="guides",
+        tags=("setup", "linux"),
+        authors=("ana",),
+        status="published",
+        featured=True,
+        word_count=120,
+        quality_score=0.9,
+        updated_at=datetime(2024, 3, 1),
+    ),
+    _doc(
+        "b",
+        "Agent architecture",
+        "The agent runtime schedules tools and install hooks.",
+        category="reference",
+        tags=("architecture",),
+        authors=("ben", "ana"),
+        status="published",
+        word_count=900,
+        quality_score=0.7,
+        updated_at=datetime(2024, 5, 1),
+    ),
+    _doc(
+        "c",
+        "Release notes",
+        "Changes since the previous release.",
+        category="guides",
+        tags=("release",),
+        authors=("ben",),
+        status="draft",
+        word_count=300,
+        quality_score=0.4,
+        updated_at=datetime(2024, 1, 1),
+    ),
+]
+
+
+@pytest.fixture
+def engine():
+    engine = FacetedSearchEngine()
+    engine.index(CORPUS)
+    return engine
+
+
+def _ids(response):
+    return [doc.id for doc in response.documents]
+
+
+def test_bitmap_set_operations():
+    evens = Bitmap(range(0, 200_000, 2))
+    low = Bitmap.full(70_000)
+    assert len(evens & low) == 35_000
+    assert evens.intersection_count(low) == 35_000
+    assert len(evens | low) == 135_000
+    assert 65_538 in evens and 65_537 not in evens
+    assert list(Bitmap([70_000, 3, 5])) == [3, 5, 70_000]
+
+
+def test_bitmap_containers_match_set_semantics():
+    rng = random.Random(7)
+    # Sparse and dense containers on both sides of ARRAY_MAX_SIZE
+    sets = [
+        set(rng.sample(range(200_000), size)) | set(range(base, base + dense))
+        for size, base, dense in [(50, 0, 0), (3_000, 65_536, 2_000), (9_000, 0, 70_000)]
+    ]
+    bitmaps = [Bitmap(values) for values in sets]
+    for a, set_a in zip(bitmaps, sets, strict=True):
+        assert list(a) == sorted(set_a)
+        for b, set_b in zip(bitmaps, sets, strict=True):
+            assert list(a & b) == sorted(set_a & set_b)
+            assert a.intersection_count(b) == len(set_a & set_b)
+            assert list(a | b) == sorted(set_a | set_b)
+            assert a | b == Bitmap(set_a | set_b)
+
+    shrinking = Bitmap(range(ARRAY_MAX_SIZE + 1))
+    shrinking.discard(0)
+    assert shrinking == Bitmap(range(1, ARRAY_MAX_SIZE + 1))
+
+
+def test_sparse_bitmaps_stay_small():
+    # A singleton at the top of a container must not allocate an 8 KiB bit set
+    bitmap = Bitmap([65_535])
+    (container,) = bitmap._containers.values()
+    assert sys.getsizeof(container) < 128
+    dense = Bitmap(range(ARRAY_MAX_SIZE + 1))
+    assert isinstance(next(iter(dense._containers.values())), int)
+
+
+def test_title_matches_rank_first(engine):
+    response = engine.search(SearchRequest(query="install"))
+    assert _ids(response) == ["a", "b"]
+    assert response.documents[0].score > response.documents[1].score
+    assert response.documents[0].highlights["title"] == ["<em>Install</em> guide"]
+
+
+def test_filters_and_facets(engine):
+    response = engine.search(
+        SearchRequest(
+            query="*",
+            category=["guides", "reference"],
+            authors=["ana"],
+            word_count_max=500,
+            facets=["category", "tags", "featured"],
+        )
+    )
+    assert _ids(response) == ["a"]
+    assert response.facets["category"][0].model_dump() == {
+        "value": "guides",
+        "count": 1,
+    }
+    assert {f.value for f in response.facets["tags"]} == {"setup", "linux"}
+    assert response.facets["featured"][0].count == 1
+
+    response = engine.search(SearchRequest(query="*", facets=["status"]))
+    assert [(f.value, f.count) for f in response.facets["status"]] == [
+        ("published", 2),
+        ("draft", 1),
+    ]
+    assert _ids(
+        engine.search(
+            SearchRequest(query="*", quality_score_min=0.5, featured_only=True)
+        )
+    ) == ["a"]
+
+
+def test_sort_pagination_and_cache(engine):
+    request = SearchRequest(query="*", sort_by="updated_at", page=2, page_size=2)
+    response = engine.search(request)
+    assert _ids(response) == ["c"]
+    assert (response.total, response.total_pages, response.cached) == (3, 2, False)
+    assert engine.search(request).cached is True
+
+    assert _ids(engine.search(SearchRequest(query="*", sort_by="word_count"))) == [
+        "a",
+        "c",
+        "b",
+    ]
+    with pytest.raises(ValueError):
+        engine.search(SearchRequest(query="*", sort_by="colour"))
+
+    engine.index(CORPUS[:1])
+    assert engine.search(request).cached is False
+
+
+def test_load_from_database(monkeypatch, tmp_path):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+
+    from core import config, database
+
+    importlib.reload(config)
+    importlib.reload(database)
+    sys.modules.pop("models", None)
+    importlib.import_module("models")
+    from models import Document
+
+    async def run():
+        await database.init_db()
+        async with database.AsyncSessionLocal() as session:
+            session.add_all(
+                [
+                    Document(
+                        id="1",
+                        path="docs/one.md",
+                        title="One",
+                        content="alpha beta gamma",
+                        tags=["x"],
+                    ),
+                    Document(
+                        id="2",
+                        path="docs/two.md",
+                        title="Two",
+                        content="beta",
+                        word_count=10,
+                    ),
+                ]
+            )
+            await session.commit()
+        engine = FacetedSearchEngine()
+        async with database.AsyncSessionLocal() as session:
+            assert await engine.load(session) == 2
+        return engine
+
+    engine = asyncio.run(run())
+    response = engine.search(SearchRequest(query="beta", tags=["x"]))
+    assert _ids(response) == ["1"]
+    assert response.documents[0].word_count == 3